@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Contract Counter Backfill / Consistency Check
+
+Contract progress is read from unified_contracts.actions_completed and
+contract_contributor_counts instead of counting contract_contributions (see
+services/contract_counters.py). This compares both counters with the
+contribution rows and, with --repair, recomputes every contract that drifted.
+
+Safe to run while the game is live: each repair batch locks its contracts,
+so work actions on them wait for the recount instead of racing it.
+Exits non-zero if drift was found and not repaired.
+
+Usage:
+    # Run with docker-compose
+    docker-compose exec api python /app/backfill_contract_counters.py
+
+    # Or run locally (if you have the right env vars)
+    cd api && python backfill_contract_counters.py --active-only
+    cd api && python backfill_contract_counters.py --repair
+"""
+
+import argparse
+import sys
+
+from db import SessionLocal
+from services.contract_counters import find_counter_drift, repair_counter_drift
+
+
+REPAIR_BATCH_SIZE = 500
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check (and repair) contract progress counters")
+    parser.add_argument("--repair", action="store_true", help="Recompute drifted contracts")
+    parser.add_argument("--active-only", action="store_true", help="Skip completed contracts")
+    parser.add_argument("--verbose", action="store_true", help="Print every drifted row")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        drift = find_counter_drift(db, active_only=args.active_only)
+        db.rollback()  # don't hold the snapshot open while repairing
+
+        contract_ids = sorted(
+            {row["contract_id"] for row in drift["contracts"]} |
+            {row["contract_id"] for row in drift["contributors"]}
+        )
+        print(f"📊 {len(drift['contracts'])} contract totals and "
+              f"{len(drift['contributors'])} contributor counts out of sync "
+              f"({len(contract_ids)} contracts)")
+
+        if args.verbose:
+            for row in drift["contracts"]:
+                print(f"   contract {row['contract_id']}: counter={row['counter']} actual={row['actual']}")
+            for row in drift["contributors"]:
+                print(f"   contract {row['contract_id']} user {row['user_id']}: "
+                      f"counter={row['counter']} actual={row['actual']}")
+
+        if not contract_ids:
+            print("✅ Counters match contract_contributions")
+            return 0
+
+        if not args.repair:
+            print("❌ Drift found - run with --repair to fix")
+            return 1
+
+        repaired = 0
+        for i in range(0, len(contract_ids), REPAIR_BATCH_SIZE):
+            repaired += repair_counter_drift(db, contract_ids[i:i + REPAIR_BATCH_SIZE])
+            db.commit()
+        print(f"🔧 Repaired {repaired} contracts")
+        return 0
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Player Stat Counter Backfill / Consistency Check
+
+Achievement progress reads lifetime totals from player_stat_counters instead
+of aggregating each player's history (see services/player_stats.py). This
+recomputes the counters from the source tables (user_kingdoms, trade_offers,
+market_transactions, contract_contributions, battles, garden_history, ...)
+and, with --repair, rebuilds every player that drifted.
+
+add_player_stat_counters.sql fills the table for existing players; use this
+to verify it and to repair any drift since. Safe to run while the game is
+live: each repair batch locks its counter rows, so bumps for those players wait for the recount.
+Exits non-zero if drift was found and not repaired.
+
+Usage:
+    # Run with docker-compose
+    docker-compose exec api python /app/backfill_player_stats.py --repair
+
+    # Or run locally (if you have the right env vars)
+    cd api && python backfill_player_stats.py
+    cd api && python backfill_player_stats.py --user-id 123 --verbose
+"""
+
+import argparse
+import sys
+
+from db import SessionLocal, User
+from services.player_stats import find_stat_drift, rebuild_stats
+
+
+BATCH_SIZE = 500
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check (and repair) player achievement counters")
+    parser.add_argument("--repair", action="store_true", help="Rebuild drifted players")
+    parser.add_argument("--user-id", type=int, help="Only check this player")
+    parser.add_argument("--verbose", action="store_true", help="Print every drifted counter")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        checked = drifted_rows = repaired = 0
+        last_id = 0
+        while True:
+            # Keyset pagination over users
+            if args.user_id:
+                user_ids = [args.user_id] if last_id == 0 else []
+            else:
+                user_ids = [uid for (uid,) in db.query(User.id).filter(
+                    User.id > last_id
+                ).order_by(User.id).limit(BATCH_SIZE).all()]
+            if not user_ids:
+                break
+            last_id = user_ids[-1]
+            checked += len(user_ids)
+
+            drift = find_stat_drift(db, user_ids)
+            db.rollback()  # don't hold the snapshot open while repairing
+            drifted_rows += len(drift)
+
+            if args.verbose:
+                for row in drift:
+                    print(f"   user {row['user_id']} {row['stat']}: "
+                          f"counter={row['counter']} actual={row['actual']}")
+
+            drifted_ids = sorted({row["user_id"] for row in drift})
+            if drifted_ids and args.repair:
+                repaired += rebuild_stats(db, drifted_ids)
+                db.commit()
+
+        print(f"📊 Checked {checked} players, {drifted_rows} counters out of sync")
+
+        if not drifted_rows:
+            print("✅ Counters match the source tables")
+            return 0
+
+        if not args.repair:
+            print("❌ Drift found - run with --repair to fix")
+            return 1
+
+        print(f"🔧 Rebuilt {repaired} players")
+        return 0
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Hunt Lookup Benchmark
+
+Times "active hunt for player" with thousands of concurrent hunts:
+1. Seeds --hunts lobby/in_progress hunts of --party players each, plus
+   --finished completed hunts, with realistic session_data blobs and their
+   hunt_participants rows (synthetic player ids, no users needed)
+2. Looks up --lookups players (creators, other participants, players in no
+   hunt) with the old approach - load every active hunt and scan its JSONB
+   participants in Python - and with persistence.get_active_hunt_for_player
+3. Reports time per lookup and SQL statements for both, checks both find the
+   same hunt, then times save_hunt (which now also syncs hunt_participants)
+
+Everything runs inside one transaction that is rolled back at the end, so
+nothing is left behind in the database.
+
+Usage:
+    # Run with docker-compose
+    docker-compose exec api python /app/benchmark_hunt_lookup.py
+
+    # Or run locally (if you have the right env vars)
+    cd api && python benchmark_hunt_lookup.py --hunts 5000 --party 4 --lookups 200
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from db import engine, HuntSession as HuntSessionModel, HuntSessionParticipant
+from systems.hunting.persistence import (
+    get_active_hunt_for_player, save_hunt, _deserialize_hunt, ACTIVE_HUNT_STATUSES, HUNT_EXPIRY_HOURS
+)
+
+
+# Far above real user ids, so lookups never match production hunts
+BENCH_PLAYER_BASE = 9_000_000_000
+
+
+def _session_data(hunt_id: str, status: str, player_ids: list, created_at: datetime) -> dict:
+    """A session_data blob shaped like persistence._serialize_hunt output mid-hunt"""
+    return {
+        "hunt_id": hunt_id,
+        "kingdom_id": "benchmark_hunt_kingdom",
+        "created_by": player_ids[0],
+        "created_at": created_at.isoformat(),
+        "status": status,
+        "current_phase": "track" if status == "in_progress" else "lobby",
+        "participants": {
+            str(pid): {
+                "player_id": pid,
+                "player_name": f"Hunter{pid}",
+                "stats": {"attack": 3, "defense": 3, "intelligence": 2, "faith": 1},
+                "joined_at": created_at.isoformat(),
+                "is_ready": True,
+                "is_injured": False,
+                "total_contribution": 0.0,
+                "successful_rolls": 0,
+                "critical_rolls": 0,
+                "meat_earned": 0,
+                "items_earned": [],
+                "phase_rolls_used": {"track": 1},
+            }
+            for pid in player_ids
+        },
+        "animal_id": None,
+        "animal_data": None,
+        "track_score": 0.0,
+        "max_tier_unlocked": 0,
+        "is_spooked": False,
+        "animal_escaped": False,
+        "current_phase_state": None,
+        "phase_results": [],
+        "total_meat": 0,
+        "bonus_meat": 0,
+        "items_dropped": [],
+        "started_at": None,
+        "completed_at": None,
+    }
+
+
+def seed_hunts(db: Session, hunts: int, finished: int, party: int) -> list:
+    """Insert active and finished hunts. Returns the player ids of each active hunt."""
+    now = datetime.utcnow()
+    active_parties = []
+    hunt_rows = []
+    participant_rows = []
+    next_player = BENCH_PLAYER_BASE
+
+    for i in range(hunts + finished):
+        active = i < hunts
+        status = ("lobby", "in_progress")[i % 2] if active else "completed"
+        hunt_id = f"hunt_benchmark_{i}"
+        player_ids = list(range(next_player, next_player + party))
+        next_player += party
+        created_at = now - timedelta(minutes=i % 600)
+
+        hunt_rows.append({
+            "hunt_id": hunt_id,
+            "created_by": player_ids[0],
+            "kingdom_id": "benchmark_hunt_kingdom",
+            "status": status,
+            "session_data": _session_data(hunt_id, status, player_ids, created_at),
+            "created_at": created_at,
+            "updated_at": created_at,
+            "expires_at": now + timedelta(hours=HUNT_EXPIRY_HOURS),
+        })
+        participant_rows.extend(
+            {"hunt_id": hunt_id, "user_id": pid, "status": status} for pid in player_ids
+        )
+        if active:
+            active_parties.append(player_ids)
+
+    for start in range(0, len(hunt_rows), 1000):
+        db.execute(insert(HuntSessionModel), hunt_rows[start:start + 1000])
+    for start in range(0, len(participant_rows), 5000):
+        db.execute(insert(HuntSessionParticipant), participant_rows[start:start + 5000])
+    db.flush()
+    return active_parties
+
+
+def legacy_active_hunt_for_player(db: Session, player_id: int):
+    """The previous get_active_hunt_for_player: creator query, then scan every active hunt"""
+    db_hunt = db.query(HuntSessionModel).filter(
+        HuntSessionModel.created_by == player_id,
+        HuntSessionModel.status.in_(ACTIVE_HUNT_STATUSES)
+    ).first()
+    if db_hunt and not db_hunt.is_expired:
+        return _deserialize_hunt(db_hunt.session_data)
+
+    for db_hunt in db.query(HuntSessionModel).filter(
+        HuntSessionModel.status.in_(ACTIVE_HUNT_STATUSES)
+    ).all():
+        if db_hunt.is_expired:
+            continue
+        if str(player_id) in db_hunt.session_data.get("participants", {}):
+            return _deserialize_hunt(db_hunt.session_data)
+    return None
+
+
+def time_lookups(db: Session, label: str, lookup, player_ids: list) -> dict:
+    statements = [0]
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements[0] += 1
+
+    found = {}
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        start = time.perf_counter()
+        for player_id in player_ids:
+            db.expunge_all()  # no identity-map help between lookups
+            hunt = lookup(db, player_id)
+            found[player_id] = hunt.hunt_id if hunt else None
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    print(
+        f"   {label:<10} {elapsed * 1000 / len(player_ids):9.2f}ms/lookup  "
+        f"statements/lookup={statements[0] / len(player_ids):.1f}  "
+        f"found={sum(1 for h in found.values() if h)}/{len(player_ids)}"
+    )
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark active-hunt-for-player lookups")
+    parser.add_argument("--hunts", type=int, default=3000, help="Concurrent lobby/in_progress hunts")
+    parser.add_argument("--finished", type=int, default=10000, help="Completed hunts not yet expired")
+    parser.add_argument("--party", type=int, default=4, help="Players per hunt")
+    parser.add_argument("--lookups", type=int, default=100, help="Players to look up")
+    parser.add_argument("--saves", type=int, default=200, help="save_hunt calls to time")
+    args = parser.parse_args()
+
+    print(f"📊 {args.hunts} active hunts + {args.finished} finished, {args.party} players each")
+
+    connection = engine.connect()
+    outer = connection.begin()
+    all_ok = True
+    try:
+        db = Session(bind=connection, join_transaction_mode="create_savepoint", autoflush=False)
+        start = time.perf_counter()
+        parties = seed_hunts(db, args.hunts, args.finished, args.party)
+        db.commit()
+        connection.exec_driver_sql("ANALYZE hunt_sessions")
+        connection.exec_driver_sql("ANALYZE hunt_participants")
+        print(f"   seeded in {time.perf_counter() - start:.1f}s\n")
+
+        rng = random.Random(42)
+        outsider = BENCH_PLAYER_BASE + (args.hunts + args.finished) * args.party + 1
+        players = []
+        for i in range(args.lookups):
+            party = rng.choice(parties)
+            kind = i % 3
+            players.append(party[0] if kind == 0 else rng.choice(party[1:] or party) if kind == 1 else outsider + i)
+
+        print("🔍 Active hunt for player (creators, participants, players in no hunt)")
+        legacy = time_lookups(db, "jsonb scan", legacy_active_hunt_for_player, players)
+        indexed = time_lookups(db, "indexed", get_active_hunt_for_player, players)
+        mismatches = [p for p in players if legacy[p] != indexed[p]]
+        all_ok = not mismatches
+        print(f"   {'✅ same hunt found for every player' if all_ok else f'❌ {len(mismatches)} mismatches'}\n")
+
+        print("💾 save_hunt (session update + participant sync)")
+        hunts = [get_active_hunt_for_player(db, rng.choice(parties)[0]) for _ in range(args.saves)]
+        start = time.perf_counter()
+        for hunt in hunts:
+            save_hunt(db, hunt)
+        elapsed = time.perf_counter() - start
+        print(f"   {elapsed * 1000 / len(hunts):9.2f}ms/save")
+
+        # A player leaving must drop out of the index
+        hunt = get_active_hunt_for_player(db, parties[0][0])
+        leaver = max(hunt.participants)
+        hunt.remove_participant(leaver)
+        save_hunt(db, hunt)
+        left_ok = get_active_hunt_for_player(db, leaver) is None
+        all_ok = all_ok and left_ok
+        print(f"   {'✅' if left_ok else '❌'} participant removed from the index on leave")
+        db.close()
+    finally:
+        outer.rollback()
+        connection.close()
+
+    print(f"\n{'✅ Done' if all_ok else '❌ Done with failures'} (all benchmark data rolled back)")
+    return 0 if all_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
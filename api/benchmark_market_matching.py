@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Market Matching Benchmark
+
+Times MarketMatchingEngine.create_order against a synthetic order book:
+1. Seeds a throwaway kingdom with --depth resting sell orders spread over
+   --levels price levels (several makers, FIFO within each level)
+2. Runs buy orders of increasing size, from a single fill up to sweeping
+   the whole book, each on a fresh copy of the book
+3. Reports time, SQL statements, order rows locked/loaded and fills, next
+   to the number of crossing orders the old full-book `.all()` load read
+
+Everything runs inside one transaction that is rolled back at the end, so
+nothing is left behind in the database.
+
+Usage:
+    # Run with docker-compose
+    docker-compose exec api python /app/benchmark_market_matching.py
+
+    # Or run locally (if you have the right env vars)
+    cd api && python benchmark_market_matching.py --depth 20000 --levels 500
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, func, insert
+from sqlalchemy.orm import Session
+
+from db import engine, User, PlayerState, Kingdom, MarketOrder, OrderType, OrderStatus
+from db.models.inventory import PlayerInventory
+from services.market_service import MarketMatchingEngine, BOOK_SCAN_BATCH
+
+
+BENCH_KINGDOM_ID = "benchmark_market_kingdom"
+BENCH_ITEM = "iron"
+BASE_PRICE = 100
+
+
+def seed_book(db: Session, depth: int, levels: int, makers: int) -> int:
+    """Create makers, a taker and `depth` resting sell orders. Returns the taker's user id."""
+    db.add(Kingdom(id=BENCH_KINGDOM_ID, name="Benchmark Market", tax_rate=10, treasury_gold=0, market_level=5))
+
+    users = [
+        User(apple_user_id=f"benchmark_market_{i}", display_name=f"BenchmarkMarket{i}")
+        for i in range(makers + 1)
+    ]
+    db.add_all(users)
+    db.flush()
+    taker = users[-1]
+    for user in users:
+        db.add(PlayerState(user_id=user.id, gold=10 ** 12))
+        db.add(PlayerInventory(user_id=user.id, item_id=BENCH_ITEM, quantity=10 ** 6))
+
+    created = datetime.utcnow() - timedelta(days=1)
+    db.execute(insert(MarketOrder), [
+        {
+            "player_id": users[i % makers].id,
+            "kingdom_id": BENCH_KINGDOM_ID,
+            "order_type": OrderType.sell,
+            "item_type": BENCH_ITEM,
+            "price_per_unit": BASE_PRICE + (i % levels),
+            "quantity_remaining": 10,
+            "quantity_original": 10,
+            "status": OrderStatus.active,
+            "created_at": created + timedelta(milliseconds=i),
+            "updated_at": created,
+        }
+        for i in range(depth)
+    ])
+    db.flush()
+    return taker.id
+
+
+def run_scenario(connection, taker_id: int, label: str, quantity: int, limit_price: int) -> None:
+    """One buy order on a savepoint copy of the book (rolled back afterwards)"""
+    savepoint = connection.begin_nested()
+    db = Session(bind=connection, join_transaction_mode="create_savepoint", autoflush=False)
+    try:
+        crossing = db.query(func.count(MarketOrder.id)).filter(
+            MarketOrder.kingdom_id == BENCH_KINGDOM_ID,
+            MarketOrder.item_type == BENCH_ITEM,
+            MarketOrder.order_type == OrderType.sell,
+            MarketOrder.status.in_([OrderStatus.active, OrderStatus.partially_filled]),
+            MarketOrder.price_per_unit <= limit_price
+        ).scalar()
+
+        statements = [0]
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements[0] += 1
+
+        matching_engine = MarketMatchingEngine(db)
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            start = time.perf_counter()
+            _, transactions = matching_engine.create_order(
+                player_id=taker_id,
+                kingdom_id=BENCH_KINGDOM_ID,
+                order_type=OrderType.buy,
+                item_type=BENCH_ITEM,
+                price_per_unit=limit_price,
+                quantity=quantity
+            )
+            elapsed = time.perf_counter() - start
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+
+        book = matching_engine.last_book
+        print(
+            f"{label:<22} qty={quantity:<7} {elapsed * 1000:9.1f}ms  "
+            f"statements={statements[0]:<5} rows_loaded={book.rows_loaded:<6} scans={book.scans:<4} "
+            f"fills={len(transactions):<6} crossing_orders={crossing}"
+        )
+    finally:
+        db.close()
+        savepoint.rollback()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark market order matching")
+    parser.add_argument("--depth", type=int, default=5000, help="Resting sell orders in the book")
+    parser.add_argument("--levels", type=int, default=200, help="Distinct price levels")
+    parser.add_argument("--makers", type=int, default=50, help="Distinct sellers")
+    args = parser.parse_args()
+
+    print(f"📊 Book: {args.depth} sell orders x 10 units over {args.levels} levels, "
+          f"{args.makers} makers, scan batch {BOOK_SCAN_BATCH}")
+
+    connection = engine.connect()
+    outer = connection.begin()
+    try:
+        setup = Session(bind=connection, join_transaction_mode="create_savepoint", autoflush=False)
+        start = time.perf_counter()
+        taker_id = seed_book(setup, args.depth, args.levels, args.makers)
+        setup.commit()
+        setup.close()
+        print(f"   seeded in {time.perf_counter() - start:.1f}s\n")
+
+        top = BASE_PRICE + args.levels
+        per_level = 10 * max(1, args.depth // args.levels)
+        scenarios = [
+            ("single fill", 1, top),
+            ("top level", per_level, top),
+            ("sweep 10 levels", per_level * 10, top),
+            ("sweep half the book", args.depth * 10 // 2, top),
+            ("sweep whole book", args.depth * 10, top),
+            ("limit below book", 10, BASE_PRICE - 1),
+        ]
+        for label, quantity, limit_price in scenarios:
+            run_scenario(connection, taker_id, label, quantity, limit_price)
+    finally:
+        outer.rollback()
+        connection.close()
+
+    print("\n✅ Done (all benchmark data rolled back)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Boundary Simplification Benchmark
+
+Compares city_service.simplify_boundary (heap-based Visvalingam-Whyatt)
+against the original O(n²) linear-scan implementation:
+1. Loads cached boundaries from city_boundaries (largest first)
+2. Runs both implementations on each boundary
+3. Verifies the outputs are IDENTICAL
+4. Reports timings and speedups
+
+Usage:
+    # Run with docker-compose
+    docker-compose exec api python /app/benchmark_simplify_boundary.py
+
+    # Or run locally (if you have the right env vars)
+    cd api && python benchmark_simplify_boundary.py --limit 20
+
+    # No database? Use synthetic rings
+    cd api && python benchmark_simplify_boundary.py --synthetic
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from typing import List
+
+from services import city_service
+from services.city_service import simplify_boundary, _triangle_area, SIMPLIFY_TARGET_POINTS
+
+
+def legacy_simplify_boundary(coords: List[List[float]], target_points: int = SIMPLIFY_TARGET_POINTS) -> List[List[float]]:
+    """Original linear-scan implementation (reference for parity checks)"""
+    if not coords or len(coords) <= target_points:
+        return coords
+
+    points = [list(c) for c in coords]
+    if points[0] != points[-1]:
+        points.append(list(points[0]))
+
+    working = points[:-1]
+    n = len(working)
+
+    if n <= target_points:
+        return coords
+
+    areas = []
+    for i in range(n):
+        prev_idx = (i - 1) % n
+        next_idx = (i + 1) % n
+        areas.append(_triangle_area(working[prev_idx], working[i], working[next_idx]))
+
+    active = [True] * n
+    points_remaining = n
+
+    while points_remaining > target_points:
+        min_area = float('inf')
+        min_idx = -1
+
+        for i in range(n):
+            if active[i] and areas[i] < min_area:
+                min_area = areas[i]
+                min_idx = i
+
+        if min_idx == -1:
+            break
+
+        active[min_idx] = False
+        points_remaining -= 1
+
+        prev_idx = (min_idx - 1) % n
+        while not active[prev_idx] and prev_idx != min_idx:
+            prev_idx = (prev_idx - 1) % n
+
+        next_idx = (min_idx + 1) % n
+        while not active[next_idx] and next_idx != min_idx:
+            next_idx = (next_idx + 1) % n
+
+        if active[prev_idx]:
+            prev_prev = (prev_idx - 1) % n
+            while not active[prev_prev] and prev_prev != prev_idx:
+                prev_prev = (prev_prev - 1) % n
+            if active[prev_prev]:
+                areas[prev_idx] = _triangle_area(working[prev_prev], working[prev_idx], working[next_idx])
+
+        if active[next_idx]:
+            next_next = (next_idx + 1) % n
+            while not active[next_next] and next_next != next_idx:
+                next_next = (next_next + 1) % n
+            if active[next_next]:
+                areas[next_idx] = _triangle_area(working[prev_idx], working[next_idx], working[next_next])
+
+    result = [working[i] for i in range(n) if active[i]]
+    if result and result[0] != result[-1]:
+        result.append(result[0])
+    return result
+
+
+def load_real_boundaries(limit: int) -> List[tuple]:
+    """Largest cached boundaries from city_boundaries as (name, coords)"""
+    from sqlalchemy import func
+    from db import SessionLocal, CityBoundary
+
+    db = SessionLocal()
+    try:
+        rows = db.query(CityBoundary.name, CityBoundary.boundary_geojson).order_by(
+            func.jsonb_array_length(CityBoundary.boundary_geojson["coordinates"]).desc()
+        ).limit(limit).all()
+        return [(name, (geojson or {}).get("coordinates", [])) for name, geojson in rows]
+    finally:
+        db.close()
+
+
+def synthetic_boundaries(sizes: List[int]) -> List[tuple]:
+    """Noisy closed rings roughly the size of a city"""
+    rng = random.Random(42)
+    boundaries = []
+    for size in sizes:
+        coords = []
+        for i in range(size):
+            angle = 2 * math.pi * i / size
+            radius = 0.05 * (1 + 0.2 * rng.random())
+            coords.append([40.0 + radius * math.cos(angle), -74.0 + radius * math.sin(angle)])
+        coords.append(list(coords[0]))
+        boundaries.append((f"synthetic-{size}", coords))
+    return boundaries
+
+
+def _timed(fn, coords, target):
+    start = time.perf_counter()
+    result = fn(coords, target)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark boundary simplification")
+    parser.add_argument("--limit", type=int, default=10, help="Number of cached boundaries to test")
+    parser.add_argument("--target", type=int, default=SIMPLIFY_TARGET_POINTS, help="Target point count")
+    parser.add_argument("--synthetic", action="store_true", help="Use synthetic rings instead of the database")
+    parser.add_argument("--skip-legacy-over", type=int, default=50000,
+                        help="Skip the O(n²) reference for boundaries larger than this")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        boundaries = synthetic_boundaries([1000, 5000, 20000, 50000, 100000])
+    else:
+        boundaries = load_real_boundaries(args.limit)
+
+    if not boundaries:
+        print("❌ No boundaries to benchmark")
+        return 1
+
+    print(f"📐 Simplifying to {args.target} points (NumPy: {'yes' if city_service.np is not None else 'no'})")
+    print(f"{'boundary':<32} {'points':>8} {'legacy':>10} {'heap':>10} {'speedup':>9}  parity")
+
+    # Keep the per-boundary log line out of the timings
+    city_service.print = lambda *a, **k: None
+    mismatches = 0
+    for name, coords in boundaries:
+        new_result, new_time = _timed(simplify_boundary, coords, args.target)
+
+        if len(coords) > args.skip_legacy_over:
+            print(f"{name[:32]:<32} {len(coords):>8} {'skipped':>10} {new_time:>9.3f}s {'-':>9}  -")
+            continue
+
+        old_result, old_time = _timed(legacy_simplify_boundary, coords, args.target)
+        same = old_result == new_result
+        if not same:
+            mismatches += 1
+        speedup = old_time / new_time if new_time > 0 else float('inf')
+        print(f"{name[:32]:<32} {len(coords):>8} {old_time:>9.3f}s {new_time:>9.3f}s {speedup:>8.1f}x  {'✅' if same else '❌'}")
+
+    if mismatches:
+        print(f"❌ {mismatches} boundaries differ from the reference implementation")
+        return 1
+    print("✅ All outputs identical")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+WebSocket Fan-out Benchmark
+
+Runs connection_manager broadcasts with real boto3 clients against the local
+API Gateway + DynamoDB stand-in (websocket/fake_aws.py), so no AWS account or
+network is needed:
+1. Seeds --connections connections in one kingdom, spread over --users users,
+   with --gone-ratio of them reported as gone by "API Gateway"
+2. broadcast_to_kingdom and broadcast_to_multiple_users, first with one
+   worker (the old one-at-a-time behaviour), then with --workers
+3. Reports time, messages/second, requests per service and peak requests in
+   flight, and checks every live connection got the message exactly once and
+   every gone connection was deleted
+
+Usage:
+    # Run with docker-compose
+    docker-compose exec api python /app/benchmark_ws_fanout.py
+
+    # Or run locally
+    cd api && python benchmark_ws_fanout.py --connections 5000 --latency-ms 30 --workers 32
+"""
+
+import argparse
+import os
+import sys
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WebSocket fan-out against local stand-ins")
+    parser.add_argument("--connections", type=int, default=2000, help="Connections in the kingdom")
+    parser.add_argument("--users", type=int, default=500, help="Users owning those connections")
+    parser.add_argument("--gone-ratio", type=float, default=0.05, help="Share of connections that are gone")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Simulated latency per AWS request")
+    parser.add_argument("--workers", type=int, default=16, help="Fan-out pool size to compare with 1")
+    args = parser.parse_args()
+
+    # The stand-in must be configured before connection_manager creates its clients
+    from websocket.fake_aws import FakeAwsState, start_fake_aws
+    state = FakeAwsState(latency_ms=args.latency_ms)
+    server, base_url = start_fake_aws(state)
+    os.environ["DYNAMODB_ENDPOINT_URL"] = base_url
+    os.environ["WS_FANOUT_WORKERS"] = str(args.workers)
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "fake")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "fake")
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+    from websocket import connection_manager
+    from websocket.fanout import FanoutEngine
+
+    endpoint = f"{base_url}/dev"
+    kingdom_id = "benchmark_ws_kingdom"
+    message = {"type": "event", "event_type": "coup_started", "data": {"kingdom_id": kingdom_id}}
+    gone_every = round(1 / args.gone_ratio) if args.gone_ratio > 0 else 0
+
+    def seed():
+        state.items.clear()
+        state.gone.clear()
+        for i in range(args.connections):
+            connection_id = f"conn-{i:07d}"
+            state.put_connection(connection_id, user_id=str(i % args.users), kingdom_id=kingdom_id)
+            if gone_every and i % gone_every == 0:
+                state.gone.add(connection_id)
+        state.reset_counters()
+        return args.connections - len(state.gone), len(state.gone)
+
+    def run(label, workers, broadcast):
+        live, gone = seed()
+        connection_manager.fanout_engine = FanoutEngine(workers)
+        start = time.perf_counter()
+        sent = broadcast()
+        elapsed = time.perf_counter() - start
+
+        delivered_once = all(state.delivered[c] == 1 for c in state.items if c not in state.gone)
+        gone_removed = not any(c in state.items for c in state.gone)
+        ok = sent == live and len(state.delivered) == live and delivered_once and gone_removed
+        attempted = live + gone
+        print(
+            f"{'✅' if ok else '❌'} {label:<16} workers={workers:<3} "
+            f"{elapsed * 1000:8.0f}ms  {attempted / elapsed:8.0f} msg/s  "
+            f"sent={sent} gone_removed={gone} "
+            f"posts={state.requests['PostToConnection']} queries={state.requests['Query']} "
+            f"batch_writes={state.requests['BatchWriteItem']} deletes={state.requests['DeleteItem']} "
+            f"peak_in_flight={state.max_in_flight}"
+        )
+        return ok, elapsed
+
+    print(f"📊 {args.connections} connections, {args.users} users, "
+          f"{args.gone_ratio:.0%} gone, {args.latency_ms:.0f}ms per request")
+
+    all_ok = True
+    user_ids = [str(u) for u in range(args.users)]
+    scenarios = [
+        ("kingdom", lambda: connection_manager.broadcast_to_kingdom(endpoint, kingdom_id, message, channel="notifications")),
+        ("multiple_users", lambda: connection_manager.broadcast_to_multiple_users(endpoint, user_ids, message)),
+    ]
+    for label, broadcast in scenarios:
+        ok_serial, serial = run(label, 1, broadcast)
+        ok_parallel, parallel = run(label, args.workers, broadcast)
+        all_ok = all_ok and ok_serial and ok_parallel
+        print(f"   ⚡ {serial / parallel:.1f}x faster with {args.workers} workers")
+
+    server.shutdown()
+    return 0 if all_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+/actions/status Query Count Check
+
+Runs GET /actions/status for a real player in-process and counts the SQL
+statements it executes. Exits non-zero if the count goes over
+STATUS_QUERY_BUDGET, so a change that brings back per-contract or
+per-cooldown queries shows up before it ships.
+
+The status screen loads its data through StatusPrefetch
+(routers/actions/status_prefetch.py): a fixed set of queries no matter how
+many contracts, cooldowns or battles the player has. Only a few branches
+(coup / invasion eligibility, alliance requests for rulers) add more.
+
+Usage:
+    # Run with docker-compose
+    docker-compose exec api python /app/check_status_query_count.py --user-id 1
+
+    # Or run locally (if you have the right env vars)
+    cd api && python check_status_query_count.py --user-id 1 --verbose
+"""
+
+import argparse
+import sys
+import time
+
+from sqlalchemy import event
+
+from db import SessionLocal, engine, User
+
+
+# Statements allowed for one /actions/status call (including the lazy
+# player_state load). A typical player needs ~10; the worst case adds
+# catchups, alliances, reputation, coup/invasion history checks and alliance
+# requests on top of the 7 prefetch queries. It used to be 30+ and grew with
+# every contract.
+STATUS_QUERY_BUDGET = 24
+
+
+def count_status_queries(user_id: int, verbose: bool = False) -> int:
+    from routers.actions.status import get_action_status
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            print(f"❌ User {user_id} not found")
+            sys.exit(2)
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            start = time.perf_counter()
+            response = get_action_status(current_user=user, db=db)
+            elapsed = time.perf_counter() - start
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    finally:
+        db.close()
+
+    print(f"📊 /actions/status for user {user_id}: {len(statements)} statements in {elapsed * 1000:.1f}ms")
+    print(f"   {len(response.get('contracts', []))} building contracts, "
+          f"{len(response.get('training_contracts', []))} training, "
+          f"{len(response.get('property_upgrade_contracts', []))} property, "
+          f"{len(response.get('actions', {}))} actions")
+    if verbose:
+        for i, statement in enumerate(statements, 1):
+            print(f"\n--- [{i}] ---\n{statement}")
+    return len(statements)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count SQL statements issued by /actions/status")
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--budget", type=int, default=STATUS_QUERY_BUDGET)
+    parser.add_argument("--verbose", action="store_true", help="Print every statement")
+    args = parser.parse_args()
+
+    count = count_status_queries(args.user_id, args.verbose)
+    if count > args.budget:
+        print(f"❌ {count} statements - over the budget of {args.budget}")
+        return 1
+    print(f"✅ Within budget ({count}/{args.budget})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
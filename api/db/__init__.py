@@ -1,7 +1,7 @@
 """
 Database package - SQLAlchemy configuration and models
 """
-from .base import engine, SessionLocal, Base, get_db, init_db
+from .base import engine, SessionLocal, Base, get_db, init_db, get_pool_stats
 from .models import (
     User,
     PlayerState,
@@ -27,18 +27,24 @@ from .models import (
     KingdomHistory,
     Alliance,
     PlayerActivityLog,
+    ActivityTimelineEntry,
     MarketOrder,
     MarketTransaction,
+    MarketCandle,
     OrderType,
     OrderStatus,
     # New unified models
     UnifiedContract,
     ContractContribution,
+    ContractContributorCount,
+    PlayerStatCounters,
     PlayerItem,
     ActionCooldown,
     PlayerInventory,
     Item,
     HuntSession,
+    HuntSessionParticipant,
+    HuntRoundResult,
     Friend,
     TradeOffer,
     TradeOfferStatus,
@@ -58,6 +64,7 @@ __all__ = [
     "Base",
     "get_db",
     "init_db",
+    "get_pool_stats",
     "User",
     "PlayerState",
     "Kingdom",
@@ -82,18 +89,24 @@ __all__ = [
     "KingdomHistory",
     "Alliance",
     "PlayerActivityLog",
+    "ActivityTimelineEntry",
     "MarketOrder",
     "MarketTransaction",
+    "MarketCandle",
     "OrderType",
     "OrderStatus",
     # New unified models
     "UnifiedContract",
     "ContractContribution",
+    "ContractContributorCount",
+    "PlayerStatCounters",
     "PlayerItem",
     "ActionCooldown",
     "PlayerInventory",
     "Item",
     "HuntSession",
+    "HuntSessionParticipant",
+    "HuntRoundResult",
     "Friend",
     "TradeOffer",
     "TradeOfferStatus",
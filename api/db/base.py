@@ -9,6 +9,8 @@ import json
 import boto3
 from botocore.exceptions import ClientError
 
+from .pool import resolve_profile, engine_kwargs, pool_stats
+
 def get_database_url():
     """Get database URL from Secrets Manager or environment variable"""
     # Check if we're using Secrets Manager
@@ -39,17 +41,10 @@ def get_database_url():
 # Database URL from environment or Secrets Manager
 DATABASE_URL = get_database_url()
 
-# Create engine with Lambda-optimized settings
-engine = create_engine(
-    DATABASE_URL,
-    pool_size=1,  # Small pool for Lambda
-    max_overflow=0,  # No overflow connections
-    pool_pre_ping=True,  # Verify connection before using
-    pool_recycle=3600,  # Recycle connections after 1 hour
-    connect_args={
-        "connect_timeout": 5,  # 5 second connection timeout
-    }
-)
+# Pool settings depend on where we run (Lambda, container, worker) - see db/pool.py
+DB_POOL_PROFILE = resolve_profile()
+
+engine = create_engine(DATABASE_URL, **engine_kwargs(DB_POOL_PROFILE, DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -63,6 +58,11 @@ def get_db():
         db.close()
 
 
+def get_pool_stats() -> dict:
+    """Connection pool utilization and checkout wait metrics"""
+    return pool_stats(engine, DB_POOL_PROFILE)
+
+
 def init_db():
     """Initialize database tables"""
     # Import all models to register them with Base
@@ -0,0 +1,41 @@
+-- Friend activity timelines (fan-out on write)
+-- Per-reader inbox of player_activity_log ids, filled by log_activity when
+-- ACTIVITY_TIMELINES=true (services/activity_timeline.py). Friend feed reads
+-- become one range scan of (owner_user_id, activity_id).
+
+CREATE TABLE IF NOT EXISTS activity_timeline (
+    owner_user_id BIGINT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    activity_id INTEGER NOT NULL REFERENCES player_activity_log(id) ON DELETE CASCADE,
+    author_user_id BIGINT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (owner_user_id, activity_id)
+);
+
+-- Unfriend cleanup
+CREATE INDEX IF NOT EXISTS idx_activity_timeline_author ON activity_timeline(author_user_id, owner_user_id);
+
+-- Newest row per user (repeat dedup) without sorting the user's whole history
+CREATE INDEX IF NOT EXISTS idx_activity_user_id ON player_activity_log(user_id, id DESC);
+
+-- Readers of an author: friends rows are matched on both columns
+CREATE INDEX IF NOT EXISTS idx_friend_friend_user ON friends(friend_user_id);
+
+-- Backfill: newest 500 entries (ACTIVITY_TIMELINE_MAX_ENTRIES) per reader
+INSERT INTO activity_timeline (owner_user_id, activity_id, author_user_id, created_at)
+SELECT owner_user_id, id, user_id, created_at
+FROM (
+    SELECT r.owner_user_id, l.id, l.user_id, l.created_at,
+           ROW_NUMBER() OVER (PARTITION BY r.owner_user_id ORDER BY l.id DESC) AS rn
+    FROM (
+        SELECT user_id AS owner_user_id, friend_user_id AS author_user_id FROM friends WHERE status = 'accepted'
+        UNION
+        SELECT friend_user_id, user_id FROM friends WHERE status = 'accepted'
+        UNION
+        SELECT id, id FROM users
+    ) r
+    JOIN player_activity_log l ON l.user_id = r.author_user_id
+    WHERE l.action_type <> 'travel_fee'
+      AND (l.visibility <> 'private' OR l.user_id = r.owner_user_id)
+) ranked
+WHERE rn <= 500
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,45 @@
+-- Battle side aggregates
+-- Fight rolls used to query player_state once per pledged participant to get
+-- a side's average defense/leadership. Each join adds the player to their
+-- side's totals (routers/battles._add_to_side_stats); the totals are rebuilt
+-- with one GROUP BY side (_refresh_side_stats) whenever a row is older than
+-- SIDE_STATS_MAX_AGE_SECONDS and when the battle resolves.
+
+CREATE TABLE IF NOT EXISTS battle_side_stats (
+    battle_id INTEGER NOT NULL REFERENCES battles(id) ON DELETE CASCADE,
+    side VARCHAR(20) NOT NULL,  -- attackers, defenders
+    participant_count INTEGER NOT NULL DEFAULT 0,
+    stats_count INTEGER NOT NULL DEFAULT 0,  -- participants with a player_state row
+    total_attack INTEGER NOT NULL DEFAULT 0,  -- active attack debuffs applied
+    total_defense INTEGER NOT NULL DEFAULT 0,
+    total_leadership INTEGER NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (battle_id, side)
+);
+
+-- Backfill unresolved battles (resolved ones are rebuilt on demand if ever read)
+INSERT INTO battle_side_stats (
+    battle_id, side, participant_count, stats_count,
+    total_attack, total_defense, total_leadership, refreshed_at
+)
+SELECT
+    b.id,
+    s.side,
+    COUNT(bp.user_id),
+    COUNT(ps.user_id),
+    COALESCE(SUM(
+        CASE WHEN ps.attack_debuff > 0 AND ps.debuff_expires_at > (NOW() AT TIME ZONE 'utc')
+             THEN GREATEST(1, ps.attack_power - ps.attack_debuff)
+             ELSE ps.attack_power
+        END
+    ), 0),
+    COALESCE(SUM(ps.defense_power), 0),
+    COALESCE(SUM(ps.leadership), 0),
+    NOW() AT TIME ZONE 'utc'
+FROM battles b
+CROSS JOIN (VALUES ('attackers'), ('defenders')) AS s(side)
+LEFT JOIN battle_participants bp ON bp.battle_id = b.id AND bp.side = s.side
+LEFT JOIN player_state ps ON ps.user_id = bp.user_id
+WHERE b.resolved_at IS NULL
+GROUP BY b.id, s.side
+ON CONFLICT (battle_id, side) DO NOTHING;
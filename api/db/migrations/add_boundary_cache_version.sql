@@ -0,0 +1,13 @@
+-- Add boundary version stamp to city_boundaries
+-- The process-level boundary cache (services/boundary_cache.py) keys decoded
+-- polygons by (osm_id, boundary_updated_at), so rewriting a boundary row
+-- invalidates every warm container's copy.
+
+ALTER TABLE city_boundaries
+ADD COLUMN IF NOT EXISTS boundary_updated_at TIMESTAMP;
+
+UPDATE city_boundaries
+SET boundary_updated_at = created_at
+WHERE boundary_updated_at IS NULL;
+
+COMMENT ON COLUMN city_boundaries.boundary_updated_at IS 'Bumped whenever boundary_geojson or simplified_boundary_geojson is rewritten (boundary cache version)';
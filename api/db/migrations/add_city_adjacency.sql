@@ -0,0 +1,12 @@
+-- City adjacency table
+-- Precomputed neighbour edge distances, filled by api/preprocess_boundaries.py
+
+CREATE TABLE IF NOT EXISTS city_adjacency (
+    city_osm_id VARCHAR NOT NULL REFERENCES city_boundaries(osm_id) ON DELETE CASCADE,
+    neighbor_osm_id VARCHAR NOT NULL REFERENCES city_boundaries(osm_id) ON DELETE CASCADE,
+    edge_distance DOUBLE PRECISION NOT NULL,
+    computed_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (city_osm_id, neighbor_osm_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_city_adjacency_neighbor ON city_adjacency(neighbor_osm_id);
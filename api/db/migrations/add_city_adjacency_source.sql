@@ -0,0 +1,7 @@
+-- City adjacency source
+-- Records whether a neighbour came from boundary sharing or a radius search
+-- and indexes the per-city distance lookup used by /cities/neighbors
+
+ALTER TABLE city_adjacency ADD COLUMN IF NOT EXISTS source VARCHAR(16) NOT NULL DEFAULT 'radius';
+
+CREATE INDEX IF NOT EXISTS idx_city_adjacency_city_distance ON city_adjacency(city_osm_id, edge_distance);
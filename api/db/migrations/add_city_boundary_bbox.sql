@@ -0,0 +1,34 @@
+-- Add bounding box columns to city_boundaries for indexed point-in-city lookups
+-- /cities/current and /startup previously loaded every city within ±0.5° (with full
+-- boundary JSONB) and ray-cast each polygon. Now only cities whose bbox contains the
+-- point are loaded and tested.
+
+ALTER TABLE city_boundaries
+ADD COLUMN IF NOT EXISTS min_lat DOUBLE PRECISION,
+ADD COLUMN IF NOT EXISTS max_lat DOUBLE PRECISION,
+ADD COLUMN IF NOT EXISTS min_lon DOUBLE PRECISION,
+ADD COLUMN IF NOT EXISTS max_lon DOUBLE PRECISION;
+
+-- Backfill from the stored boundary ([lat, lon] pairs)
+UPDATE city_boundaries cb
+SET min_lat = bbox.min_lat,
+    max_lat = bbox.max_lat,
+    min_lon = bbox.min_lon,
+    max_lon = bbox.max_lon
+FROM (
+    SELECT osm_id,
+           MIN((p->>0)::double precision) AS min_lat,
+           MAX((p->>0)::double precision) AS max_lat,
+           MIN((p->>1)::double precision) AS min_lon,
+           MAX((p->>1)::double precision) AS max_lon
+    FROM city_boundaries,
+         jsonb_array_elements(boundary_geojson->'coordinates') AS p
+    GROUP BY osm_id
+) bbox
+WHERE cb.osm_id = bbox.osm_id
+  AND cb.min_lat IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_city_boundaries_bbox
+ON city_boundaries(min_lat, max_lat, min_lon, max_lon);
+
+COMMENT ON COLUMN city_boundaries.min_lat IS 'Bounding box of boundary_geojson - used to index point-in-city lookups';
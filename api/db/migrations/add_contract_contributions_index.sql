@@ -0,0 +1,6 @@
+-- Contributor lookup for legacy building contracts
+-- /notifications/updates loads the contracts a player contributed to with
+-- action_contributions ? '<user_id>' instead of reading the whole table.
+
+CREATE INDEX IF NOT EXISTS idx_contracts_action_contributions
+ON contracts USING GIN (action_contributions);
@@ -0,0 +1,33 @@
+-- Contract progress counters
+-- Replaces COUNT(*) / GROUP BY user_id over contract_contributions on every contract render.
+-- Kept up to date by services/contract_counters.py (record_contribution);
+-- backfill_contract_counters.py checks and repairs drift.
+
+-- Total actions per contract
+ALTER TABLE unified_contracts
+ADD COLUMN IF NOT EXISTS actions_completed INTEGER NOT NULL DEFAULT 0;
+
+-- Actions per (contract, contributor)
+CREATE TABLE IF NOT EXISTS contract_contributor_counts (
+    contract_id BIGINT NOT NULL REFERENCES unified_contracts(id) ON DELETE CASCADE,
+    user_id BIGINT NOT NULL REFERENCES users(id),
+    actions INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (contract_id, user_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_contributor_counts_user ON contract_contributor_counts(user_id);
+
+-- Backfill from existing contributions
+UPDATE unified_contracts uc
+SET actions_completed = cc.actual
+FROM (
+    SELECT contract_id, COUNT(*) AS actual FROM contract_contributions GROUP BY contract_id
+) cc
+WHERE cc.contract_id = uc.id
+  AND uc.actions_completed <> cc.actual;
+
+INSERT INTO contract_contributor_counts (contract_id, user_id, actions)
+SELECT contract_id, user_id, COUNT(*)
+FROM contract_contributions
+GROUP BY contract_id, user_id
+ON CONFLICT (contract_id, user_id) DO UPDATE SET actions = EXCLUDED.actions;
@@ -0,0 +1,45 @@
+-- Deadline queue
+-- Pledge → battle, duel style/swing timeouts and hunt expiry used to happen
+-- only when a client polled after the timer. Each timer is now a row here;
+-- deadline_worker.py claims due rows with FOR UPDATE SKIP LOCKED.
+
+CREATE TABLE IF NOT EXISTS deadlines (
+    id BIGSERIAL PRIMARY KEY,
+    kind VARCHAR(32) NOT NULL,  -- battle_pledge_end, battle_resolve, duel_timeout, hunt_expiry
+    target_id VARCHAR NOT NULL,  -- battle id / duel match id / hunt id
+    due_at TIMESTAMP NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error VARCHAR,
+    failed_at TIMESTAMP,  -- set when parked after MAX_ATTEMPTS failures
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_deadlines_kind_target UNIQUE (kind, target_id)
+);
+
+-- Queue order over live rows only; parked rows stay out of the worker's scans
+CREATE INDEX IF NOT EXISTS idx_deadlines_due_at ON deadlines (due_at) WHERE failed_at IS NULL;
+
+-- Failed timers that need a look:
+--   SELECT kind, target_id, attempts, last_error, failed_at
+--   FROM deadlines WHERE failed_at IS NOT NULL ORDER BY failed_at DESC;
+
+-- Backfill timers that are still running
+INSERT INTO deadlines (kind, target_id, due_at)
+SELECT 'battle_pledge_end', id::text, pledge_end_time
+FROM battles
+WHERE resolved_at IS NULL
+  AND pledge_end_time > (NOW() AT TIME ZONE 'utc')  -- past ones already opened lazily
+ON CONFLICT (kind, target_id) DO NOTHING;
+
+INSERT INTO deadlines (kind, target_id, due_at)
+SELECT 'duel_timeout', id::text,
+       CASE WHEN round_phase = 'style_selection' THEN COALESCE(style_lock_expires_at, NOW() AT TIME ZONE 'utc')
+            ELSE COALESCE(swing_phase_expires_at, NOW() AT TIME ZONE 'utc')
+       END
+FROM duel_matches
+WHERE status = 'fighting'
+ON CONFLICT (kind, target_id) DO NOTHING;
+
+INSERT INTO deadlines (kind, target_id, due_at)
+SELECT 'hunt_expiry', hunt_id, expires_at
+FROM hunt_sessions
+ON CONFLICT (kind, target_id) DO NOTHING;
@@ -0,0 +1,28 @@
+-- Hunt participant index
+-- Normalized copy of hunt_sessions.session_data->'participants' (plus the
+-- creator), kept in sync by systems/hunting/persistence.save_hunt. "Active
+-- hunt for player" becomes one lookup on idx_hunt_participants_active_user
+-- instead of deserializing every lobby/in_progress hunt.
+
+CREATE TABLE IF NOT EXISTS hunt_participants (
+    hunt_id VARCHAR NOT NULL REFERENCES hunt_sessions(hunt_id) ON DELETE CASCADE,
+    user_id BIGINT NOT NULL,
+    status VARCHAR NOT NULL DEFAULT 'lobby',  -- mirrors hunt_sessions.status
+    PRIMARY KEY (hunt_id, user_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_hunt_participants_active_user
+    ON hunt_participants(user_id)
+    WHERE status IN ('lobby', 'in_progress');
+
+-- Backfill from the JSONB blobs (participants are keyed by player id)
+INSERT INTO hunt_participants (hunt_id, user_id, status)
+SELECT h.hunt_id, p.user_id::BIGINT, h.status
+FROM hunt_sessions h
+CROSS JOIN LATERAL jsonb_object_keys(COALESCE(h.session_data->'participants', '{}'::jsonb)) AS p(user_id)
+ON CONFLICT DO NOTHING;
+
+INSERT INTO hunt_participants (hunt_id, user_id, status)
+SELECT hunt_id, created_by, status
+FROM hunt_sessions
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,23 @@
+-- Hunt round results
+-- Each roll in a hunt phase becomes one append-only row instead of growing
+-- hunt_sessions.session_data->'current_phase_state'->'round_results', so a
+-- roll save no longer rewrites the whole (TOASTed) session blob.
+--
+-- No backfill: hunts saved before this table existed still carry their rolls
+-- inline, and systems/hunting/persistence copies them over on their next save.
+
+CREATE TABLE IF NOT EXISTS hunt_round_results (
+    hunt_id VARCHAR NOT NULL REFERENCES hunt_sessions(hunt_id) ON DELETE CASCADE,
+    phase VARCHAR NOT NULL,
+    round_number INTEGER NOT NULL,
+    player_id BIGINT NOT NULL,
+    player_name VARCHAR NOT NULL,
+    roll_value INTEGER NOT NULL,
+    stat_value INTEGER NOT NULL,
+    is_success BOOLEAN NOT NULL,
+    is_critical BOOLEAN NOT NULL,
+    contribution DOUBLE PRECISION NOT NULL,
+    effect_message VARCHAR NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (hunt_id, phase, round_number)
+);
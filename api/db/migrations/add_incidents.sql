@@ -0,0 +1,66 @@
+-- Covert incidents in Postgres
+-- IncidentManager used to keep incidents in a process-local dict, so a roll
+-- that landed on another Lambda/worker couldn't see the incident. State now
+-- lives here (systems/incidents/store.py); bar shifts and roll limits are
+-- single UPDATE ... RETURNING statements.
+
+CREATE TABLE IF NOT EXISTS incidents (
+    incident_id VARCHAR PRIMARY KEY,
+    attacker_kingdom_id VARCHAR NOT NULL,
+    defender_kingdom_id VARCHAR NOT NULL,
+    triggered_by BIGINT NOT NULL,
+    attacker_tier INTEGER NOT NULL DEFAULT 1,
+    status VARCHAR NOT NULL DEFAULT 'active',  -- active, resolved, expired
+    slots JSONB NOT NULL,                       -- the probability bar
+    attacker_rolls INTEGER NOT NULL DEFAULT 0,
+    defender_rolls INTEGER NOT NULL DEFAULT 0,
+    resolution_roll INTEGER,
+    outcome VARCHAR,
+    resolved_at TIMESTAMP,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    expires_at TIMESTAMP NOT NULL
+);
+
+-- One active incident per attacker -> defender pair
+CREATE UNIQUE INDEX IF NOT EXISTS uq_incidents_active_pair
+    ON incidents(attacker_kingdom_id, defender_kingdom_id)
+    WHERE status = 'active';
+
+CREATE INDEX IF NOT EXISTS idx_incidents_active_defender
+    ON incidents(defender_kingdom_id)
+    WHERE status = 'active';
+
+-- Expiry sweeps
+CREATE INDEX IF NOT EXISTS idx_incidents_status_expires
+    ON incidents(status, expires_at);
+
+CREATE TABLE IF NOT EXISTS incident_participants (
+    incident_id VARCHAR NOT NULL REFERENCES incidents(incident_id) ON DELETE CASCADE,
+    player_id BIGINT NOT NULL,
+    player_name VARCHAR NOT NULL,
+    side VARCHAR NOT NULL,  -- attacker, defender
+    kingdom_id VARCHAR NOT NULL,
+    stats JSONB NOT NULL,
+    rolls_made INTEGER NOT NULL DEFAULT 0,
+    successful_rolls INTEGER NOT NULL DEFAULT 0,
+    critical_rolls INTEGER NOT NULL DEFAULT 0,
+    joined_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (incident_id, player_id)
+);
+
+CREATE TABLE IF NOT EXISTS incident_rolls (
+    id BIGSERIAL PRIMARY KEY,
+    incident_id VARCHAR NOT NULL REFERENCES incidents(incident_id) ON DELETE CASCADE,
+    player_id BIGINT NOT NULL,
+    player_name VARCHAR NOT NULL,
+    side VARCHAR NOT NULL,
+    roll_value INTEGER NOT NULL,
+    stat_value INTEGER NOT NULL,
+    is_success BOOLEAN NOT NULL,
+    is_critical BOOLEAN NOT NULL,
+    shift_applied JSONB NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_incident_rolls_incident
+    ON incident_rolls(incident_id, id);
@@ -0,0 +1,17 @@
+-- Location cell cache
+-- Geohash (precision 7, ~150m) -> resolved city for /cities/current lookups
+
+CREATE TABLE IF NOT EXISTS location_cells (
+    geohash VARCHAR(12) PRIMARY KEY,
+    osm_id VARCHAR NOT NULL,
+    admin_level INTEGER NOT NULL,
+    fully_inside BOOLEAN NOT NULL DEFAULT FALSE,
+    boundary_version TIMESTAMP,
+    min_lat DOUBLE PRECISION NOT NULL,
+    max_lat DOUBLE PRECISION NOT NULL,
+    min_lon DOUBLE PRECISION NOT NULL,
+    max_lon DOUBLE PRECISION NOT NULL,
+    computed_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_location_cells_bounds ON location_cells(min_lat, max_lat, min_lon, max_lon);
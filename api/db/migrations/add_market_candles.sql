@@ -0,0 +1,52 @@
+-- Market price candles (OHLCV) per kingdom/item at 1m and 1h
+-- Maintained on every trade by services/market_candles.record_trades.
+-- Price history and /market/info read these instead of market_transactions.
+
+CREATE TABLE IF NOT EXISTS market_candles (
+    kingdom_id VARCHAR NOT NULL,
+    item_type VARCHAR NOT NULL,
+    interval VARCHAR(4) NOT NULL,
+    bucket_start TIMESTAMP NOT NULL,
+    open INTEGER NOT NULL,
+    high INTEGER NOT NULL,
+    low INTEGER NOT NULL,
+    close INTEGER NOT NULL,
+    volume BIGINT NOT NULL DEFAULT 0,
+    value BIGINT NOT NULL DEFAULT 0,
+    trades INTEGER NOT NULL DEFAULT 0,
+    first_trade_at TIMESTAMP NOT NULL,
+    last_trade_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (kingdom_id, item_type, interval, bucket_start)
+);
+
+-- Backfill from existing trades (re-running it rebuilds every candle).
+-- 1m candles only for the last 6 hours (market_candles.MINUTE_CANDLE_RETENTION)
+INSERT INTO market_candles (
+    kingdom_id, item_type, interval, bucket_start,
+    open, high, low, close, volume, value, trades, first_trade_at, last_trade_at
+)
+SELECT
+    t.kingdom_id, t.item_type, i.interval, date_trunc(i.unit, t.created_at),
+    (array_agg(t.price_per_unit ORDER BY t.created_at, t.id))[1],
+    MAX(t.price_per_unit),
+    MIN(t.price_per_unit),
+    (array_agg(t.price_per_unit ORDER BY t.created_at DESC, t.id DESC))[1],
+    SUM(t.quantity),
+    SUM(t.total_gold),
+    COUNT(*),
+    MIN(t.created_at),
+    MAX(t.created_at)
+FROM market_transactions t
+CROSS JOIN (VALUES ('1m', 'minute'), ('1h', 'hour')) AS i(interval, unit)
+WHERE i.interval = '1h' OR t.created_at >= (NOW() AT TIME ZONE 'utc') - INTERVAL '6 hours'
+GROUP BY t.kingdom_id, t.item_type, i.interval, date_trunc(i.unit, t.created_at)
+ON CONFLICT (kingdom_id, item_type, interval, bucket_start) DO UPDATE SET
+    open = EXCLUDED.open,
+    high = EXCLUDED.high,
+    low = EXCLUDED.low,
+    close = EXCLUDED.close,
+    volume = EXCLUDED.volume,
+    value = EXCLUDED.value,
+    trades = EXCLUDED.trades,
+    first_trade_at = EXCLUDED.first_trade_at,
+    last_trade_at = EXCLUDED.last_trade_at;
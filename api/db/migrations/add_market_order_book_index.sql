@@ -0,0 +1,8 @@
+-- Order book index for the market matching engine
+-- services/market_service.OrderBookSide pages through open orders for one
+-- kingdom/item/side in (price, created_at, id) order with LIMIT ... FOR UPDATE SKIP LOCKED.
+-- Partial: filled and cancelled orders (most of the table) are left out.
+
+CREATE INDEX IF NOT EXISTS idx_market_orders_book
+ON market_orders (kingdom_id, item_type, order_type, price_per_unit, created_at, id)
+WHERE status IN ('active', 'partially_filled');
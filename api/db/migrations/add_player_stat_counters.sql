@@ -0,0 +1,117 @@
+-- Lifetime achievement counters
+-- One row per player, bumped where the events happen (services/player_stats.py)
+-- so achievement progress no longer aggregates each player's whole history.
+-- Existing players are filled at the end of this file.
+
+CREATE TABLE IF NOT EXISTS player_stat_counters (
+    user_id BIGINT PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+
+    total_checkins INTEGER NOT NULL DEFAULT 0,
+
+    foraging_completed INTEGER NOT NULL DEFAULT 0,
+    direct_trades INTEGER NOT NULL DEFAULT 0,
+    market_trades INTEGER NOT NULL DEFAULT 0,
+    wood_gathered BIGINT NOT NULL DEFAULT 0,
+    iron_gathered BIGINT NOT NULL DEFAULT 0,
+    stone_gathered BIGINT NOT NULL DEFAULT 0,
+
+    building_contracts INTEGER NOT NULL DEFAULT 0,
+    training_contracts INTEGER NOT NULL DEFAULT 0,
+
+    items_crafted INTEGER NOT NULL DEFAULT 0,
+    weapons_crafted INTEGER NOT NULL DEFAULT 0,
+    armor_crafted INTEGER NOT NULL DEFAULT 0,
+    craft_tier_5_item INTEGER NOT NULL DEFAULT 0,
+
+    coups_initiated INTEGER NOT NULL DEFAULT 0,
+    coups_won INTEGER NOT NULL DEFAULT 0,
+    invasions_participated INTEGER NOT NULL DEFAULT 0,
+    invasions_won_attack INTEGER NOT NULL DEFAULT 0,
+    invasions_won_defend INTEGER NOT NULL DEFAULT 0,
+
+    plants_grown INTEGER NOT NULL DEFAULT 0,
+    flowers_grown INTEGER NOT NULL DEFAULT 0,
+    rare_flowers_grown INTEGER NOT NULL DEFAULT 0,
+    flower_colors INTEGER NOT NULL DEFAULT 0,
+    wheat_harvested INTEGER NOT NULL DEFAULT 0,
+    weeds_cleared INTEGER NOT NULL DEFAULT 0,
+    bread_baked INTEGER NOT NULL DEFAULT 0,
+
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Backfill existing players from the source tables (same expressions as
+-- services/player_stats._ACTUAL_SQL; the craft type lists mirror
+-- routers/workshop.py WEAPON_ITEM_IDS / ARMOR_ITEM_IDS). Rows that already
+-- exist are left alone - backfill_player_stats.py finds and repairs drift.
+INSERT INTO player_stat_counters (
+    user_id,
+    total_checkins,
+    foraging_completed,
+    direct_trades,
+    market_trades,
+    wood_gathered,
+    iron_gathered,
+    stone_gathered,
+    building_contracts,
+    training_contracts,
+    items_crafted,
+    weapons_crafted,
+    armor_crafted,
+    craft_tier_5_item,
+    coups_initiated,
+    coups_won,
+    invasions_participated,
+    invasions_won_attack,
+    invasions_won_defend,
+    plants_grown,
+    flowers_grown,
+    rare_flowers_grown,
+    flower_colors,
+    wheat_harvested,
+    weeds_cleared,
+    bread_baked
+)
+SELECT
+    u.id AS user_id,
+    COALESCE((SELECT SUM(checkins_count) FROM user_kingdoms WHERE user_id = u.id), 0) AS total_checkins,
+    (SELECT COUNT(*) FROM foraging_sessions WHERE user_id = u.id AND status = 'collected') AS foraging_completed,
+    (SELECT COUNT(*) FROM trade_offers WHERE (sender_id = u.id OR recipient_id = u.id) AND status = 'accepted') AS direct_trades,
+    (SELECT COUNT(*) FROM market_transactions WHERE buyer_id = u.id OR seller_id = u.id) AS market_trades,
+    COALESCE((SELECT SUM(amount_gathered) FROM daily_gathering WHERE user_id = u.id AND resource_type = 'wood'), 0) AS wood_gathered,
+    COALESCE((SELECT SUM(amount_gathered) FROM daily_gathering WHERE user_id = u.id AND resource_type = 'iron'), 0) AS iron_gathered,
+    COALESCE((SELECT SUM(amount_gathered) FROM daily_gathering WHERE user_id = u.id AND resource_type = 'stone'), 0) AS stone_gathered,
+    (SELECT COUNT(*) FROM contract_contributions cc JOIN unified_contracts uc ON cc.contract_id = uc.id
+     WHERE cc.user_id = u.id AND uc.category = 'kingdom_building') AS building_contracts,
+    (SELECT COUNT(*) FROM contract_contributions cc JOIN unified_contracts uc ON cc.contract_id = uc.id
+     WHERE cc.user_id = u.id AND uc.category = 'personal_training') AS training_contracts,
+    (SELECT COUNT(*) FROM unified_contracts WHERE user_id = u.id AND completed_at IS NOT NULL AND category = 'workshop_craft') AS items_crafted,
+    (SELECT COUNT(*) FROM unified_contracts WHERE user_id = u.id AND completed_at IS NOT NULL AND category = 'workshop_craft'
+     AND type = ANY(ARRAY['hunting_bow'])) AS weapons_crafted,
+    (SELECT COUNT(*) FROM unified_contracts WHERE user_id = u.id AND completed_at IS NOT NULL AND category = 'workshop_craft'
+     AND type = ANY(ARRAY['fur_armor'])) AS armor_crafted,
+    (SELECT COUNT(*) FROM unified_contracts WHERE user_id = u.id AND completed_at IS NOT NULL AND category = 'workshop_craft'
+     AND tier = 5) AS craft_tier_5_item,
+    (SELECT COUNT(*) FROM battles WHERE initiator_id = u.id AND type = 'coup') AS coups_initiated,
+    (SELECT COUNT(DISTINCT bp.battle_id) FROM battle_participants bp JOIN battles b ON b.id = bp.battle_id
+     WHERE bp.user_id = u.id AND b.type = 'coup' AND b.resolved_at IS NOT NULL
+       AND ((b.attacker_victory = true AND bp.side = 'attackers') OR (b.attacker_victory = false AND bp.side = 'defenders'))) AS coups_won,
+    (SELECT COUNT(DISTINCT bp.battle_id) FROM battle_participants bp JOIN battles b ON b.id = bp.battle_id
+     WHERE bp.user_id = u.id AND b.type = 'invasion' AND b.resolved_at IS NOT NULL) AS invasions_participated,
+    (SELECT COUNT(DISTINCT bp.battle_id) FROM battle_participants bp JOIN battles b ON b.id = bp.battle_id
+     WHERE bp.user_id = u.id AND b.type = 'invasion' AND b.resolved_at IS NOT NULL
+       AND b.attacker_victory = true AND bp.side = 'attackers') AS invasions_won_attack,
+    (SELECT COUNT(DISTINCT bp.battle_id) FROM battle_participants bp JOIN battles b ON b.id = bp.battle_id
+     WHERE bp.user_id = u.id AND b.type = 'invasion' AND b.resolved_at IS NOT NULL
+       AND b.attacker_victory = false AND bp.side = 'defenders') AS invasions_won_defend,
+    (SELECT COUNT(*) FROM garden_history WHERE user_id = u.id AND action = 'grown' AND plant_type IS NOT NULL) AS plants_grown,
+    (SELECT COUNT(*) FROM garden_history WHERE user_id = u.id AND action = 'grown' AND plant_type = 'flower') AS flowers_grown,
+    (SELECT COUNT(*) FROM garden_history WHERE user_id = u.id AND action = 'grown' AND plant_type = 'flower'
+     AND flower_rarity = 'rare') AS rare_flowers_grown,
+    (SELECT COUNT(DISTINCT flower_color) FROM garden_history WHERE user_id = u.id AND action = 'grown'
+     AND plant_type = 'flower' AND flower_color IS NOT NULL) AS flower_colors,
+    COALESCE((SELECT SUM(wheat_gained) FROM garden_history WHERE user_id = u.id AND action = 'harvested'), 0) AS wheat_harvested,
+    (SELECT COUNT(*) FROM garden_history WHERE user_id = u.id AND action = 'discarded' AND plant_type = 'weed') AS weeds_cleared,
+    (SELECT COUNT(*) FROM kitchen_history WHERE user_id = u.id AND action = 'baked') AS bread_baked
+FROM users u
+ON CONFLICT (user_id) DO NOTHING;
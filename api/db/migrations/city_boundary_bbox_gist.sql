@@ -0,0 +1,32 @@
+-- Replace the composite B-tree bbox index with a GiST box index
+-- A B-tree on (min_lat, max_lat, min_lon, max_lon) can only range-scan its
+-- leading column, and the lookup's "OR min_lat IS NULL" branch (for rows
+-- cached before the bbox columns) kept the planner off it entirely. Every row
+-- with boundary points now has a bbox, so lookups filter on the box alone
+-- (CityBoundary.bbox_overlaps) and the index bounds all four sides at once.
+-- Uses the built-in box type - no PostGIS needed.
+
+-- Catch any row inserted without a bbox since add_city_boundary_bbox.sql
+UPDATE city_boundaries cb
+SET min_lat = bbox.min_lat,
+    max_lat = bbox.max_lat,
+    min_lon = bbox.min_lon,
+    max_lon = bbox.max_lon
+FROM (
+    SELECT osm_id,
+           MIN((p->>0)::double precision) AS min_lat,
+           MAX((p->>0)::double precision) AS max_lat,
+           MIN((p->>1)::double precision) AS min_lon,
+           MAX((p->>1)::double precision) AS max_lon
+    FROM city_boundaries,
+         jsonb_array_elements(boundary_geojson->'coordinates') AS p
+    WHERE min_lat IS NULL
+    GROUP BY osm_id
+) bbox
+WHERE cb.osm_id = bbox.osm_id;
+
+-- Must match the expression in CityBoundary.bbox_overlaps()
+CREATE INDEX IF NOT EXISTS idx_city_boundaries_bbox_box
+ON city_boundaries USING gist (box(point(min_lat, min_lon), point(max_lat, max_lon)));
+
+DROP INDEX IF EXISTS idx_city_boundaries_bbox;
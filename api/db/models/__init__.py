@@ -8,6 +8,8 @@ from .kingdom_building import KingdomBuilding
 from .contract import Contract
 from .property import Property
 from .city_boundary import CityBoundary
+from .city_adjacency import CityAdjacency
+from .location_cell import LocationCell
 from .check_in import CheckInHistory
 from .kingdom_intelligence import KingdomIntelligence
 # Legacy coup imports - keeping for backward compat during migration
@@ -24,29 +26,32 @@ from .invasion import InvasionEvent
 
 # NEW: Unified Battle system (replaces CoupEvent + InvasionEvent)
 from .battle import (
-    Battle, BattleType, BattleParticipant, BattleTerritory,
+    Battle, BattleType, BattleParticipant, BattleSideStats, BattleTerritory,
     BattleAction, BattleInjury, FightSession,
     RollOutcome as BattleRollOutcome,
 )
 from .kingdom_history import KingdomHistory
 from .alliance import Alliance
 from .friend import Friend
-from .activity_log import PlayerActivityLog
-from .market_order import MarketOrder, MarketTransaction, OrderType, OrderStatus
+from .activity_log import PlayerActivityLog, ActivityTimelineEntry
+from .market_order import MarketOrder, MarketTransaction, MarketCandle, OrderType, OrderStatus
 from .kingdom_event import KingdomEvent
 
 # New unified models
-from .unified_contract import UnifiedContract, ContractContribution
+from .unified_contract import UnifiedContract, ContractContribution, ContractContributorCount
 from .player_item import PlayerItem
 from .action_cooldown import ActionCooldown
 from .inventory import PlayerInventory
 from .item import Item
-from .hunt_session import HuntSession
+from .hunt_session import HuntSession, HuntSessionParticipant, HuntRoundResult
 from .hunt_stats import HuntStats
+from .incident import Incident, IncidentParticipant, IncidentRoll
+from .deadline import Deadline
 from .foraging_session import ForagingSession
 from .fishing_session import FishingSession
 from .science_session import ScienceSession
 from .science_stats import ScienceStats
+from .player_stat_counters import PlayerStatCounters
 from .trade_offer import TradeOffer, TradeOfferStatus
 
 # PvP Arena Duels
@@ -92,6 +97,8 @@ __all__ = [
     "Contract",
     "Property",
     "CityBoundary",
+    "CityAdjacency",
+    "LocationCell",
     "CheckInHistory",
     "KingdomIntelligence",
     # Legacy coup (keeping for backward compat)
@@ -123,6 +130,7 @@ __all__ = [
     "Battle",
     "BattleType",
     "BattleParticipant",
+    "BattleSideStats",
     "BattleTerritory",
     "BattleAction",
     "BattleInjury",
@@ -133,24 +141,34 @@ __all__ = [
     "Alliance",
     "Friend",
     "PlayerActivityLog",
+    "ActivityTimelineEntry",
     "MarketOrder",
     "MarketTransaction",
+    "MarketCandle",
     "OrderType",
     "OrderStatus",
     "KingdomEvent",
     # New unified models
     "UnifiedContract",
     "ContractContribution",
+    "ContractContributorCount",
     "PlayerItem",
     "ActionCooldown",
     "PlayerInventory",
     "Item",
     "HuntSession",
+    "HuntSessionParticipant",
+    "HuntRoundResult",
     "HuntStats",
+    "Incident",
+    "IncidentParticipant",
+    "IncidentRoll",
+    "Deadline",
     "ForagingSession",
     "FishingSession",
     "ScienceSession",
     "ScienceStats",
+    "PlayerStatCounters",
     # Player Trading
     "TradeOffer",
     "TradeOfferStatus",
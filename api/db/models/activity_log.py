@@ -51,8 +51,27 @@ class PlayerActivityLog(Base):
         return f"<PlayerActivityLog(user_id={self.user_id}, action_type='{self.action_type}', created_at={self.created_at})>"
 
 
+class ActivityTimelineEntry(Base):
+    """
+    Per-user friend activity inbox (fan-out on write)
+    One row per (reader, activity), filled by log_activity when timelines are
+    enabled and capped to the newest entries per reader. See services/activity_timeline.py
+    """
+    __tablename__ = "activity_timeline"
+    
+    owner_user_id = Column(BigInteger, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)  # Reader
+    activity_id = Column(Integer, ForeignKey("player_activity_log.id", ondelete="CASCADE"), primary_key=True)
+    author_user_id = Column(BigInteger, nullable=False)  # Who did it (for unfriend cleanup)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<ActivityTimelineEntry(owner={self.owner_user_id}, activity_id={self.activity_id})>"
+
+
 # Composite indexes for common queries
 Index('idx_activity_user_created', PlayerActivityLog.user_id, PlayerActivityLog.created_at.desc())
+Index('idx_activity_user_id', PlayerActivityLog.user_id, PlayerActivityLog.id.desc())
+Index('idx_activity_timeline_author', ActivityTimelineEntry.author_user_id, ActivityTimelineEntry.owner_user_id)
 Index('idx_activity_kingdom_created', PlayerActivityLog.kingdom_id, PlayerActivityLog.created_at.desc())
 Index('idx_activity_type_created', PlayerActivityLog.action_type, PlayerActivityLog.created_at.desc())
 
@@ -293,6 +293,41 @@ class BattleParticipant(Base):
         return f"<BattleParticipant(battle={self.battle_id}, user={self.user_id}, side='{self.side}')>"
 
 
+class BattleSideStats(Base):
+    """
+    Per-side stat totals for a battle, so fight rolls read one row instead of
+    every participant's PlayerState.
+    
+    Each join adds the player's stats to their side in place. The totals are
+    rebuilt by one GROUP BY side over battle_participants JOIN player_state
+    once a row is older than SIDE_STATS_MAX_AGE_SECONDS (stats can change
+    mid-battle through training or debuffs) and at resolution. See
+    routers/battles._add_to_side_stats / _refresh_side_stats.
+    """
+    __tablename__ = "battle_side_stats"
+    
+    battle_id = Column(Integer, ForeignKey("battles.id", ondelete="CASCADE"), primary_key=True)
+    side = Column(String(20), primary_key=True)  # 'attackers' or 'defenders'
+    
+    # Pledged players, and how many of them have a player_state row
+    participant_count = Column(Integer, nullable=False, default=0)
+    stats_count = Column(Integer, nullable=False, default=0)
+    
+    # total_attack has active attack debuffs applied
+    total_attack = Column(Integer, nullable=False, default=0)
+    total_defense = Column(Integer, nullable=False, default=0)
+    total_leadership = Column(Integer, nullable=False, default=0)
+    
+    refreshed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<BattleSideStats(battle={self.battle_id}, side='{self.side}', count={self.participant_count})>"
+    
+    def avg(self, total: int) -> float:
+        """Average over players with stats (1.0 for an empty side)"""
+        return total / self.stats_count if self.stats_count > 0 else 1.0
+
+
 class BattleTerritory(Base):
     """
     Territory control for battles.
@@ -0,0 +1,43 @@
+"""
+CityAdjacency model - Precomputed neighbour edge distances between cached cities
+"""
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Index
+from datetime import datetime
+
+from ..base import Base
+
+
+class CityAdjacency(Base):
+    """
+    Minimum boundary-to-boundary distance from a city to one of its OSM
+    neighbour candidates (both boundaries cached).
+    
+    Filled when a boundary is cached (services/city_adjacency.link_new_boundary)
+    and by preprocess_boundaries.py, so /cities/neighbors only reads distances
+    instead of comparing polygons per request.
+    """
+    __tablename__ = "city_adjacency"
+    
+    # City whose neighbours are being filtered
+    city_osm_id = Column(String, ForeignKey("city_boundaries.osm_id", ondelete="CASCADE"), primary_key=True)
+    
+    # Neighbour candidate
+    neighbor_osm_id = Column(String, ForeignKey("city_boundaries.osm_id", ondelete="CASCADE"), primary_key=True)
+    
+    # Same value get_neighbor_cities would compute (meters, sampled from city_osm_id's vertices)
+    # 0 for boundary-sharing neighbours (OSM says they touch)
+    edge_distance = Column(Float, nullable=False)
+    
+    # Where the candidate came from: "boundary" (shared border) or "radius" (radius search)
+    source = Column(String(16), nullable=False, default="radius")
+    
+    # Compared against both cities' boundary_updated_at to detect stale rows
+    computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        Index('idx_city_adjacency_neighbor', 'neighbor_osm_id'),
+        Index('idx_city_adjacency_city_distance', 'city_osm_id', 'edge_distance'),
+    )
+    
+    def __repr__(self):
+        return f"<CityAdjacency({self.city_osm_id} -> {self.neighbor_osm_id}, {self.edge_distance:.0f}m)>"
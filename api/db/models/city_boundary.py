@@ -1,7 +1,7 @@
 """
 CityBoundary model - OSM city/town boundary data
 """
-from sqlalchemy import Column, String, Float, DateTime, Integer
+from sqlalchemy import Column, String, Float, DateTime, Integer, Index, event, inspect, func
 from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime
 
@@ -35,12 +35,23 @@ class CityBoundary(Base):
     # This is what gets returned to clients for efficient data transfer
     simplified_boundary_geojson = Column(JSONB, nullable=True)
     
+    # Bounding box of boundary_geojson (spatial index for point-in-city lookups)
+    # Point lookups only ray-cast the few polygons whose bbox contains the point.
+    # Indexed as a GiST box (see bbox_overlaps); NULL only for empty boundaries.
+    min_lat = Column(Float, nullable=True)
+    max_lat = Column(Float, nullable=True)
+    min_lon = Column(Float, nullable=True)
+    max_lon = Column(Float, nullable=True)
+    
     # Metadata
     radius_meters = Column(Float, nullable=False)  # Approximate radius
     boundary_points_count = Column(Integer, nullable=False)  # Number of points in original boundary
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Bumped whenever boundary_geojson / simplified_boundary_geojson is rewritten
+    # Version key for the process-level boundary cache (services/boundary_cache.py)
+    boundary_updated_at = Column(DateTime, default=datetime.utcnow, nullable=True)
     last_accessed = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Usage tracking
@@ -57,6 +68,35 @@ class CityBoundary(Base):
     # Optional: Store original OSM data for reference
     osm_metadata = Column(JSONB, nullable=True)
     
+    __table_args__ = (
+        # Must match the expression in bbox_overlaps() for the planner to use it
+        Index(
+            'idx_city_boundaries_bbox_box',
+            func.box(func.point(min_lat, min_lon), func.point(max_lat, max_lon)),
+            postgresql_using='gist'
+        ),
+    )
+    
     def __repr__(self):
         return f"<CityBoundary(osm_id='{self.osm_id}', name='{self.name}')>"
+    
+    @classmethod
+    def bbox_overlaps(cls, min_lat: float, max_lat: float, min_lon: float, max_lon: float):
+        """
+        Filter: bbox overlaps the rectangle (edges inclusive). A GiST box search
+        bounds all four sides at once, where a B-tree could only range-scan min_lat.
+        """
+        row_box = func.box(func.point(cls.min_lat, cls.min_lon), func.point(cls.max_lat, cls.max_lon))
+        return row_box.op('&&')(func.box(func.point(min_lat, min_lon), func.point(max_lat, max_lon)))
+
+
+
+BOUNDARY_COLUMNS = ("boundary_geojson", "simplified_boundary_geojson")
+
 
+@event.listens_for(CityBoundary, "before_update")
+def _bump_boundary_version(mapper, connection, target):
+    """Stamp a new boundary version whenever the stored geometry changes"""
+    attrs = inspect(target).attrs
+    if any(attrs[column].history.has_changes() for column in BOUNDARY_COLUMNS):
+        target.boundary_updated_at = datetime.utcnow()
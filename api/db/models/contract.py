@@ -1,7 +1,7 @@
 """
 Contract model - Building contracts for kingdom infrastructure
 """
-from sqlalchemy import Column, String, Float, DateTime, Integer, BigInteger, ForeignKey
+from sqlalchemy import Column, String, Float, DateTime, Integer, BigInteger, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime
@@ -49,6 +49,11 @@ class Contract(Base):
     kingdom = relationship("Kingdom", back_populates="contracts")
     creator = relationship("User", back_populates="contracts", foreign_keys=[created_by])
     
+    __table_args__ = (
+        # "Contracts this player contributed to" (action_contributions ? user_id)
+        Index('idx_contracts_action_contributions', 'action_contributions', postgresql_using='gin'),
+    )
+    
     def __repr__(self):
         return f"<Contract(id='{self.id}', building='{self.building_type}', status='{self.status}')>"
 
@@ -0,0 +1,45 @@
+"""
+Deadline model - Queue of time-based state transitions (services/deadline_scheduler.py)
+
+Battles, duels and hunts change state when a timer runs out. Instead of
+waiting for some client to hit an endpoint after the timer, each timer is a
+row here and the deadline worker picks up due rows with
+FOR UPDATE SKIP LOCKED.
+"""
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, Index, UniqueConstraint
+from datetime import datetime
+
+from ..base import Base
+
+
+class Deadline(Base):
+    """
+    One pending timer. There is at most one row per (kind, target_id) -
+    scheduling again moves due_at instead of adding a second row.
+    """
+    __tablename__ = "deadlines"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+
+    # 'battle_pledge_end', 'battle_resolve', 'duel_timeout', 'hunt_expiry'
+    kind = Column(String(32), nullable=False)
+    # battle id / duel match id / hunt id, as a string
+    target_id = Column(String, nullable=False)
+
+    due_at = Column(DateTime, nullable=False)
+
+    # Failed runs are retried with a backoff; after MAX_ATTEMPTS the row is
+    # parked (failed_at set) and kept for inspection instead of deleted
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+    failed_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('kind', 'target_id', name='uq_deadlines_kind_target'),
+        Index('idx_deadlines_due_at', 'due_at', postgresql_where=failed_at.is_(None)),
+    )
+
+    def __repr__(self):
+        return f"<Deadline({self.kind}:{self.target_id}, due_at={self.due_at}, attempts={self.attempts})>"
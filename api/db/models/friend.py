@@ -25,5 +25,6 @@ class Friend(Base):
     __table_args__ = (
         Index('idx_user_friend', 'user_id', 'friend_user_id'),
         Index('idx_friend_status', 'status'),
+        Index('idx_friend_friend_user', 'friend_user_id'),
     )
 
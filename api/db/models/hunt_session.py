@@ -1,7 +1,7 @@
 """
 Hunt session models - Persistent storage for hunting minigame sessions
 """
-from sqlalchemy import Column, String, Integer, BigInteger, DateTime, Text
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, Text, ForeignKey, Index, Boolean, Float
 from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime
 from typing import Optional
@@ -36,8 +36,9 @@ class HuntSession(Base):
     # Status: 'lobby', 'in_progress', 'completed', 'failed', 'cancelled'
     status = Column(String, nullable=False, default='lobby', index=True)
     
-    # Full hunt state as JSONB - this is the HuntSession dataclass serialized
+    # Hunt state as JSONB - this is the HuntSession dataclass serialized
     # Storing as JSONB means we don't need to migrate when hunt structure changes
+    # Per-roll round results live in hunt_round_results, not in this blob
     session_data = Column(JSONB, nullable=False)
     
     # Timing
@@ -61,3 +62,59 @@ class HuntSession(Base):
     def is_expired(self) -> bool:
         """Check if hunt has expired"""
         return datetime.utcnow() > self.expires_at
+
+
+class HuntSessionParticipant(Base):
+    """
+    Who is in which hunt - a normalized copy of session_data["participants"]
+    (plus the creator), rewritten by persistence.save_hunt on every save.
+
+    status mirrors hunt_sessions.status so "active hunt for player" is one
+    index lookup on (user_id) among lobby/in_progress rows, instead of
+    deserializing every active hunt's JSONB.
+    """
+    __tablename__ = "hunt_participants"
+
+    hunt_id = Column(String, ForeignKey("hunt_sessions.hunt_id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(BigInteger, primary_key=True)
+    status = Column(String, nullable=False, default='lobby')
+
+    __table_args__ = (
+        Index(
+            'idx_hunt_participants_active_user', 'user_id',
+            postgresql_where=status.in_(['lobby', 'in_progress'])
+        ),
+    )
+
+    def __repr__(self):
+        return f"<HuntSessionParticipant(hunt_id='{self.hunt_id}', user_id={self.user_id}, status='{self.status}')>"
+
+
+class HuntRoundResult(Base):
+    """
+    One roll within a hunt phase - append-only.
+
+    execute_roll used to grow current_phase_state.round_results inside
+    session_data, so every roll rewrote an ever larger JSONB value. Rolls are
+    now inserted here as one small row each, and persistence reattaches the
+    current phase's rows when it loads the hunt.
+    """
+    __tablename__ = "hunt_round_results"
+
+    hunt_id = Column(String, ForeignKey("hunt_sessions.hunt_id", ondelete="CASCADE"), primary_key=True)
+    phase = Column(String, primary_key=True)
+    round_number = Column(Integer, primary_key=True)
+
+    player_id = Column(BigInteger, nullable=False)
+    player_name = Column(String, nullable=False)
+    roll_value = Column(Integer, nullable=False)
+    stat_value = Column(Integer, nullable=False)
+    is_success = Column(Boolean, nullable=False)
+    is_critical = Column(Boolean, nullable=False)
+    contribution = Column(Float, nullable=False)
+    effect_message = Column(String, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<HuntRoundResult(hunt_id='{self.hunt_id}', phase='{self.phase}', round={self.round_number})>"
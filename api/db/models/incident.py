@@ -0,0 +1,111 @@
+"""
+Incident models - Covert incident sessions (systems/incidents)
+
+Stored in Postgres so every instance (Lambda or worker) sees the same
+incident. The probability bar lives in incidents.slots and is shifted with a
+single UPDATE ... RETURNING per roll (see systems/incidents/store.py).
+"""
+from sqlalchemy import Column, String, Integer, BigInteger, Boolean, DateTime, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+
+from ..base import Base
+
+
+class Incident(Base):
+    """
+    One covert incident between an attacking and a defending kingdom.
+
+    At most one ACTIVE incident per (attacker, defender) pair - enforced by a
+    partial unique index, so two instances triggering at once can't both win.
+    """
+    __tablename__ = "incidents"
+
+    # e.g. "incident_123_456_1768007333119"
+    incident_id = Column(String, primary_key=True)
+
+    attacker_kingdom_id = Column(String, nullable=False)
+    defender_kingdom_id = Column(String, nullable=False)
+    triggered_by = Column(BigInteger, nullable=False)
+    attacker_tier = Column(Integer, nullable=False, default=1)
+
+    # 'active', 'resolved', 'expired'
+    status = Column(String, nullable=False, default='active')
+
+    # The probability bar: outcome -> slots
+    slots = Column(JSONB, nullable=False)
+
+    # Roll counts per side (MAX_ROLLS_SIDE is checked in the same UPDATE)
+    attacker_rolls = Column(Integer, nullable=False, default=0)
+    defender_rolls = Column(Integer, nullable=False, default=0)
+
+    # Resolution
+    resolution_roll = Column(Integer, nullable=True)
+    outcome = Column(String, nullable=True)
+    resolved_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index(
+            'uq_incidents_active_pair', 'attacker_kingdom_id', 'defender_kingdom_id',
+            unique=True, postgresql_where=text("status = 'active'")
+        ),
+        Index(
+            'idx_incidents_active_defender', 'defender_kingdom_id',
+            postgresql_where=text("status = 'active'")
+        ),
+        Index('idx_incidents_status_expires', 'status', 'expires_at'),
+    )
+
+    def __repr__(self):
+        return f"<Incident({self.incident_id}, {self.attacker_kingdom_id}->{self.defender_kingdom_id}, status={self.status})>"
+
+
+class IncidentParticipant(Base):
+    """A player in an incident, with their per-player roll counters"""
+    __tablename__ = "incident_participants"
+
+    incident_id = Column(String, ForeignKey("incidents.incident_id", ondelete="CASCADE"), primary_key=True)
+    player_id = Column(BigInteger, primary_key=True)
+
+    player_name = Column(String, nullable=False)
+    side = Column(String, nullable=False)  # 'attacker' or 'defender'
+    kingdom_id = Column(String, nullable=False)
+    stats = Column(JSONB, nullable=False)
+
+    rolls_made = Column(Integer, nullable=False, default=0)
+    successful_rolls = Column(Integer, nullable=False, default=0)
+    critical_rolls = Column(Integer, nullable=False, default=0)
+
+    joined_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<IncidentParticipant({self.incident_id}, player={self.player_id}, side={self.side})>"
+
+
+class IncidentRoll(Base):
+    """One roll in an incident - append-only history"""
+    __tablename__ = "incident_rolls"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    incident_id = Column(String, ForeignKey("incidents.incident_id", ondelete="CASCADE"), nullable=False)
+
+    player_id = Column(BigInteger, nullable=False)
+    player_name = Column(String, nullable=False)
+    side = Column(String, nullable=False)
+    roll_value = Column(Integer, nullable=False)
+    stat_value = Column(Integer, nullable=False)
+    is_success = Column(Boolean, nullable=False)
+    is_critical = Column(Boolean, nullable=False)
+    shift_applied = Column(JSONB, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('idx_incident_rolls_incident', 'incident_id', 'id'),
+    )
+
+    def __repr__(self):
+        return f"<IncidentRoll({self.incident_id}, player={self.player_id}, success={self.is_success})>"
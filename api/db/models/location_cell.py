@@ -0,0 +1,49 @@
+"""
+LocationCell model - Cached "which city is this ~150m cell in" resolutions
+"""
+from sqlalchemy import Column, String, Float, DateTime, Integer, Boolean, Index
+from datetime import datetime
+
+from ..base import Base
+
+
+class LocationCell(Base):
+    """
+    Geohash cell (precision 7, ~150m) -> city resolution.
+    
+    fully_inside=True means no cached boundary edge crosses the cell, so every
+    point in it resolves to osm_id without a polygon test. fully_inside=False
+    marks cells that straddle a boundary: those always use the exact test.
+    
+    Rows overlapping a boundary are deleted whenever that boundary is
+    inserted or rewritten (services/location_cell_cache.py).
+    """
+    __tablename__ = "location_cells"
+    
+    # Geohash of the cell
+    geohash = Column(String(12), primary_key=True)
+    
+    # Resolved city (highest admin_level containing the cell)
+    osm_id = Column(String, nullable=False)
+    admin_level = Column(Integer, nullable=False)
+    
+    # No boundary edge crosses this cell
+    fully_inside = Column(Boolean, nullable=False, default=False)
+    
+    # Resolved city's boundary_updated_at when this row was computed
+    boundary_version = Column(DateTime, nullable=True)
+    
+    # Cell bounds (for invalidating every cell a changed boundary overlaps)
+    min_lat = Column(Float, nullable=False)
+    max_lat = Column(Float, nullable=False)
+    min_lon = Column(Float, nullable=False)
+    max_lon = Column(Float, nullable=False)
+    
+    computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        Index('idx_location_cells_bounds', 'min_lat', 'max_lat', 'min_lon', 'max_lon'),
+    )
+    
+    def __repr__(self):
+        return f"<LocationCell({self.geohash} -> {self.osm_id}, fully_inside={self.fully_inside})>"
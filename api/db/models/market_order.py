@@ -1,8 +1,9 @@
 """
 Market Order models - Grand Exchange style order book system
 """
-from sqlalchemy import Column, String, DateTime, Integer, BigInteger, Boolean, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, Integer, BigInteger, Boolean, ForeignKey, Index, text, Enum as SQLEnum
 from datetime import datetime
+from typing import Optional
 import enum
 
 from ..base import Base
@@ -53,6 +54,15 @@ class MarketOrder(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     filled_at = Column(DateTime, nullable=True)  # When fully filled or cancelled
     
+    # Order book scans: open orders for one kingdom/item/side in matching order
+    __table_args__ = (
+        Index(
+            'idx_market_orders_book',
+            'kingdom_id', 'item_type', 'order_type', 'price_per_unit', 'created_at', 'id',
+            postgresql_where=text("status IN ('active', 'partially_filled')")
+        ),
+    )
+    
     def __repr__(self):
         return f"<MarketOrder(id={self.id}, {self.order_type.value} {self.quantity_remaining}/{self.quantity_original} {self.item_type} @ {self.price_per_unit}g)>"
 
@@ -91,3 +101,38 @@ class MarketTransaction(Base):
         return f"<MarketTransaction(id={self.id}, {self.quantity} {self.item_type} @ {self.price_per_unit}g, total={self.total_gold}g)>"
 
 
+
+
+class MarketCandle(Base):
+    """
+    OHLCV rollup of trades per (kingdom, item) and time bucket
+    Maintained on every trade (services/market_candles.py) at 1m and 1h
+    """
+    __tablename__ = "market_candles"
+    
+    kingdom_id = Column(String, primary_key=True)
+    item_type = Column(String, primary_key=True)
+    interval = Column(String(4), primary_key=True)  # "1m", "1h"
+    bucket_start = Column(DateTime, primary_key=True)  # UTC, truncated to the interval
+    
+    # Prices (gold per unit)
+    open = Column(Integer, nullable=False)
+    high = Column(Integer, nullable=False)
+    low = Column(Integer, nullable=False)
+    close = Column(Integer, nullable=False)
+    
+    # Volume
+    volume = Column(BigInteger, nullable=False, default=0)  # Units traded
+    value = Column(BigInteger, nullable=False, default=0)   # Gold traded (sum of total_gold) - vwap = value / volume
+    trades = Column(Integer, nullable=False, default=0)
+    
+    # Decide open/close when trades arrive out of order
+    first_trade_at = Column(DateTime, nullable=False)
+    last_trade_at = Column(DateTime, nullable=False)
+    
+    @property
+    def vwap(self) -> Optional[float]:
+        return self.value / self.volume if self.volume else None
+    
+    def __repr__(self):
+        return f"<MarketCandle({self.kingdom_id} {self.item_type} {self.interval} {self.bucket_start} O{self.open} H{self.high} L{self.low} C{self.close} V{self.volume})>"
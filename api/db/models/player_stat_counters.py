@@ -0,0 +1,61 @@
+"""
+Player Stat Counters - Lifetime event counts for achievements
+Incremented where the events happen (services/player_stats.py) so achievement
+progress is one row instead of COUNT/SUM over each player's history.
+"""
+from sqlalchemy import Column, Integer, BigInteger, DateTime, ForeignKey, func
+from datetime import datetime
+
+from ..base import Base
+
+
+class PlayerStatCounters(Base):
+    """
+    One row per player. Every counter column is a lifetime total that only
+    goes up; backfill_player_stats.py rebuilds them from the source tables.
+    """
+    __tablename__ = "player_stat_counters"
+
+    user_id = Column(BigInteger, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    # Exploration
+    total_checkins = Column(Integer, default=0, server_default="0", nullable=False)
+
+    # Economy
+    foraging_completed = Column(Integer, default=0, server_default="0", nullable=False)
+    direct_trades = Column(Integer, default=0, server_default="0", nullable=False)
+    market_trades = Column(Integer, default=0, server_default="0", nullable=False)
+    wood_gathered = Column(BigInteger, default=0, server_default="0", nullable=False)
+    iron_gathered = Column(BigInteger, default=0, server_default="0", nullable=False)
+    stone_gathered = Column(BigInteger, default=0, server_default="0", nullable=False)
+
+    # Contracts (actions contributed)
+    building_contracts = Column(Integer, default=0, server_default="0", nullable=False)
+    training_contracts = Column(Integer, default=0, server_default="0", nullable=False)
+
+    # Workshop
+    items_crafted = Column(Integer, default=0, server_default="0", nullable=False)
+    weapons_crafted = Column(Integer, default=0, server_default="0", nullable=False)
+    armor_crafted = Column(Integer, default=0, server_default="0", nullable=False)
+    craft_tier_5_item = Column(Integer, default=0, server_default="0", nullable=False)
+
+    # Battles
+    coups_initiated = Column(Integer, default=0, server_default="0", nullable=False)
+    coups_won = Column(Integer, default=0, server_default="0", nullable=False)
+    invasions_participated = Column(Integer, default=0, server_default="0", nullable=False)
+    invasions_won_attack = Column(Integer, default=0, server_default="0", nullable=False)
+    invasions_won_defend = Column(Integer, default=0, server_default="0", nullable=False)
+
+    # Garden / kitchen
+    plants_grown = Column(Integer, default=0, server_default="0", nullable=False)
+    flowers_grown = Column(Integer, default=0, server_default="0", nullable=False)
+    rare_flowers_grown = Column(Integer, default=0, server_default="0", nullable=False)
+    flower_colors = Column(Integer, default=0, server_default="0", nullable=False)  # Distinct colors grown
+    wheat_harvested = Column(Integer, default=0, server_default="0", nullable=False)
+    weeds_cleared = Column(Integer, default=0, server_default="0", nullable=False)
+    bread_baked = Column(Integer, default=0, server_default="0", nullable=False)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<PlayerStatCounters(user={self.user_id})>"
@@ -34,6 +34,10 @@ class UnifiedContract(Base):
     # Requirements
     actions_required = Column(Integer, nullable=False, default=1)
     
+    # Progress counter - bumped in the same transaction as each contribution
+    # (services/contract_counters.py). Equals COUNT(contract_contributions).
+    actions_completed = Column(Integer, nullable=False, default=0, server_default="0")
+    
     # Cost paid (denormalized for history)
     # OLD SYSTEM: gold_paid > 0 means player paid upfront, actions are free
     gold_paid = Column(Integer, default=0)
@@ -66,11 +70,6 @@ class UnifiedContract(Base):
         Index('idx_unified_contracts_category_completed', 'category', 'completed_at'),
     )
     
-    @property
-    def actions_completed(self) -> int:
-        """Count of contributions = actions completed"""
-        return len(self.contributions) if self.contributions else 0
-    
     @property
     def is_complete(self) -> bool:
         """Check if contract is complete"""
@@ -119,3 +118,22 @@ class ContractContribution(Base):
     def __repr__(self):
         return f"<ContractContribution(contract_id={self.contract_id}, user_id={self.user_id})>"
 
+
+
+class ContractContributorCount(Base):
+    """
+    Per-user action counts for a contract.
+    One row per (contract, contributor), maintained alongside contract_contributions.
+    """
+    __tablename__ = "contract_contributor_counts"
+    
+    contract_id = Column(BigInteger, ForeignKey("unified_contracts.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(BigInteger, ForeignKey("users.id"), primary_key=True)
+    actions = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        Index('idx_contributor_counts_user', 'user_id'),
+    )
+    
+    def __repr__(self):
+        return f"<ContractContributorCount(contract_id={self.contract_id}, user_id={self.user_id}, actions={self.actions})>"
@@ -0,0 +1,224 @@
+"""
+Connection pool profiles - Engine settings per deployment type
+
+The same app runs on Lambda (one request per container), under uvicorn in
+a container (many concurrent requests) and as background workers. Each
+needs different pool settings, so they are grouped into profiles chosen by
+DB_PROFILE:
+
+- lambda    - 1 connection, pre-ping (containers sit frozen between calls),
+              no statement timeout (connects through RDS Proxy)
+- container - a real pool, no pre-ping round trip per checkout; dead
+              connections are recycled and invalidated on first error instead
+- worker    - small pool for long-running jobs, pre-ping, long statement timeout
+
+Without DB_PROFILE, "lambda" is used when AWS_LAMBDA_FUNCTION_NAME is set and
+"container" otherwise. Any single setting can be overridden with DB_POOL_SIZE,
+DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+DB_STATEMENT_TIMEOUT_MS and DB_PREPARED_STATEMENTS.
+
+Checkout wait time and utilization are tracked by InstrumentedQueuePool and
+exposed via pool_stats() (GET /db/stats).
+"""
+from dataclasses import dataclass, replace, asdict
+from collections import deque
+from typing import Dict, Optional
+import os
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+# ============================================================
+# PROFILES
+# ============================================================
+
+@dataclass(frozen=True)
+class PoolProfile:
+    name: str
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float  # seconds to wait for a free connection
+    pool_recycle: int  # seconds before a connection is replaced
+    pre_ping: bool
+    statement_timeout_ms: int  # 0 = no limit
+    prepared_statements: bool  # server-side prepares (psycopg 3 only)
+
+
+PROFILES: Dict[str, PoolProfile] = {
+    "lambda": PoolProfile(
+        name="lambda",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=10,
+        pool_recycle=3600,
+        pre_ping=True,
+        # RDS Proxy rejects the startup `options` parameter this is sent in;
+        # set a limit on the DB role instead (ALTER ROLE ... SET statement_timeout)
+        statement_timeout_ms=0,
+        prepared_statements=False,  # unsafe behind RDS Proxy / pgbouncer
+    ),
+    "container": PoolProfile(
+        name="container",
+        pool_size=10,
+        max_overflow=10,
+        pool_timeout=10,
+        pool_recycle=1800,
+        pre_ping=False,
+        statement_timeout_ms=15000,
+        prepared_statements=False,
+    ),
+    "worker": PoolProfile(
+        name="worker",
+        pool_size=4,
+        max_overflow=2,
+        pool_timeout=30,
+        pool_recycle=3600,
+        pre_ping=True,
+        statement_timeout_ms=300000,
+        prepared_statements=True,
+    ),
+}
+
+
+def _env_bool(name: str) -> Optional[bool]:
+    value = os.getenv(name)
+    if value is None:
+        return None
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def _env_number(name: str, cast):
+    value = os.getenv(name)
+    return cast(value) if value not in (None, "") else None
+
+
+def resolve_profile() -> PoolProfile:
+    """Profile from DB_PROFILE (or the runtime), with per-setting env overrides"""
+    name = os.getenv("DB_PROFILE", "").lower()
+    if not name:
+        name = "lambda" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "container"
+    if name not in PROFILES:
+        raise ValueError(f"Unknown DB_PROFILE '{name}' (expected one of: {', '.join(PROFILES)})")
+
+    overrides = {
+        "pool_size": _env_number("DB_POOL_SIZE", int),
+        "max_overflow": _env_number("DB_MAX_OVERFLOW", int),
+        "pool_timeout": _env_number("DB_POOL_TIMEOUT", float),
+        "pool_recycle": _env_number("DB_POOL_RECYCLE", int),
+        "pre_ping": _env_bool("DB_POOL_PRE_PING"),
+        "statement_timeout_ms": _env_number("DB_STATEMENT_TIMEOUT_MS", int),
+        "prepared_statements": _env_bool("DB_PREPARED_STATEMENTS"),
+    }
+    return replace(PROFILES[name], **{k: v for k, v in overrides.items() if v is not None})
+
+
+def engine_kwargs(profile: PoolProfile, database_url: str) -> dict:
+    """create_engine() keyword arguments for a profile"""
+    connect_args = {"connect_timeout": 5}
+    # Sent as a startup parameter - only for direct connections, not RDS Proxy
+    if profile.statement_timeout_ms:
+        connect_args["options"] = f"-c statement_timeout={profile.statement_timeout_ms}"
+
+    if profile.prepared_statements:
+        if database_url.startswith("postgresql+psycopg://"):
+            # psycopg 3 prepares a query server-side after it has run this many times
+            connect_args["prepare_threshold"] = 5
+        else:
+            print("⚠️  DB_PREPARED_STATEMENTS ignored: needs the postgresql+psycopg driver")
+
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": profile.pool_size,
+        "max_overflow": profile.max_overflow,
+        "pool_timeout": profile.pool_timeout,
+        "pool_recycle": profile.pool_recycle,
+        "pool_pre_ping": profile.pre_ping,
+        "pool_use_lifo": True,  # keep idle connections idle so recycle can retire them
+        "connect_args": connect_args,
+    }
+
+
+# ============================================================
+# METRICS
+# ============================================================
+
+class PoolMetrics:
+    """Checkout wait times for the process's pool"""
+
+    SAMPLE_SIZE = 1000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._recent = deque(maxlen=self.SAMPLE_SIZE)
+
+    def record(self, wait: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self._recent.append(wait)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            recent = sorted(self._recent)
+            checkouts = self.checkouts
+            total_wait = self.total_wait
+            max_wait = self.max_wait
+            timeouts = self.timeouts
+
+        def pct(p: float) -> float:
+            if not recent:
+                return 0.0
+            return recent[min(len(recent) - 1, int(p / 100 * len(recent)))]
+
+        return {
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "wait_ms_avg": round(total_wait / checkouts * 1000, 3) if checkouts else 0.0,
+            "wait_ms_p50": round(pct(50) * 1000, 3),
+            "wait_ms_p95": round(pct(95) * 1000, 3),
+            "wait_ms_max": round(max_wait * 1000, 3),
+        }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        pool_metrics.record(time.perf_counter() - start)
+        return connection
+
+
+def pool_stats(engine, profile: PoolProfile) -> dict:
+    """Profile, current utilization and checkout wait metrics"""
+    pool = engine.pool
+    capacity = profile.pool_size + max(profile.max_overflow, 0)
+    checked_out = pool.checkedout() if hasattr(pool, "checkedout") else 0
+    return {
+        "profile": asdict(profile),
+        "checked_out": checked_out,
+        "idle": pool.checkedin() if hasattr(pool, "checkedin") else 0,
+        "capacity": capacity,
+        "utilization": round(checked_out / capacity, 3) if capacity else 0.0,
+        **pool_metrics.snapshot(),
+    }
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Deadline Worker
+
+Runs due deadlines (services/deadline_scheduler.py): pledge → battle,
+battle recounts, duel style/swing timeouts and hunt expiry. Claims rows with
+FOR UPDATE SKIP LOCKED, so any number of copies can run at once.
+
+Three ways to run it:
+
+- Scheduled Lambda (serverless.yml `deadlines`, every minute): `handler`
+  drains what is due, then keeps polling every POLL_INTERVAL_SECONDS only
+  while the next deadline falls inside this invocation. Timers due soon
+  fire within a few seconds; when nothing is due before the invocation
+  would end, it returns right away (a timer scheduled meanwhile waits for
+  the next invocation, at most a minute).
+- Inside the local API process: DEADLINE_WORKER=inline (docker-compose sets
+  it). Local WebSocket clients live in the uvicorn process, so broadcasts
+  only reach them from there.
+- Standalone process: `python deadline_worker.py`. Broadcasts go out through
+  API Gateway when WEBSOCKET_API_ENDPOINT is set; without it there are no
+  local clients in this process to notify.
+
+Usage:
+    # Run with docker-compose
+    docker-compose exec api python /app/deadline_worker.py --once
+
+    # Or run locally (if you have the right env vars)
+    cd api && python deadline_worker.py --interval 2
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime
+
+from db import SessionLocal
+from services.deadline_scheduler import (
+    BATCH_SIZE,
+    next_due_at,
+    process_due_deadlines,
+    send_notifications,
+)
+
+logger = logging.getLogger(__name__)
+
+
+POLL_INTERVAL_SECONDS = 5
+# Stop taking new batches this long before the Lambda timeout
+LAMBDA_SAFETY_SECONDS = 10
+
+
+def _process_batch(batch_size: int):
+    db = SessionLocal()
+    try:
+        return process_due_deadlines(db, batch_size)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def drain(batch_size: int = BATCH_SIZE, until: float = float("inf")) -> dict:
+    """Run batches until one comes back short (nothing else is due) or time runs out."""
+    totals = {"batches": 0, "claimed": 0, "done": 0, "rescheduled": 0, "failed": 0, "parked": 0, "notified": 0}
+    while True:
+        stats, notifications = _process_batch(batch_size)
+        stats["notified"] = send_notifications(notifications)
+        totals["batches"] += 1
+        for key, value in stats.items():
+            totals[key] += value
+        if stats["claimed"] < batch_size or time.monotonic() >= until:
+            return totals
+
+
+def _seconds_until_next_due() -> float:
+    """Seconds until the earliest queued deadline (0 if overdue, inf if none)"""
+    db = SessionLocal()
+    try:
+        due_at = next_due_at(db)
+    finally:
+        db.close()
+    if due_at is None:
+        return float("inf")
+    return max((due_at - datetime.utcnow()).total_seconds(), 0)
+
+
+def run_for(seconds: float, interval: float = POLL_INTERVAL_SECONDS, batch_size: int = BATCH_SIZE) -> dict:
+    """
+    Drain, sleep `interval`, repeat for up to `seconds` - but stop as soon as
+    nothing is queued to come due within the remaining time.
+    """
+    until = time.monotonic() + seconds
+    totals = {}
+    while True:
+        for key, value in drain(batch_size, until).items():
+            totals[key] = totals.get(key, 0) + value
+        if time.monotonic() + interval >= until:
+            return totals
+        if time.monotonic() + _seconds_until_next_due() >= until:
+            return totals
+        time.sleep(interval)
+
+
+def handler(event, context):
+    """Scheduled Lambda entry point."""
+    seconds = 0
+    if context is not None:
+        seconds = context.get_remaining_time_in_millis() / 1000 - LAMBDA_SAFETY_SECONDS
+    totals = run_for(max(seconds, 0))
+    logger.info(f"[Deadlines] {totals}")
+    return totals
+
+
+async def run_inline(interval: float = POLL_INTERVAL_SECONDS, batch_size: int = BATCH_SIZE) -> None:
+    """
+    Worker loop for the local API process (see main.py startup).
+
+    Batches run in a thread; broadcasts are sent from the event loop so the
+    local WebSocket manager can deliver them.
+    """
+    while True:
+        claimed = 0
+        try:
+            stats, notifications = await asyncio.to_thread(_process_batch, batch_size)
+            send_notifications(notifications)
+            claimed = stats["claimed"]
+        except Exception:
+            logger.exception("[Deadlines] Inline batch failed")
+        if claimed < batch_size:
+            await asyncio.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run due battle/duel/hunt deadlines")
+    parser.add_argument("--once", action="store_true", help="Drain what is due now and exit")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL_SECONDS, help="Seconds between polls")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Deadlines claimed per transaction")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.once:
+        print(f"⏰ {drain(args.batch_size)}")
+        return
+
+    print(f"⏰ Deadline worker polling every {args.interval}s (Ctrl+C to stop)")
+    try:
+        while True:
+            totals = drain(args.batch_size)
+            if totals["claimed"]:
+                print(f"⏰ {totals}")
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
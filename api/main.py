@@ -1,13 +1,16 @@
 """
 Kingdom Game API - Main application setup
 """
+import asyncio
 import logging
 import json
+import os
 from datetime import datetime, date
 from fastapi import FastAPI, Request, WebSocket, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from services.auth_service import decode_access_token
+from utils.etag import ConditionalGetMiddleware
 
 
 class ISO8601JSONEncoder(json.JSONEncoder):
@@ -188,15 +191,30 @@ async def startup_event():
         print("🌿 Foraging: /foraging (Scratch-ticket minigame)")
         print("🏰 Empire: /empire (Empire management & treasury)")
         print("🔌 WebSocket: /ws (Real-time updates)")
+        
+        # Local dev: run the deadline worker in this process so its
+        # broadcasts reach the in-memory WebSocket clients
+        if os.getenv("DEADLINE_WORKER", "").lower() == "inline":
+            from deadline_worker import run_inline
+            asyncio.create_task(run_inline())
+            print("⏰ Deadline worker: inline")
     except Exception as e:
         print(f"❌ Database initialization error: {e}")
         # Don't fail startup, tables might already exist
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    from osm_service import close_overpass_client
+    await close_overpass_client()
+
 # Don't initialize DB during import - let it happen on first request
 # This prevents cold start timeouts in Lambda VPC
 # Tables should already exist in production anyway
 
 
+# Body-hash ETag / 304 for endpoints the app polls - saves bandwidth only (see utils/etag.py)
+app.add_middleware(ConditionalGetMiddleware)
+
 # Enable CORS so iOS app can connect
 app.add_middleware(
     CORSMiddleware,
@@ -279,6 +297,17 @@ def websocket_stats():
     }
 
 
+@app.get("/db/stats")
+def database_pool_stats():
+    """Get DB connection pool and blocking worker pool statistics."""
+    from db import get_pool_stats
+    from utils.offload import blocking_pool_stats
+    return {
+        "pool": get_pool_stats(),
+        "blocking_pool": blocking_pool_stats(),
+    }
+
+
 # Health check
 @app.get("/")
 def root():
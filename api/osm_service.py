@@ -4,7 +4,11 @@ Ported from iOS OSMLoader.swift
 """
 import httpx
 import asyncio
-from typing import List, Dict, Optional, Tuple
+import copy
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import List, Dict, Optional, Tuple, Callable, Awaitable, Any
 from datetime import datetime
 import math
 
@@ -16,7 +20,186 @@ OVERPASS_ENDPOINTS = [
 ]
 
 
+# ============================================================
+# TRANSPORT - shared pooled client, pluggable backend
+# ============================================================
+
+# "http" = real Overpass endpoints, "fake" = offline grid world (services/fake_overpass.py)
+OVERPASS_BACKEND = os.getenv("OVERPASS_BACKEND", "http").lower()
+
+# Concurrent lookups within this many decimal places (~11m) share one Overpass call
+OVERPASS_COALESCE_PRECISION = 4
+
+# How long "not found" / "all endpoints failed" results are remembered
+OVERPASS_NEGATIVE_TTL_SECONDS = float(os.getenv("OVERPASS_NEGATIVE_TTL_SECONDS", "120"))
+
+
+class HttpOverpassBackend:
+    """Real Overpass over ONE pooled AsyncClient (keep-alive across requests)"""
+    
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        # A client is bound to the event loop it was created on (Lambda may start new loops)
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                headers={"User-Agent": "KingdomApp/1.0"}
+            )
+            self._loop = loop
+        return self._client
+    
+    async def post(self, endpoint: str, query: str, timeout: float) -> httpx.Response:
+        return await self._get_client().post(endpoint, data={"data": query}, timeout=timeout)
+    
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def _create_backend():
+    if OVERPASS_BACKEND == "fake":
+        from services.fake_overpass import FakeOverpassBackend
+        print("🧪 Using fake Overpass backend (OVERPASS_BACKEND=fake)")
+        return FakeOverpassBackend()
+    return HttpOverpassBackend()
+
+
+_backend = None
+
+
+def get_overpass_backend():
+    global _backend
+    if _backend is None:
+        _backend = _create_backend()
+    return _backend
+
+
+def set_overpass_backend(backend) -> None:
+    """Swap the backend (anything with async post(endpoint, query, timeout) -> response)"""
+    global _backend
+    _backend = backend
+    _negative_cache.clear()
+
+
+async def close_overpass_client() -> None:
+    if _backend is not None and hasattr(_backend, "close"):
+        await _backend.close()
+
+
+class _OverpassSession:
+    """Drop-in for the httpx client calls below, routed through the shared backend"""
+    
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+    
+    async def post(self, endpoint: str, data: Dict, headers: Optional[Dict] = None):
+        return await get_overpass_backend().post(endpoint, data["data"], self.timeout)
+
+
+@asynccontextmanager
+async def _overpass_session(timeout: float):
+    yield _OverpassSession(timeout)
+
+
+# ============================================================
+# COALESCING - single-flight per key + negative-result cache
+# ============================================================
+
+_in_flight: Dict[tuple, Tuple[Any, asyncio.Future]] = {}
+_negative_cache: Dict[tuple, float] = {}
+
+
+def _cell_key(kind: str, lat: float, lon: float) -> tuple:
+    return (kind, round(lat, OVERPASS_COALESCE_PRECISION), round(lon, OVERPASS_COALESCE_PRECISION))
+
+
+async def _coalesced(
+    key: tuple,
+    fetch: Callable[[], Awaitable[Any]],
+    is_negative: Callable[[Any], bool],
+    negative_result: Any
+) -> Any:
+    """
+    Run fetch() once per key no matter how many callers ask concurrently.
+    
+    Every caller gets its own deep copy (callers annotate the dicts they get back).
+    Negative results are remembered for OVERPASS_NEGATIVE_TTL_SECONDS so a
+    missing city doesn't send every request back to Overpass.
+    """
+    expires_at = _negative_cache.get(key)
+    if expires_at is not None:
+        if expires_at > time.monotonic():
+            return copy.deepcopy(negative_result)
+        _negative_cache.pop(key, None)
+    
+    loop = asyncio.get_running_loop()
+    in_flight = _in_flight.get(key)
+    if in_flight is not None and in_flight[0] is loop:
+        print(f"    🔗 Joining in-flight Overpass lookup {key}")
+        return copy.deepcopy(await asyncio.shield(in_flight[1]))
+    
+    task = loop.create_task(fetch())
+    _in_flight[key] = (loop, task)
+    
+    def _release(_):
+        if _in_flight.get(key, (None, None))[1] is task:
+            _in_flight.pop(key, None)
+    
+    # Shielded + released on completion: a cancelled caller doesn't cancel the other waiters
+    task.add_done_callback(_release)
+    result = await asyncio.shield(task)
+    
+    if is_negative(result):
+        _negative_cache[key] = time.monotonic() + OVERPASS_NEGATIVE_TTL_SECONDS
+    return copy.deepcopy(result)
+
+
 async def find_user_city_fast(lat: float, lon: float) -> Optional[Dict]:
+    """
+    FAST query to find what city the user is currently in.
+    Concurrent lookups for the same ~11m cell share one Overpass call.
+    """
+    return await _coalesced(
+        _cell_key("city", lat, lon),
+        lambda: _find_user_city_fast(lat, lon),
+        is_negative=lambda result: result is None,
+        negative_result=None
+    )
+
+
+async def fetch_nearby_city_candidates(lat: float, lon: float) -> Tuple[List[Dict], bool]:
+    """
+    Fetch candidate neighboring cities from OSM (see _fetch_nearby_city_candidates).
+    Concurrent lookups for the same ~11m cell share one Overpass cascade.
+    """
+    return await _coalesced(
+        _cell_key("candidates", lat, lon),
+        lambda: _fetch_nearby_city_candidates(lat, lon),
+        is_negative=lambda result: not result[0],
+        negative_result=([], False)
+    )
+
+
+async def fetch_city_boundary_by_id(osm_id: str, name: str = "Unknown") -> Optional[Dict]:
+    """
+    Fetch ACCURATE boundary geometry for ONE specific city by OSM ID.
+    Concurrent fetches of the same relation share one Overpass call.
+    """
+    return await _coalesced(
+        ("boundary", str(osm_id)),
+        lambda: _fetch_city_boundary_by_id(osm_id, name),
+        is_negative=lambda result: result is None,
+        negative_result=None
+    )
+
+
+
+async def _find_user_city_fast(lat: float, lon: float) -> Optional[Dict]:
     """
     FAST query to find what city the user is currently in.
     Cascading: try level 8 first, then 7, then 6.
@@ -34,7 +217,7 @@ async def find_user_city_fast(lat: float, lon: float) -> Optional[Dict]:
         
         for endpoint in OVERPASS_ENDPOINTS:
             try:
-                async with httpx.AsyncClient(timeout=15.0) as client:
+                async with _overpass_session(timeout=15.0) as client:
                     response = await client.post(
                         endpoint,
                         data={"data": query},
@@ -70,7 +253,7 @@ async def find_user_city_fast(lat: float, lon: float) -> Optional[Dict]:
     return None
 
 
-async def fetch_nearby_city_candidates(lat: float, lon: float) -> Tuple[List[Dict], bool]:
+async def _fetch_nearby_city_candidates(lat: float, lon: float) -> Tuple[List[Dict], bool]:
     """
     Fetch candidate neighboring cities from OSM. Returns UNFILTERED candidates.
     Filtering happens in city_service based on cached boundaries.
@@ -183,7 +366,7 @@ async def _fetch_neighbors_at_level(lat: float, lon: float, level: int) -> List[
     
     for endpoint in OVERPASS_ENDPOINTS:
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with _overpass_session(timeout=10.0) as client:
                 response = await client.post(
                     endpoint,
                     data={"data": query},
@@ -253,7 +436,7 @@ async def _fetch_cities_in_radius(lat: float, lon: float, level: int, radius_km:
     
     for endpoint in OVERPASS_ENDPOINTS:
         try:
-            async with httpx.AsyncClient(timeout=20.0) as client:
+            async with _overpass_session(timeout=20.0) as client:
                 response = await client.post(
                     endpoint,
                     data={"data": query},
@@ -307,7 +490,7 @@ async def _fetch_cities_in_radius(lat: float, lon: float, level: int, radius_km:
     return []
 
 
-async def fetch_city_boundary_by_id(osm_id: str, name: str = "Unknown") -> Optional[Dict]:
+async def _fetch_city_boundary_by_id(osm_id: str, name: str = "Unknown") -> Optional[Dict]:
     """
     Fetch ACCURATE boundary geometry for ONE specific city by OSM ID.
     Only call this for cities we don't have cached.
@@ -323,7 +506,7 @@ async def fetch_city_boundary_by_id(osm_id: str, name: str = "Unknown") -> Optio
     
     for endpoint in OVERPASS_ENDPOINTS:
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with _overpass_session(timeout=30.0) as client:
                 response = await client.post(
                     endpoint,
                     data={"data": query},
@@ -434,7 +617,7 @@ async def _execute_overpass_query(
 ) -> List[Dict]:
     """Execute Overpass API query and parse results"""
     
-    async with httpx.AsyncClient(timeout=35.0) as client:
+    async with _overpass_session(timeout=35.0) as client:
         response = await client.post(
             endpoint,
             data={"data": query},
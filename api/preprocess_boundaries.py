@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Boundary Preprocessing Pipeline
+
+Moves the CPU-heavy boundary geometry out of request handlers. Streams
+through city_boundaries in osm_id order and:
+1. geometry  - computes simplified_boundary_geojson and the bbox columns for
+               rows that are missing them (get_current_city used to backfill
+               these on first visit)
+2. adjacency - rebuilds the city_adjacency graph (edge distances to every
+               cached OSM candidate) that get_neighbor_cities filters with;
+               new boundaries are linked incrementally as they are cached
+
+Geometry runs in a process pool so a full pass uses every core. Progress is
+saved to a cursor file after each batch, so an interrupted run picks up at
+the last committed osm_id.
+
+Usage:
+    # Run with docker-compose
+    docker-compose exec api python /app/preprocess_boundaries.py
+
+    # Or run locally (if you have the right env vars)
+    cd api && python preprocess_boundaries.py --workers 8
+
+    # One phase only / start over
+    cd api && python preprocess_boundaries.py --phase adjacency --restart
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Tuple
+
+from db import SessionLocal, CityBoundary
+from services.boundary_cache import deferred_boundary_columns, load_boundaries
+from services.city_adjacency import candidate_sources, compute_edges, store_edge_distances
+from services.city_service import simplify_boundary, _boundary_bbox
+
+
+PHASES = ("geometry", "adjacency")
+
+
+# ============================================================
+# WORKERS (run in child processes - plain data in, plain data out)
+# ============================================================
+
+def _process_geometry(task: Tuple[str, List[List[float]], bool, bool]) -> dict:
+    osm_id, boundary, needs_simplified, needs_bbox = task
+    result = {"osm_id": osm_id}
+    if needs_simplified:
+        result["simplified"] = simplify_boundary(boundary)
+    if needs_bbox:
+        result["bbox"] = _boundary_bbox(boundary)
+    return result
+
+
+def _process_adjacency(task: Tuple[str, List[List[float]], Dict[str, str], Dict[str, List[List[float]]]]) -> dict:
+    osm_id, boundary, sources, neighbour_boundaries = task
+    return {"osm_id": osm_id, "edges": compute_edges(boundary, sources, neighbour_boundaries)}
+
+
+# ============================================================
+# CURSOR
+# ============================================================
+
+def _load_cursor(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_cursor(path: str, cursor: dict) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cursor, f)
+    os.replace(tmp_path, path)
+
+
+# ============================================================
+# PHASES
+# ============================================================
+
+def _next_batch(db, after: Optional[str], batch_size: int) -> List[CityBoundary]:
+    """Keyset pagination by osm_id - boundaries are loaded separately"""
+    query = db.query(CityBoundary).options(*deferred_boundary_columns())
+    if after is not None:
+        query = query.filter(CityBoundary.osm_id > after)
+    return query.order_by(CityBoundary.osm_id).limit(batch_size).all()
+
+
+def _run_geometry_batch(db, pool, cities: List[CityBoundary]) -> int:
+    boundaries = load_boundaries(db, cities)
+
+    tasks = []
+    for city in cities:
+        entry = boundaries.get(city.osm_id)
+        if not entry or not entry.point_count:
+            continue
+        needs_simplified = entry.simplified is None
+        needs_bbox = city.min_lat is None
+        if needs_simplified or needs_bbox:
+            tasks.append((city.osm_id, entry.coordinates(), needs_simplified, needs_bbox))
+
+    by_id = {city.osm_id: city for city in cities}
+    for result in pool.map(_process_geometry, tasks, chunksize=4):
+        city = by_id[result["osm_id"]]
+        if "simplified" in result:
+            city.simplified_boundary_geojson = {"type": "Polygon", "coordinates": result["simplified"]}
+        if "bbox" in result:
+            for column, value in result["bbox"].items():
+                setattr(city, column, value)
+    return len(tasks)
+
+
+def _run_adjacency_batch(db, pool, cities: List[CityBoundary]) -> int:
+    sources = {city.osm_id: candidate_sources(city.neighbor_ids) for city in cities}
+    neighbour_rows = db.query(CityBoundary).options(*deferred_boundary_columns()).filter(
+        CityBoundary.osm_id.in_({osm_id for ids in sources.values() for osm_id in ids})
+    ).all()
+    boundaries = load_boundaries(db, list(cities) + neighbour_rows)
+
+    tasks = []
+    for city in cities:
+        entry = boundaries.get(city.osm_id)
+        if not entry or not entry.point_count or not sources[city.osm_id]:
+            continue
+        neighbour_boundaries = {
+            osm_id: boundaries[osm_id].coordinates()
+            for osm_id in sources[city.osm_id]
+            if osm_id in boundaries and boundaries[osm_id].point_count
+        }
+        tasks.append((city.osm_id, entry.coordinates(), sources[city.osm_id], neighbour_boundaries))
+
+    for result in pool.map(_process_adjacency, tasks, chunksize=4):
+        store_edge_distances(db, result["osm_id"], result["edges"])
+    return len(tasks)
+
+
+def run_phase(phase: str, pool, batch_size: int, cursor: dict, cursor_path: str) -> None:
+    run_batch = _run_geometry_batch if phase == "geometry" else _run_adjacency_batch
+    after = cursor.get(phase)
+    if after:
+        print(f"↩️  Resuming {phase} after osm_id {after}")
+
+    processed = 0
+    updated = 0
+    start = time.perf_counter()
+    while True:
+        db = SessionLocal()
+        try:
+            cities = _next_batch(db, after, batch_size)
+            if not cities:
+                break
+            batch_last = cities[-1].osm_id  # read before commit expires the rows
+            updated += run_batch(db, pool, cities)
+            db.commit()
+        finally:
+            db.close()
+
+        processed += len(cities)
+        after = batch_last
+        cursor[phase] = after
+        _save_cursor(cursor_path, cursor)
+        print(f"   📦 {phase}: {processed} cities scanned, {updated} updated (cursor {after})")
+
+    cursor[phase] = "done"
+    _save_cursor(cursor_path, cursor)
+    print(f"✅ {phase} complete: {processed} cities, {updated} updated in {time.perf_counter() - start:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute boundary geometry and neighbour distances")
+    parser.add_argument("--phase", choices=PHASES + ("all",), default="all")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--cursor-file", default=".preprocess_boundaries_cursor.json")
+    parser.add_argument("--restart", action="store_true", help="Ignore the saved cursor")
+    args = parser.parse_args()
+
+    cursor = {} if args.restart else _load_cursor(args.cursor_file)
+    phases = PHASES if args.phase == "all" else (args.phase,)
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for phase in phases:
+            if cursor.get(phase) == "done":
+                print(f"⏭️  {phase} already complete (use --restart to run again)")
+                continue
+            # Geometry writes bump boundary_updated_at, so adjacency must run after it
+            run_phase(phase, pool, args.batch_size, cursor, args.cursor_file)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,7 +14,7 @@ from db.models.player_state import PlayerState
 from routers.auth import get_current_user
 from routers.actions.utils import log_activity
 from routers.store import add_books
-from routers.workshop import WEAPON_ITEM_IDS, ARMOR_ITEM_IDS
+from services.player_stats import get_stat_counters
 from schemas.achievements import (
     Achievement,
     AchievementTier,
@@ -74,7 +74,8 @@ CATEGORY_CONFIG = {
 def get_player_achievement_progress(user_id: int, db: Session) -> Dict[str, int]:
     """
     Calculate current progress for all achievement types.
-    OPTIMIZED: Single combined query for all scalar stats to minimize DB round trips.
+    Lifetime totals come from player_stat_counters (one row); live state and
+    the single-row stat tables share one combined query.
     """
     progress = {}
     
@@ -96,13 +97,16 @@ def get_player_achievement_progress(user_id: int, db: Session) -> Dict[str, int]
         progress["total_skill_points"] = total_skills
     
     # =========================================================================
-    # SINGLE COMBINED QUERY FOR ALL SCALAR STATS
+    # LIFETIME COUNTERS (one row, maintained where the events happen)
+    # =========================================================================
+    progress.update(get_stat_counters(db, user_id))
+    progress["checkins_completed"] = progress["total_checkins"]
+    
+    # =========================================================================
+    # LIVE STATE + SINGLE-ROW STAT TABLES
     # =========================================================================
     combined_query = text("""
         SELECT
-            -- Checkins
-            COALESCE((SELECT SUM(checkins_count) FROM user_kingdoms WHERE user_id = :user_id), 0) as total_checkins,
-            
             -- Reputation (in current kingdom)
             COALESCE((SELECT local_reputation FROM user_kingdoms uk 
                       JOIN player_state ps ON ps.user_id = uk.user_id 
@@ -111,33 +115,10 @@ def get_player_achievement_progress(user_id: int, db: Session) -> Dict[str, int]
             -- Friends (count accepted friendships)
             COALESCE((SELECT COUNT(*) FROM friends WHERE (user_id = :user_id OR friend_user_id = :user_id) AND status = 'accepted'), 0) as friends_made,
             
-            -- Foraging sessions
-            COALESCE((SELECT COUNT(*) FROM foraging_sessions WHERE user_id = :user_id AND status = 'collected'), 0) as foraging_completed,
-            
-            -- Merchant: Direct trades
-            COALESCE((SELECT COUNT(*) FROM trade_offers WHERE (sender_id = :user_id OR recipient_id = :user_id) AND status = 'accepted'), 0) as direct_trades,
-            
-            -- Merchant: Market trades  
-            COALESCE((SELECT COUNT(*) FROM market_transactions WHERE buyer_id = :user_id OR seller_id = :user_id), 0) as market_trades,
-            
-            -- Contract contributions (actions completed) - count from contract_contributions joined with unified_contracts
-            COALESCE((SELECT COUNT(*) FROM contract_contributions cc JOIN unified_contracts uc ON cc.contract_id = uc.id WHERE cc.user_id = :user_id AND uc.category = 'kingdom_building'), 0) as building_contracts,
-            COALESCE((SELECT COUNT(*) FROM contract_contributions cc JOIN unified_contracts uc ON cc.contract_id = uc.id WHERE cc.user_id = :user_id AND uc.category = 'personal_training'), 0) as training_contracts,
-            -- Crafting: count completed workshop contracts only
-            COALESCE((SELECT COUNT(*) FROM unified_contracts WHERE user_id = :user_id AND completed_at IS NOT NULL AND category = 'workshop_craft'), 0) as items_crafted,
-            COALESCE((SELECT COUNT(*) FROM unified_contracts WHERE user_id = :user_id AND completed_at IS NOT NULL AND category = 'workshop_craft' AND type = ANY(:weapon_ids)), 0) as weapons_crafted,
-            COALESCE((SELECT COUNT(*) FROM unified_contracts WHERE user_id = :user_id AND completed_at IS NOT NULL AND category = 'workshop_craft' AND type = ANY(:armor_ids)), 0) as armor_crafted,
-            COALESCE((SELECT COUNT(*) FROM unified_contracts WHERE user_id = :user_id AND completed_at IS NOT NULL AND category = 'workshop_craft' AND tier = 5), 0) as craft_tier_5_item,
-            
             -- Science stats
             COALESCE((SELECT experiments_completed FROM science_stats WHERE user_id = :user_id), 0) as experiments_completed,
             COALESCE((SELECT total_blueprints_earned FROM science_stats WHERE user_id = :user_id), 0) as blueprints_earned,
             
-            -- Gathering
-            COALESCE((SELECT SUM(amount_gathered) FROM daily_gathering WHERE user_id = :user_id AND resource_type = 'wood'), 0) as wood_gathered,
-            COALESCE((SELECT SUM(amount_gathered) FROM daily_gathering WHERE user_id = :user_id AND resource_type = 'iron'), 0) as iron_gathered,
-            COALESCE((SELECT SUM(amount_gathered) FROM daily_gathering WHERE user_id = :user_id AND resource_type = 'stone'), 0) as stone_gathered,
-            
             -- Fortification stats
             COALESCE((SELECT items_sacrificed FROM player_fortification_stats WHERE user_id = :user_id), 0) as items_sacrificed,
             COALESCE((SELECT CASE WHEN max_fortification_reached THEN 1 ELSE 0 END FROM player_fortification_stats WHERE user_id = :user_id), 0) as max_fortification,
@@ -146,9 +127,6 @@ def get_player_achievement_progress(user_id: int, db: Session) -> Dict[str, int]
             COALESCE((SELECT COUNT(*) FROM kingdoms WHERE ruler_id = :user_id), 0) as empire_size,
             COALESCE((SELECT SUM(total_income_collected) FROM kingdoms WHERE ruler_id = :user_id), 0) as treasury_collected,
             
-            -- Coup stats (from unified battles table)
-            COALESCE((SELECT COUNT(*) FROM battles WHERE initiator_id = :user_id AND type = 'coup'), 0) as coups_initiated,
-            
             -- Duel stats
             COALESCE((SELECT wins FROM duel_stats WHERE user_id = :user_id), 0) as duels_won,
             COALESCE((SELECT wins + losses FROM duel_stats WHERE user_id = :user_id), 0) as duels_fought,
@@ -168,35 +146,16 @@ def get_player_achievement_progress(user_id: int, db: Session) -> Dict[str, int]
             COALESCE((SELECT COUNT(DISTINCT kingdom_id) FROM properties WHERE owner_id = :user_id), 0) as kingdoms_with_properties
     """)
     
-    combined_result = db.execute(combined_query, {
-        "user_id": user_id,
-        "weapon_ids": WEAPON_ITEM_IDS,
-        "armor_ids": ARMOR_ITEM_IDS
-    }).first()
+    combined_result = db.execute(combined_query, {"user_id": user_id}).first()
     if combined_result:
-        progress["total_checkins"] = int(combined_result.total_checkins)
-        progress["checkins_completed"] = int(combined_result.total_checkins)
         progress["reputation_earned"] = int(combined_result.reputation_earned)
         progress["friends_made"] = int(combined_result.friends_made)
-        progress["foraging_completed"] = int(combined_result.foraging_completed)
-        progress["direct_trades"] = int(combined_result.direct_trades)
-        progress["market_trades"] = int(combined_result.market_trades)
-        progress["building_contracts"] = int(combined_result.building_contracts)
-        progress["training_contracts"] = int(combined_result.training_contracts)
-        progress["items_crafted"] = int(combined_result.items_crafted)
-        progress["weapons_crafted"] = int(combined_result.weapons_crafted)
-        progress["armor_crafted"] = int(combined_result.armor_crafted)
-        progress["craft_tier_5_item"] = int(combined_result.craft_tier_5_item)
         progress["experiments_completed"] = int(combined_result.experiments_completed)
         progress["blueprints_earned"] = int(combined_result.blueprints_earned)
-        progress["wood_gathered"] = int(combined_result.wood_gathered)
-        progress["iron_gathered"] = int(combined_result.iron_gathered)
-        progress["stone_gathered"] = int(combined_result.stone_gathered)
         progress["items_sacrificed"] = int(combined_result.items_sacrificed)
         progress["max_fortification"] = int(combined_result.max_fortification)
         progress["empire_size"] = int(combined_result.empire_size)
         progress["treasury_collected"] = int(combined_result.treasury_collected)
-        progress["coups_initiated"] = int(combined_result.coups_initiated)
         progress["duels_won"] = int(combined_result.duels_won)
         progress["duels_fought"] = int(combined_result.duels_fought)
         progress["operations_attempted"] = int(combined_result.operations_attempted)
@@ -206,71 +165,6 @@ def get_player_achievement_progress(user_id: int, db: Session) -> Dict[str, int]
         progress["kingdoms_visited"] = int(combined_result.kingdoms_visited)
         progress["kingdoms_with_properties"] = int(combined_result.kingdoms_with_properties)
     
-    # =========================================================================
-    # SECOND COMBINED QUERY: Battle + Garden + Kitchen (more complex aggregations)
-    # =========================================================================
-    complex_query = text("""
-        SELECT
-            -- Battle stats (requires JOIN)
-            COALESCE((
-                SELECT COUNT(DISTINCT bp.battle_id)
-                FROM battle_participants bp
-                JOIN battles b ON b.id = bp.battle_id
-                WHERE bp.user_id = :user_id AND b.type = 'invasion'
-            ), 0) as invasions_participated,
-            COALESCE((
-                SELECT COUNT(DISTINCT bp.battle_id)
-                FROM battle_participants bp
-                JOIN battles b ON b.id = bp.battle_id
-                WHERE bp.user_id = :user_id AND b.type = 'invasion' 
-                AND b.resolved_at IS NOT NULL AND b.attacker_victory = true AND bp.side = 'attackers'
-            ), 0) as invasions_won_attack,
-            COALESCE((
-                SELECT COUNT(DISTINCT bp.battle_id)
-                FROM battle_participants bp
-                JOIN battles b ON b.id = bp.battle_id
-                WHERE bp.user_id = :user_id AND b.type = 'invasion'
-                AND b.resolved_at IS NOT NULL AND b.attacker_victory = false AND bp.side = 'defenders'
-            ), 0) as invasions_won_defend,
-            
-            -- Coup stats (from unified battles table)
-            -- Coups won: either (attacked and won) OR (defended and won)
-            COALESCE((
-                SELECT COUNT(DISTINCT bp.battle_id)
-                FROM battle_participants bp
-                JOIN battles b ON b.id = bp.battle_id
-                WHERE bp.user_id = :user_id AND b.type = 'coup'
-                AND b.resolved_at IS NOT NULL 
-                AND ((b.attacker_victory = true AND bp.side = 'attackers') 
-                     OR (b.attacker_victory = false AND bp.side = 'defenders'))
-            ), 0) as coups_won,
-            
-            -- Garden stats
-            COALESCE((SELECT COUNT(*) FROM garden_history WHERE user_id = :user_id AND action = 'grown' AND plant_type IS NOT NULL), 0) as plants_grown,
-            COALESCE((SELECT COUNT(*) FROM garden_history WHERE user_id = :user_id AND action = 'grown' AND plant_type = 'flower'), 0) as flowers_grown,
-            COALESCE((SELECT COUNT(*) FROM garden_history WHERE user_id = :user_id AND action = 'grown' AND plant_type = 'flower' AND flower_rarity = 'rare'), 0) as rare_flowers_grown,
-            COALESCE((SELECT SUM(wheat_gained) FROM garden_history WHERE user_id = :user_id AND action = 'harvested'), 0) as wheat_harvested,
-            COALESCE((SELECT COUNT(*) FROM garden_history WHERE user_id = :user_id AND action = 'discarded' AND plant_type = 'weed'), 0) as weeds_cleared,
-            COALESCE((SELECT COUNT(DISTINCT flower_color) FROM garden_history WHERE user_id = :user_id AND action = 'grown' AND plant_type = 'flower' AND flower_color IS NOT NULL), 0) as flower_colors,
-            
-            -- Kitchen stats (bread baking)
-            COALESCE((SELECT COUNT(*) FROM kitchen_history WHERE user_id = :user_id AND action = 'baked'), 0) as bread_baked
-    """)
-    
-    complex_result = db.execute(complex_query, {"user_id": user_id}).first()
-    if complex_result:
-        progress["invasions_participated"] = int(complex_result.invasions_participated)
-        progress["invasions_won_attack"] = int(complex_result.invasions_won_attack)
-        progress["invasions_won_defend"] = int(complex_result.invasions_won_defend)
-        progress["coups_won"] = int(complex_result.coups_won)
-        progress["plants_grown"] = int(complex_result.plants_grown)
-        progress["flowers_grown"] = int(complex_result.flowers_grown)
-        progress["rare_flowers_grown"] = int(complex_result.rare_flowers_grown)
-        progress["wheat_harvested"] = int(complex_result.wheat_harvested)
-        progress["weeds_cleared"] = int(complex_result.weeds_cleared)
-        progress["flower_colors"] = int(complex_result.flower_colors)
-        progress["bread_baked"] = int(complex_result.bread_baked)
-    
     # =========================================================================
     # ITEMIZED QUERIES (need multiple rows - can't combine)
     # =========================================================================
@@ -4,12 +4,11 @@ Uses unified contract system with contract_contributions table
 """
 from fastapi import APIRouter, HTTPException, Depends, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from datetime import datetime, timedelta
 import random
 import math
 
-from db import get_db, User, PlayerState, Kingdom, Property, UnifiedContract, ContractContribution
+from db import get_db, User, PlayerState, Kingdom, Property, UnifiedContract
 from routers.auth import get_current_user
 from config import DEV_MODE
 from .utils import (
@@ -23,6 +22,7 @@ from .utils import (
 from .constants import WORK_BASE_COOLDOWN
 from .tax_utils import apply_kingdom_tax_with_bonus
 from routers.tiers import BUILDING_TYPES
+from services.contract_counters import record_contribution
 
 
 router = APIRouter()
@@ -156,9 +156,7 @@ def work_on_contract(
         set_cooldown(db, current_user.id, "work", cooldown_expires)
     
     # Count current actions
-    actions_completed = db.query(func.count(ContractContribution.id)).filter(
-        ContractContribution.contract_id == contract.id
-    ).scalar()
+    actions_completed = contract.actions_completed
     
     # If actions >= required but not complete, fix it so they can finish normally
     if actions_completed >= contract.actions_required:
@@ -179,12 +177,8 @@ def work_on_contract(
             "new_total": new_total
         })
     
-    # Add contribution
-    contribution = ContractContribution(
-        contract_id=contract.id,
-        user_id=current_user.id
-    )
-    db.add(contribution)
+    # Add contribution (bumps the contract's progress counters in this transaction)
+    contribution, new_actions_completed, user_contribution = record_contribution(db, contract, current_user.id)
     
     # Calculate reward - use the ruler-set action_reward
     # Note: Building skill provides cooldown reduction and refund chance, NOT gold bonus
@@ -201,7 +195,6 @@ def work_on_contract(
     state.gold += net_income
     contribution.gold_earned = net_income  # Store what they actually earned after taxes
     
-    new_actions_completed = actions_completed + 1
     is_complete = new_actions_completed >= contract.actions_required
     
     if is_complete:
@@ -272,12 +265,6 @@ def work_on_contract(
     
     progress_percent = int((new_actions_completed / contract.actions_required) * 100)
     
-    # Get user's contribution count
-    user_contribution = db.query(func.count(ContractContribution.id)).filter(
-        ContractContribution.contract_id == contract.id,
-        ContractContribution.user_id == current_user.id
-    ).scalar()
-    
     # Build message with resource consumption info
     building_name = contract.type.capitalize()
     if is_complete:
@@ -483,9 +470,7 @@ def work_on_property_upgrade(
         set_cooldown(db, current_user.id, "work", cooldown_expires)
     
     # Count current actions
-    actions_completed = db.query(func.count(ContractContribution.id)).filter(
-        ContractContribution.contract_id == contract.id
-    ).scalar()
+    actions_completed = contract.actions_completed
     
     if actions_completed >= contract.actions_required:
         raise HTTPException(
@@ -519,14 +504,9 @@ def work_on_property_upgrade(
             "new_total": new_total
         })
     
-    # Add contribution
-    contribution = ContractContribution(
-        contract_id=contract.id,
-        user_id=current_user.id
-    )
-    db.add(contribution)
+    # Add contribution (bumps the contract's progress counters in this transaction)
+    contribution, new_actions_completed, _ = record_contribution(db, contract, current_user.id)
     
-    new_actions_completed = actions_completed + 1
     is_complete = new_actions_completed >= contract.actions_required
     
     if is_complete:
@@ -4,15 +4,15 @@ Uses unified contract system and player_items table (no more JSONB!)
 """
 from fastapi import APIRouter, HTTPException, Depends, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from datetime import datetime, timedelta
 
-from db import get_db, User, Kingdom, UnifiedContract, ContractContribution, PlayerItem, Property
+from db import get_db, User, Kingdom, UnifiedContract, PlayerItem, Property
 from db.models.inventory import PlayerInventory
 from routers.auth import get_current_user
 from config import DEV_MODE
 from .utils import check_and_set_slot_cooldown_atomic, format_datetime_iso, calculate_cooldown, set_cooldown, check_and_deduct_food_cost, set_activity_status, log_activity
 from .constants import WORK_BASE_COOLDOWN, TRAINING_COOLDOWN
+from services.contract_counters import record_contribution
 
 
 router = APIRouter()
@@ -114,9 +114,7 @@ def get_crafting_contracts(
     
     result = []
     for contract in contracts:
-        actions_completed = db.query(func.count(ContractContribution.id)).filter(
-            ContractContribution.contract_id == contract.id
-        ).scalar()
+        actions_completed = contract.actions_completed
         
         result.append({
             "id": str(contract.id),
@@ -348,10 +346,7 @@ def work_on_craft(
             detail="Crafting contract already completed"
         )
     
-    # Count current actions
-    actions_completed = db.query(func.count(ContractContribution.id)).filter(
-        ContractContribution.contract_id == contract.id
-    ).scalar()
+    actions_completed = contract.actions_completed
     
     if actions_completed >= contract.actions_required:
         raise HTTPException(
@@ -361,18 +356,12 @@ def work_on_craft(
     
     # Add contribution
     xp_earned = 15
-    contribution = ContractContribution(
-        contract_id=contract.id,
-        user_id=current_user.id,
-        xp_earned=xp_earned
-    )
-    db.add(contribution)
+    _, new_actions_completed, _ = record_contribution(db, contract, current_user.id, xp_earned=xp_earned)
     
     # Cooldown already set atomically at the start of the function
     state.experience += xp_earned
     
     # Check if complete
-    new_actions_completed = actions_completed + 1
     is_complete = new_actions_completed >= contract.actions_required
     
     new_item = None
@@ -22,6 +22,7 @@ from db.models.inventory import PlayerInventory
 from routers.auth import get_current_user
 from systems.gathering import GatherManager, GatherConfig
 from services.building_permit_service import check_building_access
+from services.player_stats import bump_stats
 from .utils import log_activity, set_activity_status
 
 router = APIRouter()
@@ -148,6 +149,9 @@ def add_gathered_amount(db: Session, user_id: int, resource_type: str, amount: i
             amount_gathered=amount
         )
         db.add(record)
+    
+    if resource_type in ("wood", "iron", "stone"):
+        bump_stats(db, user_id, **{f"{resource_type}_gathered": amount})
 
 
 @router.post("/gather")
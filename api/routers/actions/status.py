@@ -3,17 +3,16 @@ Action status endpoint - Get cooldown status for all actions
 """
 from fastapi import APIRouter, HTTPException, Depends, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from datetime import datetime
 import json
 import math
 
-from db import get_db, User, PlayerState, Contract, UnifiedContract, ContractContribution, Kingdom, Property
+from db import get_db, User, PlayerState, Contract, Property
 from routers.auth import get_current_user
 from routers.property import get_tier_name  # Import tier name helper
 from routers.notifications.alliances import get_pending_alliance_requests
-from routers.alliances import are_empires_allied
-from .utils import check_cooldown_from_table, calculate_cooldown, calculate_training_cooldown, calculate_crafting_cooldown, check_global_action_cooldown_from_table, is_patrolling, format_datetime_iso, get_player_food_total
+from .utils import calculate_cooldown, calculate_training_cooldown, calculate_crafting_cooldown, format_datetime_iso
+from .status_prefetch import StatusPrefetch
 from .training import TRAINING_TYPES
 from routers.tiers import get_total_skill_points, SKILL_TYPES, calculate_food_cost, calculate_training_gold_per_action, calculate_training_actions, get_all_skill_values
 
@@ -42,24 +41,20 @@ from .scout import OUTCOMES_BY_TIER, OUTCOME_DESCRIPTIONS
 router = APIRouter()
 
 
-def get_training_contracts_for_status(db: Session, user_id: int, current_tax_rate: int = 0, is_ruler: bool = False, player_state = None) -> list:
+def get_training_contracts_for_status(prefetch: StatusPrefetch, current_tax_rate: int = 0, is_ruler: bool = False) -> list:
     """Get training contracts from unified_contracts table for status endpoint"""
     # Rulers now pay tax to fund their own treasury
     # effective_tax_rate = 0 if is_ruler else current_tax_rate
     effective_tax_rate = current_tax_rate
+    player_state = prefetch.state
     
-    contracts = db.query(UnifiedContract).filter(
-        UnifiedContract.user_id == user_id,
-        UnifiedContract.type.in_(TRAINING_TYPES),
-        UnifiedContract.completed_at.is_(None)  # Active contracts only
-    ).all()
+    # Active contracts only
+    contracts = prefetch.own_contracts(types=TRAINING_TYPES)
     
     result = []
     for contract in contracts:
         # Count contributions = actions completed
-        actions_completed = db.query(func.count(ContractContribution.id)).filter(
-            ContractContribution.contract_id == contract.id
-        ).scalar()
+        actions_completed = prefetch.actions_completed(contract.id)
         
         # Get gold per action for pay-per-action system
         gold_per_action = contract.gold_per_action or 0
@@ -86,19 +81,14 @@ def get_training_contracts_for_status(db: Session, user_id: int, current_tax_rat
     return result
 
 
-def get_crafting_contracts_for_status(db: Session, user_id: int) -> list:
+def get_crafting_contracts_for_status(prefetch: StatusPrefetch) -> list:
     """Get crafting contracts from unified_contracts table for status endpoint"""
-    contracts = db.query(UnifiedContract).filter(
-        UnifiedContract.user_id == user_id,
-        UnifiedContract.type.in_(CRAFTING_TYPES),
-        UnifiedContract.completed_at.is_(None)  # Active contracts only
-    ).all()
+    # Active contracts only
+    contracts = prefetch.own_contracts(types=CRAFTING_TYPES)
     
     result = []
     for contract in contracts:
-        actions_completed = db.query(func.count(ContractContribution.id)).filter(
-            ContractContribution.contract_id == contract.id
-        ).scalar()
+        actions_completed = prefetch.actions_completed(contract.id)
         
         result.append({
             "id": str(contract.id),
@@ -161,21 +151,16 @@ def get_catchup_contracts_for_status(db: Session, user_id: int, state: PlayerSta
     return result
 
 
-def get_workshop_contracts_for_status(db: Session, user_id: int) -> list:
+def get_workshop_contracts_for_status(prefetch: StatusPrefetch) -> list:
     """Get workshop crafting contracts from unified_contracts table for status endpoint"""
     from routers.workshop import CRAFTABLE_ITEMS
     
-    contracts = db.query(UnifiedContract).filter(
-        UnifiedContract.user_id == user_id,
-        UnifiedContract.category == "workshop_craft",
-        UnifiedContract.completed_at.is_(None)  # Active contracts only
-    ).all()
+    # Active contracts only
+    contracts = prefetch.own_contracts(category="workshop_craft")
     
     result = []
     for contract in contracts:
-        actions_completed = db.query(func.count(ContractContribution.id)).filter(
-            ContractContribution.contract_id == contract.id
-        ).scalar()
+        actions_completed = prefetch.actions_completed(contract.id)
         
         item_config = CRAFTABLE_ITEMS.get(contract.type, {})
         
@@ -200,43 +185,33 @@ def get_workshop_contracts_for_status(db: Session, user_id: int) -> list:
     return result
 
 
-def get_property_contracts_for_status(db: Session, user_id: int, player_state, current_tax_rate: int = 0, is_ruler: bool = False, current_kingdom_id: str = None) -> list:
+def get_property_contracts_for_status(prefetch: StatusPrefetch, current_tax_rate: int = 0, is_ruler: bool = False, current_kingdom_id: str = None) -> list:
     """Get property contracts from unified_contracts table for status endpoint.
     
     Only returns contracts for properties in the player's current kingdom.
     """
     from routers.tiers import get_property_per_action_costs
     from routers.resources import RESOURCES
-    from db.models.inventory import PlayerInventory
     from .action_config import ACTION_TYPES
     from .utils import calculate_cooldown
     
     # Rulers now pay tax to fund their own treasury
     # effective_tax_rate = 0 if is_ruler else current_tax_rate
     effective_tax_rate = current_tax_rate
+    player_state = prefetch.state
     
     # Get contracts for properties in current kingdom only
     if not current_kingdom_id:
         return []
     
-    contracts = db.query(UnifiedContract).filter(
-        UnifiedContract.user_id == user_id,
-        UnifiedContract.type == 'property',
-        UnifiedContract.kingdom_id == current_kingdom_id,
-        UnifiedContract.completed_at.is_(None)
-    ).all()
+    contracts = prefetch.own_contracts(types=('property',), kingdom_id=current_kingdom_id)
     
-    # Pre-fetch inventory items for resource checking (wood, etc.)
-    inventory_items = db.query(PlayerInventory).filter(
-        PlayerInventory.user_id == user_id
-    ).all()
-    inventory_map = {item.item_id: item.quantity for item in inventory_items}
+    # Inventory items for resource checking (wood, etc.)
+    inventory_map = prefetch.inventory_map
     
     result = []
     for contract in contracts:
-        actions_completed = db.query(func.count(ContractContribution.id)).filter(
-            ContractContribution.contract_id == contract.id
-        ).scalar()
+        actions_completed = prefetch.actions_completed(contract.id)
         
         # Parse target_id to get property_id
         target_parts = contract.target_id.split("|") if contract.target_id else []
@@ -328,8 +303,11 @@ def get_action_status(
             detail="Player state not found"
         )
     
+    # Load everything this screen reads in a fixed number of queries (see status_prefetch.py)
+    prefetch = StatusPrefetch(db, current_user, state)
+    
     # Get kingdom early - needed for tax rate in contracts and later for coup eligibility
-    kingdom = db.query(Kingdom).filter(Kingdom.id == state.current_kingdom_id).first() if state.current_kingdom_id else None
+    kingdom = prefetch.kingdom
     
     # Calculate cooldowns based on skills
     # Building skill reduces building/work cooldowns
@@ -342,28 +320,10 @@ def get_action_status(
     crafting_cooldown = calculate_crafting_cooldown(CRAFTING_BASE_COOLDOWN)
     
     # Count active patrollers in current kingdom
-    active_patrollers = 0
-    if state.current_kingdom_id:
-        from db.models.action_cooldown import ActionCooldown
-        # Get all users in this kingdom
-        user_ids_in_kingdom = db.query(PlayerState.user_id).filter(
-            PlayerState.current_kingdom_id == state.current_kingdom_id
-        ).all()
-        user_ids = [uid[0] for uid in user_ids_in_kingdom]
-        
-        # Count how many have active patrol cooldowns
-        active_patrollers = db.query(ActionCooldown).filter(
-            ActionCooldown.user_id.in_(user_ids),
-            ActionCooldown.action_type == 'patrol',
-            ActionCooldown.expires_at > datetime.utcnow()
-        ).count()
-    
-    # Pre-fetch inventory for resource affordability checks (used by both building and property contracts)
-    from db.models.inventory import PlayerInventory
-    inventory_items = db.query(PlayerInventory).filter(
-        PlayerInventory.user_id == current_user.id
-    ).all()
-    inventory_map = {item.item_id: item.quantity for item in inventory_items}
+    active_patrollers = prefetch.active_patrollers
+    
+    # Inventory for resource affordability checks (used by both building and property contracts)
+    inventory_map = prefetch.inventory_map
     
     # Get contracts for HOMETOWN kingdom (from UnifiedContract table)
     # Players can ONLY work on building contracts when physically IN their hometown
@@ -371,13 +331,11 @@ def get_action_status(
     is_ruler = kingdom and kingdom.ruler_id == current_user.id if kingdom else False
     
     if state.hometown_kingdom_id and state.current_kingdom_id == state.hometown_kingdom_id:
-        # Query UnifiedContract table (not old Contract table!)
-        contracts_query = db.query(UnifiedContract).filter(
-            UnifiedContract.kingdom_id == state.hometown_kingdom_id,
-            UnifiedContract.category == 'kingdom_building',  # Only building contracts
-            UnifiedContract.completed_at.is_(None)  # Active contracts only
-        ).all()
-        contracts = [contract_to_response(c, db, inventory_map) for c in contracts_query]
+        # Active building contracts from the UnifiedContract table (not old Contract table!)
+        contracts = [
+            contract_to_response(c, inventory_map=inventory_map, contributions=prefetch.contributions[c.id])
+            for c in prefetch.hometown_building_contracts()
+        ]
         
         # Add catchup contracts as building contracts (unique name: "Expand {building}")
         catchup_list = get_catchup_contracts_for_status(db, current_user.id, state)
@@ -468,26 +426,16 @@ def get_action_status(
         slot = get_action_slot(action_type)
         if slot not in slot_cooldowns:
             # Pass the SAME skill-adjusted cooldown that the action endpoint uses
-            cooldown_info = check_global_action_cooldown_from_table(
-                db,
-                current_user.id,
-                current_action_type=action_type,
-                cooldown_minutes=action_cooldown_map[action_type]
-            )
+            cooldown_info = prefetch.slot_cooldown(action_type, action_cooldown_map[action_type])
             # Add book eligibility to slot cooldown (frontend uses this to show book button)
             cooldown_info["can_use_book"] = slot in BOOK_ELIGIBLE_SLOTS
             slot_cooldowns[slot] = cooldown_info
     
     # Check for ACTIVE BATTLE cooldowns (separate from action slots)
     # Battle cooldowns are stored as 'battle_{battle_id}' in action_cooldowns table
-    from db.models.action_cooldown import ActionCooldown
     from systems.battle.config import BATTLE_ACTION_COOLDOWN_MINUTES
     
-    active_battle_cooldown = db.query(ActionCooldown).filter(
-        ActionCooldown.user_id == current_user.id,
-        ActionCooldown.action_type.like('battle_%'),
-        ActionCooldown.expires_at > datetime.utcnow()
-    ).order_by(ActionCooldown.expires_at.desc()).first()
+    active_battle_cooldown = prefetch.active_battle_cooldown()
     
     if active_battle_cooldown:
         remaining = (active_battle_cooldown.expires_at - datetime.utcnow()).total_seconds()
@@ -520,7 +468,7 @@ def get_action_status(
     # Rulers don't pay tax, so pass is_ruler flag
     # Only show contracts for properties in current kingdom
     is_ruler = kingdom and kingdom.ruler_id == current_user.id
-    property_contracts = get_property_contracts_for_status(db, current_user.id, state, kingdom.tax_rate if kingdom else 0, is_ruler, state.current_kingdom_id)
+    property_contracts = get_property_contracts_for_status(prefetch, kingdom.tax_rate if kingdom else 0, is_ruler, state.current_kingdom_id)
     
     # Calculate expected rewards (accounting for bonuses and taxes)
     # Farm reward - no gold bonus from building skill (it provides cooldown reduction instead)
@@ -533,7 +481,7 @@ def get_action_status(
     # Work reward (need to calculate per contract, so we'll add it to each contract object)
     
     # Get player's current food total (from inventory items with is_food=True)
-    player_food_total = get_player_food_total(db, current_user.id)
+    player_food_total = prefetch.food_total
     
     # Build list of ALL possible actions dynamically
     actions = {}
@@ -542,7 +490,7 @@ def get_action_status(
     # Food costs are calculated from cooldown: 0.5 food per minute
     work_food_cost = calculate_food_cost(work_cooldown)
     actions["work"] = {
-        **check_cooldown_from_table(db, current_user.id, "work", work_cooldown),
+        **prefetch.cooldown("work", work_cooldown),
         "cooldown_minutes": work_cooldown,
         "food_cost": work_food_cost,
         "can_afford_food": player_food_total >= work_food_cost,
@@ -560,11 +508,11 @@ def get_action_status(
     from .constants import PATROL_DURATION_MINUTES
     patrol_food_cost = calculate_food_cost(PATROL_DURATION_MINUTES)
     actions["patrol"] = {
-        **check_cooldown_from_table(db, current_user.id, "patrol", patrol_cooldown),
+        **prefetch.cooldown("patrol", patrol_cooldown),
         "cooldown_minutes": patrol_cooldown,
         "food_cost": patrol_food_cost,
         "can_afford_food": player_food_total >= patrol_food_cost,
-        "is_patrolling": is_patrolling(db, current_user.id),
+        "is_patrolling": prefetch.is_patrolling(),
         "active_patrollers": active_patrollers,
         "expected_reward": {
             "reputation": patrol_rep_reward
@@ -582,7 +530,7 @@ def get_action_status(
     
     farm_food_cost = calculate_food_cost(farm_cooldown)
     actions["farm"] = {
-        **check_cooldown_from_table(db, current_user.id, "farm", farm_cooldown),
+        **prefetch.cooldown("farm", farm_cooldown),
         "cooldown_minutes": farm_cooldown,
         "food_cost": farm_food_cost,
         "can_afford_food": player_food_total >= farm_food_cost,
@@ -604,7 +552,7 @@ def get_action_status(
     
     training_food_cost = calculate_food_cost(training_cooldown)
     actions["training"] = {
-        **check_cooldown_from_table(db, current_user.id, "training", training_cooldown),
+        **prefetch.cooldown("training", training_cooldown),
         "cooldown_minutes": training_cooldown,
         "food_cost": training_food_cost,
         "can_afford_food": player_food_total >= training_food_cost,
@@ -620,7 +568,7 @@ def get_action_status(
     
     crafting_food_cost = calculate_food_cost(crafting_cooldown)
     actions["crafting"] = {
-        **check_cooldown_from_table(db, current_user.id, "crafting", crafting_cooldown),
+        **prefetch.cooldown("crafting", crafting_cooldown),
         "cooldown_minutes": crafting_cooldown,
         "food_cost": crafting_food_cost,
         "can_afford_food": player_food_total >= crafting_food_cost,
@@ -651,26 +599,17 @@ def get_action_status(
     is_at_war = False  # At war with this kingdom
     
     if state.current_kingdom_id and state.hometown_kingdom_id and not is_home_kingdom:
-        home_kingdom = db.query(Kingdom).filter(Kingdom.id == state.hometown_kingdom_id).first()
-        current_kingdom = db.query(Kingdom).filter(Kingdom.id == state.current_kingdom_id).first()
+        home_kingdom = prefetch.hometown
+        current_kingdom = prefetch.kingdom
         if home_kingdom and current_kingdom:
             # Check alliance status
-            is_in_allied_territory = are_empires_allied(
-                db,
+            is_in_allied_territory = prefetch.empires_allied(
                 home_kingdom.empire_id or home_kingdom.id,
                 current_kingdom.empire_id or current_kingdom.id
             )
             
             # Check if we're at war with this kingdom (active invasion only, not coups)
-            from db.models import Battle
-            active_war = db.query(Battle).filter(
-                Battle.resolved_at.is_(None),
-                Battle.is_coup == False,  # Only invasions, not coups
-                (
-                    (Battle.kingdom_id == current_kingdom.id and Battle.attacking_from_kingdom_id == home_kingdom.id) |
-                    (Battle.kingdom_id == home_kingdom.id and Battle.attacking_from_kingdom_id == current_kingdom.id)
-                )
-            ).first()
+            active_war = prefetch.war_between(current_kingdom.id, home_kingdom.id)
             is_at_war = active_war is not None
     
     # Friendly = home OR same empire/allied (used for action filtering)
@@ -739,7 +678,7 @@ def get_action_status(
         description = f"{', '.join(current_outcomes)}" if current_outcomes else "Gather intel"
         
         actions["scout"] = {
-            **check_cooldown_from_table(db, current_user.id, "scout", SCOUT_COOLDOWN),
+            **prefetch.cooldown("scout", SCOUT_COOLDOWN),
             "cooldown_minutes": SCOUT_COOLDOWN,
             "food_cost": scout_food_cost,
             "can_afford_food": player_food_total >= scout_food_cost,
@@ -781,7 +720,6 @@ def get_action_status(
         COUP_REPUTATION_REQUIREMENT,
         _check_player_cooldown,
         _check_kingdom_cooldown,
-        _get_kingdom_reputation
     )
     
     can_stage_coup = False
@@ -804,11 +742,7 @@ def get_action_status(
         
         if not coup_ineligibility_reason:
             # Check for active battle (coup or invasion) first
-            from db.models import Battle
-            active_battle = db.query(Battle).filter(
-                Battle.kingdom_id == kingdom.id,
-                Battle.resolved_at.is_(None)
-            ).first()
+            active_battle = prefetch.battle_in(kingdom.id)
             
             if active_battle:
                 battle_type = "Coup" if active_battle.is_coup else "Invasion"
@@ -816,7 +750,7 @@ def get_action_status(
                 active_coup_id = active_battle.id
             else:
                 # Check player stats
-                kingdom_rep = _get_kingdom_reputation(db, current_user.id, kingdom.id)
+                kingdom_rep = prefetch.kingdom_reputation(kingdom.id)
                 
                 if state.leadership < COUP_LEADERSHIP_REQUIREMENT:
                     coup_ineligibility_reason = f"Need T{COUP_LEADERSHIP_REQUIREMENT} leadership (you have T{state.leadership})"
@@ -878,7 +812,7 @@ def get_action_status(
     invasion_ineligibility_reason = None
     
     # Get kingdoms this player rules
-    ruled_kingdoms = db.query(Kingdom).filter(Kingdom.ruler_id == current_user.id).all()
+    ruled_kingdoms = prefetch.ruled_kingdoms
     fiefs_ruled = [k.id for k in ruled_kingdoms]
     
     if state.current_kingdom_id and kingdom:
@@ -900,22 +834,16 @@ def get_action_status(
             
             if not invasion_ineligibility_reason:
                 # Check empire - can't invade own empire
-                my_kingdom_id = fiefs_ruled[0] if fiefs_ruled else None
-                if my_kingdom_id:
-                    my_kingdom = db.query(Kingdom).filter(Kingdom.id == my_kingdom_id).first()
-                    if my_kingdom:
-                        my_empire = my_kingdom.empire_id or my_kingdom.id
-                        target_empire = kingdom.empire_id or kingdom.id
-                        if my_empire == target_empire:
-                            invasion_ineligibility_reason = "Cannot invade your own empire"
+                my_kingdom = ruled_kingdoms[0] if ruled_kingdoms else None
+                if my_kingdom:
+                    my_empire = my_kingdom.empire_id or my_kingdom.id
+                    target_empire = kingdom.empire_id or kingdom.id
+                    if my_empire == target_empire:
+                        invasion_ineligibility_reason = "Cannot invade your own empire"
                 
                 # Check for active battle
                 if not invasion_ineligibility_reason:
-                    from db.models import Battle
-                    active_battle = db.query(Battle).filter(
-                        Battle.kingdom_id == kingdom.id,
-                        Battle.resolved_at.is_(None)
-                    ).first()
+                    active_battle = prefetch.battle_in(kingdom.id)
                     
                     if active_battle:
                         battle_type = "Coup" if active_battle.is_coup else "Invasion"
@@ -930,8 +858,7 @@ def get_action_status(
                 
                 # Check if user is already in an active battle
                 if not invasion_ineligibility_reason:
-                    from routers.battles import _check_user_in_active_battle
-                    in_battle, battle_msg = _check_user_in_active_battle(db, current_user.id)
+                    in_battle, battle_msg = prefetch.user_active_battle()
                     if in_battle:
                         invasion_ineligibility_reason = battle_msg
                 
@@ -989,16 +916,11 @@ def get_action_status(
                 my_empire_id = ruled_kingdoms[0].empire_id or ruled_kingdoms[0].id
                 target_empire_id = kingdom.empire_id or kingdom.id
                 
-                if are_empires_allied(db, my_empire_id, target_empire_id):
+                if prefetch.empires_allied(my_empire_id, target_empire_id):
                     alliance_ineligibility_reason = "Already allied with this empire"
                 else:
                     # Check for existing pending proposal
-                    from db import Alliance
-                    existing_proposal = db.query(Alliance).filter(
-                        Alliance.status == 'pending',
-                        ((Alliance.initiator_empire_id == my_empire_id) & (Alliance.target_empire_id == target_empire_id)) |
-                        ((Alliance.initiator_empire_id == target_empire_id) & (Alliance.target_empire_id == my_empire_id))
-                    ).first()
+                    existing_proposal = prefetch.pending_alliance(my_empire_id, target_empire_id)
                     
                     if existing_proposal:
                         alliance_ineligibility_reason = "Alliance proposal already pending"
@@ -1048,16 +970,8 @@ def get_action_status(
     # 1. Battles targeting the hometown (coups or invasions where we're defending)
     # 2. Battles where hometown is attacking (invasions we declared)
     if state.hometown_kingdom_id:
-        from db.models import Battle
-        from sqlalchemy import or_
-        
-        active_home_battle = db.query(Battle).filter(
-            or_(
-                Battle.kingdom_id == state.hometown_kingdom_id,  # We're being attacked
-                Battle.attacking_from_kingdom_id == state.hometown_kingdom_id  # We're attacking
-            ),
-            Battle.resolved_at.is_(None)
-        ).first()
+        # We're being attacked, or we're attacking
+        active_home_battle = prefetch.battle_involving(state.hometown_kingdom_id)
         
         if active_home_battle:
             # Check if user already pledged
@@ -1168,13 +1082,8 @@ def get_action_status(
     # SPECTATE BATTLE - Show when visiting a kingdom with an active battle you're not part of
     # This lets visitors watch battles in progress (read-only - can't fight)
     if state.current_kingdom_id and "view_coup" not in actions:
-        from db.models import Battle
-        
         # Check for active battle in the kingdom we're currently visiting
-        local_battle = db.query(Battle).filter(
-            Battle.kingdom_id == state.current_kingdom_id,
-            Battle.resolved_at.is_(None)
-        ).first()
+        local_battle = prefetch.battle_in(state.current_kingdom_id)
         
         if local_battle:
             attacker_ids = local_battle.get_attacker_ids()
@@ -1304,15 +1213,15 @@ def get_action_status(
         "crafting": actions["crafting"],
         "vault_heist": actions["scout"],  # Legacy - now "Covert Operation" (T5 unlocks heist outcome)
         "scout": actions["scout"],
-        "training_contracts": get_training_contracts_for_status(db, current_user.id, kingdom.tax_rate if kingdom else 0, is_ruler, state),
+        "training_contracts": get_training_contracts_for_status(prefetch, kingdom.tax_rate if kingdom else 0, is_ruler),
         "training_costs": _get_training_costs_dict(state),
-        "crafting_queue": get_crafting_contracts_for_status(db, current_user.id),
+        "crafting_queue": get_crafting_contracts_for_status(prefetch),
         "crafting_costs": crafting_costs,
-        "workshop_contracts": get_workshop_contracts_for_status(db, current_user.id),  # Workshop crafting
+        "workshop_contracts": get_workshop_contracts_for_status(prefetch),  # Workshop crafting
         "property_upgrade_contracts": property_contracts,
         "contracts": contracts,
         # Alliance requests for rulers - shows in ActionsView with accept/decline buttons
-        "pending_alliance_requests": get_pending_alliance_requests(db, current_user, state)
+        "pending_alliance_requests": get_pending_alliance_requests(db, current_user, state, ruled_kingdoms=prefetch.ruled_kingdoms)
     }
 
     # if current_user.id == 52:
@@ -0,0 +1,231 @@
+"""
+Per-request prefetch for GET /actions/status
+
+/actions/status is the screen the iOS client polls most. It used to fan out
+into 30+ independent queries (every cooldown check reloaded the player's
+action_cooldowns rows, every contract ran two COUNT queries, the patroller
+count loaded every user in the kingdom, ...).
+
+StatusPrefetch loads each table once, up front, and the status builder
+computes every slot, contract and cost from memory. Lookups only a few
+branches need (reputation, alliances, coup/invasion history) are loaded on
+first use and memoized.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import func, or_, and_, select
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+
+from db import User, PlayerState, Kingdom, UnifiedContract, ActionCooldown, Alliance
+from db.models import Battle, BattleParticipant
+from .utils import cooldown_status, slot_cooldown_status, get_food_items
+from services.contract_counters import get_contributor_counts
+
+
+class StatusPrefetch:
+    """Everything /actions/status reads, loaded once per request"""
+
+    def __init__(self, db: Session, user: User, state: PlayerState):
+        from db.models.inventory import PlayerInventory
+
+        self.db = db
+        self.user = user
+        self.state = state
+        self.now = datetime.utcnow()
+
+        # Current, hometown and ruled kingdoms in one query
+        kingdom_ids = {k for k in (state.current_kingdom_id, state.hometown_kingdom_id) if k}
+        kingdom_filter = Kingdom.ruler_id == user.id
+        if kingdom_ids:
+            kingdom_filter = or_(Kingdom.id.in_(kingdom_ids), kingdom_filter)
+        kingdoms = db.query(Kingdom).filter(kingdom_filter).all()
+        self.kingdoms: Dict[str, Kingdom] = {k.id: k for k in kingdoms}
+        self.ruled_kingdoms: List[Kingdom] = [k for k in kingdoms if k.ruler_id == user.id]
+        self.kingdom: Optional[Kingdom] = self.kingdoms.get(state.current_kingdom_id)
+        self.hometown: Optional[Kingdom] = self.kingdoms.get(state.hometown_kingdom_id)
+
+        # Every action_cooldowns row for the player (slot, per-action, patrol, battle, coup)
+        self.cooldowns: List[ActionCooldown] = db.query(ActionCooldown).filter(
+            ActionCooldown.user_id == user.id
+        ).all()
+        self.cooldowns_by_type: Dict[str, ActionCooldown] = {c.action_type: c for c in self.cooldowns}
+
+        # Inventory (resource affordability + food)
+        self.inventory_map: Dict[str, int] = {
+            item.item_id: item.quantity
+            for item in db.query(PlayerInventory).filter(PlayerInventory.user_id == user.id).all()
+        }
+        food_ids = set(get_food_items())
+        self.food_total = sum(qty for item_id, qty in self.inventory_map.items() if item_id in food_ids)
+
+        # Active contracts: the player's own, plus hometown building contracts when at home
+        contract_filter = UnifiedContract.user_id == user.id
+        self.in_hometown = bool(state.hometown_kingdom_id) and state.current_kingdom_id == state.hometown_kingdom_id
+        if self.in_hometown:
+            contract_filter = or_(contract_filter, and_(
+                UnifiedContract.kingdom_id == state.hometown_kingdom_id,
+                UnifiedContract.category == 'kingdom_building'
+            ))
+        self.contracts: List[UnifiedContract] = db.query(UnifiedContract).filter(
+            contract_filter,
+            UnifiedContract.completed_at.is_(None)
+        ).all()
+
+        self.contracts_by_id: Dict[int, UnifiedContract] = {c.id: c for c in self.contracts}
+
+        # Per-contributor action counts for those contracts (one counter-table query)
+        self.contributions: Dict[int, Dict[int, int]] = get_contributor_counts(db, list(self.contracts_by_id))
+
+        # Active patrollers in the current kingdom (one COUNT, no user ID list)
+        self.active_patrollers = 0
+        if state.current_kingdom_id:
+            self.active_patrollers = db.query(func.count(ActionCooldown.user_id)).join(
+                PlayerState, PlayerState.user_id == ActionCooldown.user_id
+            ).filter(
+                PlayerState.current_kingdom_id == state.current_kingdom_id,
+                ActionCooldown.action_type == 'patrol',
+                ActionCooldown.expires_at > self.now
+            ).scalar() or 0
+
+        # Unresolved battles touching any of our kingdoms, or that the player joined
+        # (participants are eager-loaded by the Battle mapper)
+        battle_filter = Battle.id.in_(
+            select(BattleParticipant.battle_id).where(BattleParticipant.user_id == user.id)
+        )
+        if self.kingdoms:
+            battle_filter = or_(
+                Battle.kingdom_id.in_(list(self.kingdoms)),
+                Battle.attacking_from_kingdom_id.in_(list(self.kingdoms)),
+                battle_filter
+            )
+        self.active_battles: List[Battle] = db.query(Battle).filter(
+            Battle.resolved_at.is_(None),
+            battle_filter
+        ).all()
+
+        # Memoized lazy lookups
+        self._alliances: Optional[List[Alliance]] = None
+        self._kingdom_reputation: Dict[str, int] = {}
+
+    # ===== Cooldowns =====
+
+    def cooldown(self, action_type: str, cooldown_minutes: float) -> dict:
+        """Same result as check_cooldown_from_table"""
+        return cooldown_status(self.cooldowns_by_type.get(action_type), cooldown_minutes, self.now)
+
+    def slot_cooldown(self, action_type: str, cooldown_minutes: float) -> dict:
+        """Same result as check_global_action_cooldown_from_table"""
+        return slot_cooldown_status(self.cooldowns, action_type, cooldown_minutes, self.now)
+
+    def is_patrolling(self) -> bool:
+        cooldown = self.cooldowns_by_type.get("patrol")
+        return bool(cooldown and cooldown.expires_at and cooldown.expires_at > self.now)
+
+    def active_battle_cooldown(self) -> Optional[ActionCooldown]:
+        """Latest-expiring unexpired 'battle_{id}' cooldown"""
+        active = [
+            c for c in self.cooldowns
+            if c.action_type.startswith("battle_") and c.expires_at and c.expires_at > self.now
+        ]
+        return max(active, key=lambda c: c.expires_at) if active else None
+
+    # ===== Contracts =====
+
+    def own_contracts(self, types=None, category: str = None, kingdom_id: str = None) -> List[UnifiedContract]:
+        return [
+            c for c in self.contracts
+            if c.user_id == self.user.id
+            and (types is None or c.type in types)
+            and (category is None or c.category == category)
+            and (kingdom_id is None or c.kingdom_id == kingdom_id)
+        ]
+
+    def hometown_building_contracts(self) -> List[UnifiedContract]:
+        if not self.in_hometown:
+            return []
+        return [
+            c for c in self.contracts
+            if c.kingdom_id == self.state.hometown_kingdom_id and c.category == 'kingdom_building'
+        ]
+
+    def actions_completed(self, contract_id: int) -> int:
+        contract = self.contracts_by_id.get(contract_id)
+        return (contract.actions_completed or 0) if contract else 0
+
+    # ===== Battles =====
+
+    def battle_in(self, kingdom_id: str) -> Optional[Battle]:
+        """Unresolved battle targeting kingdom_id"""
+        return next((b for b in self.active_battles if b.kingdom_id == kingdom_id), None)
+
+    def battle_involving(self, kingdom_id: str) -> Optional[Battle]:
+        """Unresolved battle where kingdom_id is the target or the attacker"""
+        return next((
+            b for b in self.active_battles
+            if b.kingdom_id == kingdom_id or b.attacking_from_kingdom_id == kingdom_id
+        ), None)
+
+    def war_between(self, kingdom_a: str, kingdom_b: str) -> Optional[Battle]:
+        """Unresolved invasion between two kingdoms (either direction)"""
+        return next((
+            b for b in self.active_battles
+            if not b.is_coup and (
+                (b.kingdom_id == kingdom_a and b.attacking_from_kingdom_id == kingdom_b) or
+                (b.kingdom_id == kingdom_b and b.attacking_from_kingdom_id == kingdom_a)
+            )
+        ), None)
+
+    def user_active_battle(self) -> Tuple[bool, str]:
+        """Same result as routers.battles._check_user_in_active_battle"""
+        for battle in self.active_battles:
+            attacker_ids = battle.get_attacker_ids()
+            defender_ids = battle.get_defender_ids()
+            if self.user.id not in attacker_ids and self.user.id not in defender_ids:
+                continue
+            battle_type = "coup" if battle.is_coup else "invasion"
+            kingdom = self.kingdoms.get(battle.kingdom_id) or \
+                self.db.query(Kingdom).filter(Kingdom.id == battle.kingdom_id).first()
+            kingdom_name = kingdom.name if kingdom else "a kingdom"
+            if self.user.id in attacker_ids:
+                return True, f"You are already attacking in a {battle_type} at {kingdom_name}. Finish that battle first."
+            return True, f"You are already defending in a {battle_type} at {kingdom_name}. Finish that battle first."
+        return False, ""
+
+    # ===== Lazy lookups =====
+
+    def _empire_alliances(self) -> List[Alliance]:
+        """Active and pending alliances involving any of our kingdoms' empires (one query, on first use)"""
+        if self._alliances is None:
+            empire_ids = {k.empire_id or k.id for k in self.kingdoms.values()}
+            self._alliances = self.db.query(Alliance).filter(
+                Alliance.status.in_(('active', 'pending')),
+                or_(Alliance.initiator_empire_id.in_(empire_ids), Alliance.target_empire_id.in_(empire_ids))
+            ).all() if empire_ids else []
+        return self._alliances
+
+    def _alliance_between(self, empire_a: str, empire_b: str, status: str) -> Optional[Alliance]:
+        for alliance in self._empire_alliances():
+            if alliance.status != status:
+                continue
+            if status == 'active' and not (alliance.expires_at and alliance.expires_at > self.now):
+                continue
+            if {alliance.initiator_empire_id, alliance.target_empire_id} == {empire_a, empire_b}:
+                return alliance
+        return None
+
+    def empires_allied(self, empire_a: str, empire_b: str) -> bool:
+        """Same result as routers.alliances.are_empires_allied"""
+        if not empire_a or not empire_b:
+            return False
+        if empire_a == empire_b:
+            return True
+        return self._alliance_between(empire_a, empire_b, 'active') is not None
+
+    def pending_alliance(self, empire_a: str, empire_b: str) -> Optional[Alliance]:
+        return self._alliance_between(empire_a, empire_b, 'pending')
+
+    def kingdom_reputation(self, kingdom_id: str) -> int:
+        if kingdom_id not in self._kingdom_reputation:
+            from routers.coups import _get_kingdom_reputation
+            self._kingdom_reputation[kingdom_id] = _get_kingdom_reputation(self.db, self.user.id, kingdom_id)
+        return self._kingdom_reputation[kingdom_id]
@@ -4,16 +4,16 @@ Uses unified contract system (no more JSONB!)
 """
 from fastapi import APIRouter, HTTPException, Depends, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from datetime import datetime, timedelta
 import random
 import math
 
-from db import get_db, User, Kingdom, UnifiedContract, ContractContribution
+from db import get_db, User, Kingdom, UnifiedContract
 from routers.auth import get_current_user
 from config import DEV_MODE
 from .utils import check_and_set_slot_cooldown_atomic, format_datetime_iso, calculate_cooldown, calculate_training_cooldown, set_cooldown, check_and_deduct_food_cost, set_activity_status, log_activity
 from .constants import WORK_BASE_COOLDOWN, TRAINING_COOLDOWN
+from services.contract_counters import record_contribution
 
 
 router = APIRouter()
@@ -145,10 +145,7 @@ def get_training_contracts(
     
     result = []
     for contract in contracts:
-        # Count contributions (= actions completed)
-        actions_completed = db.query(func.count(ContractContribution.id)).filter(
-            ContractContribution.contract_id == contract.id
-        ).scalar()
+        actions_completed = contract.actions_completed
         
         # Determine gold cost info
         gold_per_action = contract.gold_per_action or 0
@@ -384,10 +381,7 @@ def work_on_training(
         # DEV_MODE: still set cooldown for functionality, just skip the check
         set_cooldown(db, current_user.id, "training", cooldown_expires)
     
-    # Count current actions completed
-    actions_completed = db.query(func.count(ContractContribution.id)).filter(
-        ContractContribution.contract_id == contract.id
-    ).scalar()
+    actions_completed = contract.actions_completed
     
     if actions_completed >= contract.actions_required:
         raise HTTPException(
@@ -409,17 +403,11 @@ def work_on_training(
     
     # Add a contribution (= 1 action)
     xp_earned = 10
-    contribution = ContractContribution(
-        contract_id=contract.id,
-        user_id=current_user.id,
-        xp_earned=xp_earned
-    )
-    db.add(contribution)
+    _, new_actions_completed, _ = record_contribution(db, contract, current_user.id, xp_earned=xp_earned)
     
     state.experience += xp_earned
     
     # Check if training is now complete
-    new_actions_completed = actions_completed + 1
     is_complete = new_actions_completed >= contract.actions_required
     
     stat_name = None
@@ -3,7 +3,7 @@ Utility functions for actions system
 Uses action_cooldowns table instead of player_state columns
 """
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
 import math
 from .constants import (
@@ -15,6 +15,7 @@ from .constants import (
 )
 from db.models.activity_log import PlayerActivityLog
 from db import Kingdom, ActionCooldown, PlayerItem
+from services.activity_timeline import NO_DEDUP_TYPES, bump_last_activity, remember_activity, fan_out
 
 
 def format_datetime_iso(dt: datetime) -> str:
@@ -161,12 +162,15 @@ def check_and_set_cooldown_atomic(
 
 def check_cooldown_from_table(db: Session, user_id: int, action_type: str, cooldown_minutes: float) -> Dict:
     """Check if action is off cooldown using action_cooldowns table"""
-    cooldown = get_cooldown(db, user_id, action_type)
-    
+    return cooldown_status(get_cooldown(db, user_id, action_type), cooldown_minutes)
+
+
+def cooldown_status(cooldown: Optional[ActionCooldown], cooldown_minutes: float, now: datetime = None) -> Dict:
+    """Cooldown check for an already-loaded action_cooldowns row"""
     if not cooldown or not cooldown.last_performed:
         return {"ready": True, "seconds_remaining": 0}
     
-    elapsed = (datetime.utcnow() - cooldown.last_performed).total_seconds()
+    elapsed = ((now or datetime.utcnow()) - cooldown.last_performed).total_seconds()
     required = cooldown_minutes * 60
     
     if elapsed >= required:
@@ -211,18 +215,28 @@ def check_global_action_cooldown_from_table(
     (use calculate_cooldown() before calling). This same value is used for
     all actions in the slot since they share the cooldown.
     """
+    # Get all cooldowns for this user
+    cooldowns = db.query(ActionCooldown).filter(
+        ActionCooldown.user_id == user_id
+    ).all()
+    
+    return slot_cooldown_status(cooldowns, current_action_type, cooldown_minutes)
+
+
+def slot_cooldown_status(
+    cooldowns: List[ActionCooldown],
+    current_action_type: str,
+    cooldown_minutes: float,
+    now: datetime = None
+) -> Dict:
+    """Slot cooldown check over a user's already-loaded action_cooldowns rows"""
     from .action_config import get_action_slot
     
-    now = datetime.utcnow()
+    now = now or datetime.utcnow()
     
     # Get the slot for the action being attempted
     current_slot = get_action_slot(current_action_type)
     
-    # Get all cooldowns for this user
-    cooldowns = db.query(ActionCooldown).filter(
-        ActionCooldown.user_id == user_id
-    ).all()
-    
     max_remaining = 0
     blocking_action = None
     required_seconds = cooldown_minutes * 60
@@ -573,24 +587,16 @@ def log_activity(
     amount: Optional[int] = None,
     details: Optional[dict] = None,
     visibility: str = "friends"
-) -> PlayerActivityLog:
-    """Log an action to the activity feed. If the last row for this user is identical, increment repeat_count instead."""
+) -> Optional[PlayerActivityLog]:
+    """
+    Log an action to the activity feed. If the user's newest row is identical, increment
+    its repeat_count instead (returns None). New rows are flushed and fanned out to
+    friends' timelines (services/activity_timeline.py).
+    """
     
     # Check if last activity for this user is the same - if so, just increment
-    last_activity = db.query(PlayerActivityLog).filter(
-        PlayerActivityLog.user_id == user_id
-    ).order_by(PlayerActivityLog.id.desc()).first()
-    
-    if (last_activity 
-        and last_activity.action_type == action_type 
-        and last_activity.description == description
-        and action_type not in ('rare_loot', 'achievement')):
-        # Same action - increment count and update timestamp
-        last_activity.repeat_count += 1
-        last_activity.created_at = datetime.utcnow()
-        if amount:
-            last_activity.amount = (last_activity.amount or 0) + amount
-        return last_activity
+    if action_type not in NO_DEDUP_TYPES and bump_last_activity(db, user_id, action_type, description, amount):
+        return None
     
     # Different action - create new row
     kingdom_name = None
@@ -611,6 +617,9 @@ def log_activity(
         repeat_count=1
     )
     db.add(activity)
+    db.flush()
+    remember_activity(activity)
+    fan_out(db, activity)
     return activity
 
 
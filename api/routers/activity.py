@@ -3,7 +3,7 @@ Player Activity Feed - Aggregate activity from existing tables
 """
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, desc, text
+from sqlalchemy import or_, and_, desc
 from typing import List, Optional
 from datetime import datetime, timedelta
 
@@ -13,6 +13,8 @@ from db.models.activity_log import PlayerActivityLog
 from sqlalchemy import func
 from routers.auth import get_current_user
 from routers.tiers import PROPERTY_TIERS
+from services.player_hydrator import PlayerHydrator
+from services.activity_timeline import read_timeline
 from schemas.activity import ActivityLogEntry, PlayerActivityResponse
 
 
@@ -317,6 +319,45 @@ def _get_action_log_activities(db: Session, user_id: int, limit: int = 50, exclu
     return activities
 
 
+def _log_rows_with_authors(db: Session, rows: List[PlayerActivityLog]) -> List[ActivityLogEntry]:
+    """Feed entries for PlayerActivityLog rows, with author cards. Rows whose author is gone are skipped."""
+    # Author cards for the whole page in a handful of IN queries
+    authors = PlayerHydrator(db, [row.user_id for row in rows])
+    
+    activities = []
+    for row in rows:
+        uid = row.user_id
+        user = authors.user(uid)
+        user_state = authors.state(uid)
+        if not user or not user_state:
+            continue
+        
+        description = row.description
+        repeat_count = row.repeat_count if row.repeat_count else 1
+        if repeat_count > 1:
+            description = f"{description} x{repeat_count}"
+        
+        activities.append(ActivityLogEntry(
+            id=row.id,
+            user_id=uid,
+            action_type=row.action_type,
+            action_category=row.action_category,
+            description=description,
+            kingdom_id=row.kingdom_id,
+            kingdom_name=row.kingdom_name,
+            amount=row.amount,
+            details=row.details or {},
+            created_at=row.created_at,
+            repeat_count=repeat_count,
+            username=user.display_name,
+            display_name=user.display_name,
+            user_level=user_state.level,
+            subscriber_customization=authors.customization(uid)
+        ))
+    
+    return activities
+
+
 @router.get("/my-activities", response_model=PlayerActivityResponse)
 def get_my_activities(
     limit: int = 50,
@@ -388,10 +429,6 @@ def get_global_activities(
     
     after_id: return activities newer than this ID
     """
-    from routers.store import is_user_subscriber
-    from db.models import UserPreferences
-    from db.models.subscription import STYLE_PRESETS
-    
     query = db.query(PlayerActivityLog).order_by(desc(PlayerActivityLog.id))
     if after_id:
         query = query.filter(PlayerActivityLog.id > after_id)
@@ -401,72 +438,33 @@ def get_global_activities(
     if not rows:
         return PlayerActivityResponse(success=True, total=0, activities=[])
     
-    all_activities = []
-    for row in rows:
-        uid = row.user_id
-        
-        # Get user info
-        user = db.query(User).filter(User.id == uid).first()
-        user_state = db.query(PlayerState).filter(PlayerState.user_id == uid).first()
-        if not user or not user_state:
-            continue
-        
-        # Get subscriber customization
-        is_subscriber = is_user_subscriber(db, uid)
-        subscriber_customization_dict = None
-        
-        if is_subscriber:
-            prefs = db.query(UserPreferences).filter(UserPreferences.user_id == uid).first()
-            if prefs:
-                selected_title_dict = None
-                if prefs.selected_title_achievement_id:
-                    title_result = db.execute(text("""
-                        SELECT ad.id, ad.display_name, ad.icon
-                        FROM achievement_definitions ad
-                        WHERE ad.id = :achievement_id
-                    """), {"achievement_id": prefs.selected_title_achievement_id}).fetchone()
-                    if title_result:
-                        selected_title_dict = {"achievement_id": title_result[0], "display_name": title_result[1], "icon": title_result[2]}
-                
-                icon_style_dict = None
-                if prefs.icon_style and prefs.icon_style in STYLE_PRESETS:
-                    s = STYLE_PRESETS[prefs.icon_style]
-                    icon_style_dict = {"id": prefs.icon_style, "name": s["name"], "background_color": s["background"], "text_color": s["text"]}
-                
-                card_style_dict = None
-                if prefs.card_style and prefs.card_style in STYLE_PRESETS:
-                    s = STYLE_PRESETS[prefs.card_style]
-                    card_style_dict = {"id": prefs.card_style, "name": s["name"], "background_color": s["background"], "text_color": s["text"]}
-                
-                if icon_style_dict or card_style_dict or selected_title_dict:
-                    subscriber_customization_dict = {
-                        "icon_style": icon_style_dict,
-                        "card_style": card_style_dict,
-                        "selected_title": selected_title_dict
-                    }
-        
-        description = row.description
-        repeat_count = row.repeat_count if row.repeat_count else 1
-        if repeat_count > 1:
-            description = f"{description} x{repeat_count}"
-        
-        all_activities.append(ActivityLogEntry(
-            id=row.id,
-            user_id=uid,
-            action_type=row.action_type,
-            action_category=row.action_category,
-            description=description,
-            kingdom_id=row.kingdom_id,
-            kingdom_name=row.kingdom_name,
-            amount=row.amount,
-            details=row.details or {},
-            created_at=row.created_at,
-            repeat_count=repeat_count,
-            username=user.display_name,
-            display_name=user.display_name,
-            user_level=user_state.level,
-            subscriber_customization=subscriber_customization_dict
-        ))
+    all_activities = _log_rows_with_authors(db, rows)
+    
+    return PlayerActivityResponse(
+        success=True,
+        total=len(all_activities),
+        activities=all_activities
+    )
+
+
+@router.get("/timeline", response_model=PlayerActivityResponse)
+def get_timeline(
+    limit: int = 50,
+    after_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Friends' and my own logged activity, newest first.
+    Served from the per-user timeline inbox when ACTIVITY_TIMELINES is enabled.
+    
+    after_id: return activities newer than this ID (polling)
+    before_id: return activities older than this ID (next page)
+    """
+    limit = max(1, min(limit, 100))
+    rows = read_timeline(db, current_user.id, limit, after_id=after_id, before_id=before_id)
+    all_activities = _log_rows_with_authors(db, rows)
     
     return PlayerActivityResponse(
         success=True,
@@ -516,14 +514,12 @@ def get_friend_activities(
     # Collect activities from all users (friends + self)
     all_activities = []
     
+    authors = PlayerHydrator(db, all_user_ids)
+    
     for uid in all_user_ids:
-        # Get user info
-        the_user = db.query(User).filter(User.id == uid).first()
-        if not the_user:
-            continue
-        
-        user_state = db.query(PlayerState).filter(PlayerState.user_id == uid).first()
-        if not user_state:
+        the_user = authors.user(uid)
+        user_state = authors.state(uid)
+        if not the_user or not user_state:
             continue
         
         # Get activities from different sources
@@ -535,43 +531,7 @@ def get_friend_activities(
         user_activities.extend(_get_training_activities(db, uid, user_state, 10))
         user_activities.extend(_get_action_log_activities(db, uid, 20, exclude_types=["travel_fee"]))
         
-        # Add user info and subscriber customization to activities
-        from routers.store import is_user_subscriber
-        from db.models import UserPreferences
-        from db.models.subscription import STYLE_PRESETS
-        
-        is_subscriber = is_user_subscriber(db, uid)
-        subscriber_customization_dict = None
-        
-        if is_subscriber:
-            prefs = db.query(UserPreferences).filter(UserPreferences.user_id == uid).first()
-            if prefs:
-                selected_title_dict = None
-                if prefs.selected_title_achievement_id:
-                    title_result = db.execute(text("""
-                        SELECT ad.id, ad.display_name, ad.icon
-                        FROM achievement_definitions ad
-                        WHERE ad.id = :achievement_id
-                    """), {"achievement_id": prefs.selected_title_achievement_id}).fetchone()
-                    if title_result:
-                        selected_title_dict = {"achievement_id": title_result[0], "display_name": title_result[1], "icon": title_result[2]}
-                
-                icon_style_dict = None
-                if prefs.icon_style and prefs.icon_style in STYLE_PRESETS:
-                    s = STYLE_PRESETS[prefs.icon_style]
-                    icon_style_dict = {"id": prefs.icon_style, "name": s["name"], "background_color": s["background"], "text_color": s["text"]}
-                
-                card_style_dict = None
-                if prefs.card_style and prefs.card_style in STYLE_PRESETS:
-                    s = STYLE_PRESETS[prefs.card_style]
-                    card_style_dict = {"id": prefs.card_style, "name": s["name"], "background_color": s["background"], "text_color": s["text"]}
-                
-                if icon_style_dict or card_style_dict or selected_title_dict:
-                    subscriber_customization_dict = {
-                        "icon_style": icon_style_dict,
-                        "card_style": card_style_dict,
-                        "selected_title": selected_title_dict
-                    }
+        subscriber_customization_dict = authors.customization(uid)
         
         for activity in user_activities:
             activity.username = the_user.display_name
@@ -241,6 +241,32 @@ def get_active_alliances_for_empire(db: Session, empire_id: str) -> List[dict]:
         )
     ).order_by(Alliance.expires_at.asc()).all()
     
+    return describe_active_alliances(db, empire_id, alliances)
+
+
+def describe_active_alliances(db: Session, empire_id: str, alliances: List[Alliance]) -> List[dict]:
+    """
+    Build get_active_alliances_for_empire dicts from already-loaded alliances.
+    Looks up all allied kingdoms in ONE query.
+    """
+    other_empire_ids = [
+        a.target_empire_id if a.initiator_empire_id == empire_id else a.initiator_empire_id
+        for a in alliances
+    ]
+    
+    # Prefer the capital (kingdom.id == empire_id), else any kingdom in that empire
+    kingdoms_by_empire = {}
+    if other_empire_ids:
+        other_kingdoms = db.query(Kingdom).filter(
+            or_(Kingdom.empire_id.in_(other_empire_ids), Kingdom.id.in_(other_empire_ids))
+        ).all()
+        for kingdom in other_kingdoms:
+            if kingdom.id in other_empire_ids:
+                kingdoms_by_empire[kingdom.id] = kingdom
+        for kingdom in other_kingdoms:
+            if kingdom.empire_id in other_empire_ids:
+                kingdoms_by_empire.setdefault(kingdom.empire_id, kingdom)
+    
     result = []
     for alliance in alliances:
         # Determine which side is the "other" empire
@@ -252,9 +278,7 @@ def get_active_alliances_for_empire(db: Session, empire_id: str) -> List[dict]:
             other_ruler_name = alliance.initiator_ruler_name
         
         # Get the other kingdom's name
-        other_kingdom = db.query(Kingdom).filter(
-            or_(Kingdom.empire_id == other_empire_id, Kingdom.id == other_empire_id)
-        ).first()
+        other_kingdom = kingdoms_by_empire.get(other_empire_id)
         other_kingdom_name = other_kingdom.name if other_kingdom else other_empire_id
         other_kingdom_id = other_kingdom.id if other_kingdom else other_empire_id
         
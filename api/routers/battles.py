@@ -15,10 +15,12 @@ import random
 
 from db import get_db, User, PlayerState, Kingdom, ActionCooldown
 from db.models import (
-    Battle, BattleType, BattleParticipant, BattleTerritory,
+    Battle, BattleType, BattleParticipant, BattleSideStats, BattleTerritory,
     BattleAction, BattleInjury, FightSession, BattleRollOutcome,
     KingdomHistory, UserKingdom,
 )
+from services.player_stats import bump_stats, bump_stats_many
+from services.deadline_scheduler import schedule_deadline, BATTLE_PLEDGE_END, BATTLE_RESOLVE
 from systems.battle.config import (
     # Timing
     COUP_PLEDGE_DURATION_HOURS,
@@ -335,8 +337,8 @@ def _check_user_in_active_battle(db: Session, user_id: int) -> Tuple[bool, str]:
 
 # ===== Battle Phase Helpers =====
 
-def _ensure_territories_exist(db: Session, battle: Battle) -> List[BattleTerritory]:
-    """Create territories for a battle if they don't exist."""
+def _add_missing_territories(db: Session, battle: Battle) -> Tuple[List[BattleTerritory], bool]:
+    """Add any territories a battle is missing (caller commits). Returns (territories, added_any)."""
     territories = db.query(BattleTerritory).filter(
         BattleTerritory.battle_id == battle.id
     ).all()
@@ -345,7 +347,7 @@ def _ensure_territories_exist(db: Session, battle: Battle) -> List[BattleTerrito
     starting_bars = get_starting_bars_for_type(battle.type)
     
     if len(territories) == len(expected_territories):
-        return territories
+        return territories, False
     
     existing_names = {t.territory_name for t in territories}
     
@@ -359,6 +361,15 @@ def _ensure_territories_exist(db: Session, battle: Battle) -> List[BattleTerrito
             db.add(territory)
             territories.append(territory)
     
+    return territories, True
+
+
+def _ensure_territories_exist(db: Session, battle: Battle) -> List[BattleTerritory]:
+    """Create territories for a battle if they don't exist."""
+    territories, added = _add_missing_territories(db, battle)
+    if not added:
+        return territories
+    
     db.commit()
     
     return db.query(BattleTerritory).filter(
@@ -414,20 +425,131 @@ def _get_active_injury(db: Session, user_id: int, battle_id: int) -> Optional[Ba
     ).first()
 
 
-def _get_side_avg_stat(db: Session, player_ids: List[int], stat: str) -> float:
-    """Get average stat value for a side"""
-    if not player_ids:
-        return 1.0
+# Side stats older than this are rebuilt on read (training/debuffs change stats mid-battle)
+SIDE_STATS_MAX_AGE_SECONDS = 60
+
+_SIDE_STAT_COLUMNS = {
+    'attack_power': 'total_attack',
+    'defense_power': 'total_defense',
+    'leadership': 'total_leadership',
+}
+
+
+def _refresh_side_stats(db: Session, battle_id: int) -> dict:
+    """
+    Rebuild battle_side_stats for both sides with one GROUP BY side over
+    battle_participants JOIN player_state. Used when a row is stale or
+    missing and at resolution; joins use _add_to_side_stats.
     
-    total = 0
-    count = 0
-    for player_id in player_ids:
-        state = db.query(PlayerState).filter(PlayerState.user_id == player_id).first()
-        if state:
-            total += getattr(state, stat, 1)
-            count += 1
+    Returns: {"attackers": BattleSideStats, "defenders": BattleSideStats}
+    """
+    from sqlalchemy import text
+    
+    now = datetime.utcnow()
+    db.flush()  # pick up participants added through battle.add_participant
+    db.execute(text("""
+        INSERT INTO battle_side_stats (
+            battle_id, side, participant_count, stats_count,
+            total_attack, total_defense, total_leadership, refreshed_at
+        )
+        SELECT
+            :battle_id,
+            s.side,
+            COUNT(bp.user_id),
+            COUNT(ps.user_id),
+            COALESCE(SUM(
+                CASE WHEN ps.attack_debuff > 0 AND ps.debuff_expires_at > :now
+                     THEN GREATEST(1, ps.attack_power - ps.attack_debuff)
+                     ELSE ps.attack_power
+                END
+            ), 0),
+            COALESCE(SUM(ps.defense_power), 0),
+            COALESCE(SUM(ps.leadership), 0),
+            :now
+        FROM (VALUES ('attackers'), ('defenders')) AS s(side)
+        LEFT JOIN battle_participants bp ON bp.battle_id = :battle_id AND bp.side = s.side
+        LEFT JOIN player_state ps ON ps.user_id = bp.user_id
+        GROUP BY s.side
+        ON CONFLICT (battle_id, side) DO UPDATE SET
+            participant_count = excluded.participant_count,
+            stats_count = excluded.stats_count,
+            total_attack = excluded.total_attack,
+            total_defense = excluded.total_defense,
+            total_leadership = excluded.total_leadership,
+            refreshed_at = excluded.refreshed_at
+    """), {"battle_id": battle_id, "now": now})
+    
+    rows = db.query(BattleSideStats).populate_existing().filter(
+        BattleSideStats.battle_id == battle_id
+    ).all()
+    return {row.side: row for row in rows}
+
+
+def _add_to_side_stats(db: Session, battle_id: int, side: str, user_ids: List[int]) -> None:
+    """
+    Add newly pledged players to one side's totals with a single-row upsert
+    (participant_count + n, total_* + their stats). Atomic, so concurrent
+    joins don't overwrite each other. refreshed_at is left alone: the other
+    participants' stats are still as old as the last rebuild.
+    """
+    from sqlalchemy import text
+    
+    if not user_ids:
+        return
+    now = datetime.utcnow()
+    db.execute(text("""
+        INSERT INTO battle_side_stats (
+            battle_id, side, participant_count, stats_count,
+            total_attack, total_defense, total_leadership, refreshed_at
+        )
+        SELECT
+            :battle_id,
+            :side,
+            :participant_count,
+            COUNT(ps.user_id),
+            COALESCE(SUM(
+                CASE WHEN ps.attack_debuff > 0 AND ps.debuff_expires_at > :now
+                     THEN GREATEST(1, ps.attack_power - ps.attack_debuff)
+                     ELSE ps.attack_power
+                END
+            ), 0),
+            COALESCE(SUM(ps.defense_power), 0),
+            COALESCE(SUM(ps.leadership), 0),
+            :now
+        FROM player_state ps
+        WHERE ps.user_id = ANY(:user_ids)
+        ON CONFLICT (battle_id, side) DO UPDATE SET
+            participant_count = battle_side_stats.participant_count + excluded.participant_count,
+            stats_count = battle_side_stats.stats_count + excluded.stats_count,
+            total_attack = battle_side_stats.total_attack + excluded.total_attack,
+            total_defense = battle_side_stats.total_defense + excluded.total_defense,
+            total_leadership = battle_side_stats.total_leadership + excluded.total_leadership
+    """), {
+        "battle_id": battle_id,
+        "side": side,
+        "participant_count": len(user_ids),
+        "user_ids": list(user_ids),
+        "now": now,
+    })
+
+
+def _get_side_stats(db: Session, battle_id: int, side: str) -> BattleSideStats:
+    """Aggregates for one side - one row read, rebuilt if missing or stale."""
+    row = db.query(BattleSideStats).filter(
+        BattleSideStats.battle_id == battle_id,
+        BattleSideStats.side == side
+    ).first()
     
-    return total / count if count > 0 else 1.0
+    max_age = timedelta(seconds=SIDE_STATS_MAX_AGE_SECONDS)
+    if row is None or row.refreshed_at < datetime.utcnow() - max_age:
+        row = _refresh_side_stats(db, battle_id)[side]
+    return row
+
+
+def _get_side_avg_stat(db: Session, battle_id: int, side: str, stat: str) -> float:
+    """Get average stat value for a side"""
+    side_stats = _get_side_stats(db, battle_id, side)
+    return side_stats.avg(getattr(side_stats, _SIDE_STAT_COLUMNS[stat]))
 
 
 def _perform_roll(attack: int, enemy_avg_defense: float) -> Tuple[float, str]:
@@ -708,48 +830,19 @@ def _try_resolve_battle(db: Session, battle_id: int, winner_side: str) -> bool:
 
 
 def _calculate_combat_strength(
-    db: Session,
-    player_ids: List[int],
-    kingdom_id: str,
+    side_stats: BattleSideStats,
     include_wall_defense: bool = False,
     wall_level: int = 0
-) -> Tuple[int, int, List[BattleParticipantSchema]]:
-    """Calculate total attack and defense power for a list of players."""
-    total_attack = 0
-    total_defense = 0
-    participants = []
-    
-    for player_id in player_ids:
-        user = db.query(User).filter(User.id == player_id).first()
-        if not user:
-            continue
-        
-        state = _get_player_state(db, user)
-        kingdom_rep = _get_kingdom_reputation(db, user.id, kingdom_id)
-        
-        attack_power = state.attack_power
-        if state.attack_debuff and state.debuff_expires_at:
-            if datetime.utcnow() < state.debuff_expires_at:
-                attack_power = max(1, attack_power - state.attack_debuff)
-        
-        total_attack += attack_power
-        total_defense += state.defense_power
-        
-        participants.append(BattleParticipantSchema(
-            player_id=player_id,
-            player_name=user.display_name,
-            kingdom_reputation=kingdom_rep,
-            attack_power=attack_power,
-            defense_power=state.defense_power,
-            leadership=state.leadership,
-            level=state.level
-        ))
+) -> Tuple[int, int]:
+    """Total attack and defense power for one side of a battle."""
+    total_attack = side_stats.total_attack
+    total_defense = side_stats.total_defense
     
     # Add wall defense for invasions
     if include_wall_defense:
         total_defense += calculate_wall_defense(wall_level)
     
-    return total_attack, total_defense, participants
+    return total_attack, total_defense
 
 
 # ===== Resolution Helpers =====
@@ -1001,6 +1094,29 @@ def _apply_battle_outcome_bulk(
     }
 
 
+def _record_battle_stats(
+    db: Session,
+    battle: Battle,
+    attacker_ids: List[int],
+    defender_ids: List[int],
+    attacker_victory: bool
+) -> None:
+    """Bump participants' lifetime achievement counters for a resolved battle"""
+    winner_ids = set(attacker_ids if attacker_victory else defender_ids)
+    deltas = {}
+    for user_id in set(attacker_ids) | set(defender_ids):
+        won = int(user_id in winner_ids)
+        if battle.is_invasion:
+            deltas[user_id] = {
+                "invasions_participated": 1,
+                "invasions_won_attack": won if attacker_victory else 0,
+                "invasions_won_defend": 0 if attacker_victory else won,
+            }
+        else:
+            deltas[user_id] = {"coups_won": won}
+    bump_stats_many(db, deltas)
+
+
 def _apply_battle_resolution_effects(db: Session, battle: Battle, winner_side: str) -> None:
     """
     Apply battle resolution effects AFTER the battle has been atomically resolved.
@@ -1013,6 +1129,8 @@ def _apply_battle_resolution_effects(db: Session, battle: Battle, winner_side: s
     
     This is called ONLY after _atomic_check_and_resolve_battle succeeds,
     so we know we're the Lambda that won the resolution race.
+    
+    Does not commit - the caller commits together with the resolution.
     """
     from db.models.kingdom_event import KingdomEvent
     from sqlalchemy import text
@@ -1029,12 +1147,11 @@ def _apply_battle_resolution_effects(db: Session, battle: Battle, winner_side: s
     attacker_ids = battle.get_attacker_ids()
     defender_ids = battle.get_defender_ids()
     
-    # Calculate strength for record-keeping only
-    attacker_attack, _, _ = _calculate_combat_strength(
-        db, attacker_ids, battle.kingdom_id
-    )
-    _, defender_defense, _ = _calculate_combat_strength(
-        db, defender_ids, battle.kingdom_id,
+    # Calculate strength for record-keeping only (fresh totals, one aggregate query)
+    side_stats = _refresh_side_stats(db, battle.id)
+    attacker_attack, _ = _calculate_combat_strength(side_stats["attackers"])
+    _, defender_defense = _calculate_combat_strength(
+        side_stats["defenders"],
         include_wall_defense=battle.is_invasion,
         wall_level=wall_level
     )
@@ -1057,6 +1174,7 @@ def _apply_battle_resolution_effects(db: Session, battle: Battle, winner_side: s
     
     # Use bulk SQL operations - handles 10k+ participants efficiently
     _apply_battle_outcome_bulk(db, battle, kingdom, attacker_ids, defender_ids, attacker_victory)
+    _record_battle_stats(db, battle, attacker_ids, defender_ids, attacker_victory)
     
     battle_type_name = "Coup" if battle.is_coup else "Invasion"
     if attacker_victory:
@@ -1072,8 +1190,6 @@ def _apply_battle_resolution_effects(db: Session, battle: Battle, winner_side: s
         description=description
     )
     db.add(event)
-    
-    db.commit()
 
 
 def _resolve_battle_victory(db: Session, battle: Battle, winner_side: str) -> bool:
@@ -1090,6 +1206,7 @@ def _resolve_battle_victory(db: Session, battle: Battle, winner_side: str) -> bo
     
     # Apply effects
     _apply_battle_resolution_effects(db, battle, winner_side)
+    db.commit()
     return True
 
 
@@ -1358,14 +1475,18 @@ def initiate_coup(
     )
     
     db.add(battle)
+    bump_stats(db, current_user.id, coups_initiated=1)
     db.commit()
     db.refresh(battle)
     
     # Add initiator as attacker
     battle.add_attacker(current_user.id)
+    _add_to_side_stats(db, battle.id, "attackers", [current_user.id])
     # Auto-add ruler as defender
     if kingdom.ruler_id:
         battle.add_defender(kingdom.ruler_id)
+        _add_to_side_stats(db, battle.id, "defenders", [kingdom.ruler_id])
+    schedule_deadline(db, BATTLE_PLEDGE_END, battle.id, battle.pledge_end_time)
     db.commit()
     
     # Log activity: "Declared Coup against X"
@@ -1482,9 +1603,12 @@ def declare_invasion(
     db.refresh(battle)
     
     battle.add_attacker(current_user.id)
+    _add_to_side_stats(db, battle.id, "attackers", [current_user.id])
     # Auto-add ruler as defender
     if target_kingdom.ruler_id:
         battle.add_defender(target_kingdom.ruler_id)
+        _add_to_side_stats(db, battle.id, "defenders", [target_kingdom.ruler_id])
+    schedule_deadline(db, BATTLE_PLEDGE_END, battle.id, battle.pledge_end_time)
     db.commit()
     
     # Log activity: "Declared Invasion against X"
@@ -1585,6 +1709,7 @@ def join_battle(
     else:
         battle.add_defender(current_user.id)
     
+    _add_to_side_stats(db, battle.id, request.side, [current_user.id])
     db.commit()
     db.refresh(battle)
     
@@ -1821,10 +1946,10 @@ def start_fight_session(
     
     if current_user.id in attacker_ids:
         user_side = "attackers"
-        enemy_ids = defender_ids
+        enemy_side = "defenders"
     elif current_user.id in defender_ids:
         user_side = "defenders"
-        enemy_ids = attacker_ids
+        enemy_side = "attackers"
     else:
         raise HTTPException(status_code=400, detail="You haven't joined this battle")
     
@@ -1896,7 +2021,7 @@ def start_fight_session(
     attack_power = state.attack_power or 0
     max_rolls = calculate_max_rolls(attack_power)
     
-    enemy_defense = _get_side_avg_stat(db, enemy_ids, 'defense_power')
+    enemy_defense = _get_side_avg_stat(db, battle_id, enemy_side, 'defense_power')
     miss_pct, hit_pct, injure_pct = calculate_roll_chances(attack_power, enemy_defense)
     
     session = FightSession(
@@ -2061,13 +2186,9 @@ def resolve_fight_session(
     push_amount = 0.0
     
     if best_outcome != "miss":
-        if session.side == "attackers":
-            side_ids = battle.get_attacker_ids()
-        else:
-            side_ids = battle.get_defender_ids()
-        
-        side_size = len(side_ids)
-        avg_leadership = _get_side_avg_stat(db, side_ids, 'leadership')
+        side_stats = _get_side_stats(db, battle_id, session.side)
+        side_size = side_stats.participant_count
+        avg_leadership = side_stats.avg(side_stats.total_leadership)
         base_push = calculate_push_per_hit(side_size, avg_leadership)
         
         if best_outcome == "injure":
@@ -2127,6 +2248,11 @@ def resolve_fight_session(
     if battle_won:
         # We won the resolution race - apply effects (rewards, events, ruler change)
         _apply_battle_resolution_effects(db, battle, winner_side)
+    elif push_result["captured_by"]:
+        # Two captures committing at the same time can each count only their
+        # own and both miss the threshold - let the deadline worker recount
+        # once this commits.
+        schedule_deadline(db, BATTLE_RESOLVE, battle.id, datetime.utcnow())
     
     # Save session data before deleting
     session_rolls = session.rolls or []
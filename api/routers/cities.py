@@ -5,6 +5,9 @@ FAST LOADING - TWO ENDPOINTS:
 - GET /cities/current - ONLY the city user is in (< 2s) - UNBLOCKS FRONTEND
 - GET /cities/neighbors - Neighbor cities (returns immediately, fetches boundaries in background)
 - GET /cities/{osm_id}/boundary - Lazy-load single boundary
+
+Handlers are async (Overpass calls are awaited); every database/geometry
+step runs in the bounded blocking pool (utils/offload.run_sync).
 """
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
@@ -15,6 +18,7 @@ from db.models import User
 from schemas import CityBoundaryResponse, BoundaryResponse
 from services import city_service
 from routers.auth import get_current_user_optional
+from utils.offload import run_sync
 
 
 router = APIRouter(prefix="/cities", tags=["cities"])
@@ -77,7 +81,7 @@ async def get_neighbor_cities(
 @router.get("/stats", response_model=dict)
 async def get_city_stats(db: Session = Depends(get_db)):
     """Get cache statistics"""
-    return city_service.get_city_stats(db)
+    return await run_sync(city_service.get_city_stats, db)
 
 
 @router.get("/{osm_id}/boundary", response_model=BoundaryResponse)
@@ -124,7 +128,7 @@ async def get_city_boundaries_batch(
 @router.get("/{osm_id}", response_model=CityBoundaryResponse)
 async def get_city_by_id(osm_id: str, db: Session = Depends(get_db)):
     """Get a specific city from cache by its OSM ID"""
-    city = city_service.get_city_by_id(db, osm_id)
+    city = await run_sync(city_service.get_city_by_id, db, osm_id)
     
     if not city:
         raise HTTPException(status_code=404, detail=f"City {osm_id} not found in cache")
@@ -9,13 +9,14 @@ from datetime import datetime
 from typing import List, Optional
 import math
 
-from db import get_db, User, PlayerState, Kingdom, UnifiedContract, ContractContribution
+from db import get_db, User, PlayerState, Kingdom, UnifiedContract, ContractContribution, ContractContributorCount
 from db.models.kingdom_event import KingdomEvent
 from routers.auth import get_current_user
 from routers.tiers import BUILDING_TYPES, check_building_prerequisites
 from config import DEV_MODE
 from schemas.contract import ContractCreate
 from websocket.broadcast import notify_kingdom, KingdomEvents
+from services.contract_counters import get_contributor_counts
 
 
 router = APIRouter(prefix="/contracts", tags=["contracts"])
@@ -28,32 +29,21 @@ from services.kingdom_service import (
 )
 
 
-def contract_to_response(contract: UnifiedContract, db: Session = None, inventory_map: dict = None) -> dict:
+def contract_to_response(contract: UnifiedContract, db: Session = None, inventory_map: dict = None, contributions: dict = None) -> dict:
     """Convert UnifiedContract to response dict.
     
     Args:
         contract: The contract to convert
-        db: Database session for querying contributions
+        db: Database session for loading per-user contribution counts
         inventory_map: Optional dict of {item_id: quantity} for checking affordability
+        contributions: Optional pre-loaded {user_id: actions} for this contract (skips the query)
     """
-    # Count contributions
-    actions_completed = 0
-    action_contributions = {}
-    
-    if db:
-        actions_completed = db.query(func.count(ContractContribution.id)).filter(
-            ContractContribution.contract_id == contract.id
-        ).scalar()
-        
-        # Get per-user contribution counts
-        contrib_counts = db.query(
-            ContractContribution.user_id,
-            func.count(ContractContribution.id)
-        ).filter(
-            ContractContribution.contract_id == contract.id
-        ).group_by(ContractContribution.user_id).all()
-        
-        action_contributions = {str(user_id): count for user_id, count in contrib_counts}
+    # Progress comes from the counters (services/contract_counters.py)
+    actions_completed = contract.actions_completed or 0
+    
+    if contributions is None and db:
+        contributions = get_contributor_counts(db, [contract.id])[contract.id]
+    action_contributions = {str(user_id): count for user_id, count in (contributions or {}).items()}
     
     # Get building benefit information from tiers.py
     building_benefit = None
@@ -137,7 +127,8 @@ def list_contracts(
         query = query.filter(UnifiedContract.kingdom_id == kingdom_id)
     
     contracts = query.order_by(UnifiedContract.created_at.desc()).offset(skip).limit(limit).all()
-    return [contract_to_response(c, db) for c in contracts]
+    contributions = get_contributor_counts(db, [c.id for c in contracts])
+    return [contract_to_response(c, contributions=contributions[c.id]) for c in contracts]
 
 
 @router.get("/my")
@@ -147,18 +138,17 @@ def get_my_contracts(
 ):
     """Get contracts where current user has contributed"""
     # Find contracts where user has contributions
-    contributed_contract_ids = db.query(ContractContribution.contract_id).filter(
-        ContractContribution.user_id == current_user.id
-    ).distinct().subquery()
-    
-    # Only show active (not completed) contracts
-    contracts = db.query(UnifiedContract).filter(
-        UnifiedContract.id.in_(contributed_contract_ids),
+    contracts = db.query(UnifiedContract).join(
+        ContractContributorCount,
+        ContractContributorCount.contract_id == UnifiedContract.id
+    ).filter(
+        ContractContributorCount.user_id == current_user.id,
         UnifiedContract.category == 'kingdom_building',
-        UnifiedContract.completed_at.is_(None)
+        UnifiedContract.completed_at.is_(None)  # Only show active (not completed) contracts
     ).all()
     
-    return [contract_to_response(c, db) for c in contracts]
+    contributions = get_contributor_counts(db, [c.id for c in contracts])
+    return [contract_to_response(c, contributions=contributions[c.id]) for c in contracts]
 
 
 @router.get("/{contract_id}")
@@ -356,10 +346,7 @@ def complete_contract(
             detail="Contract is already completed"
         )
     
-    # Count actions completed from ContractContribution table
-    actions_completed = db.query(func.count(ContractContribution.id)).filter(
-        ContractContribution.contract_id == contract.id
-    ).scalar()
+    actions_completed = contract.actions_completed
     
     if actions_completed < contract.actions_required:
         raise HTTPException(
@@ -382,8 +369,8 @@ def complete_contract(
     db.commit()
     
     # Get contributor count
-    contributor_count = db.query(func.count(func.distinct(ContractContribution.user_id))).filter(
-        ContractContribution.contract_id == contract.id
+    contributor_count = db.query(func.count(ContractContributorCount.user_id)).filter(
+        ContractContributorCount.contract_id == contract.id
     ).scalar()
     
     # Get display name for message
@@ -428,7 +415,7 @@ def cancel_contract(
             detail="Cannot cancel completed contract"
         )
     
-    # Delete the contract and all contributions
+    # Delete the contract and all contributions (contributor counts cascade)
     db.query(ContractContribution).filter(
         ContractContribution.contract_id == contract.id
     ).delete()
@@ -26,6 +26,7 @@ from db.models.player_state import PlayerState
 from db.models.foraging_session import ForagingSession as ForagingSessionDB
 from routers.auth import get_current_user
 from routers.actions.utils import log_activity, set_activity_status
+from services.player_stats import bump_stats
 from systems.foraging.foraging_manager import ForagingManager
 from systems.foraging.config import GRID_SIZE, MAX_REVEALS, MATCHES_TO_WIN, BUSH_DISPLAY, GRID_CONFIG, ROUND1_WIN_CONFIG, ROUND2_WIN_CONFIG
 from systems.hunting.config import MEAT_MARKET_VALUE
@@ -358,6 +359,7 @@ def collect_rewards(
     # Mark session as collected
     db_session.status = 'collected'
     db_session.collected_at = datetime.utcnow()
+    bump_stats(db, player_id, foraging_completed=1)
     
     # Clear activity status
     state = db.query(PlayerState).filter(PlayerState.user_id == player_id).first()
@@ -1,12 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_, func, desc, text
-from typing import List
+from typing import List, Optional
 from datetime import datetime, timedelta
 
 from db.base import get_db
-from db.models import User, Friend, PlayerState, UserPreferences
-from db.models.subscription import STYLE_PRESETS
+from db.models import User, Friend, PlayerState
 from schemas.friend import (
     FriendRequest,
     FriendResponse,
@@ -17,7 +16,13 @@ from schemas.friend import (
 )
 from routers.auth import get_current_user
 from routers.actions.utils import format_datetime_iso, get_activity_icon_color
-from routers.store import is_user_subscriber
+from services.player_hydrator import PlayerHydrator
+from services.activity_timeline import (
+    ACTIVITY_TIMELINES_ENABLED,
+    read_timeline,
+    on_friendship_accepted,
+    on_friendship_removed
+)
 
 
 router = APIRouter(prefix="/friends", tags=["friends"])
@@ -188,18 +193,24 @@ def _convert_to_friend_activity(activity) -> dict:
     }
 
 
-def _get_friend_response(db: Session, friendship: Friend, current_user_id: int) -> FriendResponse:
-    """Convert Friend model to FriendResponse with activity data"""
+def _get_friend_response(db: Session, friendship: Friend, current_user_id: int, authors: Optional[PlayerHydrator] = None) -> FriendResponse:
+    """
+    Convert Friend model to FriendResponse with activity data.
+    Pass a PlayerHydrator preloaded with every friend when building a list.
+    """
     # Determine which user is the friend
     friend_user_id = friendship.friend_user_id if friendship.user_id == current_user_id else friendship.user_id
     
+    if authors is None:
+        authors = PlayerHydrator(db, [friend_user_id])
+    
     # Get friend's user info
-    friend_user = db.query(User).filter(User.id == friend_user_id).first()
+    friend_user = authors.user(friend_user_id)
     if not friend_user:
         raise HTTPException(status_code=404, detail="Friend user not found")
     
     # Get friend's player state for activity
-    friend_state = db.query(PlayerState).filter(PlayerState.user_id == friend_user_id).first()
+    friend_state = authors.state(friend_user_id)
     
     # Check if online (active in last 10 minutes) using User.last_login
     is_online = False
@@ -227,42 +238,7 @@ def _get_friend_response(db: Session, friendship: Friend, current_user_id: int)
                 current_kingdom_name = kingdom.name
     
     # Get subscriber customization (server-driven) if accepted
-    subscriber_customization_dict = None
-    if friendship.status == 'accepted':
-        from routers.store import is_user_subscriber
-        from db.models import UserPreferences
-        from db.models.subscription import STYLE_PRESETS
-        from sqlalchemy import text
-        
-        if is_user_subscriber(db, friend_user_id):
-            prefs = db.query(UserPreferences).filter(UserPreferences.user_id == friend_user_id).first()
-            if prefs:
-                selected_title_dict = None
-                if prefs.selected_title_achievement_id:
-                    title_result = db.execute(text("""
-                        SELECT id, display_name, icon
-                        FROM achievement_definitions
-                        WHERE id = :achievement_id
-                    """), {"achievement_id": prefs.selected_title_achievement_id}).fetchone()
-                    if title_result:
-                        selected_title_dict = {"achievement_id": title_result.id, "display_name": title_result.display_name, "icon": title_result.icon or "star.fill"}
-                
-                icon_style_dict = None
-                if prefs.icon_style and prefs.icon_style in STYLE_PRESETS:
-                    s = STYLE_PRESETS[prefs.icon_style]
-                    icon_style_dict = {"id": prefs.icon_style, "name": s["name"], "background_color": s["background"], "text_color": s["text"]}
-                
-                card_style_dict = None
-                if prefs.card_style and prefs.card_style in STYLE_PRESETS:
-                    s = STYLE_PRESETS[prefs.card_style]
-                    card_style_dict = {"id": prefs.card_style, "name": s["name"], "background_color": s["background"], "text_color": s["text"]}
-                
-                if icon_style_dict or card_style_dict or selected_title_dict:
-                    subscriber_customization_dict = {
-                        "icon_style": icon_style_dict,
-                        "card_style": card_style_dict,
-                        "selected_title": selected_title_dict
-                    }
+    subscriber_customization_dict = authors.customization(friend_user_id) if friendship.status == 'accepted' else None
     
     return FriendResponse(
         id=friendship.id,
@@ -303,12 +279,18 @@ def list_friends(
         )
     ).all()
     
+    # Batch load every friend's card (a handful of IN queries instead of ~5 per friend)
+    authors = PlayerHydrator(db, [
+        f.friend_user_id if f.user_id == user_id else f.user_id
+        for f in friendships
+    ])
+    
     friends = []
     pending_received = []
     pending_sent = []
     
     for friendship in friendships:
-        friend_response = _get_friend_response(db, friendship, user_id)
+        friend_response = _get_friend_response(db, friendship, user_id, authors)
         
         if friendship.status == 'accepted':
             friends.append(friend_response)
@@ -361,22 +343,14 @@ def get_friends_dashboard(
         fid = f.friend_user_id if f.user_id == user_id else f.user_id
         all_friend_user_ids.append(fid)
     
-    # Batch load all users, states, and kingdoms (3 queries instead of 4N)
-    users_by_id = {}
-    states_by_user_id = {}
+    # Batch load all users, states and subscriber customization (shared with the
+    # activity feed below), then kingdoms
+    authors = PlayerHydrator(db, all_friend_user_ids)
     kingdoms_by_id = {}
     
     if all_friend_user_ids:
-        # Load users (has last_login for online status)
-        users = db.query(User).filter(User.id.in_(all_friend_user_ids)).all()
-        users_by_id = {u.id: u for u in users}
-        
-        # Load player states
-        states = db.query(PlayerState).filter(PlayerState.user_id.in_(all_friend_user_ids)).all()
-        states_by_user_id = {s.user_id: s for s in states}
-        
         # Load kingdoms for states that have current_kingdom_id
-        kingdom_ids = [s.current_kingdom_id for s in states if s.current_kingdom_id]
+        kingdom_ids = [s.current_kingdom_id for s in authors.states.values() if s.current_kingdom_id]
         if kingdom_ids:
             from db.models import Kingdom
             kingdoms = db.query(Kingdom).filter(Kingdom.id.in_(kingdom_ids)).all()
@@ -388,11 +362,11 @@ def get_friends_dashboard(
     
     for friendship in friendships:
         friend_user_id = friendship.friend_user_id if friendship.user_id == user_id else friendship.user_id
-        friend_user = users_by_id.get(friend_user_id)
+        friend_user = authors.user(friend_user_id)
         if not friend_user:
             continue
         
-        friend_state = states_by_user_id.get(friend_user_id)
+        friend_state = authors.state(friend_user_id)
         
         # Check online status from User.last_login (updated on every app load)
         is_online = False
@@ -432,7 +406,8 @@ def get_friends_dashboard(
             current_kingdom_id=friend_state.current_kingdom_id if friend_state and friendship.status == 'accepted' else None,
             current_kingdom_name=current_kingdom_name,
             last_seen=last_seen if friendship.status == 'accepted' else None,
-            activity=activity_dict if friendship.status == 'accepted' else None
+            activity=activity_dict if friendship.status == 'accepted' else None,
+            subscriber_customization=authors.customization(friend_user_id) if friendship.status == 'accepted' else None
         )
         
         if friendship.status == 'accepted':
@@ -543,78 +518,72 @@ def get_friends_dashboard(
             friend_id = friendship.friend_user_id if friendship.user_id == user_id else friendship.user_id
             friend_ids.append(friend_id)
     
-    # Include self
-    all_user_ids = friend_ids + [user_id]
-    
-    # Group consecutive duplicates per user in SQL (except rare drops)
-    user_ids_str = ",".join(str(uid) for uid in all_user_ids)
     cutoff = datetime.utcnow() - timedelta(days=7)
     
-    sql = text(f"""
-        WITH ordered_logs AS (
-            SELECT *,
-                LAG(action_type) OVER (PARTITION BY user_id ORDER BY created_at DESC) as prev_action_type,
-                LAG(description) OVER (PARTITION BY user_id ORDER BY created_at DESC) as prev_description
-            FROM player_activity_log
-            WHERE user_id IN ({user_ids_str})
-              AND created_at >= :cutoff
-              AND action_type NOT IN ('travel_fee')
-        ),
-        grouped AS (
-            SELECT *,
-                CASE 
-                    WHEN action_type IN ('rare_loot', 'achievement', 'science_discovery') THEN 1
-                    WHEN prev_action_type IS NULL 
-                         OR action_type != prev_action_type 
-                         OR description != prev_description THEN 1
-                    ELSE 0
-                END as is_group_start
-            FROM ordered_logs
-        ),
-        with_groups AS (
-            SELECT *,
-                SUM(is_group_start) OVER (PARTITION BY user_id ORDER BY created_at DESC) as group_id
-            FROM grouped
-        )
-        SELECT 
-            MIN(id) as id,
-            user_id,
-            action_type,
-            action_category,
-            (array_agg(description ORDER BY created_at DESC))[1] as description,
-            kingdom_id,
-            kingdom_name,
-            SUM(COALESCE(amount, 0)) as amount,
-            (array_agg(visibility ORDER BY created_at DESC))[1] as visibility,
-            MAX(created_at) as created_at,
-            COUNT(*) as repeat_count,
-            (array_agg(details ORDER BY created_at DESC))[1] as details
-        FROM with_groups
-        GROUP BY group_id, user_id, action_type, action_category, kingdom_id, kingdom_name
-        ORDER BY created_at DESC
-        LIMIT 50
-    """)
-    
-    activity_rows = db.execute(sql, {"cutoff": cutoff}).fetchall()
-    
-    # Batch load user info
-    activity_user_ids = list(set(row.user_id for row in activity_rows))
-    users_map = {}
-    states_map = {}
-    prefs_map = {}
-    if activity_user_ids:
-        users = db.query(User).filter(User.id.in_(activity_user_ids)).all()
-        users_map = {u.id: u for u in users}
-        states = db.query(PlayerState).filter(PlayerState.user_id.in_(activity_user_ids)).all()
-        states_map = {s.user_id: s for s in states}
-        prefs_list = db.query(UserPreferences).filter(UserPreferences.user_id.in_(activity_user_ids)).all()
-        prefs_map = {p.user_id: p for p in prefs_list}
+    if ACTIVITY_TIMELINES_ENABLED:
+        # Fan-out-on-write inbox: one range scan, repeats already folded into repeat_count
+        activity_rows = [row for row in read_timeline(db, user_id, 50) if row.created_at >= cutoff]
+    else:
+        # Include self
+        all_user_ids = friend_ids + [user_id]
+    
+        # Group consecutive duplicates per user in SQL (except rare drops)
+        user_ids_str = ",".join(str(uid) for uid in all_user_ids)
+    
+        sql = text(f"""
+            WITH ordered_logs AS (
+                SELECT *,
+                    LAG(action_type) OVER (PARTITION BY user_id ORDER BY created_at DESC) as prev_action_type,
+                    LAG(description) OVER (PARTITION BY user_id ORDER BY created_at DESC) as prev_description
+                FROM player_activity_log
+                WHERE user_id IN ({user_ids_str})
+                  AND created_at >= :cutoff
+                  AND action_type NOT IN ('travel_fee')
+            ),
+            grouped AS (
+                SELECT *,
+                    CASE 
+                        WHEN action_type IN ('rare_loot', 'achievement', 'science_discovery') THEN 1
+                        WHEN prev_action_type IS NULL 
+                             OR action_type != prev_action_type 
+                             OR description != prev_description THEN 1
+                        ELSE 0
+                    END as is_group_start
+                FROM ordered_logs
+            ),
+            with_groups AS (
+                SELECT *,
+                    SUM(is_group_start) OVER (PARTITION BY user_id ORDER BY created_at DESC) as group_id
+                FROM grouped
+            )
+            SELECT 
+                MIN(id) as id,
+                user_id,
+                action_type,
+                action_category,
+                (array_agg(description ORDER BY created_at DESC))[1] as description,
+                kingdom_id,
+                kingdom_name,
+                SUM(COALESCE(amount, 0)) as amount,
+                (array_agg(visibility ORDER BY created_at DESC))[1] as visibility,
+                MAX(created_at) as created_at,
+                COUNT(*) as repeat_count,
+                (array_agg(details ORDER BY created_at DESC))[1] as details
+            FROM with_groups
+            GROUP BY group_id, user_id, action_type, action_category, kingdom_id, kingdom_name
+            ORDER BY created_at DESC
+            LIMIT 50
+        """)
+    
+        activity_rows = db.execute(sql, {"cutoff": cutoff}).fetchall()
+    
+    # Author cards - friends are already loaded, only new ids are queried
+    authors.load(row.user_id for row in activity_rows)
     
     friend_activities = []
     for row in activity_rows:
-        user = users_map.get(row.user_id)
-        user_state = states_map.get(row.user_id)
-        prefs = prefs_map.get(row.user_id)
+        user = authors.user(row.user_id)
+        user_state = authors.state(row.user_id)
         icon, color = get_activity_icon_color(row.action_type)
         
         # Add (xN) suffix if grouped
@@ -622,34 +591,6 @@ def get_friends_dashboard(
         if row.repeat_count > 1:
             description = f"{description} (x{row.repeat_count})"
         
-        # Build subscriber customization if user is subscriber with prefs
-        subscriber_customization_dict = None
-        if is_user_subscriber(db, row.user_id) and prefs:
-            selected_title_dict = None
-            if prefs.selected_title_achievement_id:
-                title_result = db.execute(text("""
-                    SELECT id, display_name, icon FROM achievement_definitions WHERE id = :achievement_id
-                """), {"achievement_id": prefs.selected_title_achievement_id}).fetchone()
-                if title_result:
-                    selected_title_dict = {"achievement_id": title_result[0], "display_name": title_result[1], "icon": title_result[2] or "star.fill"}
-            
-            icon_style_dict = None
-            if prefs.icon_style and prefs.icon_style in STYLE_PRESETS:
-                s = STYLE_PRESETS[prefs.icon_style]
-                icon_style_dict = {"id": prefs.icon_style, "name": s["name"], "background_color": s["background"], "text_color": s["text"]}
-            
-            card_style_dict = None
-            if prefs.card_style and prefs.card_style in STYLE_PRESETS:
-                s = STYLE_PRESETS[prefs.card_style]
-                card_style_dict = {"id": prefs.card_style, "name": s["name"], "background_color": s["background"], "text_color": s["text"]}
-            
-            if icon_style_dict or card_style_dict or selected_title_dict:
-                subscriber_customization_dict = {
-                    "icon_style": icon_style_dict,
-                    "card_style": card_style_dict,
-                    "selected_title": selected_title_dict
-                }
-        
         friend_activities.append({
             "id": row.id,
             "user_id": row.user_id,
@@ -666,7 +607,7 @@ def get_friends_dashboard(
             "details": row.details or {},
             "icon": icon,
             "color": color,
-            "subscriber_customization": subscriber_customization_dict,
+            "subscriber_customization": authors.customization(row.user_id),
             "created_at": row.created_at.replace(microsecond=0).strftime('%Y-%m-%dT%H:%M:%S')
         })
     
@@ -739,6 +680,7 @@ def add_friend(
             if existing.user_id == target_user.id:
                 existing.status = 'accepted'
                 existing.updated_at = datetime.utcnow()
+                on_friendship_accepted(db, existing.user_id, existing.friend_user_id)
                 db.commit()
                 db.refresh(existing)
                 
@@ -807,6 +749,7 @@ def accept_friend_request(
     
     friendship.status = 'accepted'
     friendship.updated_at = datetime.utcnow()
+    on_friendship_accepted(db, friendship.user_id, friendship.friend_user_id)
     db.commit()
     
     return FriendActionResponse(
@@ -873,6 +816,8 @@ def remove_friend(
             detail="Not authorized"
         )
     
+    if friendship.status == 'accepted':
+        on_friendship_removed(db, friendship.user_id, friendship.friend_user_id)
     db.delete(friendship)
     db.commit()
     
@@ -17,6 +17,7 @@ from schemas import CheckInRequest, CheckInResponse, CheckInRewards, CityBoundar
 from schemas.user import PlayerState as PlayerStateSchema, TravelEvent
 from routers.auth import get_current_user, get_current_user_optional
 from routers.actions.utils import format_datetime_iso
+from utils.offload import run_sync
 from routers.player import player_state_to_response, handle_kingdom_checkin, get_or_create_player_state
 from services import city_service
 from config import DEV_MODE
@@ -127,10 +128,7 @@ async def get_startup_data(
     """
     from services import city_service
     
-    # 1. Update last_login (what /auth/me does)
-    current_user.last_login = datetime.utcnow()
-    
-    # 2. Get current city (what /cities/current does)
+    # 1. Get current city (what /cities/current does)
     city = await city_service.get_current_city(db, lat, lon, current_user)
     
     if not city:
@@ -139,30 +137,38 @@ async def get_startup_data(
             detail="No city found at this location"
         )
     
-    # 3. Get or create player state
+    # 2. Everything else is blocking DB work - run it off the event loop
+    player_state = await run_sync(_startup_player_state, db, current_user, city.osm_id)
+    
+    # 3. Return combined response
+    return {
+        "city": city,
+        "player": player_state,
+        "server_time": format_datetime_iso(datetime.utcnow())
+    }
+
+
+def _startup_player_state(db: Session, current_user: User, kingdom_id: str):
+    """Blocking part of /startup: last_login, check-in and the player state response"""
+    # Update last_login (what /auth/me does)
+    current_user.last_login = datetime.utcnow()
+    
+    # Get or create player state
     state = get_or_create_player_state(db, current_user)
     
-    # 4. Handle check-in if entering a kingdom (what /player/state does)
+    # Handle check-in if entering a kingdom (what /player/state does)
+    # The city's OSM ID is the kingdom ID
     travel_event = None
-    kingdom_id = city.osm_id  # The city's OSM ID is the kingdom ID
-    
     kingdom = db.query(Kingdom).filter(Kingdom.id == kingdom_id).first()
     if kingdom:
         # Use existing check-in logic
         travel_event = handle_kingdom_checkin(db, current_user, state, kingdom)
     
-    # 5. Commit all changes (last_login + check-in)
+    # Commit all changes (last_login + check-in)
     db.commit()
     
-    # 6. Build player state response (what /player/state returns)
-    player_state = player_state_to_response(current_user, state, db, travel_event)
-    
-    # 7. Return combined response
-    return {
-        "city": city,
-        "player": player_state,
-        "server_time": format_datetime_iso(datetime.utcnow())
-    }
+    # Build player state response (what /player/state returns)
+    return player_state_to_response(current_user, state, db, travel_event)
 
 
 # ===== Kingdom Endpoints =====
@@ -187,7 +193,7 @@ def get_kingdom(
     """Get kingdom details with building upgrade costs and catchup info"""
     from services.kingdom_service import get_active_citizens_count, check_ruler_abandonment, calculate_actions_required
     from services.city_service import get_buildings_for_kingdom
-    from db.models import PlayerState, UnifiedContract, ContractContribution
+    from db.models import PlayerState, UnifiedContract
     from sqlalchemy import func
     
     kingdom = db.query(Kingdom).filter(Kingdom.id == kingdom_id).first()
@@ -234,9 +240,7 @@ def get_kingdom(
             for contract in contracts:
                 new_actions = calculate_actions_required(contract.type, contract.tier, active_citizens_count, farm_level)
                 if new_actions < contract.actions_required:
-                    actions_completed = db.query(func.count(ContractContribution.id)).filter(
-                        ContractContribution.contract_id == contract.id
-                    ).scalar()
+                    actions_completed = contract.actions_completed
                     new_actions = max(new_actions, actions_completed + 1)
                     if new_actions < contract.actions_required:
                         contract.actions_required = new_actions
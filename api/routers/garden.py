@@ -20,6 +20,7 @@ from db.models.inventory import PlayerInventory
 from routers.auth import get_current_user
 from routers.resources import RESOURCES
 from routers.actions.utils import format_datetime_iso, log_activity
+from services.player_stats import bump_stats
 
 router = APIRouter(prefix="/garden", tags=["garden"])
 
@@ -525,6 +526,24 @@ def water_plant(
         slot.flower_color = determined_color
         slot.flower_rarity = determined_rarity
         
+        # Achievement counters (first flower of a color counts toward flower_colors)
+        is_flower = determined_type == PlantType.FLOWER
+        new_color = is_flower and determined_color is not None and not db.query(
+            db.query(GardenHistory.id).filter(
+                GardenHistory.user_id == current_user.id,
+                GardenHistory.action == "grown",
+                GardenHistory.plant_type == "flower",
+                GardenHistory.flower_color == determined_color
+            ).exists()
+        ).scalar()
+        bump_stats(
+            db, current_user.id,
+            plants_grown=1,
+            flowers_grown=int(is_flower),
+            rare_flowers_grown=int(is_flower and determined_rarity == "rare"),
+            flower_colors=int(new_color)
+        )
+        
         # Log the grown event (for achievements)
         history = GardenHistory(
             user_id=current_user.id,
@@ -611,6 +630,7 @@ def harvest_plant(
         wheat_gained=wheat_amount
     )
     db.add(history)
+    bump_stats(db, current_user.id, wheat_harvested=wheat_amount)
     
     # Log to activity feed
     log_activity(
@@ -686,6 +706,8 @@ def discard_plant(
         planted_at=slot.planted_at
     )
     db.add(history)
+    if slot.plant_type == PlantType.WEED:
+        bump_stats(db, current_user.id, weeds_cleared=1)
     
     # Clear the slot
     slot.status = PlantStatus.EMPTY
@@ -29,7 +29,7 @@ from websocket.broadcast import notify_kingdom
 
 router = APIRouter(prefix="/incidents", tags=["incidents"])
 
-# Global incident manager (in production, this would be Redis-backed)
+# Global incident manager - state lives in its store (Postgres), not this process
 _incident_manager = IncidentManager()
 
 
@@ -252,6 +252,7 @@ def trigger_incident(
     # Phase 1: Initial success roll (int tier vs patrols)
     # Phase 2: If success, incident triggers for tug-of-war
     result = manager.attempt_trigger(
+        db,
         attacker_kingdom_id=state.hometown_kingdom_id,
         defender_kingdom_id=defender_kingdom_id,
         attacker_id=user.id,
@@ -322,7 +323,7 @@ def join_incident(
     if not state:
         raise HTTPException(status_code=404, detail="Player state not found")
     
-    incident = manager.get_incident(incident_id)
+    incident = manager.get_incident(db, incident_id)
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
     
@@ -345,6 +346,7 @@ def join_incident(
         raise HTTPException(status_code=400, detail="Side must be 'attacker' or 'defender'")
     
     result = manager.join_incident(
+        db,
         incident_id=incident_id,
         player_id=user.id,
         player_name=user.display_name or f"Player {user.id}",
@@ -356,6 +358,8 @@ def join_incident(
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["message"])
     
+    db.commit()
+    
     # Notify participants
     notify_kingdom(
         kingdom_id=incident.defender_kingdom_id,
@@ -387,25 +391,26 @@ def execute_roll(
     - Must be a participant
     - Shifts the probability bar based on success
     """
-    result = manager.execute_roll(incident_id, user.id)
+    result = manager.execute_roll(db, incident_id, user.id)
     
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["message"])
     
-    incident = manager.get_incident(incident_id)
+    db.commit()
+    
+    incident = result["incident"]
     
     # Broadcast roll to both kingdoms
-    if incident:
-        for kingdom_id in [incident.attacker_kingdom_id, incident.defender_kingdom_id]:
-            notify_kingdom(
-                kingdom_id=kingdom_id,
-                event_type="incident_roll",
-                data={
-                    "incident_id": incident_id,
-                    "roll": result["roll"],
-                    "probabilities": incident.get_probabilities(),
-                }
-            )
+    for kingdom_id in [incident["attacker_kingdom_id"], incident["defender_kingdom_id"]]:
+        notify_kingdom(
+            kingdom_id=kingdom_id,
+            event_type="incident_roll",
+            data={
+                "incident_id": incident_id,
+                "roll": result["roll"],
+                "probabilities": incident["probabilities"],
+            }
+        )
     
     return IncidentResponse(
         success=True,
@@ -427,12 +432,14 @@ def resolve_incident(
     - Must have at least 1 roll
     - Picks outcome based on current probability bar
     """
-    result = manager.resolve_incident(incident_id)
+    result = manager.resolve_incident(db, incident_id)
     
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["message"])
     
-    incident = manager.get_incident(incident_id)
+    db.commit()
+    
+    incident = result["incident"]
     
     # Apply outcome effects (TODO: implement these)
     outcome = result["outcome"]
@@ -450,19 +457,18 @@ def resolve_incident(
         pass
     
     # Broadcast resolution to both kingdoms
-    if incident:
-        for kingdom_id in [incident.attacker_kingdom_id, incident.defender_kingdom_id]:
-            notify_kingdom(
-                kingdom_id=kingdom_id,
-                event_type="incident_resolved",
-                data={
-                    "incident_id": incident_id,
-                    "outcome": outcome,
-                    "winner": result["winner"],
-                    "message": result["message"],
-                    "master_roll": result["master_roll"],
-                }
-            )
+    for kingdom_id in [incident["attacker_kingdom_id"], incident["defender_kingdom_id"]]:
+        notify_kingdom(
+            kingdom_id=kingdom_id,
+            event_type="incident_resolved",
+            data={
+                "incident_id": incident_id,
+                "outcome": outcome,
+                "winner": result["winner"],
+                "message": result["message"],
+                "master_roll": result["master_roll"],
+            }
+        )
     
     return IncidentResponse(
         success=True,
@@ -474,10 +480,11 @@ def resolve_incident(
 @router.get("/{incident_id}")
 def get_incident_status(
     incident_id: str,
+    db: Session = Depends(get_db),
     manager: IncidentManager = Depends(get_incident_manager),
 ):
     """Get current status of an incident."""
-    incident = manager.get_incident(incident_id)
+    incident = manager.get_incident(db, incident_id)
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
     
@@ -487,23 +494,25 @@ def get_incident_status(
 @router.get("/active/attacking/{kingdom_id}")
 def get_incidents_by_attacker(
     kingdom_id: str,
+    db: Session = Depends(get_db),
     manager: IncidentManager = Depends(get_incident_manager),
 ):
     """Get active incidents where this kingdom is the attacker."""
-    incidents = [
-        inc.to_dict() for inc in manager._incidents.values()
-        if inc.attacker_kingdom_id == kingdom_id and inc.status.value == "active"
-    ]
-    return {"incidents": incidents, "count": len(incidents)}
+    incidents = manager.get_incidents_for_attacker(db, kingdom_id)
+    return {
+        "incidents": [inc.to_dict() for inc in incidents],
+        "count": len(incidents),
+    }
 
 
 @router.get("/active/defending/{kingdom_id}")
 def get_incidents_by_defender(
     kingdom_id: str,
+    db: Session = Depends(get_db),
     manager: IncidentManager = Depends(get_incident_manager),
 ):
     """Get active incidents where this kingdom is the defender."""
-    incidents = manager.get_incidents_for_defender(kingdom_id)
+    incidents = manager.get_incidents_for_defender(db, kingdom_id)
     return {
         "incidents": [inc.to_dict() for inc in incidents],
         "count": len(incidents),
@@ -23,6 +23,7 @@ from db.models.unified_contract import UnifiedContract
 from routers.auth import get_current_user
 from routers.resources import RESOURCES
 from routers.actions.utils import format_datetime_iso, log_activity
+from services.player_stats import bump_stats
 
 router = APIRouter(prefix="/kitchen", tags=["kitchen"])
 
@@ -455,6 +456,7 @@ def collect_bread(
         started_at=slot.started_at,
     )
     db.add(history)
+    bump_stats(db, current_user.id, bread_baked=1)
     
     # Log to activity feed
     log_activity(
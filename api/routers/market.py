@@ -12,15 +12,21 @@ from db import get_db, User, Kingdom, MarketOrder, MarketTransaction, OrderType,
 from routers.auth import get_current_user
 from schemas.market import (
     CreateOrderRequest, CreateOrderResult, MarketOrderResponse, MarketTransactionResponse,
-    OrderBook, OrderBookEntry, PriceHistory, PriceHistoryEntry, PlayerOrdersResponse,
+    OrderBook, OrderBookEntry, PriceHistory, PriceHistoryEntry, PriceCandle, PlayerOrdersResponse,
     CancelOrderResult, MarketInfoResponse, AvailableItemsResponse
 )
 from routers.resources import RESOURCES
 from services.market_service import MarketMatchingEngine
+from services.market_candles import bucket_start, get_candles, window_candles, summarize
 
 
 router = APIRouter(prefix="/market", tags=["market"])
 
+# Price history: windows up to this long are charted with 1-minute candles
+MINUTE_CANDLE_MAX_HOURS = 3
+# Price history: raw trades returned alongside the candles
+PRICE_HISTORY_RECENT_TRADES = 50
+
 
 def get_market_commodities(kingdom: Kingdom) -> List[str]:
     """
@@ -338,7 +344,8 @@ def get_price_history(
     """
     Get price history for an item
     
-    Shows recent completed transactions with statistics
+    Shows OHLCV candles and statistics for the whole window, plus the most
+    recent completed transactions
     """
     state = current_user.player_state
     if not state or not state.current_kingdom_id:
@@ -350,53 +357,51 @@ def get_price_history(
     kingdom_id = state.current_kingdom_id
     cutoff_time = datetime.utcnow() - timedelta(hours=hours)
     
-    # Get recent transactions
+    # Chart: minute candles for short windows, hourly otherwise (a few hundred rows at most)
+    interval = "1m" if hours <= MINUTE_CANDLE_MAX_HOURS else "1h"
+    candles = get_candles(db, kingdom_id, item_type, interval, since=bucket_start(cutoff_time, interval))
+    
+    # Statistics for the exact window
+    stats = summarize(window_candles(db, kingdom_id, cutoff_time, item_type=item_type))
+    
+    # Only the latest trades are sent individually
     transactions = db.query(MarketTransaction).filter(
         and_(
             MarketTransaction.kingdom_id == kingdom_id,
             MarketTransaction.item_type == item_type,
             MarketTransaction.created_at >= cutoff_time
         )
-    ).order_by(MarketTransaction.created_at.desc()).limit(500).all()
-    
-    if not transactions:
-        return PriceHistory(
-            item_type=item_type,
-            kingdom_id=kingdom_id,
-            transactions=[],
-            average_price=None,
-            min_price=None,
-            max_price=None,
-            total_volume=0
-        )
-    
-    # Build history entries
-    history_entries = [
-        PriceHistoryEntry(
-            timestamp=t.created_at,
-            price=t.price_per_unit,
-            quantity=t.quantity
-        )
-        for t in transactions
-    ]
-    
-    # Calculate statistics
-    prices = [t.price_per_unit for t in transactions]
-    quantities = [t.quantity for t in transactions]
-    
-    # Weighted average price
-    total_value = sum(t.total_gold for t in transactions)
-    total_quantity = sum(quantities)
-    avg_price = total_value / total_quantity if total_quantity > 0 else None
+    ).order_by(MarketTransaction.created_at.desc()).limit(PRICE_HISTORY_RECENT_TRADES).all()
     
     return PriceHistory(
         item_type=item_type,
         kingdom_id=kingdom_id,
-        transactions=history_entries,
-        average_price=avg_price,
-        min_price=min(prices),
-        max_price=max(prices),
-        total_volume=total_quantity
+        transactions=[
+            PriceHistoryEntry(
+                timestamp=t.created_at,
+                price=t.price_per_unit,
+                quantity=t.quantity
+            )
+            for t in transactions
+        ],
+        interval=interval,
+        candles=[
+            PriceCandle(
+                timestamp=c.bucket_start,
+                open=c.open,
+                high=c.high,
+                low=c.low,
+                close=c.close,
+                volume=c.volume,
+                vwap=c.vwap,
+                trades=c.trades
+            )
+            for c in candles
+        ],
+        average_price=stats["vwap"],
+        min_price=stats["low"],
+        max_price=stats["high"],
+        total_volume=stats["volume"]
     )
 
 
@@ -507,14 +512,9 @@ def get_market_info(
         )
     ).scalar()
     
-    # Count transactions in last 24 hours
+    # Count transactions in last 24 hours (from candles)
     cutoff_time = datetime.utcnow() - timedelta(hours=24)
-    total_transactions_24h = db.query(func.count(MarketTransaction.id)).filter(
-        and_(
-            MarketTransaction.kingdom_id == kingdom.id,
-            MarketTransaction.created_at >= cutoff_time
-        )
-    ).scalar()
+    total_transactions_24h = summarize(window_candles(db, kingdom.id, cutoff_time))["trades"]
     
     # Build player resources from both column storage and inventory
     # This tells the frontend how much the player can SELL of each item
@@ -21,12 +21,14 @@ from .invasions import get_invasion_notifications
 from .kingdom_events import get_kingdom_event_notifications, get_unread_kingdom_events_count
 from .alliances import get_alliance_notifications, get_pending_alliance_requests
 from .config import enrich_notification
+from .context import load_updates_context, run_sections
+from utils.offload import run_sync
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
 
 @router.get("/updates")
-def get_user_updates(
+async def get_user_updates(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -39,21 +41,42 @@ def get_user_updates(
     - Kingdom updates (if ruler)
     - Rewards available
     - Important notifications
+    
+    Shared rows are loaded once (UpdatesContext), then the read-only sections
+    run concurrently on their own pooled sessions - see context.py.
     """
     
-    state = get_player_state(db, current_user)
+    ctx = await run_sync(load_updates_context, db, current_user)
+    user, state, ruled = ctx.user, ctx.state, ctx.ruled_kingdoms
     
     # Build all data in parallel
-    player_summary = build_player_summary(db, current_user, state)
-    contracts_data = build_contract_updates(db, current_user)
-    kingdoms_list = build_kingdom_updates(db, current_user)
+    results = await run_sections({
+        "summary": lambda s: build_player_summary(s, user, state, contracts=ctx.contracts, kingdoms_ruled=len(ruled)),
+        "contracts": lambda s: build_contract_updates(s, user, contracts=ctx.contracts),
+        "kingdoms": lambda s: build_kingdom_updates(s, user, ruled_kingdoms=ruled),
+        "coups": lambda s: get_coup_notifications(s, user, state),
+        "invasions": lambda s: get_invasion_notifications(s, user, state, kingdoms=ctx.kingdoms),
+        "kingdom_events": lambda s: (
+            get_kingdom_event_notifications(s, user, state, ruled_kingdoms=ruled),
+            get_unread_kingdom_events_count(s, user, state, ruled_kingdoms=ruled)
+        ),
+        "alliances": lambda s: (
+            get_alliance_notifications(s, user, state, ruled_kingdoms=ruled),
+            get_pending_alliance_requests(s, user, state, ruled_kingdoms=ruled)
+        ),
+    })
+    player_summary = results["summary"]
+    contracts_data = results["contracts"]
+    kingdoms_list = results["kingdoms"]
+    kingdom_event_notifications, unread_kingdom_events = results["kingdom_events"]
+    alliance_notifications, pending_alliance_requests = results["alliances"]
     
     # Gather all notifications
     notifications = []
-    notifications.extend(get_coup_notifications(db, current_user, state))
-    notifications.extend(get_invasion_notifications(db, current_user, state))
-    notifications.extend(get_kingdom_event_notifications(db, current_user, state))
-    notifications.extend(get_alliance_notifications(db, current_user, state))
+    notifications.extend(results["coups"])
+    notifications.extend(results["invasions"])
+    notifications.extend(kingdom_event_notifications)
+    notifications.extend(alliance_notifications)
     
     # Enrich all notifications with icon/color from config (SINGLE SOURCE OF TRUTH)
     notifications = [enrich_notification(n) for n in notifications]
@@ -65,12 +88,6 @@ def get_user_updates(
         reverse=True
     )
     
-    # Count unread kingdom events since last check-in
-    unread_kingdom_events = get_unread_kingdom_events_count(db, current_user, state)
-    
-    # Get pending alliance requests for ActionsView (rulers only)
-    pending_alliance_requests = get_pending_alliance_requests(db, current_user, state)
-    
     return {
         "success": True,
         "summary": player_summary,
@@ -2,18 +2,25 @@
 Alliance notifications builder
 """
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from sqlalchemy import or_
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 from db import User, PlayerState, Kingdom, Alliance
 from routers.actions.utils import format_datetime_iso
 
 
-def get_alliance_notifications(db: Session, user: User, state: PlayerState) -> List[Dict[str, Any]]:
-    """Get all alliance-related notifications for the user"""
+def get_alliance_notifications(db: Session, user: User, state: PlayerState, ruled_kingdoms: Optional[List[Kingdom]] = None) -> List[Dict[str, Any]]:
+    """
+    Get all alliance-related notifications for the user.
+    Pass ruled_kingdoms if the caller already loaded them.
+    """
     notifications = []
     
     # Get player's empire ID (if they rule a kingdom)
-    ruled_kingdom = db.query(Kingdom).filter(Kingdom.ruler_id == user.id).first()
+    if ruled_kingdoms is None:
+        ruled_kingdom = db.query(Kingdom).filter(Kingdom.ruler_id == user.id).first()
+    else:
+        ruled_kingdom = ruled_kingdoms[0] if ruled_kingdoms else None
     if not ruled_kingdom:
         return notifications  # Only rulers get alliance notifications
     
@@ -176,13 +183,17 @@ def get_alliance_notifications(db: Session, user: User, state: PlayerState) -> L
     return notifications
 
 
-def get_pending_alliance_requests(db: Session, user: User, state: PlayerState) -> List[Dict[str, Any]]:
+def get_pending_alliance_requests(db: Session, user: User, state: PlayerState, ruled_kingdoms: Optional[List[Kingdom]] = None) -> List[Dict[str, Any]]:
     """
     Get pending alliance requests for the ActionsView.
     Returns structured data for rendering accept/decline buttons.
+    Pass ruled_kingdoms if the caller already loaded them.
     """
     # Get player's empire ID (if they rule a kingdom)
-    ruled_kingdom = db.query(Kingdom).filter(Kingdom.ruler_id == user.id).first()
+    if ruled_kingdoms is None:
+        ruled_kingdom = db.query(Kingdom).filter(Kingdom.ruler_id == user.id).first()
+    else:
+        ruled_kingdom = ruled_kingdoms[0] if ruled_kingdoms else None
     if not ruled_kingdom:
         return []
     
@@ -195,16 +206,22 @@ def get_pending_alliance_requests(db: Session, user: User, state: PlayerState) -
         Alliance.target_empire_id == my_empire_id
     ).all()
     
+    # Initiator kingdom names in one query (empire ID is the capital's kingdom ID, or any member's empire_id)
+    initiator_ids = {proposal.initiator_empire_id for proposal in received_proposals}
+    kingdoms_by_id = {}
+    kingdoms_by_empire = {}
+    if initiator_ids:
+        for kingdom in db.query(Kingdom).filter(
+            or_(Kingdom.id.in_(initiator_ids), Kingdom.empire_id.in_(initiator_ids))
+        ).all():
+            kingdoms_by_id[kingdom.id] = kingdom
+            kingdoms_by_empire.setdefault(kingdom.empire_id, kingdom)
+    
     requests = []
     for proposal in received_proposals:
         # Get initiator kingdom name
-        initiator_kingdom = db.query(Kingdom).filter(
-            Kingdom.id == proposal.initiator_empire_id
-        ).first()
-        if not initiator_kingdom:
-            initiator_kingdom = db.query(Kingdom).filter(
-                Kingdom.empire_id == proposal.initiator_empire_id
-            ).first()
+        initiator_kingdom = kingdoms_by_id.get(proposal.initiator_empire_id) or \
+            kingdoms_by_empire.get(proposal.initiator_empire_id)
         
         initiator_name = initiator_kingdom.name if initiator_kingdom else "Unknown Kingdom"
         
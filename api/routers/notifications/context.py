@@ -0,0 +1,99 @@
+"""
+Per-request context for GET /notifications/updates
+
+/notifications/updates is the app-open call. It used to run its sections one
+after another (summary, contracts, ruled kingdoms, four notification
+builders, unread count, alliance requests), and several of them reloaded the
+same rows: ruled kingdoms five times, the whole contracts table twice, the
+hometown once per active invasion.
+
+UpdatesContext loads what the sections share once, in the request session:
+the player state, hometown + ruled kingdoms (one query) and the contracts the
+player contributed to. The request session is then closed, which detaches
+those rows and returns its connection to the pool.
+
+run_sections() runs the independent, read-only sections concurrently, each
+in its own pooled Session on the utils/offload.py worker threads, so the
+call takes about as long as its slowest section. Sections only read column
+attributes of the shared (detached) rows - an accidental lazy load raises
+instead of racing on a shared Session.
+
+With a pool too small to run two sections at once (the lambda profile has a
+single connection), sections run one after another instead.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import or_
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import os
+
+from db import SessionLocal, User, PlayerState, Kingdom, Contract
+from db.base import DB_POOL_PROFILE
+from utils.offload import run_sync
+
+from .utils import get_player_state
+from .contracts import get_contributed_contracts
+
+
+# Max sections of one request holding a DB connection at the same time
+UPDATES_SECTION_CONCURRENCY = min(
+    int(os.getenv("NOTIFICATION_SECTION_CONCURRENCY", "4")),
+    DB_POOL_PROFILE.pool_size + max(DB_POOL_PROFILE.max_overflow, 0)
+)
+
+
+class UpdatesContext:
+    """Entities several /notifications/updates sections read, loaded once"""
+
+    def __init__(self, db: Session, user: User):
+        self.user = user
+        self.state: PlayerState = get_player_state(db, user)
+
+        # Hometown and ruled kingdoms in one query
+        kingdom_filter = Kingdom.ruler_id == user.id
+        if self.state.hometown_kingdom_id:
+            kingdom_filter = or_(Kingdom.id == self.state.hometown_kingdom_id, kingdom_filter)
+        kingdoms = db.query(Kingdom).filter(kingdom_filter).all()
+        self.kingdoms: Dict[str, Kingdom] = {k.id: k for k in kingdoms}
+        self.ruled_kingdoms: List[Kingdom] = [k for k in kingdoms if k.ruler_id == user.id]
+        self.hometown: Optional[Kingdom] = self.kingdoms.get(self.state.hometown_kingdom_id)
+
+        # Contracts the player contributed to (summary counts + contract updates)
+        self.contracts: List[Contract] = get_contributed_contracts(db, user.id)
+
+
+def load_updates_context(db: Session, user: User) -> UpdatesContext:
+    """
+    Build the context, then close the request session: its rows stay readable
+    (detached) and its connection goes back to the pool for the sections.
+    """
+    ctx = UpdatesContext(db, user)
+    db.close()
+    return ctx
+
+
+def _run_in_own_session(section: Callable[[Session], Any]) -> Any:
+    db = SessionLocal()
+    try:
+        return section(db)
+    finally:
+        db.close()
+
+
+async def run_sections(sections: Dict[str, Callable[[Session], Any]]) -> Dict[str, Any]:
+    """
+    Run read-only sections, each with its own Session, and return their results
+    by name. Concurrent (up to UPDATES_SECTION_CONCURRENCY at once) when the
+    pool allows it, sequential otherwise.
+    """
+    if UPDATES_SECTION_CONCURRENCY < 2:
+        return {name: await run_sync(_run_in_own_session, section) for name, section in sections.items()}
+
+    slots = asyncio.Semaphore(UPDATES_SECTION_CONCURRENCY)
+
+    async def run(section: Callable[[Session], Any]) -> Any:
+        async with slots:
+            return await run_sync(_run_in_own_session, section)
+
+    results = await asyncio.gather(*(run(section) for section in sections.values()))
+    return dict(zip(sections.keys(), results))
@@ -2,34 +2,45 @@
 Contract updates and notifications
 """
 from sqlalchemy.orm import Session
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from db import User, Contract, Kingdom
 
 
-def build_contract_updates(db: Session, user: User) -> Dict[str, List[Dict[str, Any]]]:
-    """Build contract updates (ready to complete and in progress)"""
+def get_contributed_contracts(db: Session, user_id: int) -> List[Contract]:
+    """Contracts the user has contributed to (action_contributions has their ID as a key)"""
+    return db.query(Contract).filter(
+        Contract.action_contributions.has_key(str(user_id))
+    ).all()
+
+
+def build_contract_updates(db: Session, user: User, contracts: Optional[List[Contract]] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Build contract updates (ready to complete and in progress).
+    Pass contracts (get_contributed_contracts) if the caller already loaded them.
+    """
     
     user_id_str = str(user.id)
     
-    # Get all contracts and filter by user contributions
-    all_contracts = db.query(Contract).all()
+    if contracts is None:
+        contracts = get_contributed_contracts(db, user.id)
+    
+    # Kingdom names for every contract in one query
+    kingdom_ids = {c.kingdom_id for c in contracts}
+    kingdom_names = dict(
+        db.query(Kingdom.id, Kingdom.name).filter(Kingdom.id.in_(kingdom_ids)).all()
+    ) if kingdom_ids else {}
     
     # Ready to complete - contracts user contributed to that are now completed
     ready_contracts_list = []
-    for contract in all_contracts:
-        if (contract.completed_at is not None and 
-            contract.action_contributions and 
-            user_id_str in contract.action_contributions):
-            
-            kingdom = db.query(Kingdom).filter(Kingdom.id == contract.kingdom_id).first()
-            
+    for contract in contracts:
+        if contract.completed_at is not None:
             # Calculate user's reward based on contribution
             user_contribution = contract.action_contributions.get(user_id_str, 0)
             user_reward = int((user_contribution / contract.actions_completed) * contract.reward_pool) if contract.actions_completed > 0 else 0
             
             ready_contracts_list.append({
                 "id": contract.id,
-                "kingdom_name": kingdom.name if kingdom else "Unknown",
+                "kingdom_name": kingdom_names.get(contract.kingdom_id, "Unknown"),
                 "building_type": contract.building_type,
                 "building_level": contract.building_level,
                 "reward": user_reward
@@ -37,18 +48,13 @@ def build_contract_updates(db: Session, user: User) -> Dict[str, List[Dict[str,
     
     # In progress - contracts user is currently contributing to
     in_progress_list = []
-    for contract in all_contracts:
-        if (contract.completed_at is None and 
-            contract.action_contributions and 
-            user_id_str in contract.action_contributions):
-            
-            kingdom = db.query(Kingdom).filter(Kingdom.id == contract.kingdom_id).first()
+    for contract in contracts:
+        if contract.completed_at is None:
             progress = contract.actions_completed / contract.total_actions_required if contract.total_actions_required > 0 else 0
-            user_contribution = contract.action_contributions.get(user_id_str, 0)
             
             in_progress_list.append({
                 "id": contract.id,
-                "kingdom_name": kingdom.name if kingdom else "Unknown",
+                "kingdom_name": kingdom_names.get(contract.kingdom_id, "Unknown"),
                 "building_type": contract.building_type,
                 "progress": progress,
                 "actions_remaining": contract.total_actions_required - contract.actions_completed,
@@ -60,4 +66,3 @@ def build_contract_updates(db: Session, user: User) -> Dict[str, List[Dict[str,
         "ready_to_complete": ready_contracts_list,
         "in_progress": in_progress_list
     }
-
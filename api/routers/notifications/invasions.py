@@ -2,15 +2,18 @@
 Invasion notifications builder
 """
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from db import User, PlayerState, Kingdom, InvasionEvent
 from routers.alliances import are_empires_allied
 from routers.actions.utils import format_datetime_iso
 
 
-def get_invasion_notifications(db: Session, user: User, state: PlayerState) -> List[Dict[str, Any]]:
-    """Get all invasion-related notifications for the user"""
+def get_invasion_notifications(db: Session, user: User, state: PlayerState, kingdoms: Optional[Dict[str, Kingdom]] = None) -> List[Dict[str, Any]]:
+    """
+    Get all invasion-related notifications for the user.
+    kingdoms: already-loaded kingdoms by ID (the hometown is looked up there first)
+    """
     notifications = []
     
     # ===== Active invasions =====
@@ -18,6 +21,12 @@ def get_invasion_notifications(db: Session, user: User, state: PlayerState) -> L
         InvasionEvent.status == 'declared'
     ).all()
     
+    # User's home kingdom (for alliance / same-empire checks), loaded once
+    home_kingdom = None
+    if active_invasions and state.hometown_kingdom_id:
+        home_kingdom = (kingdoms or {}).get(state.hometown_kingdom_id) or \
+            db.query(Kingdom).filter(Kingdom.id == state.hometown_kingdom_id).first()
+    
     for invasion in active_invasions:
         target_kingdom = db.query(Kingdom).filter(Kingdom.id == invasion.target_kingdom_id).first()
         attacking_kingdom = db.query(Kingdom).filter(Kingdom.id == invasion.attacking_from_kingdom_id).first()
@@ -33,7 +42,6 @@ def get_invasion_notifications(db: Session, user: User, state: PlayerState) -> L
         at_target = state.current_kingdom_id == invasion.target_kingdom_id
         
         # Check if user's empire is allied with target
-        home_kingdom = db.query(Kingdom).filter(Kingdom.id == state.hometown_kingdom_id).first() if state.hometown_kingdom_id else None
         is_allied = home_kingdom and are_empires_allied(
             db,
             home_kingdom.empire_id or home_kingdom.id,
@@ -3,7 +3,7 @@ Kingdom event notifications
 """
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, func
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional, Set
 from datetime import datetime, timedelta
 
 from db import User, PlayerState, Kingdom
@@ -11,28 +11,34 @@ from db.models.kingdom_event import KingdomEvent
 from routers.actions.utils import format_datetime_iso
 
 
+def _relevant_kingdom_ids(state: PlayerState, ruled_kingdoms: List[Kingdom]) -> Set[str]:
+    """
+    Kingdoms whose events the user sees: hometown and ruled - NOT current_kingdom_id.
+    Players shouldn't see events from kingdoms they're just visiting
+    (otherwise spies would see the "Intelligence Operation Detected" alert they caused!)
+    """
+    relevant_kingdom_ids = {k.id for k in ruled_kingdoms}
+    if state.hometown_kingdom_id:
+        relevant_kingdom_ids.add(state.hometown_kingdom_id)
+    return relevant_kingdom_ids
+
+
 def get_kingdom_event_notifications(
     db: Session,
     user: User,
     state: PlayerState,
-    days: int = 7
+    days: int = 7,
+    ruled_kingdoms: Optional[List[Kingdom]] = None
 ) -> List[Dict[str, Any]]:
-    """Get kingdom event notifications for the user's relevant kingdoms."""
-    from db.models import UnifiedContract
+    """
+    Get kingdom event notifications for the user's relevant kingdoms.
+    Pass ruled_kingdoms if the caller already loaded them.
+    """
     from services.kingdom_service import get_active_project_kingdoms
     
-    # Get relevant kingdom IDs
-    # Only hometown and ruled kingdoms - NOT current_kingdom_id
-    # Players shouldn't see events from kingdoms they're just visiting
-    # (otherwise spies would see the "Intelligence Operation Detected" alert they caused!)
-    relevant_kingdom_ids = set()
-    
-    if state.hometown_kingdom_id:
-        relevant_kingdom_ids.add(state.hometown_kingdom_id)
-    
-    ruled_kingdoms = db.query(Kingdom).filter(Kingdom.ruler_id == user.id).all()
-    for k in ruled_kingdoms:
-        relevant_kingdom_ids.add(k.id)
+    if ruled_kingdoms is None:
+        ruled_kingdoms = db.query(Kingdom).filter(Kingdom.ruler_id == user.id).all()
+    relevant_kingdom_ids = _relevant_kingdom_ids(state, ruled_kingdoms)
     
     if not relevant_kingdom_ids:
         return []
@@ -80,7 +86,8 @@ def get_kingdom_event_notifications(
 def get_unread_kingdom_events_count(
     db: Session,
     user: User,
-    state: PlayerState
+    state: PlayerState,
+    ruled_kingdoms: Optional[List[Kingdom]] = None
 ) -> int:
     """Count kingdom events since user last viewed notifications."""
     last_viewed = state.last_notifications_viewed
@@ -88,14 +95,10 @@ def get_unread_kingdom_events_count(
     if not last_viewed:
         return 0
     
-    # Get relevant kingdom IDs (same as get_kingdom_event_notifications)
-    # Only hometown and ruled kingdoms - NOT current_kingdom_id
-    relevant_kingdom_ids = set()
-    if state.hometown_kingdom_id:
-        relevant_kingdom_ids.add(state.hometown_kingdom_id)
-    ruled_kingdoms = db.query(Kingdom).filter(Kingdom.ruler_id == user.id).all()
-    for k in ruled_kingdoms:
-        relevant_kingdom_ids.add(k.id)
+    # Same kingdoms as get_kingdom_event_notifications
+    if ruled_kingdoms is None:
+        ruled_kingdoms = db.query(Kingdom).filter(Kingdom.ruler_id == user.id).all()
+    relevant_kingdom_ids = _relevant_kingdom_ids(state, ruled_kingdoms)
     
     if not relevant_kingdom_ids:
         return 0
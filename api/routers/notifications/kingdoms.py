@@ -2,32 +2,38 @@
 Kingdom updates and notifications
 """
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from sqlalchemy import func
+from typing import List, Dict, Any, Optional
 from db import User, Kingdom, Contract
 
 
-def build_kingdom_updates(db: Session, user: User) -> List[Dict[str, Any]]:
-    """Build updates for kingdoms where user is ruler"""
+def build_kingdom_updates(db: Session, user: User, ruled_kingdoms: Optional[List[Kingdom]] = None) -> List[Dict[str, Any]]:
+    """
+    Build updates for kingdoms where user is ruler.
+    Pass ruled_kingdoms if the caller already loaded them.
+    """
     
     # Get kingdoms where user is ruler
-    ruled_kingdoms = db.query(Kingdom).filter(Kingdom.ruler_id == user.id).all()
+    if ruled_kingdoms is None:
+        ruled_kingdoms = db.query(Kingdom).filter(Kingdom.ruler_id == user.id).all()
+    if not ruled_kingdoms:
+        return []
+    
+    # Open contracts per kingdom in one grouped count
+    open_contracts = dict(db.query(Contract.kingdom_id, func.count(Contract.id)).filter(
+        Contract.kingdom_id.in_([k.id for k in ruled_kingdoms]),
+        Contract.status == 'open'
+    ).group_by(Contract.kingdom_id).all())
     
     kingdoms_list = []
     for kingdom in ruled_kingdoms:
-        # Count open contracts in this kingdom
-        open_contracts = db.query(Contract).filter(
-            Contract.kingdom_id == kingdom.id,
-            Contract.status == 'open'
-        ).count()
-        
         kingdoms_list.append({
             "id": kingdom.id,
             "name": kingdom.name,
             "level": kingdom.level,
             "population": kingdom.population,
             "treasury": int(kingdom.treasury_gold),
-            "open_contracts": open_contracts
+            "open_contracts": open_contracts.get(kingdom.id, 0)
         })
     
     return kingdoms_list
-
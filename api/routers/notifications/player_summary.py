@@ -2,12 +2,24 @@
 Player summary builder
 """
 from sqlalchemy.orm import Session
-from typing import Dict, Any
-from db import User, PlayerState, Contract
+from typing import Dict, Any, List, Optional
+from db import User, PlayerState, Contract, Kingdom
 
+from .contracts import get_contributed_contracts
 
-def build_player_summary(db: Session, user: User, state: PlayerState) -> Dict[str, Any]:
-    """Build player summary with gold, level, XP, etc."""
+
+def build_player_summary(
+    db: Session,
+    user: User,
+    state: PlayerState,
+    contracts: Optional[List[Contract]] = None,
+    kingdoms_ruled: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Build player summary with gold, level, XP, etc.
+    Pass contracts (get_contributed_contracts) and kingdoms_ruled if the caller
+    already loaded them.
+    """
     
     # Calculate XP needed for next level
     xp_to_next_level = (state.level * 100) - state.experience
@@ -16,22 +28,15 @@ def build_player_summary(db: Session, user: User, state: PlayerState) -> Dict[st
     
     # Count contracts where user has contributed
     # Contracts use action_contributions JSONB field, not assignee_id
-    user_id_str = str(user.id)
-    
-    all_contracts = db.query(Contract).all()
-    active_contracts = sum(1 for c in all_contracts 
-                          if c.status == 'in_progress' 
-                          and c.action_contributions 
-                          and user_id_str in c.action_contributions)
+    if contracts is None:
+        contracts = get_contributed_contracts(db, user.id)
     
-    ready_contracts = sum(1 for c in all_contracts 
-                         if c.status == 'completed' 
-                         and c.action_contributions 
-                         and user_id_str in c.action_contributions)
+    active_contracts = sum(1 for c in contracts if c.status == 'in_progress')
+    ready_contracts = sum(1 for c in contracts if c.status == 'completed')
     
     # Compute kingdoms_ruled from kingdoms table
-    from db import Kingdom
-    kingdoms_ruled = db.query(Kingdom).filter(Kingdom.ruler_id == user.id).count()
+    if kingdoms_ruled is None:
+        kingdoms_ruled = db.query(Kingdom).filter(Kingdom.ruler_id == user.id).count()
     
     return {
         "gold": int(state.gold),
@@ -44,4 +49,3 @@ def build_player_summary(db: Session, user: User, state: PlayerState) -> Dict[st
         "active_contracts": active_contracts,
         "ready_contracts": ready_contracts
     }
-
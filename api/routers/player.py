@@ -15,6 +15,7 @@ from routers.alliances import are_empires_allied
 from config import DEV_MODE
 from routers.tiers import calculate_training_gold_per_action, calculate_training_actions
 from routers.actions.utils import get_equipped_items, get_inventory, log_activity, format_datetime_iso
+from services.player_stats import bump_stats
 
 router = APIRouter(prefix="/player", tags=["player"])
 
@@ -283,11 +284,9 @@ def player_state_to_response(user: User, state: DBPlayerState, db: Session, trav
         UserKingdom.user_id == user.id
     ).scalar() or 0
     
-    # Compute contracts_completed (distinct contract_ids from contributions)
-    from db.models import ContractContribution
-    contracts_completed = db.query(func.count(func.distinct(ContractContribution.contract_id))).filter(
-        ContractContribution.user_id == user.id
-    ).scalar() or 0
+    # Compute contracts_completed (distinct contracts the player has worked on)
+    from services.contract_counters import get_contracts_contributed_count
+    contracts_completed = get_contracts_contributed_count(db, user.id)
     
     # Calculate total food (sum of all resources with is_food=True)
     total_food = sum(
@@ -547,6 +546,7 @@ def handle_kingdom_checkin(db: Session, current_user: User, state: DBPlayerState
     else:
         user_kingdom.checkins_count += 1
         user_kingdom.last_checkin = datetime.utcnow()
+    bump_stats(db, current_user.id, total_checkins=1)
     
     # Update kingdom activity
     kingdom.last_activity = datetime.utcnow()
@@ -1183,6 +1183,7 @@ def get_world_map(
     positioned relative to a reference point (hometown or centroid of all visited).
     """
     from db import CityBoundary
+    from services.boundary_cache import deferred_boundary_columns, load_boundaries
     
     state = get_or_create_player_state(db, current_user)
     
@@ -1202,10 +1203,11 @@ def get_world_map(
     kingdom_ids = [uk.kingdom_id for uk in user_kingdoms]
     
     # Fetch city boundaries for these kingdoms
-    boundaries = db.query(CityBoundary).filter(
+    boundaries = db.query(CityBoundary).options(*deferred_boundary_columns()).filter(
         CityBoundary.osm_id.in_(kingdom_ids)
     ).all()
     boundaries_by_id = {b.osm_id: b for b in boundaries}
+    geometry_by_id = load_boundaries(db, boundaries)
     
     # Fetch kingdom data (names, ruler info)
     kingdoms_data = db.query(Kingdom).filter(
@@ -1227,10 +1229,11 @@ def get_world_map(
         
         # Use simplified boundary if available
         boundary_coords = []
-        if boundary.simplified_boundary_geojson:
-            boundary_coords = boundary.simplified_boundary_geojson.get("coordinates", [])
-        elif boundary.boundary_geojson:
-            boundary_coords = boundary.boundary_geojson.get("coordinates", [])
+        geometry = geometry_by_id.get(uk.kingdom_id)
+        if geometry:
+            boundary_coords = geometry.simplified_coordinates()
+            if boundary_coords is None:
+                boundary_coords = geometry.coordinates()
         
         valid_coords.append((boundary.center_lat, boundary.center_lon))
         
@@ -7,7 +7,7 @@ from sqlalchemy import desc
 from datetime import datetime, timedelta
 from typing import Optional
 
-from db import get_db, User, PlayerState, Kingdom, UnifiedContract, ContractContribution
+from db import get_db, User, PlayerState, Kingdom, UnifiedContract
 from db.models import KingdomIntelligence, UserKingdom
 from routers.auth import get_current_user
 from sqlalchemy import func
@@ -26,7 +26,9 @@ from schemas.player import (
     SubscriberSettings,
     SubscriberSettingsUpdate
 )
-from db.models.subscription import STYLE_PRESETS, get_style_colors
+from db.models.subscription import STYLE_PRESETS
+from services.contract_counters import get_contracts_contributed_count
+from services.player_hydrator import PlayerHydrator, style_card, get_titles
 from sqlalchemy import text
 
 
@@ -45,26 +47,21 @@ def _get_player_activity(db: Session, state: PlayerState) -> PlayerActivity:
     # These show as status WITHOUT spamming activity log
     
     # Check hunting session (highest priority - group activity)
-    # Check as creator first, then as participant
-    from db.models import HuntSession
-    active_hunt = db.query(HuntSession).filter(
-        HuntSession.created_by == state.user_id,
+    # Creators and participants are both in the hunt_participants index
+    from db.models import HuntSession, HuntSessionParticipant
+    active_hunt = db.query(HuntSession).join(
+        HuntSessionParticipant,
+        HuntSessionParticipant.hunt_id == HuntSession.hunt_id
+    ).filter(
+        HuntSessionParticipant.user_id == state.user_id,
+        HuntSessionParticipant.status.in_(['lobby', 'in_progress']),
         HuntSession.status.in_(['lobby', 'in_progress']),
         HuntSession.expires_at > now
+    ).order_by(
+        # A hunt they created wins over one they only joined, as before
+        (HuntSession.created_by == state.user_id).desc()
     ).first()
     
-    # Also check if they're a participant in someone else's hunt
-    if not active_hunt:
-        active_hunts = db.query(HuntSession).filter(
-            HuntSession.status.in_(['lobby', 'in_progress']),
-            HuntSession.expires_at > now
-        ).all()
-        for hunt in active_hunts:
-            participants = hunt.session_data.get("participants", {})
-            if str(state.user_id) in participants:
-                active_hunt = hunt
-                break
-    
     if active_hunt:
         hunt_status = "Waiting for hunters" if active_hunt.status == 'lobby' else "Tracking prey"
         return PlayerActivity(
@@ -146,9 +143,7 @@ def _get_player_activity(db: Session, state: PlayerState) -> PlayerActivity:
     ).first()
     
     if active_training:
-        actions_completed = db.query(func.count(ContractContribution.id)).filter(
-            ContractContribution.contract_id == active_training.id
-        ).scalar()
+        actions_completed = active_training.actions_completed
         return PlayerActivity(
             type="training",
             details=f"Training {active_training.type.capitalize()} ({actions_completed}/{active_training.actions_required})",
@@ -166,9 +161,7 @@ def _get_player_activity(db: Session, state: PlayerState) -> PlayerActivity:
     ).first()
     
     if active_crafting:
-        actions_completed = db.query(func.count(ContractContribution.id)).filter(
-            ContractContribution.contract_id == active_crafting.id
-        ).scalar()
+        actions_completed = active_crafting.actions_completed
         return PlayerActivity(
             type="crafting",
             details=f"Crafting T{active_crafting.tier} {active_crafting.type.capitalize()} ({actions_completed}/{active_crafting.actions_required})",
@@ -289,52 +282,16 @@ def _get_user_preferences(db: Session, user_id: int):
 
 def _get_style_preset(style_id: str) -> Optional[StylePreset]:
     """Convert style ID to StylePreset object."""
-    if not style_id:
-        return None
-    colors = get_style_colors(style_id)
-    if not colors.get("background"):
-        return None
-    return StylePreset(id=style_id, name=colors["name"], background_color=colors["background"], text_color=colors["text"])
+    card = style_card(style_id)
+    return StylePreset(**card) if card else None
 
 
-def _get_user_subscriber_customization(db: Session, user_id: int) -> Optional[SubscriberCustomization]:
-    """Get user's full subscriber customization."""
-    prefs = _get_user_preferences(db, user_id)
-    selected_title = _get_user_selected_title(db, user_id)
-    
-    if not prefs and not selected_title:
-        return None
-    
-    icon_style = _get_style_preset(prefs.icon_style) if prefs else None
-    card_style = _get_style_preset(prefs.card_style) if prefs else None
-    
-    if not icon_style and not card_style and not selected_title:
-        return None
-    
-    return SubscriberCustomization(icon_style=icon_style, card_style=card_style, selected_title=selected_title)
-
-
-def _get_user_selected_title(db: Session, user_id: int) -> Optional[TitleData]:
-    """Get user's selected achievement title."""
-    prefs = _get_user_preferences(db, user_id)
+def _get_selected_title(db: Session, prefs) -> Optional[TitleData]:
+    """Selected achievement title from already-loaded preferences (definitions are memoized)."""
     if not prefs or not prefs.selected_title_achievement_id:
         return None
-    
-    # Query the achievement definition
-    result = db.execute(text("""
-        SELECT id, display_name, icon
-        FROM achievement_definitions
-        WHERE id = :achievement_id
-    """), {"achievement_id": prefs.selected_title_achievement_id}).fetchone()
-    
-    if not result:
-        return None
-    
-    return TitleData(
-        achievement_id=result.id,
-        display_name=result.display_name,
-        icon=result.icon or "star.fill"
-    )
+    title = get_titles(db, [prefs.selected_title_achievement_id]).get(prefs.selected_title_achievement_id)
+    return TitleData(**title) if title else None
 
 
 @router.get("/in-kingdom/{kingdom_id}", response_model=PlayersInKingdomResponse)
@@ -597,14 +554,16 @@ def get_player_profile(
     - Achievements and history
     - Current activity and location
     """
-    user = db.query(User).filter(User.id == user_id, User.is_active == True).first()
-    if not user:
+    # User, state, membership and customization in one batch
+    card = PlayerHydrator(db, [user_id])
+    user = card.user(user_id)
+    if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Player not found"
         )
     
-    state = user.player_state
+    state = card.state(user_id)
     if not state:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -649,10 +608,8 @@ def get_player_profile(
         CoupEvent.attacker_victory == True
     ).scalar() or 0
     
-    # Count contracts completed (distinct contract_ids from contributions)
-    contracts_completed = db.query(func.count(func.distinct(ContractContribution.contract_id))).filter(
-        ContractContribution.user_id == user.id
-    ).scalar() or 0
+    # Count contracts completed (distinct contracts the player has worked on)
+    contracts_completed = get_contracts_contributed_count(db, user.id)
     
     # Sum total check-ins across all kingdoms
     total_checkins = db.query(func.sum(UserKingdom.checkins_count)).filter(
@@ -673,7 +630,8 @@ def get_player_profile(
     # Check if this is own profile or if target user has membership
     # Pets and achievements are only shown publicly for members
     is_own_profile = user.id == current_user.id
-    show_premium_content = is_own_profile or _has_membership(db, user.id)
+    is_subscriber = card.is_subscriber(user.id)
+    show_premium_content = is_own_profile or is_subscriber
     
     # Get pets (only if own profile or has membership)
     pets = []
@@ -736,8 +694,8 @@ def get_player_profile(
             )
     
     # Get subscriber customization data (server-driven)
-    is_subscriber = _has_membership(db, user.id)
-    subscriber_customization = _get_user_subscriber_customization(db, user.id) if is_subscriber else None
+    customization = card.customization(user.id)
+    subscriber_customization = SubscriberCustomization(**customization) if customization else None
     
     return PlayerPublicProfile(
         id=user.id,
@@ -779,7 +737,7 @@ def get_subscriber_settings(
     """Get current user's subscriber settings."""
     is_subscriber = _has_membership(db, current_user.id)
     prefs = _get_user_preferences(db, current_user.id)
-    selected_title = _get_user_selected_title(db, current_user.id)
+    selected_title = _get_selected_title(db, prefs)
     
     # Build available styles list
     available_styles = [
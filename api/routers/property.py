@@ -17,7 +17,7 @@ import uuid
 import random
 from datetime import datetime, timezone, timedelta
 
-from db import get_db, Property, User, Kingdom, UnifiedContract, ContractContribution, UserKingdom, PlayerItem
+from db import get_db, Property, User, Kingdom, UnifiedContract, UserKingdom, PlayerItem
 from db.models.inventory import PlayerInventory
 from routers.auth import get_current_user
 from routers.actions.utils import format_datetime_iso
@@ -568,9 +568,7 @@ def get_property_contracts_for_user(db: Session, user_id: int) -> list:
     
     result = []
     for contract in contracts:
-        actions_completed = db.query(func.count(ContractContribution.id)).filter(
-            ContractContribution.contract_id == contract.id
-        ).scalar()
+        actions_completed = contract.actions_completed
         
         # Get per-action costs for this specific option
         from_tier = (contract.tier or 1) - 1
@@ -1254,9 +1252,7 @@ def get_property_upgrade_status(
     ).first()
     
     if contract:
-        actions_completed = db.query(func.count(ContractContribution.id)).filter(
-            ContractContribution.contract_id == contract.id
-        ).scalar()
+        actions_completed = contract.actions_completed
         
         # Get per-action costs for this specific option
         contract_costs = get_upgrade_costs_full(contract.tier - 1, actions_required=contract.actions_required, option_id=contract.option_id)
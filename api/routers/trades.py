@@ -28,6 +28,7 @@ from routers.auth import get_current_user
 from routers.resources import RESOURCES
 from routers.actions.utils import format_datetime_iso
 from routers.actions.tax_utils import apply_kingdom_tax
+from services.player_stats import bump_stats_many
 from websocket.broadcast import notify_user
 
 
@@ -599,6 +600,7 @@ def accept_trade_offer(
     # Mark as accepted
     offer.status = TradeOfferStatus.ACCEPTED.value
     offer.responded_at = datetime.now(timezone.utc)
+    bump_stats_many(db, {offer.sender_id: {"direct_trades": 1}, offer.recipient_id: {"direct_trades": 1}})
     db.commit()
     
     # Notify sender that offer was accepted
@@ -9,10 +9,9 @@ Crafting uses the contract system like everything else in the game:
 """
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from datetime import datetime, timedelta
 
-from db import get_db, User, Property, PlayerItem, UnifiedContract, ContractContribution
+from db import get_db, User, Property, PlayerItem, UnifiedContract
 from db.models.inventory import PlayerInventory
 from routers.auth import get_current_user
 from routers.resources import RESOURCES
@@ -27,6 +26,8 @@ from routers.actions.utils import (
 )
 from routers.actions.constants import CRAFTING_BASE_COOLDOWN
 from config import DEV_MODE
+from services.contract_counters import record_contribution
+from services.player_stats import bump_stats
 
 
 router = APIRouter(prefix="/workshop", tags=["workshop"])
@@ -193,9 +194,7 @@ def get_workshop_status(
     active_contract_data = None
     
     if active_contract:
-        actions_completed = db.query(func.count(ContractContribution.id)).filter(
-            ContractContribution.contract_id == active_contract.id
-        ).scalar()
+        actions_completed = active_contract.actions_completed
         
         item_config = CRAFTABLE_ITEMS.get(active_contract.type, {})
         
@@ -413,24 +412,21 @@ def work_on_craft(
     
     # Add contribution
     xp_earned = 15
-    contribution = ContractContribution(
-        contract_id=contract.id,
-        user_id=current_user.id,
-        xp_earned=xp_earned
-    )
-    db.add(contribution)
+    _, actions_completed, _ = record_contribution(db, contract, current_user.id, xp_earned=xp_earned)
     state.experience += xp_earned
     
-    # Count actions
-    actions_completed = db.query(func.count(ContractContribution.id)).filter(
-        ContractContribution.contract_id == contract.id
-    ).scalar() + 1  # +1 for the one we just added
-    
     is_complete = actions_completed >= contract.actions_required
     new_item = None
     
     if is_complete:
         contract.completed_at = datetime.utcnow()
+        bump_stats(
+            db, current_user.id,
+            items_crafted=1,
+            weapons_crafted=int(contract.type in WEAPON_ITEM_IDS),
+            armor_crafted=int(contract.type in ARMOR_ITEM_IDS),
+            craft_tier_5_item=int(contract.tier == 5)
+        )
         
         # Create the item
         new_item = PlayerItem(
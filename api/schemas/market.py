@@ -132,13 +132,34 @@ class PriceHistoryEntry(BaseModel):
         return serialize_datetime_with_z(dt)
 
 
+class PriceCandle(BaseModel):
+    """OHLCV candle for price charts"""
+    timestamp: datetime  # Start of the bucket
+    open: int
+    high: int
+    low: int
+    close: int
+    volume: int
+    vwap: Optional[float] = None
+    trades: int = 0
+    
+    @field_serializer('timestamp')
+    @classmethod
+    def serialize_dt(cls, dt: Optional[datetime]) -> Optional[str]:
+        return serialize_datetime_with_z(dt)
+
+
 class PriceHistory(BaseModel):
     """Price history for an item"""
     item_type: ItemType
     kingdom_id: str
-    transactions: List[PriceHistoryEntry]
+    transactions: List[PriceHistoryEntry]  # Most recent trades only (bounded)
+    
+    # Chart data for the whole window
+    interval: Optional[str] = None  # "1m" or "1h"
+    candles: List[PriceCandle] = []
     
-    # Statistics
+    # Statistics (whole window, from candles)
     average_price: Optional[float] = None
     min_price: Optional[int] = None
     max_price: Optional[int] = None
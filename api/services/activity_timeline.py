@@ -0,0 +1,302 @@
+"""
+Friend activity timelines - fan-out on write
+============================================
+Friend feeds used to be assembled at read time: every read scanned
+player_activity_log for every friend (window functions included), so the
+cost grew with friend count x history. With ACTIVITY_TIMELINES=true,
+log_activity also writes the new row's id into an inbox per reader
+(activity_timeline: the author plus every accepted friend), and a feed read
+is one range scan of the reader's inbox primary key, keyset-paginated on
+activity id.
+
+- Inboxes are capped at TIMELINE_MAX_ENTRIES. Every TIMELINE_TRIM_EVERY-th
+  activity id also trims its readers' inboxes, so the trim cost is amortized.
+- Accepting a friendship pulls the last TIMELINE_BACKFILL_ENTRIES of each
+  other's activity into both inboxes; removing it deletes them again.
+- Repeats of the same action bump the existing row (repeat_count), so they
+  never fan out.
+
+Repeat dedup used to query "last row for this user" on every action. It now
+reads a per-process LRU of each user's newest activity and bumps that row with
+one guarded UPDATE (no-op if another process wrote a newer row meanwhile), so
+a stale cache only ever costs a missed dedup, never a wrong one.
+
+With the flag off, reads fall back to an IN query over friends + self.
+Backfill for existing data: db/migrations/add_activity_timeline.sql
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import exists, func, or_, text, update
+from typing import List, Optional
+from collections import OrderedDict
+from datetime import datetime
+import os
+import threading
+
+from db import PlayerActivityLog, ActivityTimelineEntry, Friend
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+ACTIVITY_TIMELINES_ENABLED = os.getenv("ACTIVITY_TIMELINES", "false").lower() == "true"
+
+TIMELINE_MAX_ENTRIES = int(os.getenv("ACTIVITY_TIMELINE_MAX_ENTRIES", "500"))
+TIMELINE_TRIM_EVERY = 50          # Trim readers' inboxes on every Nth activity id
+TIMELINE_BACKFILL_ENTRIES = 50    # Pulled into both inboxes when a friendship is accepted
+
+TIMELINE_EXCLUDED_TYPES = ("travel_fee",)       # Never shown in friend feeds
+NO_DEDUP_TYPES = ("rare_loot", "achievement")   # Always logged as their own row
+
+LAST_ACTIVITY_CACHE_MAX_ENTRIES = int(os.getenv("LAST_ACTIVITY_CACHE_MAX_ENTRIES", "20000"))
+
+
+# ============================================================
+# LAST-ACTIVITY CACHE (repeat dedup)
+# ============================================================
+
+class LastActivity:
+    """A user's newest player_activity_log row, as far as this process knows"""
+
+    __slots__ = ("activity_id", "action_type", "description")
+
+    def __init__(self, activity_id: int, action_type: str, description: str):
+        self.activity_id = activity_id
+        self.action_type = action_type
+        self.description = description
+
+
+class LastActivityCache:
+    """Thread-safe LRU of user_id -> LastActivity"""
+
+    def __init__(self, max_entries: int = LAST_ACTIVITY_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, LastActivity]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Optional[LastActivity]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry
+
+    def put(self, user_id: int, entry: LastActivity) -> None:
+        with self._lock:
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Shared by every request handled by this process
+last_activity_cache = LastActivityCache()
+
+
+def bump_last_activity(db: Session, user_id: int, action_type: str, description: str, amount: Optional[int] = None) -> bool:
+    """
+    If the user's newest activity is the same action, bump its repeat_count
+    (and amount, timestamp) and return True. Does not commit.
+
+    One UPDATE on a cache hit. The UPDATE only applies while that row is still
+    the user's newest, so a stale cache entry just means a new row is written.
+    """
+    last = last_activity_cache.get(user_id)
+    if last is None:
+        row = db.query(
+            PlayerActivityLog.id, PlayerActivityLog.action_type, PlayerActivityLog.description
+        ).filter(
+            PlayerActivityLog.user_id == user_id
+        ).order_by(PlayerActivityLog.id.desc()).first()
+        if row is None:
+            return False
+        last = LastActivity(*row)
+        last_activity_cache.put(user_id, last)
+
+    if last.action_type != action_type or last.description != description:
+        return False
+
+    values = {
+        "repeat_count": PlayerActivityLog.repeat_count + 1,
+        "created_at": datetime.utcnow(),
+    }
+    if amount:
+        values["amount"] = func.coalesce(PlayerActivityLog.amount, 0) + amount
+
+    newer = exists().where(
+        PlayerActivityLog.user_id == user_id,
+        PlayerActivityLog.id > last.activity_id
+    )
+    result = db.execute(
+        update(PlayerActivityLog)
+        .where(PlayerActivityLog.id == last.activity_id, ~newer)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        return True
+
+    last_activity_cache.invalidate(user_id)
+    return False
+
+
+def remember_activity(activity: PlayerActivityLog) -> None:
+    """Record a freshly flushed row as the user's newest activity"""
+    last_activity_cache.put(
+        activity.user_id,
+        LastActivity(activity.id, activity.action_type, activity.description)
+    )
+
+
+# ============================================================
+# FAN-OUT (writes)
+# ============================================================
+
+# Readers of an author's activity: the author, plus accepted friends unless private
+_READERS_CTE = """
+    WITH readers AS (
+        SELECT CAST(:author AS BIGINT) AS owner_user_id
+        UNION
+        SELECT CASE WHEN f.user_id = :author THEN f.friend_user_id ELSE f.user_id END
+        FROM friends f
+        WHERE (f.user_id = :author OR f.friend_user_id = :author)
+          AND f.status = 'accepted'
+          AND :shared
+    )
+"""
+
+_FAN_OUT_SQL = text(_READERS_CTE + """
+    INSERT INTO activity_timeline (owner_user_id, activity_id, author_user_id, created_at)
+    SELECT owner_user_id, :activity_id, :author, :created_at FROM readers
+    ON CONFLICT DO NOTHING
+""")
+
+# Drop everything older than each reader's TIMELINE_MAX_ENTRIES-th newest entry
+_TRIM_SQL = text(_READERS_CTE + """
+    DELETE FROM activity_timeline t
+    USING readers r
+    WHERE t.owner_user_id = r.owner_user_id
+      AND t.activity_id <= (
+          SELECT x.activity_id FROM activity_timeline x
+          WHERE x.owner_user_id = r.owner_user_id
+          ORDER BY x.activity_id DESC
+          OFFSET :cap LIMIT 1
+      )
+""")
+
+_BACKFILL_SQL = text("""
+    INSERT INTO activity_timeline (owner_user_id, activity_id, author_user_id, created_at)
+    SELECT :owner, id, user_id, created_at
+    FROM player_activity_log
+    WHERE user_id = :author
+      AND visibility <> 'private'
+      AND action_type <> ALL(:excluded)
+    ORDER BY id DESC
+    LIMIT :limit
+    ON CONFLICT DO NOTHING
+""")
+
+
+def fan_out(db: Session, activity: PlayerActivityLog) -> None:
+    """Write a flushed activity into its readers' inboxes. Does not commit."""
+    if not ACTIVITY_TIMELINES_ENABLED or activity.action_type in TIMELINE_EXCLUDED_TYPES:
+        return
+    params = {
+        "author": activity.user_id,
+        "shared": activity.visibility != "private",
+        "activity_id": activity.id,
+        "created_at": activity.created_at or datetime.utcnow(),
+    }
+    db.execute(_FAN_OUT_SQL, params)
+    if activity.id % TIMELINE_TRIM_EVERY == 0:
+        db.execute(_TRIM_SQL, {**params, "cap": TIMELINE_MAX_ENTRIES})
+
+
+def on_friendship_accepted(db: Session, user_a: int, user_b: int) -> None:
+    """Pull each friend's recent activity into the other's inbox. Does not commit."""
+    if not ACTIVITY_TIMELINES_ENABLED:
+        return
+    for owner, author in ((user_a, user_b), (user_b, user_a)):
+        db.execute(_BACKFILL_SQL, {
+            "owner": owner,
+            "author": author,
+            "excluded": list(TIMELINE_EXCLUDED_TYPES),
+            "limit": TIMELINE_BACKFILL_ENTRIES,
+        })
+
+
+def on_friendship_removed(db: Session, user_a: int, user_b: int) -> None:
+    """Remove each (former) friend's activity from the other's inbox. Does not commit."""
+    if not ACTIVITY_TIMELINES_ENABLED:
+        return
+    db.query(ActivityTimelineEntry).filter(
+        or_(
+            (ActivityTimelineEntry.owner_user_id == user_a) & (ActivityTimelineEntry.author_user_id == user_b),
+            (ActivityTimelineEntry.owner_user_id == user_b) & (ActivityTimelineEntry.author_user_id == user_a)
+        )
+    ).delete(synchronize_session=False)
+
+
+# ============================================================
+# READS
+# ============================================================
+
+def get_friend_ids(db: Session, user_id: int) -> List[int]:
+    """Accepted friends of user_id"""
+    rows = db.query(Friend.user_id, Friend.friend_user_id).filter(
+        or_(Friend.user_id == user_id, Friend.friend_user_id == user_id),
+        Friend.status == 'accepted'
+    ).all()
+    return list({b if a == user_id else a for a, b in rows})
+
+
+def read_timeline(
+    db: Session,
+    user_id: int,
+    limit: int = 50,
+    after_id: Optional[int] = None,
+    before_id: Optional[int] = None
+) -> List[PlayerActivityLog]:
+    """
+    Friends' and own activity, newest first, keyset-paginated on activity id:
+    after_id returns only newer rows (polling), before_id only older ones (scrolling).
+    """
+    if ACTIVITY_TIMELINES_ENABLED:
+        # One range scan of the reader's inbox
+        id_column = ActivityTimelineEntry.activity_id
+        query = db.query(PlayerActivityLog).join(
+            ActivityTimelineEntry, ActivityTimelineEntry.activity_id == PlayerActivityLog.id
+        ).filter(ActivityTimelineEntry.owner_user_id == user_id)
+    else:
+        id_column = PlayerActivityLog.id
+        author_ids = get_friend_ids(db, user_id) + [user_id]
+        query = db.query(PlayerActivityLog).filter(
+            PlayerActivityLog.user_id.in_(author_ids),
+            ~PlayerActivityLog.action_type.in_(TIMELINE_EXCLUDED_TYPES),
+            or_(PlayerActivityLog.visibility != 'private', PlayerActivityLog.user_id == user_id)
+        )
+
+    if after_id:
+        query = query.filter(id_column > after_id)
+    if before_id:
+        query = query.filter(id_column < before_id)
+    return query.order_by(id_column.desc()).limit(limit).all()
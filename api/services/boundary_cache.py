@@ -0,0 +1,313 @@
+"""
+Boundary cache - Process-level cache of decoded city boundaries
+
+City boundaries are big JSONB blobs that never change once cached, but
+/cities/current, /cities/neighbors, /cities/boundaries/batch and
+/player/world-map used to pull and decode them from Postgres on every call.
+
+This cache keeps decoded polygons in memory (compact array('d') buffers plus
+a precomputed bbox) keyed by osm_id:
+- Queries load CityBoundary rows with the boundary columns DEFERRED
+- load_boundaries() serves hits from memory and fetches only the misses
+- Entries carry the row's boundary_updated_at, so a rewritten row is a miss
+- LRU eviction keeps the cache under BOUNDARY_CACHE_MAX_BYTES
+
+Warm Lambda containers serve repeat lookups for popular cities with no
+JSONB transfer at all.
+"""
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, defer
+from typing import List, Optional, Dict, Iterable
+from collections import OrderedDict
+from datetime import datetime
+from array import array
+import os
+import threading
+
+from db import CityBoundary
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+# Upper bound on decoded boundary data held per process
+BOUNDARY_CACHE_MAX_BYTES = int(os.getenv("BOUNDARY_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Rough per-entry overhead (object, dict slot, OrderedDict node) on top of the buffers
+_ENTRY_OVERHEAD_BYTES = 256
+
+
+# ============================================================
+# CACHED BOUNDARY
+# ============================================================
+
+def _pack(coords: List[List[float]]) -> array:
+    """Pack [[lat, lon], ...] into a flat [lat0, lon0, lat1, lon1, ...] buffer"""
+    packed = array('d')
+    for point in coords:
+        packed.append(point[0])
+        packed.append(point[1])
+    return packed
+
+
+def _unpack(packed: array) -> List[List[float]]:
+    """Unpack a flat buffer back into fresh [[lat, lon], ...] lists"""
+    return [[packed[i], packed[i + 1]] for i in range(0, len(packed), 2)]
+
+
+class CachedBoundary:
+    """Decoded, prepared boundary polygon for one city"""
+
+    __slots__ = ("osm_id", "version", "boundary", "simplified", "bbox", "nbytes")
+
+    def __init__(
+        self,
+        osm_id: str,
+        version: Optional[datetime],
+        boundary: List[List[float]],
+        simplified: Optional[List[List[float]]]
+    ):
+        self.osm_id = osm_id
+        self.version = version
+        self.boundary = _pack(boundary)
+        # None = no simplified boundary stored yet (needs backfill)
+        self.simplified = _pack(simplified) if simplified is not None else None
+
+        if boundary:
+            lats = self.boundary[0::2]
+            lons = self.boundary[1::2]
+            self.bbox = (min(lats), max(lats), min(lons), max(lons))
+        else:
+            self.bbox = None
+
+        self.nbytes = _ENTRY_OVERHEAD_BYTES + self.boundary.itemsize * len(self.boundary)
+        if self.simplified is not None:
+            self.nbytes += self.simplified.itemsize * len(self.simplified)
+
+    @classmethod
+    def from_geojson(cls, osm_id: str, version: Optional[datetime], boundary_geojson, simplified_geojson) -> "CachedBoundary":
+        boundary = boundary_geojson.get("coordinates", []) if boundary_geojson else []
+        simplified = simplified_geojson.get("coordinates", []) if simplified_geojson else None
+        return cls(osm_id, version, boundary, simplified)
+
+    @property
+    def point_count(self) -> int:
+        return len(self.boundary) // 2
+
+    def coordinates(self) -> List[List[float]]:
+        """Full boundary as [[lat, lon], ...]"""
+        return _unpack(self.boundary)
+
+    def simplified_coordinates(self) -> Optional[List[List[float]]]:
+        """Stored simplified boundary as [[lat, lon], ...], None if not computed yet"""
+        if self.simplified is None:
+            return None
+        return _unpack(self.simplified)
+
+    def contains(self, lat: float, lon: float) -> bool:
+        """
+        Point-in-polygon test on the full boundary.
+        Same ray cast as city_service._is_point_in_polygon, with a bbox reject first.
+        """
+        n = self.point_count
+        if n < 3:
+            return False
+        min_lat, max_lat, min_lon, max_lon = self.bbox
+        if lat < min_lat or lat > max_lat or lon < min_lon or lon > max_lon:
+            return False
+
+        coords = self.boundary
+        x, y = lat, lon
+        inside = False
+        p1x, p1y = coords[0], coords[1]
+        for i in range(1, n + 1):
+            j = (i % n) * 2
+            p2x, p2y = coords[j], coords[j + 1]
+            if y > min(p1y, p2y):
+                if y <= max(p1y, p2y):
+                    if x <= max(p1x, p2x):
+                        if p1y != p2y:
+                            xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
+                        if p1x == p2x or x <= xinters:
+                            inside = not inside
+            p1x, p1y = p2x, p2y
+        return inside
+
+
+    def crosses_rect(self, min_lat: float, max_lat: float, min_lon: float, max_lon: float) -> bool:
+        """
+        True if any boundary edge touches the rectangle.
+        If no edge does, every point of the rectangle is on the same side of the
+        polygon (all inside or all outside) - used by the location cell cache.
+        """
+        n = self.point_count
+        if n < 2:
+            return False
+        b_min_lat, b_max_lat, b_min_lon, b_max_lon = self.bbox
+        if b_max_lat < min_lat or b_min_lat > max_lat or b_max_lon < min_lon or b_min_lon > max_lon:
+            return False
+
+        coords = self.boundary
+        for i in range(n):
+            j = ((i + 1) % n) * 2
+            if _segment_touches_rect(
+                coords[i * 2], coords[i * 2 + 1], coords[j], coords[j + 1],
+                min_lat, max_lat, min_lon, max_lon
+            ):
+                return True
+        return False
+
+
+def _segment_touches_rect(x1, y1, x2, y2, min_x, max_x, min_y, max_y) -> bool:
+    """Liang-Barsky clip: does segment (x1,y1)-(x2,y2) touch the closed rectangle?"""
+    dx = x2 - x1
+    dy = y2 - y1
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x1 - min_x), (dx, max_x - x1), (-dy, y1 - min_y), (dy, max_y - y1)):
+        if p == 0:
+            if q < 0:
+                return False
+        else:
+            t = q / p
+            if p < 0:
+                if t > t1:
+                    return False
+                t0 = max(t0, t)
+            else:
+                if t < t0:
+                    return False
+                t1 = min(t1, t)
+    return True
+
+
+# ============================================================
+# LRU CACHE
+# ============================================================
+
+class BoundaryCache:
+    """Thread-safe LRU of CachedBoundary entries bounded by total bytes"""
+
+    def __init__(self, max_bytes: int = BOUNDARY_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CachedBoundary]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, osm_id: str, version: Optional[datetime]) -> Optional[CachedBoundary]:
+        """Get entry if cached at this version (stale versions count as a miss)"""
+        with self._lock:
+            entry = self._entries.get(osm_id)
+            if entry is None or entry.version != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(osm_id)
+            self.hits += 1
+            return entry
+
+    def put(self, entry: CachedBoundary) -> None:
+        with self._lock:
+            existing = self._entries.pop(entry.osm_id, None)
+            if existing is not None:
+                self._bytes -= existing.nbytes
+            if entry.nbytes > self.max_bytes:
+                return
+            self._entries[entry.osm_id] = entry
+            self._bytes += entry.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def invalidate(self, osm_id: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(osm_id, None)
+            if entry is not None:
+                self._bytes -= entry.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Shared by every request handled by this process
+boundary_cache = BoundaryCache()
+
+
+@event.listens_for(CityBoundary, "after_update")
+def _invalidate_rewritten_boundary(mapper, connection, target):
+    """Drop our copy as soon as this process rewrites a boundary row"""
+    attrs = inspect(target).attrs
+    if any(attrs[column].history.has_changes() for column in ("boundary_geojson", "simplified_boundary_geojson")):
+        boundary_cache.invalidate(target.osm_id)
+
+
+# ============================================================
+# LOADING
+# ============================================================
+
+def deferred_boundary_columns() -> list:
+    """Query options that skip the boundary JSONB columns (served by load_boundaries)"""
+    return [
+        defer(CityBoundary.boundary_geojson),
+        defer(CityBoundary.simplified_boundary_geojson),
+    ]
+
+
+def load_boundaries(db: Session, cities: Iterable[CityBoundary]) -> Dict[str, CachedBoundary]:
+    """
+    Get decoded boundaries for CityBoundary rows, keyed by osm_id.
+
+    Cache hits cost nothing. Rows that already have their boundary columns
+    loaded are decoded in place; the remaining misses are fetched in ONE query.
+    """
+    result = {}
+    missing = {}
+
+    for city in cities:
+        entry = boundary_cache.get(city.osm_id, city.boundary_updated_at)
+        if entry is not None:
+            result[city.osm_id] = entry
+            continue
+
+        unloaded = inspect(city).unloaded
+        if "boundary_geojson" not in unloaded and "simplified_boundary_geojson" not in unloaded:
+            entry = CachedBoundary.from_geojson(
+                city.osm_id, city.boundary_updated_at,
+                city.boundary_geojson, city.simplified_boundary_geojson
+            )
+            boundary_cache.put(entry)
+            result[city.osm_id] = entry
+        else:
+            missing[city.osm_id] = city
+
+    if missing:
+        rows = db.query(
+            CityBoundary.osm_id,
+            CityBoundary.boundary_updated_at,
+            CityBoundary.boundary_geojson,
+            CityBoundary.simplified_boundary_geojson
+        ).filter(CityBoundary.osm_id.in_(list(missing.keys()))).all()
+
+        for osm_id, version, boundary_geojson, simplified_geojson in rows:
+            entry = CachedBoundary.from_geojson(osm_id, version, boundary_geojson, simplified_geojson)
+            boundary_cache.put(entry)
+            result[osm_id] = entry
+
+    return result
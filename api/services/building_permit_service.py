@@ -21,7 +21,7 @@ from typing import Dict, Optional, Tuple
 from sqlalchemy.orm import Session
 
 from db import Kingdom, BuildingCatchup, BuildingPermit, User, PlayerState
-from routers.alliances import are_empires_allied
+from routers.alliances import are_empires_allied, get_allied_empire_ids
 from services.catchup_service import EXEMPT_BUILDINGS
 
 
@@ -79,16 +79,92 @@ def get_valid_permit(db: Session, user_id: int, kingdom_id: str, building_type:
     return permit
 
 
+class BuildingAccessPrefetch:
+    """
+    Per-request cache of everything check_building_access reads for ONE player.
+    
+    Checking access for every permit building across 20+ kingdoms used to run
+    the hometown, catchup, alliance and permit queries per building per kingdom.
+    With a prefetch each of those runs at most once per request.
+    """
+    
+    def __init__(self, db: Session, user: User, state: Optional[PlayerState]):
+        self.db = db
+        self.user = user
+        self.state = state
+        self._hometown_loaded = False
+        self._hometown = None
+        self._catchups = None
+        self._permits = None
+        self._allied_empire_ids = None
+    
+    @property
+    def hometown(self) -> Optional[Kingdom]:
+        if not self._hometown_loaded:
+            self._hometown_loaded = True
+            if self.state and self.state.hometown_kingdom_id:
+                self._hometown = self.db.query(Kingdom).filter(Kingdom.id == self.state.hometown_kingdom_id).first()
+        return self._hometown
+    
+    def hometown_building_level(self, building_type: str) -> int:
+        """Same as get_hometown_building_level"""
+        if not self.hometown:
+            return 0
+        return getattr(self.hometown, f"{building_type}_level", 0) or 0
+    
+    def catchup(self, kingdom_id: str, building_type: str) -> Optional[BuildingCatchup]:
+        if self._catchups is None:
+            self._catchups = {}
+            for catchup in self.db.query(BuildingCatchup).filter(BuildingCatchup.user_id == self.user.id).all():
+                self._catchups.setdefault((catchup.kingdom_id, catchup.building_type), []).append(catchup)
+        rows = self._catchups.get((kingdom_id, building_type.lower()), [])
+        return rows[0] if rows else None
+    
+    def has_active_catchup(self, kingdom_id: str, building_type: str) -> bool:
+        """Same as has_active_catchup"""
+        self.catchup(kingdom_id, building_type)
+        for catchup in self._catchups.get((kingdom_id, building_type.lower()), []):
+            if catchup.completed_at is None:
+                return catchup.actions_completed < catchup.actions_required
+        return False
+    
+    def valid_permit(self, kingdom_id: str, building_type: str) -> Optional[BuildingPermit]:
+        """Same as get_valid_permit"""
+        if self._permits is None:
+            self._permits = {}
+            for permit in self.db.query(BuildingPermit).filter(
+                BuildingPermit.user_id == self.user.id,
+                BuildingPermit.expires_at > datetime.utcnow()
+            ).all():
+                self._permits.setdefault((permit.kingdom_id, permit.building_type), permit)
+        return self._permits.get((kingdom_id, building_type.lower()))
+    
+    def is_allied_with(self, empire_id: str) -> bool:
+        """Same as are_empires_allied(hometown empire, empire_id)"""
+        if not self.hometown:
+            return False
+        hometown_empire_id = get_kingdom_empire_id(self.hometown)
+        if hometown_empire_id == empire_id:
+            return True
+        if self._allied_empire_ids is None:
+            self._allied_empire_ids = set(get_allied_empire_ids(self.db, hometown_empire_id))
+        return empire_id in self._allied_empire_ids
+
+
 def check_building_access(
     db: Session,
     user: User,
     state: PlayerState,
     current_kingdom: Kingdom,
-    building_type: str
+    building_type: str,
+    prefetch: Optional[BuildingAccessPrefetch] = None
 ) -> Dict:
     """
     Master helper function to check if a player can access a building.
     
+    Pass a BuildingAccessPrefetch when checking many buildings/kingdoms for
+    the same player in one request.
+    
     Returns a dict with all the information needed for UI and access control:
     {
         "can_access": bool,           # Final verdict - can they use this building?
@@ -138,7 +214,10 @@ def check_building_access(
         return result
     
     # Get hometown info
-    hometown_level = get_hometown_building_level(db, state, building_type)
+    if prefetch:
+        hometown_level = prefetch.hometown_building_level(building_type)
+    else:
+        hometown_level = get_hometown_building_level(db, state, building_type)
     result["hometown_building_level"] = hometown_level
     result["hometown_has_building"] = hometown_level > 0
     
@@ -155,12 +234,19 @@ def check_building_access(
         
         # Check catchup for hometown
         if building_type not in EXEMPT_BUILDINGS:
-            if has_active_catchup(db, user.id, current_kingdom.id, building_type):
-                catchup = db.query(BuildingCatchup).filter(
-                    BuildingCatchup.user_id == user.id,
-                    BuildingCatchup.kingdom_id == current_kingdom.id,
-                    BuildingCatchup.building_type == building_type.lower()
-                ).first()
+            if prefetch:
+                active_catchup = prefetch.has_active_catchup(current_kingdom.id, building_type)
+            else:
+                active_catchup = has_active_catchup(db, user.id, current_kingdom.id, building_type)
+            if active_catchup:
+                if prefetch:
+                    catchup = prefetch.catchup(current_kingdom.id, building_type)
+                else:
+                    catchup = db.query(BuildingCatchup).filter(
+                        BuildingCatchup.user_id == user.id,
+                        BuildingCatchup.kingdom_id == current_kingdom.id,
+                        BuildingCatchup.building_type == building_type.lower()
+                    ).first()
                 result["has_active_catchup"] = True
                 result["catchup_actions_remaining"] = catchup.actions_remaining if catchup else 0
                 result["can_access"] = False
@@ -172,7 +258,9 @@ def check_building_access(
         return result
     
     # Not hometown - check alliance status
-    if state and state.hometown_kingdom_id:
+    if prefetch:
+        result["is_allied"] = prefetch.is_allied_with(get_kingdom_empire_id(current_kingdom))
+    elif state and state.hometown_kingdom_id:
         hometown = db.query(Kingdom).filter(Kingdom.id == state.hometown_kingdom_id).first()
         if hometown:
             hometown_empire_id = get_kingdom_empire_id(hometown)
@@ -190,12 +278,19 @@ def check_building_access(
     
     # BLOCKER CHECK 2: Cannot have active catchup in hometown
     if state and state.hometown_kingdom_id:
-        if has_active_catchup(db, user.id, state.hometown_kingdom_id, building_type):
-            catchup = db.query(BuildingCatchup).filter(
-                BuildingCatchup.user_id == user.id,
-                BuildingCatchup.kingdom_id == state.hometown_kingdom_id,
-                BuildingCatchup.building_type == building_type.lower()
-            ).first()
+        if prefetch:
+            active_catchup = prefetch.has_active_catchup(state.hometown_kingdom_id, building_type)
+        else:
+            active_catchup = has_active_catchup(db, user.id, state.hometown_kingdom_id, building_type)
+        if active_catchup:
+            if prefetch:
+                catchup = prefetch.catchup(state.hometown_kingdom_id, building_type)
+            else:
+                catchup = db.query(BuildingCatchup).filter(
+                    BuildingCatchup.user_id == user.id,
+                    BuildingCatchup.kingdom_id == state.hometown_kingdom_id,
+                    BuildingCatchup.building_type == building_type.lower()
+                ).first()
             result["has_active_catchup"] = True
             result["catchup_actions_remaining"] = catchup.actions_remaining if catchup else 0
             result["can_access"] = False
@@ -215,7 +310,10 @@ def check_building_access(
     result["needs_permit"] = True
     
     # Check for existing valid permit
-    permit = get_valid_permit(db, user.id, current_kingdom.id, building_type)
+    if prefetch:
+        permit = prefetch.valid_permit(current_kingdom.id, building_type)
+    else:
+        permit = get_valid_permit(db, user.id, current_kingdom.id, building_type)
     if permit:
         result["has_valid_permit"] = True
         result["permit_expires_at"] = permit.expires_at
@@ -21,7 +21,7 @@ from sqlalchemy import and_, func
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
-from db import User, Kingdom, BuildingCatchup, ContractContribution, UnifiedContract
+from db import User, Kingdom, BuildingCatchup, ContractContributorCount, UnifiedContract
 
 
 # ============================================================
@@ -92,11 +92,11 @@ def get_building_contributions(db: Session, user_id: int, kingdom_id: str, build
     """
     from sqlalchemy import func as sql_func
     
-    total = db.query(sql_func.count(ContractContribution.id)).join(
+    total = db.query(sql_func.sum(ContractContributorCount.actions)).join(
         UnifiedContract,
-        ContractContribution.contract_id == UnifiedContract.id
+        ContractContributorCount.contract_id == UnifiedContract.id
     ).filter(
-        ContractContribution.user_id == user_id,
+        ContractContributorCount.user_id == user_id,
         UnifiedContract.kingdom_id == kingdom_id,
         UnifiedContract.category == 'kingdom_building',
         func.lower(UnifiedContract.type) == building_type.lower()
@@ -105,6 +105,44 @@ def get_building_contributions(db: Session, user_id: int, kingdom_id: str, build
     return total
 
 
+def get_catchup_progress_batch(db: Session, user_id: int, kingdom_id: str) -> Dict[str, int]:
+    """
+    Get total catch-up progress for EVERY building type in a kingdom in two queries.
+    
+    Same sum as get_catchup_status (contract contributions + catchup actions),
+    keyed by lowercase building_type. Pass the result to get_catchup_status(progress=...).
+    """
+    from sqlalchemy import func as sql_func
+    
+    progress: Dict[str, int] = {}
+    
+    contributions = db.query(
+        func.lower(UnifiedContract.type),
+        sql_func.sum(ContractContributorCount.actions)
+    ).join(
+        UnifiedContract,
+        ContractContributorCount.contract_id == UnifiedContract.id
+    ).filter(
+        ContractContributorCount.user_id == user_id,
+        UnifiedContract.kingdom_id == kingdom_id,
+        UnifiedContract.category == 'kingdom_building'
+    ).group_by(func.lower(UnifiedContract.type)).all()
+    for building_type, count in contributions:
+        progress[building_type] = progress.get(building_type, 0) + (count or 0)
+    
+    catchups = db.query(
+        BuildingCatchup.building_type,
+        func.coalesce(func.sum(BuildingCatchup.actions_completed), 0)
+    ).filter(
+        BuildingCatchup.user_id == user_id,
+        BuildingCatchup.kingdom_id == kingdom_id
+    ).group_by(BuildingCatchup.building_type).all()
+    for building_type, actions in catchups:
+        progress[building_type] = progress.get(building_type, 0) + (actions or 0)
+    
+    return progress
+
+
 def has_contributed_to_building(db: Session, user_id: int, kingdom_id: str, building_type: str) -> bool:
     """Check if user has contributed at all to this building."""
     return get_building_contributions(db, user_id, kingdom_id, building_type) > 0
@@ -116,11 +154,15 @@ def get_catchup_status(
     kingdom_id: str, 
     building_type: str,
     building_level: int,
-    building_skill: int = 0
+    building_skill: int = 0,
+    progress: Optional[Dict[str, int]] = None
 ) -> Dict:
     """
     Check if a player needs catch-up for a specific building.
     
+    progress: Optional prefetched result of get_catchup_progress_batch for this
+    user/kingdom (skips the two per-building queries).
+    
     ALWAYS sums BOTH sources of progress:
     - contract_contributions: actions done on normal building contracts
     - building_catchups: actions done on dedicated catchup contracts
@@ -156,15 +198,18 @@ def get_catchup_status(
         }
     
     # ALWAYS sum both sources of progress
-    contributions = get_building_contributions(db, user_id, kingdom_id, building_type)
-    
-    catchup_actions = db.query(func.coalesce(func.sum(BuildingCatchup.actions_completed), 0)).filter(
-        BuildingCatchup.user_id == user_id,
-        BuildingCatchup.kingdom_id == kingdom_id,
-        BuildingCatchup.building_type == building_type
-    ).scalar() or 0
-    
-    total_progress = contributions + catchup_actions
+    if progress is not None:
+        total_progress = progress.get(building_type, 0)
+    else:
+        contributions = get_building_contributions(db, user_id, kingdom_id, building_type)
+        
+        catchup_actions = db.query(func.coalesce(func.sum(BuildingCatchup.actions_completed), 0)).filter(
+            BuildingCatchup.user_id == user_id,
+            BuildingCatchup.kingdom_id == kingdom_id,
+            BuildingCatchup.building_type == building_type
+        ).scalar() or 0
+        
+        total_progress = contributions + catchup_actions
     actions_required = calculate_catchup_actions(building_level, building_skill)
     
     if total_progress >= actions_required:
@@ -0,0 +1,232 @@
+"""
+City adjacency - Precomputed neighbour graph with edge distances
+
+get_neighbor_cities filters OSM radius candidates by the minimum distance
+between the current city's boundary and each candidate's boundary. That
+polygon-to-polygon comparison is O(n·m) pure Python, so it is computed once
+and stored in city_adjacency:
+- link_new_boundary() adds a freshly cached city's edges incrementally
+  (both directions, nearby cities found through the bbox index)
+- preprocess_boundaries.py rebuilds the whole graph offline
+- load_edge_distances() is the indexed read used by request handlers
+
+Rows older than either city's boundary_updated_at are ignored, so a
+rewritten boundary falls back to the inline computation until relinked.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import List, Dict, Tuple, Iterable, Optional
+from datetime import datetime
+import math
+
+from db import CityBoundary
+from db.models import CityAdjacency
+from osm_service import _min_distance_between_polygons
+
+
+# Cities whose bbox is within this margin of a new boundary get linked to it
+# (~11km - neighbours are kept at <= 5km edge distance)
+LINK_SEARCH_MARGIN_DEG = 0.1
+
+
+# ============================================================
+# GEOMETRY
+# ============================================================
+
+def candidate_sources(neighbor_ids: Optional[List[dict]]) -> Dict[str, str]:
+    """osm_id -> "boundary" | "radius" for a city's cached OSM candidates"""
+    return {c["osm_id"]: c.get("source", "radius") for c in (neighbor_ids or [])}
+
+
+def compute_edge_distances(
+    boundary: List[List[float]],
+    neighbours: Iterable[Tuple[str, List[List[float]]]]
+) -> Dict[str, float]:
+    """
+    Edge distance from boundary to each neighbour boundary (meters).
+    Same call get_neighbor_cities makes inline, so results are identical.
+    """
+    poly_a = [(p[0], p[1]) for p in boundary]
+    distances = {}
+    for osm_id, neighbour_boundary in neighbours:
+        if not neighbour_boundary:
+            continue
+        dist = _min_distance_between_polygons(poly_a, [(p[0], p[1]) for p in neighbour_boundary])
+        if dist != float('inf'):
+            distances[osm_id] = dist
+    return distances
+
+
+def compute_edges(
+    boundary: List[List[float]],
+    sources: Dict[str, str],
+    neighbour_boundaries: Dict[str, List[List[float]]]
+) -> Dict[str, Tuple[float, str]]:
+    """
+    Edges from a city to its cached candidates: osm_id -> (edge_distance, source).
+    Boundary-sharing candidates touch by definition and skip the polygon comparison.
+    """
+    edges = {
+        osm_id: (0.0, "boundary")
+        for osm_id, source in sources.items()
+        if source == "boundary" and osm_id in neighbour_boundaries
+    }
+    radius = [
+        (osm_id, neighbour_boundaries[osm_id])
+        for osm_id, source in sources.items()
+        if source != "boundary" and osm_id in neighbour_boundaries
+    ]
+    for osm_id, dist in compute_edge_distances(boundary, radius).items():
+        edges[osm_id] = (dist, "radius")
+    return edges
+
+
+# ============================================================
+# STORAGE
+# ============================================================
+
+def store_edge_distances(db: Session, city_osm_id: str, edges: Dict[str, Tuple[float, str]]) -> None:
+    """Replace all precomputed edges for a city (caller commits)"""
+    db.query(CityAdjacency).filter(CityAdjacency.city_osm_id == city_osm_id).delete(synchronize_session=False)
+    now = datetime.utcnow()
+    db.add_all([
+        CityAdjacency(city_osm_id=city_osm_id, neighbor_osm_id=osm_id, edge_distance=dist, source=source, computed_at=now)
+        for osm_id, (dist, source) in edges.items()
+    ])
+
+
+def upsert_edges(db: Session, edges: Iterable[Tuple[str, str, float, str]]) -> int:
+    """
+    Insert or refresh edges (city_osm_id, neighbor_osm_id, edge_distance, source)
+    in one INSERT ... ON CONFLICT DO UPDATE (caller commits).
+
+    Concurrent requests writing the same edge both succeed instead of one
+    hitting a primary key error. Non-finite distances (no comparable
+    vertices) are not stored. Rows go in key order so two writers lock
+    edges in the same order.
+
+    Returns:
+        Number of edges written
+    """
+    rows = {}
+    for city_osm_id, neighbor_osm_id, edge_distance, source in edges:
+        if math.isfinite(edge_distance):
+            rows[(city_osm_id, neighbor_osm_id)] = (edge_distance, source)
+    if not rows:
+        return 0
+
+    now = datetime.utcnow()
+    stmt = pg_insert(CityAdjacency).values([
+        {
+            "city_osm_id": city_osm_id,
+            "neighbor_osm_id": neighbor_osm_id,
+            "edge_distance": edge_distance,
+            "source": source,
+            "computed_at": now,
+        }
+        for (city_osm_id, neighbor_osm_id), (edge_distance, source) in sorted(rows.items())
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CityAdjacency.city_osm_id, CityAdjacency.neighbor_osm_id],
+        set_={
+            "edge_distance": stmt.excluded.edge_distance,
+            "source": stmt.excluded.source,
+            "computed_at": stmt.excluded.computed_at,
+        }
+    )
+    db.execute(stmt)
+    return len(rows)
+
+
+def load_edge_distances(
+    db: Session,
+    city_osm_id: str,
+    boundary_versions: Dict[str, Optional[datetime]]
+) -> Dict[str, float]:
+    """
+    Precomputed distances from a city to its neighbours, keyed by neighbour osm_id.
+    One index range scan on (city_osm_id, edge_distance).
+
+    Args:
+        boundary_versions: osm_id -> boundary_updated_at for the city and the
+            candidates; rows computed before either boundary changed are skipped
+    """
+    rows = db.query(
+        CityAdjacency.neighbor_osm_id,
+        CityAdjacency.edge_distance,
+        CityAdjacency.computed_at
+    ).filter(CityAdjacency.city_osm_id == city_osm_id).all()
+    city_version = boundary_versions.get(city_osm_id)
+
+    distances = {}
+    for neighbor_osm_id, edge_distance, computed_at in rows:
+        if neighbor_osm_id not in boundary_versions:
+            continue
+        neighbour_version = boundary_versions[neighbor_osm_id]
+        if city_version and computed_at < city_version:
+            continue
+        if neighbour_version and computed_at < neighbour_version:
+            continue
+        distances[neighbor_osm_id] = edge_distance
+    return distances
+
+
+# ============================================================
+# INCREMENTAL LINKING
+# ============================================================
+
+def link_new_boundary(db: Session, city: CityBoundary, boundary: List[List[float]]) -> int:
+    """
+    Add adjacency edges for a freshly cached boundary (caller commits).
+
+    Only cities near the new boundary can list it as a candidate, so nearby
+    rows come from the bbox index instead of a table scan. Edges are added in
+    both directions:
+    - nearby city -> new city, when the nearby city lists it as a candidate
+    - new city -> nearby city, when the new city's own candidates are cached
+
+    Returns:
+        Number of edges written
+    """
+    from services.boundary_cache import deferred_boundary_columns, load_boundaries
+
+    if not boundary or city.min_lat is None:
+        return 0
+
+    nearby = db.query(CityBoundary).options(*deferred_boundary_columns()).filter(
+        CityBoundary.osm_id != city.osm_id,
+        CityBoundary.bbox_overlaps(
+            city.min_lat - LINK_SEARCH_MARGIN_DEG, city.max_lat + LINK_SEARCH_MARGIN_DEG,
+            city.min_lon - LINK_SEARCH_MARGIN_DEG, city.max_lon + LINK_SEARCH_MARGIN_DEG
+        )
+    ).all()
+
+    own_sources = candidate_sources(city.neighbor_ids)
+    listing = [n for n in nearby if city.osm_id in candidate_sources(n.neighbor_ids)]
+    listed = [n for n in nearby if n.osm_id in own_sources]
+    if not listing and not listed:
+        return 0
+
+    boundaries = load_boundaries(db, {n.osm_id: n for n in listing + listed}.values())
+    edges = []
+
+    for neighbour in listing:
+        entry = boundaries.get(neighbour.osm_id)
+        if not entry or not entry.point_count:
+            continue
+        source = candidate_sources(neighbour.neighbor_ids)[city.osm_id]
+        for osm_id, (dist, edge_source) in compute_edges(entry.coordinates(), {city.osm_id: source}, {city.osm_id: boundary}).items():
+            edges.append((neighbour.osm_id, osm_id, dist, edge_source))
+
+    neighbour_boundaries = {
+        n.osm_id: boundaries[n.osm_id].coordinates()
+        for n in listed
+        if n.osm_id in boundaries and boundaries[n.osm_id].point_count
+    }
+    for osm_id, (dist, source) in compute_edges(boundary, own_sources, neighbour_boundaries).items():
+        edges.append((city.osm_id, osm_id, dist, source))
+
+    written = upsert_edges(db, edges)
+    if written:
+        print(f"   🕸️ Linked {city.name} into adjacency graph ({written} edges)")
+    return written
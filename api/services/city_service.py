@@ -6,16 +6,25 @@ FAST LOADING - TWO ENDPOINTS:
 2. /cities/neighbors - Returns neighbor cities IMMEDIATELY, fetches boundaries in background
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional, Dict
+from sqlalchemy import func, or_
+from typing import List, Optional, Dict, Tuple
 from datetime import datetime, timedelta, date, time
 import math
+import heapq
 import asyncio
 
+try:
+    import numpy as np
+except ImportError:  # Optional - pure Python path is used without it
+    np = None
+
 from db import CityBoundary, Kingdom, User, get_db, CoupEvent
 from db.models import Battle
+from services.boundary_cache import CachedBoundary, deferred_boundary_columns, load_boundaries
+from utils.offload import run_sync
+from services.location_cell_cache import geohash_cell, get_cell, store_cell, location_cell_cache
+from services.city_adjacency import load_edge_distances, link_new_boundary, upsert_edges
 from schemas import CityBoundaryResponse, BoundaryResponse, KingdomData, BuildingData, BuildingUpgradeCost, BuildingTierInfo, BuildingClickAction, BuildingCatchupInfo, BUILDING_COLORS, AllianceInfo, ActiveAllianceInfo, ActiveCoupData
-from routers.alliances import are_empires_allied, get_alliance_between, get_active_alliances_for_empire
 from services.catchup_service import get_catchup_status, EXEMPT_BUILDINGS
 from osm_service import (
     find_user_city_fast,
@@ -41,6 +50,28 @@ def _triangle_area(p1: List[float], p2: List[float], p3: List[float]) -> float:
     return abs((p2[0] - p1[0]) * (p3[1] - p1[1]) - (p3[0] - p1[0]) * (p2[1] - p1[1])) / 2
 
 
+def _initial_areas(working: List[List[float]]) -> List[float]:
+    """
+    Triangle area of every vertex with its ring neighbours.
+    Uses NumPy when available (same float64 arithmetic, so identical results).
+    """
+    n = len(working)
+    if np is not None:
+        pts = np.asarray(working, dtype=np.float64)
+        prev_pts = np.roll(pts, 1, axis=0)
+        next_pts = np.roll(pts, -1, axis=0)
+        areas = np.abs(
+            (pts[:, 0] - prev_pts[:, 0]) * (next_pts[:, 1] - prev_pts[:, 1])
+            - (next_pts[:, 0] - prev_pts[:, 0]) * (pts[:, 1] - prev_pts[:, 1])
+        ) / 2
+        return areas.tolist()
+    
+    return [
+        _triangle_area(working[(i - 1) % n], working[i], working[(i + 1) % n])
+        for i in range(n)
+    ]
+
+
 def simplify_boundary(coords: List[List[float]], target_points: int = SIMPLIFY_TARGET_POINTS) -> List[List[float]]:
     """
     Simplify polygon using Visvalingam-Whyatt algorithm.
@@ -50,6 +81,10 @@ def simplify_boundary(coords: List[List[float]], target_points: int = SIMPLIFY_T
     - Removes points progressively from least important to most
     - Doesn't create self-intersections or weird loops
     
+    Runs in O(n log n): a min-heap of (area, index) picks the next point to
+    drop (ties go to the lowest index, stale entries are skipped lazily) and
+    prev/next arrays track each point's active neighbours.
+    
     Args:
         coords: List of [lat, lon] coordinate pairs (closed polygon)
         target_points: Target number of points to keep (default from SIMPLIFY_TARGET_POINTS)
@@ -79,60 +114,40 @@ def simplify_boundary(coords: List[List[float]], target_points: int = SIMPLIFY_T
         
         # Calculate initial areas for each point
         # Area = triangle formed with previous and next point
-        areas = []
-        for i in range(n):
-            prev_idx = (i - 1) % n
-            next_idx = (i + 1) % n
-            area = _triangle_area(working[prev_idx], working[i], working[next_idx])
-            areas.append(area)
+        areas = _initial_areas(working)
         
-        # Track which points are still active
+        # Linked ring of active points
+        prev_of = [(i - 1) % n for i in range(n)]
+        next_of = [(i + 1) % n for i in range(n)]
         active = [True] * n
         points_remaining = n
         
+        heap = [(areas[i], i) for i in range(n)]
+        heapq.heapify(heap)
+        
         # Remove points until we reach target
-        while points_remaining > target_points:
-            # Find point with minimum area (least important)
-            min_area = float('inf')
-            min_idx = -1
-            
-            for i in range(n):
-                if active[i] and areas[i] < min_area:
-                    min_area = areas[i]
-                    min_idx = i
-            
-            if min_idx == -1:
-                break
+        while points_remaining > target_points and heap:
+            # Pop point with minimum area (least important), skipping stale entries
+            area, min_idx = heapq.heappop(heap)
+            if not active[min_idx] or area != areas[min_idx]:
+                continue
             
-            # Remove this point
+            # Remove this point and unlink it from its neighbours
             active[min_idx] = False
             points_remaining -= 1
+            prev_idx = prev_of[min_idx]
+            next_idx = next_of[min_idx]
+            next_of[prev_idx] = next_idx
+            prev_of[next_idx] = prev_idx
             
             # Update areas of neighboring points
-            # Find previous active point
-            prev_idx = (min_idx - 1) % n
-            while not active[prev_idx] and prev_idx != min_idx:
-                prev_idx = (prev_idx - 1) % n
-            
-            # Find next active point
-            next_idx = (min_idx + 1) % n
-            while not active[next_idx] and next_idx != min_idx:
-                next_idx = (next_idx + 1) % n
-            
-            # Update their areas
             if active[prev_idx]:
-                prev_prev = (prev_idx - 1) % n
-                while not active[prev_prev] and prev_prev != prev_idx:
-                    prev_prev = (prev_prev - 1) % n
-                if active[prev_prev]:
-                    areas[prev_idx] = _triangle_area(working[prev_prev], working[prev_idx], working[next_idx])
+                areas[prev_idx] = _triangle_area(working[prev_of[prev_idx]], working[prev_idx], working[next_idx])
+                heapq.heappush(heap, (areas[prev_idx], prev_idx))
             
             if active[next_idx]:
-                next_next = (next_idx + 1) % n
-                while not active[next_next] and next_next != next_idx:
-                    next_next = (next_next + 1) % n
-                if active[next_next]:
-                    areas[next_idx] = _triangle_area(working[prev_idx], working[next_idx], working[next_next])
+                areas[next_idx] = _triangle_area(working[prev_idx], working[next_idx], working[next_of[next_idx]])
+                heapq.heappush(heap, (areas[next_idx], next_idx))
         
         # Build result from active points
         result = [working[i] for i in range(n) if active[i]]
@@ -157,7 +172,8 @@ def get_buildings_for_kingdom(
     db: Session, 
     kingdom: Kingdom, 
     current_user: Optional[User] = None,
-    include_upgrade_costs: bool = True
+    include_upgrade_costs: bool = True,
+    prefetch: Optional["KingdomDataPrefetch"] = None
 ) -> list:
     """
     Build the buildings array for a kingdom with all metadata, upgrade costs, and catchup info.
@@ -170,6 +186,7 @@ def get_buildings_for_kingdom(
         kingdom: The kingdom to get buildings for
         current_user: Optional user for catchup info (None = no catchup check)
         include_upgrade_costs: Whether to calculate upgrade costs
+        prefetch: Optional KingdomDataPrefetch covering this kingdom (no per-kingdom queries)
         
     Returns:
         List of building dicts with full metadata
@@ -177,22 +194,29 @@ def get_buildings_for_kingdom(
     from services.kingdom_service import calculate_actions_required, calculate_construction_cost, get_active_citizens_count
     from db.models import PlayerState, KingdomBuilding
     
-    # Get active citizens count for cost calculations
-    active_citizens_count = get_active_citizens_count(db, kingdom.id) if include_upgrade_costs else 0
-    
-    # Load all buildings for this kingdom from the table
-    kingdom_buildings_rows = db.query(KingdomBuilding).filter(
-        KingdomBuilding.kingdom_id == kingdom.id
-    ).all()
-    building_levels_map = {b.building_type: b.level for b in kingdom_buildings_rows}
+    if prefetch:
+        active_citizens_count = prefetch.active_citizens.get(kingdom.id, 0) if include_upgrade_costs else 0
+        building_levels_map = prefetch.building_levels.get(kingdom.id, {})
+    else:
+        # Get active citizens count for cost calculations
+        active_citizens_count = get_active_citizens_count(db, kingdom.id) if include_upgrade_costs else 0
+        
+        # Load all buildings for this kingdom from the table
+        kingdom_buildings_rows = db.query(KingdomBuilding).filter(
+            KingdomBuilding.kingdom_id == kingdom.id
+        ).all()
+        building_levels_map = {b.building_type: b.level for b in kingdom_buildings_rows}
     
     # Get player's building skill and hometown if user is logged in
     building_skill = 0
     user_hometown_id = None
     if current_user:
-        player_state = db.query(PlayerState).filter(
-            PlayerState.user_id == current_user.id
-        ).first()
+        if prefetch:
+            player_state = prefetch.player_state
+        else:
+            player_state = db.query(PlayerState).filter(
+                PlayerState.user_id == current_user.id
+            ).first()
         if player_state:
             building_skill = player_state.building_skill or 0
             user_hometown_id = player_state.hometown_kingdom_id
@@ -258,8 +282,12 @@ def get_buildings_for_kingdom(
                 resource = click_action_meta.get("resource")
                 if resource:
                     from routers.actions.gathering import get_daily_limit, get_gathered_today, DAILY_LIMIT_PER_LEVEL
-                    daily_limit = get_daily_limit(db, current_user, resource)
-                    gathered_today = get_gathered_today(db, current_user.id, resource)
+                    if prefetch:
+                        daily_limit = prefetch.daily_limit(resource)
+                        gathered_today = prefetch.gathered_today(resource)
+                    else:
+                        daily_limit = get_daily_limit(db, current_user, resource)
+                        gathered_today = get_gathered_today(db, current_user.id, resource)
                     if gathered_today >= daily_limit:
                         click_action["exhausted"] = True
                         
@@ -287,7 +315,8 @@ def get_buildings_for_kingdom(
         if current_user and is_hometown and level > 0 and building_type not in EXEMPT_BUILDINGS:
             catchup_status = get_catchup_status(
                 db, current_user.id, kingdom.id, 
-                building_type, level, building_skill
+                building_type, level, building_skill,
+                progress=prefetch.catchup_progress if prefetch else None
             )
             catchup_info = {
                 "needs_catchup": catchup_status["needs_catchup"],
@@ -303,9 +332,12 @@ def get_buildings_for_kingdom(
         if current_user and level > 0:
             from services.building_permit_service import check_building_access, PERMIT_REQUIRED_BUILDINGS
             if building_type in PERMIT_REQUIRED_BUILDINGS:
-                player_state = current_user.player_state
+                player_state = prefetch.player_state if prefetch else current_user.player_state
                 if player_state:
-                    access = check_building_access(db, current_user, player_state, kingdom, building_type)
+                    access = check_building_access(
+                        db, current_user, player_state, kingdom, building_type,
+                        prefetch=prefetch.building_access if prefetch else None
+                    )
                     permit_info = {
                         "can_access": access["can_access"],
                         "reason": access["reason"],
@@ -378,17 +410,262 @@ def _is_point_in_polygon(lat: float, lon: float, polygon: List[List[float]]) ->
     return inside
 
 
+def _boundary_bbox(boundary: List[List[float]]) -> Dict[str, Optional[float]]:
+    """Bounding box columns (min/max lat/lon) for a boundary of [lat, lon] pairs"""
+    if not boundary:
+        return {"min_lat": None, "max_lat": None, "min_lon": None, "max_lon": None}
+    lats = [p[0] for p in boundary]
+    lons = [p[1] for p in boundary]
+    return {"min_lat": min(lats), "max_lat": max(lats), "min_lon": min(lons), "max_lon": max(lons)}
+
+
+def _boundary_candidates(
+    db: Session,
+    lat: float,
+    lon: float,
+    rect: Optional[Tuple[float, float, float, float]] = None
+) -> List[Tuple[CityBoundary, CachedBoundary]]:
+    """
+    Cached cities whose bbox overlaps rect (default: contains the point), with
+    their decoded boundaries. Uses the bbox index; the ±0.5° center window is
+    kept so results match the previous center-window scan exactly.
+    
+    Rows with no bbox have an empty boundary (the migration backfilled every
+    other row), so they can't contain anything and are not read.
+    """
+    min_lat, max_lat, min_lon, max_lon = rect or (lat, lat, lon, lon)
+    lat_delta = 0.5  # ~55km
+    lon_delta = 0.5 / max(0.1, math.cos(math.radians(lat)))
+    
+    candidates = db.query(CityBoundary).options(*deferred_boundary_columns()).filter(
+        CityBoundary.center_lat.between(lat - lat_delta, lat + lat_delta),
+        CityBoundary.center_lon.between(lon - lon_delta, lon + lon_delta),
+        CityBoundary.bbox_overlaps(min_lat, max_lat, min_lon, max_lon)
+    ).all()
+    boundaries = load_boundaries(db, candidates)
+    
+    result = []
+    for city in candidates:
+        entry = boundaries.get(city.osm_id)
+        if not entry or not entry.point_count:
+            continue
+        result.append((city, entry))
+    
+    return result
+
+
+def _find_cities_containing_point(db: Session, lat: float, lon: float) -> List[Tuple[CityBoundary, CachedBoundary]]:
+    """
+    Find all cached cities whose boundary contains the point.
+    
+    Uses the bbox index so only the few polygons whose bounding box contains
+    the point get ray-cast. Polygons come from the process-level boundary
+    cache, so warm lookups transfer no JSONB.
+    
+    Returns (city, cached boundary) tuples, highest admin_level first
+    (most specific: 8=city > 7=borough > 6=county).
+    """
+    matching_cities = [
+        (city, entry) for city, entry in _boundary_candidates(db, lat, lon)
+        if entry.contains(lat, lon)
+    ]
+    matching_cities.sort(key=lambda x: x[0].admin_level, reverse=True)
+    return matching_cities
+
+
+def _find_current_city(db: Session, lat: float, lon: float) -> Optional[Tuple[CityBoundary, CachedBoundary]]:
+    """
+    The city the point is in (highest admin_level), via the location cell cache.
+    
+    - Cell cached fully_inside: load that city, no polygon math
+    - Cell cached as straddling a boundary: exact polygon test
+    - Cell not cached: exact test over every polygon near the cell, then store
+      whether any boundary edge crosses the cell
+    """
+    geohash, cell = geohash_cell(lat, lon)
+    cached_cell = get_cell(db, geohash)
+    
+    if cached_cell is not None and cached_cell.fully_inside:
+        city = db.query(CityBoundary).options(*deferred_boundary_columns()).filter(
+            CityBoundary.osm_id == cached_cell.osm_id
+        ).first()
+        if city and city.boundary_updated_at == cached_cell.boundary_version:
+            entry = load_boundaries(db, [city]).get(city.osm_id)
+            if entry and entry.point_count:
+                return city, entry
+        location_cell_cache.invalidate(geohash)
+    elif cached_cell is not None:
+        matching_cities = _find_cities_containing_point(db, lat, lon)
+        return matching_cities[0] if matching_cities else None
+    
+    near_cell = _boundary_candidates(db, lat, lon, rect=cell)
+    matching_cities = [(city, entry) for city, entry in near_cell if entry.contains(lat, lon)]
+    if not matching_cities:
+        return None
+    matching_cities.sort(key=lambda x: x[0].admin_level, reverse=True)
+    
+    # No edge crosses the cell => every point in it has the same answer
+    fully_inside = not any(entry.crosses_rect(*cell) for _, entry in near_cell)
+    store_cell(db, geohash, cell, matching_cities[0][0], fully_inside)
+    return matching_cities[0]
+
+
+def _get_simplified_boundary(city, entry: Optional[CachedBoundary]) -> List[List[float]]:
+    """
+    Use cached simplified boundary if available, otherwise compute and store it.
+    Backfill is a lazy migration - the caller commits.
+    """
+    simplified = entry.simplified_coordinates() if entry else None
+    if simplified is None:
+        simplified = simplify_boundary(entry.coordinates() if entry else [])
+        city.simplified_boundary_geojson = {"type": "Polygon", "coordinates": simplified}
+    return simplified
+
+
+def _link_adjacency(db: Session, city: CityBoundary, boundary: List[List[float]]) -> None:
+    """Add a newly cached city to the adjacency graph - best effort, never fails the request"""
+    try:
+        if link_new_boundary(db, city, boundary):
+            db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"   ⚠️ Adjacency linking failed for {city.osm_id}: {e}")
+
+
+class KingdomDataPrefetch:
+    """
+    Per-request prefetch for _get_kingdom_data and get_buildings_for_kingdom.
+    
+    Everything that varies per kingdom is loaded for ALL requested kingdoms in
+    one set-based query each; per-player lookups are memoized so they run at
+    most once. The statement count stays constant no matter how many kingdoms
+    /cities/neighbors asks for.
+    """
+    
+    def __init__(self, db: Session, kingdoms: List[Kingdom], current_user=None):
+        from db.models import PlayerState, KingdomBuilding, Alliance
+        from services.kingdom_service import get_active_citizens_batch
+        from services.building_permit_service import BuildingAccessPrefetch
+        
+        self.db = db
+        self.current_user = current_user
+        kingdom_ids = [k.id for k in kingdoms]
+        
+        # Player state / hometown / ruled kingdoms (once per request)
+        self.player_state = None
+        self.ruled_kingdoms: List[Kingdom] = []
+        self.hometown: Optional[Kingdom] = None
+        if current_user:
+            self.player_state = db.query(PlayerState).filter(PlayerState.user_id == current_user.id).first()
+            self.ruled_kingdoms = db.query(Kingdom).filter(Kingdom.ruler_id == current_user.id).all()
+            hometown_id = self.player_state.hometown_kingdom_id if self.player_state else None
+            if hometown_id:
+                self.hometown = next((k for k in kingdoms if k.id == hometown_id), None) or \
+                    db.query(Kingdom).filter(Kingdom.id == hometown_id).first()
+        
+        # Ruler names
+        self.ruler_names: Dict[int, str] = {}
+        ruler_ids = [k.ruler_id for k in kingdoms if k.ruler_id]
+        if ruler_ids:
+            self.ruler_names = {u.id: u.display_name for u in db.query(User).filter(User.id.in_(ruler_ids)).all()}
+        
+        # Population: checked-in players and active citizens per kingdom
+        self.current_players: Dict[str, int] = {}
+        if kingdom_ids:
+            player_counts = db.query(
+                PlayerState.current_kingdom_id,
+                func.count(PlayerState.user_id)
+            ).filter(
+                PlayerState.current_kingdom_id.in_(kingdom_ids)
+            ).group_by(PlayerState.current_kingdom_id).all()
+            self.current_players = {kingdom_id: count for kingdom_id, count in player_counts}
+        self.active_citizens = get_active_citizens_batch(db, kingdom_ids)
+        
+        # Building levels per kingdom
+        self.building_levels: Dict[str, Dict[str, int]] = {}
+        if kingdom_ids:
+            for row in db.query(KingdomBuilding).filter(KingdomBuilding.kingdom_id.in_(kingdom_ids)).all():
+                self.building_levels.setdefault(row.kingdom_id, {})[row.building_type] = row.level
+        
+        # Unresolved battles where any kingdom is the target OR the attacker
+        self.defending_battles: Dict[str, Battle] = {}
+        self.attacking_battles: Dict[str, Battle] = {}
+        if kingdom_ids:
+            battles = db.query(Battle).filter(
+                Battle.resolved_at.is_(None),
+                or_(
+                    Battle.kingdom_id.in_(kingdom_ids),
+                    Battle.attacking_from_kingdom_id.in_(kingdom_ids)
+                )
+            ).order_by(Battle.id).all()
+            for battle in battles:
+                self.defending_battles.setdefault(battle.kingdom_id, battle)
+                if battle.attacking_from_kingdom_id:
+                    self.attacking_battles.setdefault(battle.attacking_from_kingdom_id, battle)
+        
+        # Active alliances touching the player's ruled empires or hometown empire
+        self.alliances = []
+        empire_ids = {k.empire_id or k.id for k in self.ruled_kingdoms}
+        if self.hometown and self.hometown.id in kingdom_ids:
+            empire_ids.add(self.hometown.empire_id or self.hometown.id)
+        if empire_ids:
+            self.alliances = db.query(Alliance).filter(
+                Alliance.status == 'active',
+                Alliance.expires_at > datetime.utcnow(),
+                or_(
+                    Alliance.initiator_empire_id.in_(empire_ids),
+                    Alliance.target_empire_id.in_(empire_ids)
+                )
+            ).order_by(Alliance.expires_at.asc()).all()
+        
+        # Catch-up progress (only the hometown shows catch-up)
+        self.catchup_progress: Dict[str, int] = {}
+        if current_user and self.hometown and self.hometown.id in kingdom_ids:
+            from services.catchup_service import get_catchup_progress_batch
+            self.catchup_progress = get_catchup_progress_batch(db, current_user.id, self.hometown.id)
+        
+        self.building_access = BuildingAccessPrefetch(db, current_user, self.player_state) if current_user else None
+        self._daily_limits: Dict[str, int] = {}
+        self._gathered_today: Dict[str, int] = {}
+    
+    def alliance_between(self, empire_a_id: str, empire_b_id: str):
+        """Prefetched equivalent of get_alliance_between"""
+        for alliance in self.alliances:
+            if {alliance.initiator_empire_id, alliance.target_empire_id} == {empire_a_id, empire_b_id}:
+                return alliance
+        return None
+    
+    def active_alliances_for_empire(self, empire_id: str) -> List[dict]:
+        """Prefetched equivalent of get_active_alliances_for_empire"""
+        from routers.alliances import describe_active_alliances
+        alliances = [
+            a for a in self.alliances
+            if a.initiator_empire_id == empire_id or a.target_empire_id == empire_id
+        ]
+        return describe_active_alliances(self.db, empire_id, alliances)
+    
+    def daily_limit(self, resource: str) -> int:
+        from routers.actions.gathering import get_daily_limit
+        if resource not in self._daily_limits:
+            self._daily_limits[resource] = get_daily_limit(self.db, self.current_user, resource)
+        return self._daily_limits[resource]
+    
+    def gathered_today(self, resource: str) -> int:
+        from routers.actions.gathering import get_gathered_today
+        if resource not in self._gathered_today:
+            self._gathered_today[resource] = get_gathered_today(self.db, self.current_user.id, resource)
+        return self._gathered_today[resource]
+
+
 def _get_kingdom_data(db: Session, osm_ids: List[str], current_user=None) -> Dict[str, KingdomData]:
     """Get or create kingdom data for cities. Returns dict of osm_id -> KingdomData"""
     from db.models import UserKingdom
-    from db.models import PlayerState
     
     if not osm_ids:
         return {}
     
     # Fetch existing kingdoms
     kingdoms = db.query(Kingdom).filter(Kingdom.id.in_(osm_ids)).all()
-    existing_ids = {k.id for k in kingdoms}
     
     # Check for ruler abandonment (rulers who haven't logged in for 60+ days)
     # AND apply market passive income (once per 24 hours per kingdom)
@@ -396,57 +673,25 @@ def _get_kingdom_data(db: Session, osm_ids: List[str], current_user=None) -> Dic
     check_ruler_abandonment_batch(db, kingdoms)
     apply_market_passive_income_batch(db, kingdoms)
     
+    # Load everything the loop needs up front - no per-kingdom queries below
+    prefetch = KingdomDataPrefetch(db, kingdoms, current_user)
+    
     # Get user's current location and hometown (which kingdom they're in)
     user_current_kingdom_id = None
     user_hometown_kingdom_id = None
-    if current_user:
-        player_state = db.query(PlayerState).filter(PlayerState.user_id == current_user.id).first()
-        if player_state:
-            user_current_kingdom_id = player_state.current_kingdom_id
-            user_hometown_kingdom_id = player_state.hometown_kingdom_id
+    if prefetch.player_state:
+        user_current_kingdom_id = prefetch.player_state.current_kingdom_id
+        user_hometown_kingdom_id = prefetch.player_state.hometown_kingdom_id
     
     # Get user's kingdoms for relationship checking
-    user_kingdom_ids = set()
-    user_empire_id = None  # User's empire ID (from hometown kingdom)
-    if current_user:
-        user_kingdoms = db.query(Kingdom).filter(Kingdom.ruler_id == current_user.id).all()
-        user_kingdom_ids = {k.id for k in user_kingdoms}
-        # Get user's empire_id from their hometown kingdom
-        if user_hometown_kingdom_id:
-            hometown_kingdom = db.query(Kingdom).filter(Kingdom.id == user_hometown_kingdom_id).first()
-            if hometown_kingdom:
-                user_empire_id = hometown_kingdom.empire_id
-    
-    # Batch fetch ruler names
-    ruler_ids = [k.ruler_id for k in kingdoms if k.ruler_id]
-    rulers = {}
-    if ruler_ids:
-        ruler_users = db.query(User).filter(User.id.in_(ruler_ids)).all()
-        rulers = {u.id: u.display_name for u in ruler_users}
-    
-    # Batch calculate population stats for all kingdoms
-    from db.models import PlayerState, UserKingdom
-    kingdom_ids = [k.id for k in kingdoms]
-    
-    # Count currently checked-in players per kingdom
-    current_players = {}
-    if kingdom_ids:
-        player_counts = db.query(
-            PlayerState.current_kingdom_id,
-            func.count(PlayerState.user_id)
-        ).filter(
-            PlayerState.current_kingdom_id.in_(kingdom_ids)
-        ).group_by(PlayerState.current_kingdom_id).all()
-        current_players = {kingdom_id: count for kingdom_id, count in player_counts}
-    
-    # Count active citizens (all alive citizens whose hometown is this kingdom)
-    from services.kingdom_service import get_active_citizens_batch
-    active_citizens = get_active_citizens_batch(db, kingdom_ids)
+    user_kingdom_ids = {k.id for k in prefetch.ruled_kingdoms}
+    # User's empire ID (from hometown kingdom)
+    user_empire_id = prefetch.hometown.empire_id if prefetch.hometown else None
     
     # Build result
     result = {}
     for kingdom in kingdoms:
-        ruler_name = rulers.get(kingdom.ruler_id) if kingdom.ruler_id else None
+        ruler_name = prefetch.ruler_names.get(kingdom.ruler_id) if kingdom.ruler_id else None
         # Can claim ONLY if:
         # 1. Kingdom is unclaimed (no ruler)
         # 2. User doesn't already rule any kingdoms
@@ -481,23 +726,21 @@ def _get_kingdom_data(db: Session, osm_ids: List[str], current_user=None) -> Dic
             target_empire_id = kingdom.empire_id or kingdom.id
             
             # Check each of user's ruled kingdoms for alliance
-            for user_kingdom_id in user_kingdom_ids:
-                user_kingdom = db.query(Kingdom).filter(Kingdom.id == user_kingdom_id).first()
-                if user_kingdom:
-                    user_empire_id = user_kingdom.empire_id or user_kingdom.id
-                    
-                    # Check if allied using the Alliance table
-                    if are_empires_allied(db, user_empire_id, target_empire_id):
-                        is_allied = True
-                        # Get alliance details for display
-                        alliance = get_alliance_between(db, user_empire_id, target_empire_id)
-                        if alliance:
-                            alliance_info = {
-                                "id": alliance.id,
-                                "days_remaining": alliance.days_remaining,
-                                "expires_at": alliance.expires_at.isoformat() if alliance.expires_at else None
-                            }
-                        break
+            for user_kingdom in prefetch.ruled_kingdoms:
+                ruled_empire_id = user_kingdom.empire_id or user_kingdom.id
+                
+                # Same empire counts as allied (see are_empires_allied)
+                alliance = prefetch.alliance_between(ruled_empire_id, target_empire_id)
+                if ruled_empire_id == target_empire_id or alliance:
+                    is_allied = True
+                    # Get alliance details for display
+                    if alliance:
+                        alliance_info = {
+                            "id": alliance.id,
+                            "days_remaining": alliance.days_remaining,
+                            "expires_at": alliance.expires_at.isoformat() if alliance.expires_at else None
+                        }
+                    break
             
             # Legacy enemy check (still using JSONB for now - wars not implemented yet)
             kingdom_enemies = set(kingdom.enemies) if kingdom.enemies else set()
@@ -522,7 +765,8 @@ def _get_kingdom_data(db: Session, osm_ids: List[str], current_user=None) -> Dic
                     _check_kingdom_cooldown
                 )
                 
-                player_state_for_coup = db.query(PlayerState).filter(PlayerState.user_id == current_user.id).first()
+                # Only one kingdom can be the user's current kingdom, so these run at most once
+                player_state_for_coup = prefetch.player_state
                 user_kingdom_record = db.query(UserKingdom).filter(
                     UserKingdom.user_id == current_user.id,
                     UserKingdom.kingdom_id == kingdom.id
@@ -546,7 +790,7 @@ def _get_kingdom_data(db: Session, osm_ids: List[str], current_user=None) -> Dic
                         can_stage_coup = True
         
         # SINGLE SOURCE OF TRUTH: Get buildings with all metadata, costs, and catchup info
-        buildings_data = get_buildings_for_kingdom(db, kingdom, current_user)
+        buildings_data = get_buildings_for_kingdom(db, kingdom, current_user, prefetch=prefetch)
         
         # Convert dicts to Pydantic models for this endpoint
         buildings = []
@@ -604,8 +848,8 @@ def _get_kingdom_data(db: Session, osm_ids: List[str], current_user=None) -> Dic
             ))
         
         # CALCULATE LIVE: Count players in kingdom RIGHT NOW
-        checked_in_count = current_players.get(kingdom.id, 0)
-        citizen_count = active_citizens.get(kingdom.id, 0)
+        checked_in_count = prefetch.current_players.get(kingdom.id, 0)
+        citizen_count = prefetch.active_citizens.get(kingdom.id, 0)
         
         # Check for active battle involving this kingdom
         # A kingdom is "at war" if:
@@ -614,16 +858,10 @@ def _get_kingdom_data(db: Session, osm_ids: List[str], current_user=None) -> Dic
         active_coup_data = None
         
         # First check if this kingdom is being attacked
-        active_battle = db.query(Battle).filter(
-            Battle.kingdom_id == kingdom.id,
-            Battle.resolved_at.is_(None)
-        ).first()
+        active_battle = prefetch.defending_battles.get(kingdom.id)
         
         # Also check if this kingdom is ATTACKING another kingdom (invasions only)
-        attacking_battle = db.query(Battle).filter(
-            Battle.attacking_from_kingdom_id == kingdom.id,
-            Battle.resolved_at.is_(None)
-        ).first()
+        attacking_battle = prefetch.attacking_battles.get(kingdom.id)
         
         # Kingdom is at war if involved in any battle (attacking OR defending)
         is_at_war = (active_battle is not None) or (attacking_battle is not None)
@@ -676,7 +914,7 @@ def _get_kingdom_data(db: Session, osm_ids: List[str], current_user=None) -> Dic
             hometown_empire_id = kingdom.empire_id or kingdom.id
             print(f"🤝 Fetching alliances for hometown empire: {hometown_empire_id}")
             try:
-                alliance_list = get_active_alliances_for_empire(db, hometown_empire_id)
+                alliance_list = prefetch.active_alliances_for_empire(hometown_empire_id)
                 print(f"🤝 Found {len(alliance_list)} alliances: {alliance_list}")
                 active_alliances_data = [
                     ActiveAllianceInfo(**a) for a in alliance_list
@@ -739,141 +977,73 @@ def _ensure_kingdom_exists(db: Session, osm_id: str, name: str):
         db.commit()
 
 
-async def get_current_city(
-    db: Session,
-    lat: float,
-    lon: float,
-    current_user = None
-) -> Optional[CityBoundaryResponse]:
-    """
-    FAST - Get ONLY the city the user is currently in.
-    This should return in < 2 seconds to unblock the frontend.
-    
-    Strategy:
-    1. Check cache first (instant)
-    2. If not cached, call fast OSM query
-    3. Fetch boundary for just this ONE city
-    """
-    print(f"🎯 Getting current city for ({lat:.4f}, {lon:.4f})")
-    
-    # Step 1: Check cache - find city user is inside
-    lat_delta = 0.5  # ~55km
-    lon_delta = 0.5 / max(0.1, math.cos(math.radians(lat)))
-    
-    cached_cities = db.query(CityBoundary).filter(
-        CityBoundary.center_lat.between(lat - lat_delta, lat + lat_delta),
-        CityBoundary.center_lon.between(lon - lon_delta, lon + lon_delta)
-    ).all()
+def _current_city_response(db: Session, city: CityBoundary, entry: Optional[CachedBoundary], current_user) -> CityBoundaryResponse:
+    """Response for a cached city the user is in (counts the access)"""
+    city.access_count += 1
+    city.last_accessed = datetime.utcnow()
+    simplified = _get_simplified_boundary(city, entry)
+    db.commit()
     
-    # Check which cached cities user is inside - collect ALL matches
-    matching_cities = []
-    for city in cached_cities:
-        boundary = city.boundary_geojson.get("coordinates", [])
-        if boundary and _is_point_in_polygon(lat, lon, boundary):
-            matching_cities.append((city, boundary))
+    _ensure_kingdom_exists(db, city.osm_id, city.name)
+    kingdoms = _get_kingdom_data(db, [city.osm_id], current_user)
     
+    return CityBoundaryResponse(
+        osm_id=city.osm_id,
+        name=city.name,
+        admin_level=city.admin_level,
+        center_lat=city.center_lat,
+        center_lon=city.center_lon,
+        boundary=simplified,
+        radius_meters=city.radius_meters,
+        cached=True,
+        is_current=True,
+        kingdom=kingdoms.get(city.osm_id)
+    )
+
+
+def _current_city_from_cache(db: Session, lat: float, lon: float, current_user) -> Optional[CityBoundaryResponse]:
+    """Step 1 (blocking): cached city containing the point"""
     # Prefer highest admin_level (most specific: 8=city > 7=borough > 6=county)
-    if matching_cities:
-        matching_cities.sort(key=lambda x: x[0].admin_level, reverse=True)
-        city, boundary = matching_cities[0]
-        
-        print(f"   💾 Found in cache: {city.name} (level {city.admin_level})")
-        city.access_count += 1
-        city.last_accessed = datetime.utcnow()
-        db.commit()
-        
-        _ensure_kingdom_exists(db, city.osm_id, city.name)
-        kingdoms = _get_kingdom_data(db, [city.osm_id], current_user)
-        
-        # Use cached simplified boundary if available, otherwise compute and store it
-        if city.simplified_boundary_geojson:
-            simplified = city.simplified_boundary_geojson.get("coordinates", [])
-        else:
-            # Backfill: Compute and store simplified boundary for this city
-            simplified = simplify_boundary(boundary)
-            city.simplified_boundary_geojson = {"type": "Polygon", "coordinates": simplified}
-            db.commit()
-        
-        return CityBoundaryResponse(
-            osm_id=city.osm_id,
-            name=city.name,
-            admin_level=city.admin_level,
-            center_lat=city.center_lat,
-            center_lon=city.center_lon,
-            boundary=simplified,
-            radius_meters=city.radius_meters,
-            cached=True,
-            is_current=True,
-            kingdom=kingdoms.get(city.osm_id)
-        )
-    
-    # Step 2: Not in cache - call OSM
-    print(f"   🌐 Not in cache, calling OSM...")
-    city_info = await find_user_city_fast(lat, lon)
-    
-    if not city_info:
-        print(f"   ⚠️ No city found at this location")
+    current = _find_current_city(db, lat, lon)
+    if not current:
         return None
-    
+    city, entry = current
+    print(f"   💾 Found in cache: {city.name} (level {city.admin_level})")
+    return _current_city_response(db, city, entry, current_user)
+
+
+def _current_city_by_osm_id(db: Session, osm_id: str, current_user) -> Optional[CityBoundaryResponse]:
+    """Step 2 (blocking): OSM found the city - do we have its boundary (just not with user inside)?"""
+    cached = db.query(CityBoundary).options(*deferred_boundary_columns()).filter(CityBoundary.osm_id == osm_id).first()
+    if not cached:
+        return None
+    print(f"   💾 Found boundary in cache: {cached.name}")
+    entry = load_boundaries(db, [cached]).get(cached.osm_id)
+    return _current_city_response(db, cached, entry, current_user)
+
+
+def _center_only_current_city(db: Session, city_info: Dict, lat: float, lon: float, current_user) -> CityBoundaryResponse:
+    """Step 3 fallback (blocking): boundary fetch failed - return city with center only"""
     osm_id = city_info["osm_id"]
+    _ensure_kingdom_exists(db, osm_id, city_info.get("name", "Unknown"))
+    kingdoms = _get_kingdom_data(db, [osm_id], current_user)
     
-    # Check if we have this city cached (just not with user inside)
-    cached = db.query(CityBoundary).filter(CityBoundary.osm_id == osm_id).first()
-    
-    if cached:
-        print(f"   💾 Found boundary in cache: {cached.name}")
-        cached.access_count += 1
-        cached.last_accessed = datetime.utcnow()
-        db.commit()
-        
-        _ensure_kingdom_exists(db, cached.osm_id, cached.name)
-        kingdoms = _get_kingdom_data(db, [cached.osm_id], current_user)
-        
-        # Use cached simplified boundary if available, otherwise compute and store it
-        if cached.simplified_boundary_geojson:
-            simplified = cached.simplified_boundary_geojson.get("coordinates", [])
-        else:
-            # Backfill: Compute and store simplified boundary for this city
-            simplified = simplify_boundary(cached.boundary_geojson.get("coordinates", []))
-            cached.simplified_boundary_geojson = {"type": "Polygon", "coordinates": simplified}
-            db.commit()
-        
-        return CityBoundaryResponse(
-            osm_id=cached.osm_id,
-            name=cached.name,
-            admin_level=cached.admin_level,
-            center_lat=cached.center_lat,
-            center_lon=cached.center_lon,
-            boundary=simplified,
-            radius_meters=cached.radius_meters,
-            cached=True,
-            is_current=True,
-            kingdom=kingdoms.get(cached.osm_id)
-        )
-    
-    # Step 3: Fetch boundary from OSM
-    print(f"   🌐 Fetching boundary for {city_info['name']}...")
-    boundary_data = await fetch_city_boundary_by_id(osm_id, city_info.get("name", "Unknown"))
-    
-    if not boundary_data:
-        # Return city with center only, no boundary
-        print(f"   ⚠️ Could not fetch boundary, returning center only")
-        _ensure_kingdom_exists(db, osm_id, city_info.get("name", "Unknown"))
-        kingdoms = _get_kingdom_data(db, [osm_id], current_user)
-        
-        return CityBoundaryResponse(
-            osm_id=osm_id,
-            name=city_info.get("name", "Unknown"),
-            admin_level=city_info.get("admin_level", 8),
-            center_lat=city_info.get("center_lat", lat),
-            center_lon=city_info.get("center_lon", lon),
-            boundary=[],
-            radius_meters=5000.0,
-            cached=False,
-            is_current=True,
-            kingdom=kingdoms.get(osm_id)
-        )
-    
+    return CityBoundaryResponse(
+        osm_id=osm_id,
+        name=city_info.get("name", "Unknown"),
+        admin_level=city_info.get("admin_level", 8),
+        center_lat=city_info.get("center_lat", lat),
+        center_lon=city_info.get("center_lon", lon),
+        boundary=[],
+        radius_meters=5000.0,
+        cached=False,
+        is_current=True,
+        kingdom=kingdoms.get(osm_id)
+    )
+
+
+def _cache_current_city(db: Session, osm_id: str, boundary_data: Dict, current_user) -> CityBoundaryResponse:
+    """Step 3 (blocking): simplify, cache and return a freshly fetched boundary"""
     # Cache it (with race condition protection)
     # Pre-compute and store simplified boundary for efficient retrieval
     simplified = simplify_boundary(boundary_data["boundary"])
@@ -889,11 +1059,13 @@ async def get_current_city(
             simplified_boundary_geojson={"type": "Polygon", "coordinates": simplified},
             radius_meters=boundary_data["radius_meters"],
             boundary_points_count=len(boundary_data["boundary"]),
+            **_boundary_bbox(boundary_data["boundary"]),
             access_count=1,
             osm_metadata=boundary_data.get("osm_tags", {})
         )
         db.add(new_city)
         db.commit()
+        _link_adjacency(db, new_city, boundary_data["boundary"])
     except Exception as e:
         # Race condition - another request already cached it
         db.rollback()
@@ -928,88 +1100,120 @@ async def get_current_city(
     )
 
 
-async def get_neighbor_cities(
+async def get_current_city(
     db: Session,
     lat: float,
     lon: float,
     current_user = None
-) -> List[CityBoundaryResponse]:
+) -> Optional[CityBoundaryResponse]:
     """
-    Get cities that DIRECTLY TOUCH the current city (shared borders only).
-    admin_level=8 ONLY (cities, not counties).
+    FAST - Get ONLY the city the user is currently in.
+    This should return in < 2 seconds to unblock the frontend.
+    
+    Strategy:
+    1. Check cache first (instant)
+    2. If not cached, call fast OSM query
+    3. Fetch boundary for just this ONE city
+    
+    Database and geometry steps run in the blocking pool (run_sync);
+    only the Overpass calls are awaited on the event loop.
     """
-    print(f"🏘️ Loading neighbors for ({lat:.4f}, {lon:.4f})")
+    print(f"🎯 Getting current city for ({lat:.4f}, {lon:.4f})")
     
-    # Step 1: Find the current city (prefer highest admin_level)
-    current_city = None
-    lat_delta = 0.5
-    lon_delta = 0.5 / max(0.1, math.cos(math.radians(lat)))
+    # Step 1: Check cache - find city user is inside
+    cached_response = await run_sync(_current_city_from_cache, db, lat, lon, current_user)
+    if cached_response:
+        return cached_response
     
-    cached_cities = db.query(CityBoundary).filter(
-        CityBoundary.center_lat.between(lat - lat_delta, lat + lat_delta),
-        CityBoundary.center_lon.between(lon - lon_delta, lon + lon_delta)
-    ).all()
+    # Step 2: Not in cache - call OSM
+    print(f"   🌐 Not in cache, calling OSM...")
+    city_info = await find_user_city_fast(lat, lon)
     
-    # Find all cities containing the point, then pick highest admin_level
-    matching_cities = []
-    for city in cached_cities:
-        boundary = city.boundary_geojson.get("coordinates", [])
-        if boundary and _is_point_in_polygon(lat, lon, boundary):
-            matching_cities.append(city)
+    if not city_info:
+        print(f"   ⚠️ No city found at this location")
+        return None
     
-    if matching_cities:
-        matching_cities.sort(key=lambda c: c.admin_level, reverse=True)
-        current_city = matching_cities[0]
+    osm_id = city_info["osm_id"]
     
-    # Step 2: Get candidates (from cache or OSM)
-    candidates = []
-    is_boundary_sharing = True  # Assume true (already precise)
+    cached_response = await run_sync(_current_city_by_osm_id, db, osm_id, current_user)
+    if cached_response:
+        return cached_response
     
+    # Step 3: Fetch boundary from OSM
+    print(f"   🌐 Fetching boundary for {city_info['name']}...")
+    boundary_data = await fetch_city_boundary_by_id(osm_id, city_info.get("name", "Unknown"))
+    
+    if not boundary_data:
+        print(f"   ⚠️ Could not fetch boundary, returning center only")
+        return await run_sync(_center_only_current_city, db, city_info, lat, lon, current_user)
+    
+    return await run_sync(_cache_current_city, db, osm_id, boundary_data, current_user)
+
+
+def _neighbor_lookup_start(db: Session, lat: float, lon: float):
+    """Steps 1-2 (blocking): current city and its cached OSM candidates"""
+    # Step 1: Find the current city (prefer highest admin_level)
+    current = _find_current_city(db, lat, lon)
+    current_city = current[0] if current else None
+    
+    # Step 2: Get candidates (from cache)
+    candidates = []
     if current_city and current_city.neighbor_ids is not None:
         print(f"   💾 Cached candidates for {current_city.name}")
         candidates = current_city.neighbor_ids  # Now stores full candidate dicts
-        # Check if these were from boundary sharing or radius search
-        is_boundary_sharing = candidates[0].get("is_boundary_sharing", True) if candidates else True
-    
-    # Step 3: Fetch from OSM if not cached
-    if not candidates:
-        print(f"   🌐 Fetching candidates from OSM...")
-        
-        candidates, is_boundary_sharing = await fetch_nearby_city_candidates(lat, lon)
-        
-        if not candidates:
-            print(f"   ⚠️ No neighbors found")
-            return []
-        
-        print(f"   🌐 OSM returned {len(candidates)} candidates")
-        
-        # Cache candidates with metadata
-        if current_city:
-            for c in candidates:
-                c["is_boundary_sharing"] = is_boundary_sharing
-            current_city.neighbor_ids = candidates
-            current_city.neighbors_updated_at = datetime.utcnow()
-            db.commit()
-            print(f"   💾 Cached {len(candidates)} candidates for {current_city.name}")
-    else:
-        print(f"   🌐 Using {len(candidates)} cached candidates")
-    
+    return current, candidates
+
+
+def _cache_neighbor_candidates(db: Session, current_city: CityBoundary, candidates: List[Dict], is_boundary_sharing: bool) -> None:
+    """Step 3 (blocking): remember OSM candidates with metadata"""
+    for c in candidates:
+        c["is_boundary_sharing"] = is_boundary_sharing
+    current_city.neighbor_ids = candidates
+    current_city.neighbors_updated_at = datetime.utcnow()
+    db.commit()
+    print(f"   💾 Cached {len(candidates)} candidates for {current_city.name}")
+
+
+def _filter_neighbor_candidates(db: Session, current: Optional[Tuple[CityBoundary, CachedBoundary]], candidates: List[Dict]) -> List[Dict]:
+    """Step 4 (blocking, CPU-heavy): keep candidates that actually border the current city"""
     # Step 4: Dynamic filtering based on source and cached boundaries
     # Boundary-sharing candidates are already precise; radius candidates need filtering
+    current_city = current[0] if current else None
     current_boundary = None
-    if current_city and current_city.boundary_geojson:
-        coords = current_city.boundary_geojson.get("coordinates", [])
-        if coords:
-            current_boundary = [(c[0], c[1]) for c in coords]
+    if current_city:
+        current_entry = current[1]
+        if current_entry.point_count:
+            current_boundary = [(c[0], c[1]) for c in current_entry.coordinates()]
     
-    # Get cached boundaries for candidates
+    # Candidate rows without their boundary JSONB
     candidate_osm_ids = [c["osm_id"] for c in candidates]
-    cached_boundaries = {
-        c.osm_id: [(p[0], p[1]) for p in c.boundary_geojson.get("coordinates", [])]
-        for c in db.query(CityBoundary).filter(CityBoundary.osm_id.in_(candidate_osm_ids)).all()
-        if c.boundary_geojson and c.boundary_geojson.get("coordinates")
-    }
-    
+    candidate_cities = db.query(CityBoundary).options(*deferred_boundary_columns()).filter(
+        CityBoundary.osm_id.in_(candidate_osm_ids)
+    ).all()
+    has_boundary = {c.osm_id for c in candidate_cities if c.boundary_points_count}
+    
+    # Edge distances from city_adjacency (skips the polygon comparison)
+    precomputed_distances = {}
+    if current_city:
+        boundary_versions = {c.osm_id: c.boundary_updated_at for c in candidate_cities}
+        boundary_versions[current_city.osm_id] = current_city.boundary_updated_at
+        precomputed_distances = load_edge_distances(db, current_city.osm_id, boundary_versions)
+    
+    # Only decode the polygons of radius candidates with no stored distance
+    radius_ids = {c["osm_id"] for c in candidates if c.get("source", "radius") != "boundary"}
+    uncached = [
+        c for c in candidate_cities
+        if c.osm_id in radius_ids and c.osm_id in has_boundary and c.osm_id not in precomputed_distances
+    ]
+    cached_boundaries = {}
+    if current_boundary and uncached:
+        cached_boundaries = {
+            osm_id: [(p[0], p[1]) for p in entry.coordinates()]
+            for osm_id, entry in load_boundaries(db, uncached).items()
+            if entry.point_count
+        }
+    
+    new_edges = []
     neighbor_ids = []
     boundary_count = 0
     radius_count = 0
@@ -1024,9 +1228,12 @@ async def get_neighbor_cities(
             boundary_count += 1
         else:
             # Radius search = needs filtering
-            if osm_id in cached_boundaries and current_boundary:
+            if current_boundary and (osm_id in precomputed_distances or osm_id in cached_boundaries):
                 # BEST: boundary-to-boundary check (precise)
-                dist = _min_distance_between_polygons(current_boundary, cached_boundaries[osm_id])
+                dist = precomputed_distances.get(osm_id)
+                if dist is None:
+                    dist = _min_distance_between_polygons(current_boundary, cached_boundaries[osm_id])
+                    new_edges.append((current_city.osm_id, osm_id, dist, "radius"))
                 if dist <= 5000:  # Within 5km = neighbor (accounts for water/gaps)
                     city["edge_distance"] = dist
                     neighbor_ids.append(city)
@@ -1044,76 +1251,97 @@ async def get_neighbor_cities(
                     neighbor_ids.append(city)
                     radius_count += 1
     
+    # Write through in one upsert so the next request is a lookup
+    upsert_edges(db, new_edges)
+    
     neighbor_ids.sort(key=lambda c: c.get("edge_distance", c.get("distance", 0)))
     neighbor_ids = neighbor_ids[:20]
     print(f"   🎯 {len(neighbor_ids)} neighbors ({boundary_count} boundary, {radius_count} radius-filtered)")
     
-    # EMPIRE EXPANSION: Also load neighbors of any empire kingdoms in the initial results
-    # AND the current city if it's part of the empire
-    if current_user:
-        from db.models import PlayerState
-        player_state = db.query(PlayerState).filter(PlayerState.user_id == current_user.id).first()
-        print(f"   👑 Empire check: player_state={player_state is not None}, hometown={player_state.hometown_kingdom_id if player_state else None}")
-        
-        if player_state and player_state.hometown_kingdom_id:
-            hometown = db.query(Kingdom).filter(Kingdom.id == player_state.hometown_kingdom_id).first()
-            print(f"   👑 Hometown kingdom: {hometown.id if hometown else None}, empire_id={hometown.empire_id if hometown else None}")
-            
-            if hometown:
-                # Use empire_id if set, otherwise hometown id IS the empire (capital)
-                user_empire_id = hometown.empire_id or hometown.id
-                print(f"   👑 User empire_id: {user_empire_id}")
-                initial_osm_ids = {n["osm_id"] for n in neighbor_ids}
-                
-                # Also check if CURRENT city is part of empire
-                empire_ids_to_expand = []
-                if current_city:
-                    current_kingdom = db.query(Kingdom).filter(Kingdom.id == current_city.osm_id).first()
-                    if current_kingdom:
-                        k_empire = current_kingdom.empire_id or current_kingdom.id
-                        if k_empire == user_empire_id:
-                            empire_ids_to_expand.append(current_city.osm_id)
-                            print(f"   👑 Current city {current_city.name} is part of empire!")
-                
-                # Batch query: find which neighbors are empire kingdoms  
-                neighbor_kingdoms = db.query(Kingdom).filter(Kingdom.id.in_(initial_osm_ids)).all()
-                for k in neighbor_kingdoms:
-                    k_empire = k.empire_id or k.id
-                    if k_empire == user_empire_id:
-                        empire_ids_to_expand.append(k.id)
-                
-                print(f"   👑 Empire kingdoms to expand: {empire_ids_to_expand}")
-                
-                if empire_ids_to_expand:
-                    print(f"   👑 Found {len(empire_ids_to_expand)} empire kingdoms, expanding...")
-                    
-                    # Get cached neighbors for each empire kingdom
-                    empire_cities = db.query(CityBoundary).filter(CityBoundary.osm_id.in_(empire_ids_to_expand)).all()
-                    for empire_city in empire_cities:
-                        # Fetch neighbors from OSM if not cached
-                        if not empire_city.neighbor_ids:
-                            print(f"   👑 Fetching neighbors for {empire_city.name} from OSM...")
-                            emp_candidates, _ = await fetch_nearby_city_candidates(
-                                empire_city.center_lat, 
-                                empire_city.center_lon
-                            )
-                            if emp_candidates:
-                                empire_city.neighbor_ids = emp_candidates
-                                empire_city.neighbors_updated_at = datetime.utcnow()
-                                db.commit()
-                                print(f"   👑 Cached {len(emp_candidates)} neighbors for {empire_city.name}")
-                        
-                        if empire_city.neighbor_ids:
-                            for emp_neighbor in empire_city.neighbor_ids:
-                                if emp_neighbor["osm_id"] not in initial_osm_ids:
-                                    neighbor_ids.append(emp_neighbor)
-                                    initial_osm_ids.add(emp_neighbor["osm_id"])
-                    
-                    print(f"   👑 Expanded to {len(neighbor_ids)} total neighbors")
-    
+    return neighbor_ids
+
+
+def _empire_expansion_targets(db: Session, current_city: Optional[CityBoundary], neighbor_ids: List[Dict], current_user) -> List[Dict]:
+    """
+    EMPIRE EXPANSION (blocking): empire kingdoms among the current city and its
+    neighbors, as plain dicts (osm_id, name, center, cached candidates) so the
+    Overpass fetches below never touch ORM state on the event loop.
+    """
+    from db.models import PlayerState
+    player_state = db.query(PlayerState).filter(PlayerState.user_id == current_user.id).first()
+    print(f"   👑 Empire check: player_state={player_state is not None}, hometown={player_state.hometown_kingdom_id if player_state else None}")
+    
+    if not player_state or not player_state.hometown_kingdom_id:
+        return []
+    
+    hometown = db.query(Kingdom).filter(Kingdom.id == player_state.hometown_kingdom_id).first()
+    print(f"   👑 Hometown kingdom: {hometown.id if hometown else None}, empire_id={hometown.empire_id if hometown else None}")
+    if not hometown:
+        return []
+    
+    # Use empire_id if set, otherwise hometown id IS the empire (capital)
+    user_empire_id = hometown.empire_id or hometown.id
+    print(f"   👑 User empire_id: {user_empire_id}")
+    initial_osm_ids = {n["osm_id"] for n in neighbor_ids}
+    
+    # Also check if CURRENT city is part of empire
+    empire_ids_to_expand = []
+    if current_city:
+        current_kingdom = db.query(Kingdom).filter(Kingdom.id == current_city.osm_id).first()
+        if current_kingdom:
+            k_empire = current_kingdom.empire_id or current_kingdom.id
+            if k_empire == user_empire_id:
+                empire_ids_to_expand.append(current_city.osm_id)
+                print(f"   👑 Current city {current_city.name} is part of empire!")
+    
+    # Batch query: find which neighbors are empire kingdoms  
+    neighbor_kingdoms = db.query(Kingdom).filter(Kingdom.id.in_(initial_osm_ids)).all()
+    for k in neighbor_kingdoms:
+        k_empire = k.empire_id or k.id
+        if k_empire == user_empire_id:
+            empire_ids_to_expand.append(k.id)
+    
+    print(f"   👑 Empire kingdoms to expand: {empire_ids_to_expand}")
+    if not empire_ids_to_expand:
+        return []
+    
+    print(f"   👑 Found {len(empire_ids_to_expand)} empire kingdoms, expanding...")
+    
+    # Get cached neighbors for each empire kingdom
+    empire_cities = db.query(CityBoundary).options(*deferred_boundary_columns()).filter(
+        CityBoundary.osm_id.in_(empire_ids_to_expand)
+    ).all()
+    return [
+        {
+            "osm_id": c.osm_id,
+            "name": c.name,
+            "center_lat": c.center_lat,
+            "center_lon": c.center_lon,
+            "neighbor_ids": c.neighbor_ids,
+        }
+        for c in empire_cities
+    ]
+
+
+def _cache_empire_candidates(db: Session, osm_id: str, candidates: List[Dict]) -> None:
+    """EMPIRE EXPANSION (blocking): remember candidates fetched for an empire kingdom"""
+    empire_city = db.query(CityBoundary).options(*deferred_boundary_columns()).filter(CityBoundary.osm_id == osm_id).first()
+    if empire_city:
+        empire_city.neighbor_ids = candidates
+        empire_city.neighbors_updated_at = datetime.utcnow()
+        db.commit()
+        print(f"   👑 Cached {len(candidates)} neighbors for {empire_city.name}")
+
+
+def _build_neighbor_response(db: Session, neighbor_ids: List[Dict], current_user) -> List[CityBoundaryResponse]:
+    """Final step (blocking): kingdoms, cached boundaries and the response"""
     # Check which ones we have cached
     osm_ids = [n["osm_id"] for n in neighbor_ids]
-    cached_by_id = {c.osm_id: c for c in db.query(CityBoundary).filter(CityBoundary.osm_id.in_(osm_ids)).all()}
+    cached_by_id = {
+        c.osm_id: c
+        for c in db.query(CityBoundary).options(*deferred_boundary_columns()).filter(CityBoundary.osm_id.in_(osm_ids)).all()
+    }
+    boundaries = load_boundaries(db, cached_by_id.values())
     
     print(f"   💾 {len(cached_by_id)}/{len(osm_ids)} boundaries cached")
     
@@ -1140,8 +1368,6 @@ async def get_neighbor_cities(
                 'admin_level': city_info.get("admin_level", 8),
                 'center_lat': city_info.get("center_lat", 0.0),
                 'center_lon': city_info.get("center_lon", 0.0),
-                'boundary_geojson': {"coordinates": []},  # Empty - frontend should fetch via batch endpoint
-                'simplified_boundary_geojson': None,  # No cached simplified boundary
                 'radius_meters': 5000.0,  # Estimated
                 'cached': False
             })()
@@ -1159,13 +1385,10 @@ async def get_neighbor_cities(
     # Build response with cached simplified boundaries
     response = []
     for city in result_cities:
-        # Use cached simplified boundary if available, otherwise compute and store it
-        if city.simplified_boundary_geojson:
-            simplified = city.simplified_boundary_geojson.get("coordinates", [])
+        if city.osm_id in cached_by_id:
+            simplified = _get_simplified_boundary(city, boundaries.get(city.osm_id))
         else:
-            # Backfill: Compute and store simplified boundary for this city
-            simplified = simplify_boundary(city.boundary_geojson.get("coordinates", []))
-            city.simplified_boundary_geojson = {"type": "Polygon", "coordinates": simplified}
+            simplified = []  # Empty - frontend should fetch via batch endpoint
         
         response.append(CityBoundaryResponse(
             osm_id=city.osm_id,
@@ -1186,6 +1409,77 @@ async def get_neighbor_cities(
     return response
 
 
+
+
+async def get_neighbor_cities(
+    db: Session,
+    lat: float,
+    lon: float,
+    current_user = None
+) -> List[CityBoundaryResponse]:
+    """
+    Get cities that DIRECTLY TOUCH the current city (shared borders only).
+    admin_level=8 ONLY (cities, not counties).
+    
+    Database and geometry steps run in the blocking pool (run_sync);
+    only the Overpass calls are awaited on the event loop.
+    """
+    print(f"🏘️ Loading neighbors for ({lat:.4f}, {lon:.4f})")
+    
+    current, candidates = await run_sync(_neighbor_lookup_start, db, lat, lon)
+    
+    # Step 3: Fetch from OSM if not cached
+    if not candidates:
+        print(f"   🌐 Fetching candidates from OSM...")
+        
+        candidates, is_boundary_sharing = await fetch_nearby_city_candidates(lat, lon)
+        
+        if not candidates:
+            print(f"   ⚠️ No neighbors found")
+            return []
+        
+        print(f"   🌐 OSM returned {len(candidates)} candidates")
+        
+        # Cache candidates with metadata
+        if current:
+            await run_sync(_cache_neighbor_candidates, db, current[0], candidates, is_boundary_sharing)
+    else:
+        print(f"   🌐 Using {len(candidates)} cached candidates")
+    
+    # Step 4: Dynamic filtering based on source and cached boundaries
+    neighbor_ids = await run_sync(_filter_neighbor_candidates, db, current, candidates)
+    
+    # EMPIRE EXPANSION: Also load neighbors of any empire kingdoms in the initial results
+    # AND the current city if it's part of the empire
+    if current_user:
+        empire_cities = await run_sync(
+            _empire_expansion_targets, db, current[0] if current else None, neighbor_ids, current_user
+        )
+        initial_osm_ids = {n["osm_id"] for n in neighbor_ids}
+        for empire_city in empire_cities:
+            # Fetch neighbors from OSM if not cached
+            if not empire_city["neighbor_ids"]:
+                print(f"   👑 Fetching neighbors for {empire_city['name']} from OSM...")
+                emp_candidates, _ = await fetch_nearby_city_candidates(
+                    empire_city["center_lat"], 
+                    empire_city["center_lon"]
+                )
+                if emp_candidates:
+                    await run_sync(_cache_empire_candidates, db, empire_city["osm_id"], emp_candidates)
+                    empire_city["neighbor_ids"] = emp_candidates
+            
+            if empire_city["neighbor_ids"]:
+                for emp_neighbor in empire_city["neighbor_ids"]:
+                    if emp_neighbor["osm_id"] not in initial_osm_ids:
+                        neighbor_ids.append(emp_neighbor)
+                        initial_osm_ids.add(emp_neighbor["osm_id"])
+        
+        if empire_cities:
+            print(f"   👑 Expanded to {len(neighbor_ids)} total neighbors")
+    
+    return await run_sync(_build_neighbor_response, db, neighbor_ids, current_user)
+
+
 # Legacy endpoint - combines current + neighbors (for backward compat)
 async def get_cities_near_location(
     db: Session,
@@ -1205,24 +1499,17 @@ async def get_cities_near_location(
     return result
 
 
-async def get_city_boundary(db: Session, osm_id: str) -> Optional[BoundaryResponse]:
-    """Lazy-load boundary for a single city."""
-    cached = db.query(CityBoundary).filter(CityBoundary.osm_id == osm_id).first()
+def _cached_boundary_response(db: Session, osm_id: str) -> Optional[BoundaryResponse]:
+    """Blocking: boundary from cache (counts the access)"""
+    cached = db.query(CityBoundary).options(*deferred_boundary_columns()).filter(CityBoundary.osm_id == osm_id).first()
     
     if cached:
+        entry = load_boundaries(db, [cached]).get(cached.osm_id)
         cached.access_count += 1
         cached.last_accessed = datetime.utcnow()
+        simplified = _get_simplified_boundary(cached, entry)
         db.commit()
         
-        # Use cached simplified boundary if available, otherwise compute and store it
-        if cached.simplified_boundary_geojson:
-            simplified = cached.simplified_boundary_geojson.get("coordinates", [])
-        else:
-            # Backfill: Compute and store simplified boundary for this city
-            simplified = simplify_boundary(cached.boundary_geojson.get("coordinates", []))
-            cached.simplified_boundary_geojson = {"type": "Polygon", "coordinates": simplified}
-            db.commit()
-        
         return BoundaryResponse(
             osm_id=cached.osm_id,
             name=cached.name,
@@ -1231,12 +1518,11 @@ async def get_city_boundary(db: Session, osm_id: str) -> Optional[BoundaryRespon
             from_cache=True
         )
     
-    print(f"🌐 Lazy-loading boundary for {osm_id}")
-    boundary_data = await fetch_city_boundary_by_id(osm_id)
-    
-    if not boundary_data:
-        return None
-    
+    return None
+
+
+def _cache_fetched_boundary(db: Session, osm_id: str, boundary_data: Dict) -> BoundaryResponse:
+    """Blocking: simplify, cache and return a freshly fetched boundary"""
     # Cache it (with race condition protection)
     # Pre-compute and store simplified boundary for efficient retrieval
     simplified = simplify_boundary(boundary_data["boundary"])
@@ -1252,11 +1538,13 @@ async def get_city_boundary(db: Session, osm_id: str) -> Optional[BoundaryRespon
             simplified_boundary_geojson={"type": "Polygon", "coordinates": simplified},
             radius_meters=boundary_data["radius_meters"],
             boundary_points_count=len(boundary_data["boundary"]),
+            **_boundary_bbox(boundary_data["boundary"]),
             access_count=1,
             osm_metadata=boundary_data.get("osm_tags", {})
         )
         db.add(new_city)
         db.commit()
+        _link_adjacency(db, new_city, boundary_data["boundary"])
     except Exception as e:
         # Race condition - another request already cached it
         db.rollback()
@@ -1281,18 +1569,27 @@ async def get_city_boundary(db: Session, osm_id: str) -> Optional[BoundaryRespon
     )
 
 
-async def get_city_boundaries_batch(db: Session, osm_ids: List[str]) -> List[BoundaryResponse]:
-    """
-    Fetch multiple city boundaries in parallel.
+async def get_city_boundary(db: Session, osm_id: str) -> Optional[BoundaryResponse]:
+    """Lazy-load boundary for a single city."""
+    cached_response = await run_sync(_cached_boundary_response, db, osm_id)
+    if cached_response:
+        return cached_response
     
-    Much faster than calling get_city_boundary() sequentially.
-    Returns boundaries in same order as requested osm_ids.
-    """
-    print(f"📦 Batch loading {len(osm_ids)} boundaries...")
+    print(f"🌐 Lazy-loading boundary for {osm_id}")
+    boundary_data = await fetch_city_boundary_by_id(osm_id)
     
+    if not boundary_data:
+        return None
+    
+    return await run_sync(_cache_fetched_boundary, db, osm_id, boundary_data)
+
+
+def _batch_lookup_cached(db: Session, osm_ids: List[str]):
+    """Blocking: cached rows + decoded boundaries for a batch (counts the access)"""
     # Check cache first
-    cached = db.query(CityBoundary).filter(CityBoundary.osm_id.in_(osm_ids)).all()
+    cached = db.query(CityBoundary).options(*deferred_boundary_columns()).filter(CityBoundary.osm_id.in_(osm_ids)).all()
     cached_by_id = {c.osm_id: c for c in cached}
+    boundaries = load_boundaries(db, cached)
     
     print(f"   💾 {len(cached)}/{len(osm_ids)} already cached")
     
@@ -1302,88 +1599,90 @@ async def get_city_boundaries_batch(db: Session, osm_ids: List[str]) -> List[Bou
         city.last_accessed = datetime.utcnow()
     db.commit()
     
-    # Fetch missing ones in parallel
     missing_ids = [osm_id for osm_id in osm_ids if osm_id not in cached_by_id]
-    
-    if missing_ids:
-        print(f"   🌐 Fetching {len(missing_ids)} from OSM in parallel...")
-        
-        # Fetch all in parallel using asyncio.gather
-        fetch_tasks = [fetch_city_boundary_by_id(osm_id) for osm_id in missing_ids]
-        boundary_results = await asyncio.gather(*fetch_tasks, return_exceptions=True)
-        
-        # Cache successful fetches
-        newly_cached = {}
-        for osm_id, boundary_data in zip(missing_ids, boundary_results):
-            # Skip exceptions and None results
-            if isinstance(boundary_data, Exception):
-                print(f"   ❌ Error fetching {osm_id}: {boundary_data}")
-                continue
-            if not boundary_data:
-                print(f"   ⚠️  No data for {osm_id}")
-                continue
-            
-            try:
-                # Pre-compute and store simplified boundary for efficient retrieval
-                simplified = simplify_boundary(boundary_data["boundary"])
-                
-                new_city = CityBoundary(
-                    osm_id=osm_id,
-                    name=boundary_data["name"],
-                    admin_level=boundary_data["admin_level"],
-                    center_lat=boundary_data["center_lat"],
-                    center_lon=boundary_data["center_lon"],
-                    boundary_geojson={"type": "Polygon", "coordinates": boundary_data["boundary"]},
-                    simplified_boundary_geojson={"type": "Polygon", "coordinates": simplified},
-                    radius_meters=boundary_data["radius_meters"],
-                    boundary_points_count=len(boundary_data["boundary"]),
-                    access_count=1,
-                    osm_metadata=boundary_data.get("osm_tags", {})
-                )
-                db.add(new_city)
-                db.flush()  # Get it into session without committing
-                newly_cached[osm_id] = new_city
-                print(f"   ✅ Cached {boundary_data['name']}")
-            except Exception as e:
-                # Race condition - another request cached it
-                db.rollback()
-                if "duplicate key" in str(e).lower():
-                    print(f"   ⏭️  {osm_id} already cached by another request")
-                    # Fetch from DB
-                    city = db.query(CityBoundary).filter(CityBoundary.osm_id == osm_id).first()
-                    if city:
-                        newly_cached[osm_id] = city
-                else:
-                    print(f"   ❌ Error caching {osm_id}: {e}")
+    return cached_by_id, boundaries, missing_ids
+
+
+def _batch_cache_fetched(db: Session, missing_ids: List[str], boundary_results: list) -> Dict[str, CityBoundary]:
+    """Blocking: simplify and cache the boundaries fetched for a batch"""
+    # Cache successful fetches
+    newly_cached = {}
+    created_boundaries = {}  # osm_id -> boundary, for adjacency linking after commit
+    for osm_id, boundary_data in zip(missing_ids, boundary_results):
+        # Skip exceptions and None results
+        if isinstance(boundary_data, Exception):
+            print(f"   ❌ Error fetching {osm_id}: {boundary_data}")
+            continue
+        if not boundary_data:
+            print(f"   ⚠️  No data for {osm_id}")
+            continue
         
         try:
-            db.commit()
+            # Pre-compute and store simplified boundary for efficient retrieval
+            simplified = simplify_boundary(boundary_data["boundary"])
+            
+            new_city = CityBoundary(
+                osm_id=osm_id,
+                name=boundary_data["name"],
+                admin_level=boundary_data["admin_level"],
+                center_lat=boundary_data["center_lat"],
+                center_lon=boundary_data["center_lon"],
+                boundary_geojson={"type": "Polygon", "coordinates": boundary_data["boundary"]},
+                simplified_boundary_geojson={"type": "Polygon", "coordinates": simplified},
+                radius_meters=boundary_data["radius_meters"],
+                boundary_points_count=len(boundary_data["boundary"]),
+                **_boundary_bbox(boundary_data["boundary"]),
+                access_count=1,
+                osm_metadata=boundary_data.get("osm_tags", {})
+            )
+            db.add(new_city)
+            db.flush()  # Get it into session without committing
+            newly_cached[osm_id] = new_city
+            created_boundaries[osm_id] = boundary_data["boundary"]
+            print(f"   ✅ Cached {boundary_data['name']}")
         except Exception as e:
+            # Race condition - another request cached it
             db.rollback()
-            print(f"   ⚠️  Commit error (likely race condition): {e}")
-            # Re-fetch to get latest state
-            for osm_id in missing_ids:
-                if osm_id not in newly_cached:
-                    city = db.query(CityBoundary).filter(CityBoundary.osm_id == osm_id).first()
-                    if city:
-                        newly_cached[osm_id] = city
-        
-        # Update cached_by_id with newly cached items
-        cached_by_id.update(newly_cached)
+            if "duplicate key" in str(e).lower():
+                print(f"   ⏭️  {osm_id} already cached by another request")
+                # Fetch from DB
+                city = db.query(CityBoundary).filter(CityBoundary.osm_id == osm_id).first()
+                if city:
+                    newly_cached[osm_id] = city
+            else:
+                print(f"   ❌ Error caching {osm_id}: {e}")
     
+    try:
+        db.commit()
+        for osm_id, boundary in created_boundaries.items():
+            _link_adjacency(db, newly_cached[osm_id], boundary)
+    except Exception as e:
+        db.rollback()
+        print(f"   ⚠️  Commit error (likely race condition): {e}")
+        # Re-fetch to get latest state
+        for osm_id in missing_ids:
+            if osm_id not in newly_cached:
+                city = db.query(CityBoundary).filter(CityBoundary.osm_id == osm_id).first()
+                if city:
+                    newly_cached[osm_id] = city
+    
+    return newly_cached
+
+
+def _batch_build_response(
+    db: Session,
+    osm_ids: List[str],
+    cached_by_id: Dict[str, CityBoundary],
+    boundaries: Dict[str, CachedBoundary],
+    missing_ids: List[str]
+) -> List[BoundaryResponse]:
+    """Blocking: response in request order (backfills simplified boundaries)"""
     # Build response in same order as input
     result = []
     for osm_id in osm_ids:
         if osm_id in cached_by_id:
             city = cached_by_id[osm_id]
-            
-            # Use cached simplified boundary if available, otherwise compute and store it
-            if city.simplified_boundary_geojson:
-                simplified = city.simplified_boundary_geojson.get("coordinates", [])
-            else:
-                # Backfill: Compute and store simplified boundary for this city
-                simplified = simplify_boundary(city.boundary_geojson.get("coordinates", []))
-                city.simplified_boundary_geojson = {"type": "Polygon", "coordinates": simplified}
+            simplified = _get_simplified_boundary(city, boundaries.get(osm_id))
             
             result.append(BoundaryResponse(
                 osm_id=city.osm_id,
@@ -1406,27 +1705,47 @@ async def get_city_boundaries_batch(db: Session, osm_ids: List[str]) -> List[Bou
     return result
 
 
+async def get_city_boundaries_batch(db: Session, osm_ids: List[str]) -> List[BoundaryResponse]:
+    """
+    Fetch multiple city boundaries in parallel.
+    
+    Much faster than calling get_city_boundary() sequentially.
+    Returns boundaries in same order as requested osm_ids.
+    """
+    print(f"📦 Batch loading {len(osm_ids)} boundaries...")
+    
+    cached_by_id, boundaries, missing_ids = await run_sync(_batch_lookup_cached, db, osm_ids)
+    
+    if missing_ids:
+        print(f"   🌐 Fetching {len(missing_ids)} from OSM in parallel...")
+        
+        # Fetch all in parallel using asyncio.gather
+        fetch_tasks = [fetch_city_boundary_by_id(osm_id) for osm_id in missing_ids]
+        boundary_results = await asyncio.gather(*fetch_tasks, return_exceptions=True)
+        
+        newly_cached = await run_sync(_batch_cache_fetched, db, missing_ids, boundary_results)
+        
+        # Update cached_by_id with newly cached items
+        cached_by_id.update(newly_cached)
+        boundaries.update(await run_sync(load_boundaries, db, list(newly_cached.values())))
+    
+    return await run_sync(_batch_build_response, db, osm_ids, cached_by_id, boundaries, missing_ids)
+
+
 def get_city_by_id(db: Session, osm_id: str) -> Optional[CityBoundaryResponse]:
     """Get a specific city from cache"""
-    city = db.query(CityBoundary).filter(CityBoundary.osm_id == osm_id).first()
+    city = db.query(CityBoundary).options(*deferred_boundary_columns()).filter(CityBoundary.osm_id == osm_id).first()
     if not city:
         return None
     
+    entry = load_boundaries(db, [city]).get(osm_id)
     city.access_count += 1
     city.last_accessed = datetime.utcnow()
+    simplified = _get_simplified_boundary(city, entry)
     db.commit()
     
     kingdoms = _get_kingdom_data(db, [osm_id], None)
     
-    # Use cached simplified boundary if available, otherwise compute and store it
-    if city.simplified_boundary_geojson:
-        simplified = city.simplified_boundary_geojson.get("coordinates", [])
-    else:
-        # Backfill: Compute and store simplified boundary for this city
-        simplified = simplify_boundary(city.boundary_geojson.get("coordinates", []))
-        city.simplified_boundary_geojson = {"type": "Polygon", "coordinates": simplified}
-        db.commit()
-    
     return CityBoundaryResponse(
         osm_id=city.osm_id,
         name=city.name,
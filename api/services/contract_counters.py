@@ -0,0 +1,187 @@
+"""
+Contract progress counters
+==========================
+Contract progress used to be COUNT(*) over contract_contributions (plus a
+GROUP BY user_id) every time a contract was rendered. It is now kept as:
+
+- unified_contracts.actions_completed - total actions on the contract
+- contract_contributor_counts         - actions per (contract, user)
+
+record_contribution() inserts the contribution row and bumps both counters
+in the caller's transaction, so they commit (or roll back) together with the
+work action. The contract UPDATE takes the contract's row lock, which also
+serializes concurrent contributions and repair_counter_drift().
+
+find_counter_drift() / repair_counter_drift() compare the counters with the
+contribution rows and fix any drift (see backfill_contract_counters.py).
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy import func, text
+from typing import Dict, Iterable, List, Tuple
+
+from db import UnifiedContract, ContractContribution, ContractContributorCount
+from services.player_stats import bump_stats
+
+
+_contracts = UnifiedContract.__table__
+_contributor_counts = ContractContributorCount.__table__
+
+# Contract category -> player_stat_counters column bumped per action
+_CONTRIBUTION_STATS = {
+    "kingdom_building": "building_contracts",
+    "personal_training": "training_contracts",
+}
+
+
+# ============================================================
+# WRITES
+# ============================================================
+
+def record_contribution(db: Session, contract: UnifiedContract, user_id: int, **fields) -> Tuple[ContractContribution, int, int]:
+    """
+    Add one contribution (= one action) and bump the counters.
+
+    Does not commit. Returns (contribution, contract actions_completed, user's actions on the contract).
+    Extra keyword arguments (gold_earned, xp_earned, ...) go on the ContractContribution row.
+    """
+    if contract.id is None:
+        db.flush()
+
+    contribution = ContractContribution(contract_id=contract.id, user_id=user_id, **fields)
+    db.add(contribution)
+
+    actions_completed = db.execute(
+        _contracts.update()
+        .where(_contracts.c.id == contract.id)
+        .values(actions_completed=_contracts.c.actions_completed + 1)
+        .returning(_contracts.c.actions_completed)
+    ).scalar_one()
+    # Keep the loaded object in sync without marking it dirty
+    set_committed_value(contract, "actions_completed", actions_completed)
+
+    upsert = pg_insert(_contributor_counts).values(contract_id=contract.id, user_id=user_id, actions=1)
+    user_actions = db.execute(
+        upsert.on_conflict_do_update(
+            index_elements=[_contributor_counts.c.contract_id, _contributor_counts.c.user_id],
+            set_={"actions": _contributor_counts.c.actions + 1}
+        ).returning(_contributor_counts.c.actions)
+    ).scalar_one()
+
+    # Lifetime achievement counters (services/player_stats.py)
+    stat = _CONTRIBUTION_STATS.get(contract.category)
+    if stat:
+        bump_stats(db, user_id, **{stat: 1})
+
+    return contribution, actions_completed, user_actions
+
+
+# ============================================================
+# READS
+# ============================================================
+
+def get_contributor_counts(db: Session, contract_ids: Iterable[int]) -> Dict[int, Dict[int, int]]:
+    """{contract_id: {user_id: actions}} for several contracts in one query"""
+    counts: Dict[int, Dict[int, int]] = {contract_id: {} for contract_id in contract_ids}
+    if not counts:
+        return counts
+    rows = db.query(
+        ContractContributorCount.contract_id,
+        ContractContributorCount.user_id,
+        ContractContributorCount.actions
+    ).filter(
+        ContractContributorCount.contract_id.in_(list(counts))
+    ).all()
+    for contract_id, user_id, actions in rows:
+        counts[contract_id][user_id] = actions
+    return counts
+
+
+def get_contracts_contributed_count(db: Session, user_id: int) -> int:
+    """Number of distinct contracts the user has worked on"""
+    return db.query(func.count(ContractContributorCount.contract_id)).filter(
+        ContractContributorCount.user_id == user_id,
+        ContractContributorCount.actions > 0
+    ).scalar() or 0
+
+
+# ============================================================
+# CONSISTENCY CHECK / REPAIR
+# ============================================================
+
+_TOTAL_DRIFT_SQL = """
+    SELECT uc.id, uc.actions_completed, coalesce(cc.actual, 0)
+    FROM unified_contracts uc
+    LEFT JOIN (
+        SELECT contract_id, COUNT(*) AS actual FROM contract_contributions GROUP BY contract_id
+    ) cc ON cc.contract_id = uc.id
+    WHERE uc.actions_completed IS DISTINCT FROM coalesce(cc.actual, 0) {extra}
+"""
+
+_CONTRIBUTOR_DRIFT_SQL = """
+    SELECT coalesce(a.contract_id, c.contract_id), coalesce(a.user_id, c.user_id),
+           coalesce(c.actions, 0), coalesce(a.actual, 0)
+    FROM (
+        SELECT contract_id, user_id, COUNT(*) AS actual
+        FROM contract_contributions GROUP BY contract_id, user_id
+    ) a
+    FULL OUTER JOIN contract_contributor_counts c
+        ON c.contract_id = a.contract_id AND c.user_id = a.user_id
+    WHERE coalesce(c.actions, 0) <> coalesce(a.actual, 0) {extra}
+"""
+
+
+def find_counter_drift(db: Session, active_only: bool = False) -> Dict[str, List[dict]]:
+    """
+    Contracts and contributors whose counters don't match contract_contributions.
+    With active_only, completed contracts are skipped.
+    """
+    total_extra = "AND uc.completed_at IS NULL" if active_only else ""
+    contributor_extra = (
+        "AND coalesce(a.contract_id, c.contract_id) IN (SELECT id FROM unified_contracts WHERE completed_at IS NULL)"
+        if active_only else ""
+    )
+
+    contracts = [
+        {"contract_id": contract_id, "counter": counter, "actual": actual}
+        for contract_id, counter, actual in db.execute(text(_TOTAL_DRIFT_SQL.format(extra=total_extra))).all()
+    ]
+    contributors = [
+        {"contract_id": contract_id, "user_id": user_id, "counter": counter, "actual": actual}
+        for contract_id, user_id, counter, actual in db.execute(text(_CONTRIBUTOR_DRIFT_SQL.format(extra=contributor_extra))).all()
+    ]
+    return {"contracts": contracts, "contributors": contributors}
+
+
+def repair_counter_drift(db: Session, contract_ids: Iterable[int]) -> int:
+    """
+    Recompute both counters for the given contracts from contract_contributions.
+
+    Locks the contract rows first, so contributions recorded concurrently either
+    land before the recount or wait for it. Does not commit. Returns contracts repaired.
+    """
+    contract_ids = sorted(set(contract_ids))
+    if not contract_ids:
+        return 0
+
+    params = {"ids": contract_ids}
+    locked = db.execute(
+        text("SELECT id FROM unified_contracts WHERE id = ANY(:ids) ORDER BY id FOR UPDATE"), params
+    ).scalars().all()
+
+    db.execute(text("""
+        UPDATE unified_contracts uc
+        SET actions_completed = (SELECT COUNT(*) FROM contract_contributions cc WHERE cc.contract_id = uc.id)
+        WHERE uc.id = ANY(:ids)
+    """), params)
+    db.execute(text("DELETE FROM contract_contributor_counts WHERE contract_id = ANY(:ids)"), params)
+    db.execute(text("""
+        INSERT INTO contract_contributor_counts (contract_id, user_id, actions)
+        SELECT contract_id, user_id, COUNT(*)
+        FROM contract_contributions
+        WHERE contract_id = ANY(:ids)
+        GROUP BY contract_id, user_id
+    """), params)
+
+    return len(locked)
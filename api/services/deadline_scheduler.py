@@ -0,0 +1,335 @@
+"""
+Deadline Scheduler
+==================
+Time-based transitions used to run only when a client happened to hit an
+endpoint after the timer (pledge → battle on the next battle GET, duel
+timeouts on the next swing/claim, hunt expiry on the next load). Nothing
+happened while nobody polled, and the request that did poll paid for it.
+
+Each timer is now a row in `deadlines` (kind, target_id, due_at):
+
+- schedule_deadline() upserts the row in the caller's transaction, so a
+  timer only exists if the state change that started it commits
+- process_due_deadlines() claims up to `batch_size` due rows with
+  FOR UPDATE SKIP LOCKED, runs each kind's handler in a savepoint and
+  commits the batch - any number of workers can run side by side
+- a row that keeps failing is parked (failed_at set, last_error kept)
+  rather than deleted, so failures stay queryable
+- notifications are sent through websocket/broadcast after the commit, so
+  clients never hear about state that rolled back
+
+Handlers are idempotent and re-check the target's own timestamps: if the
+timer moved (new duel round, battle already resolved) they reschedule or
+drop the row instead of acting. The lazy checks in the routers stay as a
+fallback, so a late worker never blocks a player.
+
+Run by deadline_worker.py (scheduled Lambda or local loop).
+"""
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from functools import partial
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, lazyload
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from db.models import Deadline
+
+logger = logging.getLogger(__name__)
+
+
+# Deadline kinds
+BATTLE_PLEDGE_END = "battle_pledge_end"  # target: battle id
+BATTLE_RESOLVE = "battle_resolve"        # target: battle id
+DUEL_TIMEOUT = "duel_timeout"            # target: duel match id
+HUNT_EXPIRY = "hunt_expiry"              # target: hunt id
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+RETRY_BACKOFF_SECONDS = 30
+
+
+@dataclass
+class DeadlineOutcome:
+    """What a handler did: when to run again (None = done) and what to broadcast after commit."""
+    reschedule_at: Optional[datetime] = None
+    notifications: List[Callable[[], int]] = field(default_factory=list)
+
+
+# ============================================================
+# QUEUE
+# ============================================================
+
+def schedule_deadline(db: Session, kind: str, target_id, due_at: datetime) -> None:
+    """
+    Queue (or move) the timer for a target. Does not commit.
+
+    There is one row per (kind, target_id), so scheduling again just moves
+    due_at - e.g. each duel round re-schedules the same match.
+    """
+    stmt = pg_insert(Deadline).values(
+        kind=kind,
+        target_id=str(target_id),
+        due_at=due_at,
+        attempts=0,
+        created_at=datetime.utcnow(),
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_deadlines_kind_target",
+        set_={
+            "due_at": stmt.excluded.due_at,
+            "attempts": 0,
+            "last_error": None,
+            "failed_at": None,
+        }
+    )
+    db.execute(stmt)
+
+
+def cancel_deadline(db: Session, kind: str, target_id) -> None:
+    """Drop a queued timer. Does not commit."""
+    db.query(Deadline).filter(
+        Deadline.kind == kind,
+        Deadline.target_id == str(target_id)
+    ).delete(synchronize_session=False)
+
+
+# ============================================================
+# WORKER
+# ============================================================
+
+def process_due_deadlines(
+    db: Session,
+    batch_size: int = BATCH_SIZE,
+    now: Optional[datetime] = None
+) -> Tuple[Dict[str, int], List[Callable[[], int]]]:
+    """
+    Claim and run one batch of due deadlines, then commit.
+
+    Rows another worker holds are skipped, not waited on. A handler that
+    raises is rolled back to its savepoint and retried with a backoff, up to
+    MAX_ATTEMPTS, without affecting the rest of the batch; then the row is
+    parked with its last_error.
+
+    Returns:
+        (stats, notifications) - call send_notifications() with the latter
+    """
+    now = now or datetime.utcnow()
+
+    due = db.query(Deadline).filter(
+        Deadline.failed_at.is_(None),
+        Deadline.due_at <= now
+    ).order_by(Deadline.due_at).limit(batch_size).with_for_update(skip_locked=True).all()
+
+    stats = {"claimed": len(due), "done": 0, "rescheduled": 0, "failed": 0, "parked": 0}
+    notifications: List[Callable[[], int]] = []
+
+    for deadline in due:
+        handler = _HANDLERS.get(deadline.kind)
+        if handler is None:
+            logger.warning(f"[Deadlines] Unknown kind {deadline.kind!r} for {deadline.target_id}, parking")
+            deadline.last_error = f"Unknown kind {deadline.kind!r}"
+            deadline.failed_at = now
+            stats["parked"] += 1
+            continue
+
+        try:
+            with db.begin_nested():
+                outcome = handler(db, deadline.target_id, now)
+        except Exception as e:
+            logger.exception(f"[Deadlines] {deadline.kind}:{deadline.target_id} failed")
+            deadline.attempts = (deadline.attempts or 0) + 1
+            deadline.last_error = f"{type(e).__name__}: {e}"[:500]
+            if deadline.attempts >= MAX_ATTEMPTS:
+                deadline.failed_at = now
+                stats["parked"] += 1
+            else:
+                deadline.due_at = now + timedelta(seconds=RETRY_BACKOFF_SECONDS * deadline.attempts)
+            stats["failed"] += 1
+            continue
+
+        if outcome.reschedule_at:
+            deadline.due_at = outcome.reschedule_at
+            deadline.attempts = 0
+            stats["rescheduled"] += 1
+        else:
+            db.delete(deadline)
+            stats["done"] += 1
+        notifications.extend(outcome.notifications)
+
+    db.commit()
+
+    return stats, notifications
+
+
+def next_due_at(db: Session) -> Optional[datetime]:
+    """due_at of the earliest live (not parked) deadline, or None if the queue is empty"""
+    return db.query(func.min(Deadline.due_at)).filter(Deadline.failed_at.is_(None)).scalar()
+
+
+def send_notifications(notifications: List[Callable[[], int]]) -> int:
+    """Send post-commit broadcasts. A failed broadcast is logged, not retried."""
+    sent = 0
+    for notify in notifications:
+        try:
+            sent += notify() or 0
+        except Exception:
+            logger.exception("[Deadlines] Broadcast failed")
+    return sent
+
+
+def run_due_deadlines(db: Session, batch_size: int = BATCH_SIZE) -> Dict[str, int]:
+    """Run one batch and broadcast its results."""
+    stats, notifications = process_due_deadlines(db, batch_size)
+    stats["notified"] = send_notifications(notifications)
+    return stats
+
+
+# ============================================================
+# HANDLERS
+# ============================================================
+
+def _handle_battle_pledge_end(db: Session, target_id: str, now: datetime) -> DeadlineOutcome:
+    """Pledge window closed: open the territories and tell both kingdoms the fight is on."""
+    from db.models import Battle
+    from routers.battles import _add_missing_territories, _refresh_side_stats
+    from websocket.broadcast import notify_kingdom, KingdomEvents
+
+    # participants is eager-joined; Postgres can't FOR UPDATE an outer join
+    battle = db.query(Battle).options(lazyload(Battle.participants)).filter(
+        Battle.id == int(target_id)
+    ).with_for_update().first()
+    if not battle or battle.resolved_at is not None:
+        return DeadlineOutcome()
+
+    if now < battle.pledge_end_time:
+        return DeadlineOutcome(reschedule_at=battle.pledge_end_time)
+
+    _add_missing_territories(db, battle)
+    _refresh_side_stats(db, battle.id)
+
+    data = {
+        "battle_id": battle.id,
+        "battle_type": battle.type,
+        "kingdom_id": battle.kingdom_id,
+        "attacking_from_kingdom_id": battle.attacking_from_kingdom_id,
+    }
+    kingdom_ids = {battle.kingdom_id, battle.attacking_from_kingdom_id} - {None}
+    return DeadlineOutcome(notifications=[
+        partial(notify_kingdom, kingdom_id=kid, event_type=KingdomEvents.BATTLE_PHASE_STARTED, data=data)
+        for kid in kingdom_ids
+    ])
+
+
+def _handle_battle_resolve(db: Session, target_id: str, now: datetime) -> DeadlineOutcome:
+    """Recount captures after a push that captured without winning."""
+    from db.models import Battle
+    from routers.battles import _atomic_check_and_resolve_battle, _apply_battle_resolution_effects
+    from websocket.broadcast import notify_kingdom, KingdomEvents
+
+    winner_side = _atomic_check_and_resolve_battle(db, int(target_id))
+    if not winner_side:
+        return DeadlineOutcome()
+
+    battle = db.query(Battle).filter(Battle.id == int(target_id)).first()
+    _apply_battle_resolution_effects(db, battle, winner_side)
+
+    event_type = KingdomEvents.COUP_ENDED if battle.is_coup else KingdomEvents.INVASION_ENDED
+    data = {
+        "battle_id": battle.id,
+        "battle_type": battle.type,
+        "winner_side": winner_side,
+        "attacker_victory": winner_side == "attackers",
+    }
+    kingdom_ids = {battle.kingdom_id, battle.attacking_from_kingdom_id} - {None}
+    return DeadlineOutcome(notifications=[
+        partial(notify_kingdom, kingdom_id=kid, event_type=event_type, data=data)
+        for kid in kingdom_ids
+    ])
+
+
+def _handle_duel_timeout(db: Session, target_id: str, now: datetime) -> DeadlineOutcome:
+    """Style lock or swing phase ran out: apply defaults / award the timeout win."""
+    from db.models import DuelMatch, User
+    from systems.duel import DuelManager
+    from websocket.broadcast import broadcast_duel_event, DuelEvents
+
+    match = db.query(DuelMatch).options(lazyload(DuelMatch.invitations)).filter(
+        DuelMatch.id == int(target_id)
+    ).with_for_update().first()
+    if not match:
+        return DeadlineOutcome()
+
+    manager = DuelManager()
+    applied = manager.apply_expired_timeouts(db, match)
+    next_due = manager.next_timeout_at(match)
+    # Only keep the row while a timer that hasn't fired yet is running
+    reschedule_at = next_due if next_due and next_due > now else None
+    if not applied:
+        return DeadlineOutcome(reschedule_at=reschedule_at)
+
+    player_ids = [match.challenger_id, match.opponent_id]
+    apple_ids = {
+        u.id: u.apple_user_id
+        for u in db.query(User).filter(User.id.in_([pid for pid in player_ids if pid is not None])).all()
+    }
+
+    if applied == "styles_revealed":
+        event_type = DuelEvents.DUEL_STYLES_REVEALED
+        data = {
+            "challenger_style": match.challenger_style,
+            "opponent_style": match.opponent_style,
+            "phase": "style_reveal",
+        }
+    else:
+        event_type = DuelEvents.DUEL_TIMEOUT
+        data = {"reason": "timeout"}
+
+    return DeadlineOutcome(reschedule_at=reschedule_at, notifications=[
+        partial(
+            broadcast_duel_event,
+            event_type=event_type,
+            match=match.to_dict_for_player(pid),
+            target_user_ids=[apple_ids[pid]] if apple_ids.get(pid) else [],
+            data=data,
+        )
+        for pid in player_ids if pid is not None
+    ])
+
+
+def _handle_hunt_expiry(db: Session, target_id: str, now: datetime) -> DeadlineOutcome:
+    """Delete an expired hunt; tell anyone still in it that it ended."""
+    from db.models import HuntSession as HuntSessionModel
+    from systems.hunting.persistence import ACTIVE_HUNT_STATUSES
+    from websocket.broadcast import notify_hunt_participants, PartyEvents
+
+    db_hunt = db.query(HuntSessionModel).filter(
+        HuntSessionModel.hunt_id == target_id
+    ).with_for_update().first()
+    if not db_hunt:
+        return DeadlineOutcome()
+
+    if now < db_hunt.expires_at:
+        return DeadlineOutcome(reschedule_at=db_hunt.expires_at)
+
+    notifications = []
+    if db_hunt.status in ACTIVE_HUNT_STATUSES:
+        notifications.append(partial(
+            notify_hunt_participants,
+            hunt_session=db_hunt.session_data or {},
+            event_type=PartyEvents.HUNT_ENDED,
+            data={"reason": "expired"},
+        ))
+
+    db.delete(db_hunt)
+    return DeadlineOutcome(notifications=notifications)
+
+
+_HANDLERS: Dict[str, Callable[[Session, str, datetime], DeadlineOutcome]] = {
+    BATTLE_PLEDGE_END: _handle_battle_pledge_end,
+    BATTLE_RESOLVE: _handle_battle_resolve,
+    DUEL_TIMEOUT: _handle_duel_timeout,
+    HUNT_EXPIRY: _handle_hunt_expiry,
+}
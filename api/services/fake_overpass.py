@@ -0,0 +1,152 @@
+"""
+Fake Overpass backend - Offline stand-in for the Overpass API
+
+Lets the whole city lookup path (osm_service -> city_service -> routers) run
+without network access, e.g. for load tests. Enable it with:
+
+    OVERPASS_BACKEND=fake
+
+The world is a grid of square "cities" FAKE_CELL_DEGREES wide. Every cell is
+an admin_level 8 relation whose OSM ID encodes its grid position, so
+relation(ID) lookups can rebuild the geometry without any stored state.
+
+Answers the query shapes osm_service sends:
+- is_in(lat,lon) ... out center       -> the cell containing the point
+- way(r.current) / relation(bw...)     -> the 8 surrounding cells
+- [bbox:...] ... out center | out geom -> every cell centered in the bbox
+- relation(ID); out geom               -> that cell with its boundary way
+"""
+import asyncio
+import math
+import os
+import re
+from typing import Dict, List, Optional
+
+
+FAKE_CELL_DEGREES = float(os.getenv("OVERPASS_FAKE_CELL_DEGREES", "0.05"))
+
+# Simulated Overpass latency per query (makes coalescing visible in load tests)
+FAKE_LATENCY_SECONDS = float(os.getenv("OVERPASS_FAKE_LATENCY_MS", "200")) / 1000
+
+# OSM IDs start here so they never collide with real relation IDs in a shared DB
+_ID_BASE = 9_000_000_000
+_LON_CELLS = 100_000
+
+_IS_IN = re.compile(r"is_in\(\s*(-?[\d.]+)\s*,\s*(-?[\d.]+)\s*\)")
+_BBOX = re.compile(r"\[bbox:\s*(-?[\d.]+)\s*,\s*(-?[\d.]+)\s*,\s*(-?[\d.]+)\s*,\s*(-?[\d.]+)\s*\]")
+_RELATION_ID = re.compile(r"relation\(\s*(\d+)\s*\)")
+_ADMIN_LEVEL = re.compile(r'"admin_level"(?:=|~)"\^?\(?([\d|,]+)\)?\$?"')
+
+
+class FakeResponse:
+    """The subset of httpx.Response osm_service uses"""
+
+    def __init__(self, payload: Dict, status_code: int = 200):
+        self.status_code = status_code
+        self._payload = payload
+
+    def json(self) -> Dict:
+        return self._payload
+
+
+# ============================================================
+# GRID
+# ============================================================
+
+def _cell_of(lat: float, lon: float) -> tuple:
+    return math.floor(lat / FAKE_CELL_DEGREES), math.floor(lon / FAKE_CELL_DEGREES)
+
+
+def _cell_id(row: int, col: int) -> int:
+    return _ID_BASE + (row + _LON_CELLS // 2) * _LON_CELLS + (col + _LON_CELLS // 2)
+
+
+def _cell_from_id(osm_id: int) -> Optional[tuple]:
+    offset = osm_id - _ID_BASE
+    if offset < 0:
+        return None
+    return offset // _LON_CELLS - _LON_CELLS // 2, offset % _LON_CELLS - _LON_CELLS // 2
+
+
+def _cell_element(row: int, col: int, level: int, geom: bool) -> Dict:
+    south = row * FAKE_CELL_DEGREES
+    west = col * FAKE_CELL_DEGREES
+    element = {
+        "type": "relation",
+        "id": _cell_id(row, col),
+        "tags": {
+            "name": f"Fakeville {row}:{col}",
+            "boundary": "administrative",
+            "admin_level": str(level),
+        },
+        "center": {"lat": south + FAKE_CELL_DEGREES / 2, "lon": west + FAKE_CELL_DEGREES / 2},
+    }
+    if geom:
+        # 10 points per side - enough to pass osm_service's minimum point check
+        ring = []
+        steps = 10
+        corners = [(south, west), (south, west + FAKE_CELL_DEGREES),
+                   (south + FAKE_CELL_DEGREES, west + FAKE_CELL_DEGREES), (south + FAKE_CELL_DEGREES, west)]
+        for i in range(4):
+            (lat1, lon1), (lat2, lon2) = corners[i], corners[(i + 1) % 4]
+            for s in range(steps):
+                t = s / steps
+                ring.append({"lat": lat1 + (lat2 - lat1) * t, "lon": lon1 + (lon2 - lon1) * t})
+        ring.append(dict(ring[0]))
+        element["members"] = [{"type": "way", "role": "outer", "geometry": ring}]
+    return element
+
+
+# ============================================================
+# BACKEND
+# ============================================================
+
+class FakeOverpassBackend:
+    """Answers Overpass QL queries from the synthetic grid"""
+
+    def __init__(self, latency_seconds: float = FAKE_LATENCY_SECONDS):
+        self.latency_seconds = latency_seconds
+        self.query_count = 0
+
+    async def post(self, endpoint: str, query: str, timeout: float) -> FakeResponse:
+        self.query_count += 1
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        return FakeResponse({"elements": self._answer(query)})
+
+    def _answer(self, query: str) -> List[Dict]:
+        geom = "out geom" in query
+        level_match = _ADMIN_LEVEL.search(query)
+        levels = [int(l) for l in re.split(r"[|,]", level_match.group(1)) if l] if level_match else [8]
+
+        relation_match = _RELATION_ID.search(query)
+        if relation_match:
+            cell = _cell_from_id(int(relation_match.group(1)))
+            return [_cell_element(*cell, level=8, geom=True)] if cell else []
+
+        # Grid cities only exist at admin_level 8
+        if 8 not in levels:
+            return []
+
+        is_in_match = _IS_IN.search(query)
+        if is_in_match:
+            row, col = _cell_of(float(is_in_match.group(1)), float(is_in_match.group(2)))
+            if "bw." in query:
+                return [
+                    _cell_element(row + dr, col + dc, level=8, geom=geom)
+                    for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc
+                ]
+            return [_cell_element(row, col, level=8, geom=geom)]
+
+        bbox_match = _BBOX.search(query)
+        if bbox_match:
+            south, west, north, east = (float(v) for v in bbox_match.groups())
+            min_row, min_col = _cell_of(south, west)
+            max_row, max_col = _cell_of(north, east)
+            return [
+                _cell_element(row, col, level=8, geom=geom)
+                for row in range(min_row, max_row + 1)
+                for col in range(min_col, max_col + 1)
+            ]
+
+        return []
@@ -188,29 +188,31 @@ def apply_market_passive_income_batch(db: Session, kingdoms: List[Kingdom]) -> D
     now = datetime.utcnow()
     income_applied = {}
     
-    for kingdom in kingdoms:
-        gold_per_citizen = get_market_gold_per_citizen(kingdom.market_level)
-        if gold_per_citizen == 0:
-            continue
-        
-        # Lock the kingdom row to prevent concurrent updates
-        locked_kingdom = db.query(Kingdom).filter(
-            Kingdom.id == kingdom.id
-        ).with_for_update().first()
-        
-        if not locked_kingdom:
-            continue
+    earning_ids = [k.id for k in kingdoms if get_market_gold_per_citizen(k.market_level) > 0]
+    if not earning_ids:
+        return {}
+    
+    # Lock all earning kingdom rows in one statement to prevent concurrent updates
+    locked_kingdoms = db.query(Kingdom).filter(
+        Kingdom.id.in_(earning_ids)
+    ).order_by(Kingdom.id).with_for_update().all()
+    
+    # Only kingdoms with at least 24 hours since last collection get paid
+    due_kingdoms = [
+        k for k in locked_kingdoms
+        if (now - k.last_income_collection).total_seconds() / 86400 >= 1.0
+    ]
+    active_citizens_by_id = get_active_citizens_batch(db, [k.id for k in due_kingdoms])
+    
+    for locked_kingdom in due_kingdoms:
+        gold_per_citizen = get_market_gold_per_citizen(locked_kingdom.market_level)
         
         # Calculate time elapsed
         time_since = now - locked_kingdom.last_income_collection
         days_elapsed = time_since.total_seconds() / 86400
         
-        # Only apply if at least 24 hours have passed
-        if days_elapsed < 1.0:
-            continue
-        
         # Get active citizens count
-        active_citizens = get_active_citizens_count(db, locked_kingdom.id)
+        active_citizens = active_citizens_by_id.get(locked_kingdom.id, 0)
         
         # Calculate income for complete days only
         complete_days = int(days_elapsed)
@@ -219,7 +221,7 @@ def apply_market_passive_income_batch(db: Session, kingdoms: List[Kingdom]) -> D
         if income > 0:
             locked_kingdom.treasury_gold += income
             locked_kingdom.last_income_collection = locked_kingdom.last_income_collection + timedelta(days=complete_days)
-            income_applied[kingdom.id] = income
+            income_applied[locked_kingdom.id] = income
     
     if income_applied:
         db.flush()
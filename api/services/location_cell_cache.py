@@ -0,0 +1,254 @@
+"""
+Location cell cache - "Which city am I in" by ~150m geohash cell
+
+Players open the app from the same few places, but every /cities/current
+and /cities/neighbors call used to ray-cast candidate polygons again. This
+caches the resolution per geohash cell (precision 7, ~150m x 150m):
+- A cell that no cached boundary edge crosses is stored fully_inside=True:
+  every point in it resolves to the same city with NO polygon math
+- A cell that straddles a boundary is stored fully_inside=False so lookups
+  go straight to the exact test without re-classifying the cell
+- Rows live in location_cells (shared by all processes) with an in-process
+  LRU in front, so warm lookups are a dict hit
+
+Inserting or rewriting a boundary deletes every cell row it overlaps in the
+same transaction. Other processes' LRU entries expire after
+LOCATION_CELL_CACHE_TTL_SECONDS, and hits are re-checked against the
+resolved city's boundary_updated_at.
+"""
+from sqlalchemy import event, inspect, delete, and_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import Optional, Tuple, List
+from collections import OrderedDict
+from datetime import datetime
+import os
+import threading
+import time
+
+from db import CityBoundary
+from db.models import LocationCell
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+GEOHASH_PRECISION = 7  # ~153m x 153m at the equator
+
+LOCATION_CELL_CACHE_MAX_ENTRIES = int(os.getenv("LOCATION_CELL_CACHE_MAX_ENTRIES", "50000"))
+LOCATION_CELL_CACHE_TTL_SECONDS = float(os.getenv("LOCATION_CELL_CACHE_TTL_SECONDS", "300"))
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+Rect = Tuple[float, float, float, float]  # (min_lat, max_lat, min_lon, max_lon)
+
+
+# ============================================================
+# GEOHASH
+# ============================================================
+
+def geohash_cell(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> Tuple[str, Rect]:
+    """Geohash of the point and the bounds of its cell"""
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # geohash starts with a longitude bit
+
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if lon >= mid:
+                bits = (bits << 1) | 1
+                lon_lo = mid
+            else:
+                bits <<= 1
+                lon_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars), (lat_lo, lat_hi, lon_lo, lon_hi)
+
+
+# ============================================================
+# IN-PROCESS LRU
+# ============================================================
+
+class CellResolution:
+    """Cached resolution for one cell"""
+
+    __slots__ = ("osm_id", "admin_level", "fully_inside", "boundary_version", "rect", "expires_at")
+
+    def __init__(self, osm_id: str, admin_level: int, fully_inside: bool,
+                 boundary_version: Optional[datetime], rect: Rect):
+        self.osm_id = osm_id
+        self.admin_level = admin_level
+        self.fully_inside = fully_inside
+        self.boundary_version = boundary_version
+        self.rect = rect
+        self.expires_at = time.monotonic() + LOCATION_CELL_CACHE_TTL_SECONDS
+
+
+class LocationCellCache:
+    """Thread-safe LRU of CellResolution entries with a TTL"""
+
+    def __init__(self, max_entries: int = LOCATION_CELL_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CellResolution]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, geohash: str) -> Optional[CellResolution]:
+        with self._lock:
+            entry = self._entries.get(geohash)
+            if entry is None or entry.expires_at < time.monotonic():
+                self._entries.pop(geohash, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(geohash)
+            self.hits += 1
+            return entry
+
+    def put(self, geohash: str, entry: CellResolution) -> None:
+        with self._lock:
+            self._entries[geohash] = entry
+            self._entries.move_to_end(geohash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, geohash: str) -> None:
+        with self._lock:
+            self._entries.pop(geohash, None)
+
+    def invalidate_rect(self, rect: Rect) -> None:
+        """Drop every entry whose cell overlaps rect"""
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if _overlaps(entry.rect, rect)]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Shared by every request handled by this process
+location_cell_cache = LocationCellCache()
+
+
+def _overlaps(a: Rect, b: Rect) -> bool:
+    return a[0] <= b[1] and a[1] >= b[0] and a[2] <= b[3] and a[3] >= b[2]
+
+
+# ============================================================
+# LOOKUP / STORE
+# ============================================================
+
+def get_cell(db: Session, geohash: str) -> Optional[CellResolution]:
+    """Cell resolution from the LRU, falling back to location_cells"""
+    entry = location_cell_cache.get(geohash)
+    if entry is not None:
+        return entry
+
+    row = db.query(LocationCell).filter(LocationCell.geohash == geohash).first()
+    if row is None:
+        return None
+    entry = CellResolution(
+        row.osm_id, row.admin_level, row.fully_inside, row.boundary_version,
+        (row.min_lat, row.max_lat, row.min_lon, row.max_lon)
+    )
+    location_cell_cache.put(geohash, entry)
+    return entry
+
+
+def store_cell(db: Session, geohash: str, rect: Rect, city: CityBoundary, fully_inside: bool) -> None:
+    """
+    Remember a cell's resolution (caller commits).
+    Runs in a savepoint so a concurrent insert of the same cell never fails the request.
+    """
+    entry = CellResolution(city.osm_id, city.admin_level, fully_inside, city.boundary_updated_at, rect)
+    try:
+        with db.begin_nested():
+            db.merge(LocationCell(
+                geohash=geohash,
+                osm_id=city.osm_id,
+                admin_level=city.admin_level,
+                fully_inside=fully_inside,
+                boundary_version=city.boundary_updated_at,
+                min_lat=rect[0],
+                max_lat=rect[1],
+                min_lon=rect[2],
+                max_lon=rect[3],
+                computed_at=datetime.utcnow()
+            ))
+    except IntegrityError:
+        # Another request stored this cell first - same answer
+        pass
+    location_cell_cache.put(geohash, entry)
+
+
+# ============================================================
+# INVALIDATION
+# ============================================================
+
+def _coords_rect(boundary_geojson) -> Optional[Rect]:
+    coords = (boundary_geojson or {}).get("coordinates") or []
+    if not coords:
+        return None
+    lats = [p[0] for p in coords]
+    lons = [p[1] for p in coords]
+    return min(lats), max(lats), min(lons), max(lons)
+
+
+def _invalidate_rects(connection, rects: List[Rect]) -> None:
+    for rect in rects:
+        connection.execute(delete(LocationCell.__table__).where(and_(
+            LocationCell.min_lat <= rect[1],
+            LocationCell.max_lat >= rect[0],
+            LocationCell.min_lon <= rect[3],
+            LocationCell.max_lon >= rect[2]
+        )))
+        location_cell_cache.invalidate_rect(rect)
+
+
+@event.listens_for(CityBoundary, "after_insert")
+def _invalidate_cells_for_new_boundary(mapper, connection, target):
+    """A newly cached city may now contain (or split) cells resolved before it existed"""
+    rect = _coords_rect(target.boundary_geojson)
+    if rect:
+        _invalidate_rects(connection, [rect])
+
+
+@event.listens_for(CityBoundary, "after_update")
+def _invalidate_cells_for_rewritten_boundary(mapper, connection, target):
+    """Cells under both the old and the new geometry are stale"""
+    history = inspect(target).attrs.boundary_geojson.history
+    if not history.has_changes():
+        return
+    rects = [_coords_rect(old) for old in history.deleted] + [_coords_rect(target.boundary_geojson)]
+    _invalidate_rects(connection, [rect for rect in rects if rect])
@@ -0,0 +1,194 @@
+"""
+Market candles - OHLCV rollups of market trades
+===============================================
+Every trade is folded into 1-minute and 1-hour candles per
+(kingdom, item) as it happens (record_trades, called by the matching engine
+in the trade's transaction). Price history and market stats read candles
+instead of raw market_transactions, so the cost of a query depends on the
+number of buckets, not the number of trades.
+
+A window is answered to the minute by window_candles(): 1-minute candles
+for the partial hour at the start of the window, then 1-hour candles for
+the rest (at most ~60 + 169 rows for a week).
+
+1-minute candles are only kept for MINUTE_CANDLE_RETENTION (record_trades
+prunes older ones for the items it touches). Windows starting before that
+are answered from the start of the hour containing `since`.
+
+Backfill: db/migrations/add_market_candles.sql
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy import and_, or_, case, func, tuple_
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timedelta
+
+from db import MarketCandle, MarketTransaction
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+CANDLE_INTERVALS = {
+    "1m": timedelta(minutes=1),
+    "1h": timedelta(hours=1),
+}
+
+# 1-minute candles older than this are deleted; covers the 1m price-history
+# charts (routers/market.MINUTE_CANDLE_MAX_HOURS) plus the partial first hour
+MINUTE_CANDLE_RETENTION = timedelta(hours=6)
+
+
+def bucket_start(ts: datetime, interval: str) -> datetime:
+    """Start of the candle containing ts (same as Postgres date_trunc)"""
+    if interval == "1m":
+        return ts.replace(second=0, microsecond=0)
+    if interval == "1h":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown candle interval: {interval}")
+
+
+# ============================================================
+# WRITES
+# ============================================================
+
+def record_trades(db: Session, transactions: Iterable[MarketTransaction]) -> None:
+    """
+    Fold trades into their 1m/1h candles with one multi-row upsert, then
+    prune expired 1m candles of the same items. Does not commit.
+    Transactions must have created_at set (i.e. be flushed).
+    """
+    candles: Dict[Tuple, dict] = {}
+    for t in transactions:
+        for interval in CANDLE_INTERVALS:
+            key = (t.kingdom_id, t.item_type, interval, bucket_start(t.created_at, interval))
+            c = candles.get(key)
+            if c is None:
+                candles[key] = {
+                    "kingdom_id": t.kingdom_id,
+                    "item_type": t.item_type,
+                    "interval": interval,
+                    "bucket_start": key[3],
+                    "open": t.price_per_unit,
+                    "high": t.price_per_unit,
+                    "low": t.price_per_unit,
+                    "close": t.price_per_unit,
+                    "volume": t.quantity,
+                    "value": t.total_gold,
+                    "trades": 1,
+                    "first_trade_at": t.created_at,
+                    "last_trade_at": t.created_at,
+                }
+                continue
+            c["high"] = max(c["high"], t.price_per_unit)
+            c["low"] = min(c["low"], t.price_per_unit)
+            c["volume"] += t.quantity
+            c["value"] += t.total_gold
+            c["trades"] += 1
+            if t.created_at < c["first_trade_at"]:
+                c["open"], c["first_trade_at"] = t.price_per_unit, t.created_at
+            if t.created_at >= c["last_trade_at"]:
+                c["close"], c["last_trade_at"] = t.price_per_unit, t.created_at
+
+    if not candles:
+        return
+
+    table = MarketCandle.__table__
+    stmt = pg_insert(table).values(list(candles.values()))
+    new = stmt.excluded
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[table.c.kingdom_id, table.c.item_type, table.c.interval, table.c.bucket_start],
+        set_={
+            "open": case((new.first_trade_at < table.c.first_trade_at, new.open), else_=table.c.open),
+            "close": case((new.last_trade_at >= table.c.last_trade_at, new.close), else_=table.c.close),
+            "high": func.greatest(table.c.high, new.high),
+            "low": func.least(table.c.low, new.low),
+            "volume": table.c.volume + new.volume,
+            "value": table.c.value + new.value,
+            "trades": table.c.trades + new.trades,
+            "first_trade_at": func.least(table.c.first_trade_at, new.first_trade_at),
+            "last_trade_at": func.greatest(table.c.last_trade_at, new.last_trade_at),
+        }
+    ))
+
+    # Retention: a handful of rows per traded item, found through the primary key
+    items = sorted({(c["kingdom_id"], c["item_type"]) for c in candles.values()})
+    db.execute(table.delete().where(
+        tuple_(table.c.kingdom_id, table.c.item_type).in_(items),
+        table.c.interval == "1m",
+        table.c.bucket_start < datetime.utcnow() - MINUTE_CANDLE_RETENTION
+    ))
+
+
+# ============================================================
+# READS
+# ============================================================
+
+def get_candles(
+    db: Session,
+    kingdom_id: str,
+    item_type: str,
+    interval: str,
+    since: datetime,
+    until: Optional[datetime] = None
+) -> List[MarketCandle]:
+    """Candles of one interval whose bucket starts in [since, until), oldest first"""
+    query = db.query(MarketCandle).filter(
+        MarketCandle.kingdom_id == kingdom_id,
+        MarketCandle.item_type == item_type,
+        MarketCandle.interval == interval,
+        MarketCandle.bucket_start >= since
+    )
+    if until is not None:
+        query = query.filter(MarketCandle.bucket_start < until)
+    return query.order_by(MarketCandle.bucket_start.asc()).all()
+
+
+def window_candles(db: Session, kingdom_id: str, since: datetime, item_type: Optional[str] = None) -> List[MarketCandle]:
+    """
+    Candles covering [since, now) with no overlap, to the minute: 1m candles up
+    to the first whole hour, 1h candles after it. All items if item_type is None.
+    Past MINUTE_CANDLE_RETENTION the window starts at the hour containing since.
+    """
+    if since < datetime.utcnow() - MINUTE_CANDLE_RETENTION:
+        since = bucket_start(since, "1h")
+    first_minute = bucket_start(since, "1m")
+    if first_minute < since:
+        first_minute += CANDLE_INTERVALS["1m"]
+    first_hour = bucket_start(first_minute, "1h")
+    if first_hour < first_minute:
+        first_hour += CANDLE_INTERVALS["1h"]
+
+    query = db.query(MarketCandle).filter(
+        MarketCandle.kingdom_id == kingdom_id,
+        or_(
+            and_(
+                MarketCandle.interval == "1m",
+                MarketCandle.bucket_start >= first_minute,
+                MarketCandle.bucket_start < first_hour
+            ),
+            and_(
+                MarketCandle.interval == "1h",
+                MarketCandle.bucket_start >= first_hour
+            )
+        )
+    )
+    if item_type is not None:
+        query = query.filter(MarketCandle.item_type == item_type)
+    return query.order_by(MarketCandle.bucket_start.asc()).all()
+
+
+def summarize(candles: List[MarketCandle]) -> dict:
+    """Window statistics from non-overlapping candles"""
+    volume = sum(c.volume for c in candles)
+    value = sum(c.value for c in candles)
+    return {
+        "trades": sum(c.trades for c in candles),
+        "volume": volume,
+        "vwap": value / volume if volume else None,
+        "high": max((c.high for c in candles), default=None),
+        "low": min((c.low for c in candles), default=None),
+        "open": candles[0].open if candles else None,
+        "close": candles[-1].close if candles else None,
+    }
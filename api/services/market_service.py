@@ -22,14 +22,174 @@ Implementation notes:
 - When placing order: Check if player can access that kingdom's market
 - When matching: Consider orders from accessible kingdoms based on market tier
 - Player with Merchant 3+ can use markets in kingdoms they're visiting
+
+ORDER BOOK
+==========
+Matching walks an OrderBookSide: the resting orders on the other side of a
+(kingdom, item) book, kept as sorted price levels with a FIFO queue per level.
+Orders are loaded lazily, best price first, BOOK_SCAN_BATCH rows at a time
+with FOR UPDATE SKIP LOCKED - a small buy never reads the whole book, and
+orders another request is already filling are skipped instead of waited on.
+Fills are settled in bulk (one participant query, one inventory query, one
+multi-row INSERT for the trades, one upsert for the price candles).
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from typing import List, Optional, Tuple
+from sqlalchemy import and_, or_, insert
+from typing import Deque, Dict, List, Optional, Tuple
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
+import bisect
 
 from db.models import MarketOrder, MarketTransaction, OrderType, OrderStatus, PlayerState, User, PlayerInventory, Kingdom
 from routers.resources import RESOURCES
+from services.market_candles import record_trades
+from services.player_stats import bump_stats_many
+
+
+# ============================================================
+# ORDER BOOK
+# ============================================================
+
+# Resting orders locked per scan of the book
+BOOK_SCAN_BATCH = 50
+
+OPEN_STATUSES = (OrderStatus.active, OrderStatus.partially_filled)
+
+
+class PriceLevel:
+    """All loaded resting orders at one price, oldest first"""
+    
+    __slots__ = ("price", "orders")
+    
+    def __init__(self, price: int):
+        self.price = price
+        self.orders: Deque[MarketOrder] = deque()
+    
+    @property
+    def quantity(self) -> int:
+        return sum(o.quantity_remaining for o in self.orders)
+
+
+@dataclass
+class Fill:
+    """Part of an incoming order matched against one resting order"""
+    resting_order: MarketOrder
+    quantity: int
+    price_per_unit: int
+
+
+class OrderBookSide:
+    """
+    One side (bids or asks) of a (kingdom, item) order book, limited to prices
+    that cross limit_price.
+    
+    Rows are paged in with a keyset cursor over (price, created_at, id) in
+    matching order and locked FOR UPDATE SKIP LOCKED, so only the levels a
+    match actually consumes are read and locked.
+    """
+    
+    def __init__(
+        self,
+        db: Session,
+        kingdom_id: str,
+        item_type: str,
+        side: OrderType,
+        limit_price: int,
+        exclude_order_id: Optional[int] = None,
+        batch_size: int = BOOK_SCAN_BATCH
+    ):
+        self.db = db
+        self.kingdom_id = kingdom_id
+        self.item_type = item_type
+        self.side = side
+        self.limit_price = limit_price
+        self.exclude_order_id = exclude_order_id
+        self.batch_size = batch_size
+        
+        self._keys: List[int] = []  # level sort keys, best first
+        self._levels: Dict[int, PriceLevel] = {}
+        self._cursor: Optional[Tuple[int, datetime, int]] = None  # (price, created_at, id) of the last row loaded
+        self._exhausted = False
+        self.rows_loaded = 0
+        self.scans = 0
+    
+    def _sort_key(self, price: int) -> int:
+        # Asks: lowest price first. Bids: highest price first.
+        return price if self.side == OrderType.sell else -price
+    
+    def _load_more(self) -> None:
+        query = self.db.query(MarketOrder).filter(
+            MarketOrder.kingdom_id == self.kingdom_id,
+            MarketOrder.item_type == self.item_type,
+            MarketOrder.order_type == self.side,
+            MarketOrder.status.in_(OPEN_STATUSES),
+            MarketOrder.quantity_remaining > 0
+        )
+        if self.side == OrderType.sell:
+            query = query.filter(MarketOrder.price_per_unit <= self.limit_price)  # Willing to pay this much
+            price_order = MarketOrder.price_per_unit.asc()
+        else:
+            query = query.filter(MarketOrder.price_per_unit >= self.limit_price)  # Willing to accept this much
+            price_order = MarketOrder.price_per_unit.desc()
+        if self.exclude_order_id is not None:
+            query = query.filter(MarketOrder.id != self.exclude_order_id)  # Don't match with self
+        
+        if self._cursor is not None:
+            # Everything after the last row in (price, created_at, id) matching order
+            price, created_at, order_id = self._cursor
+            later_price = (
+                MarketOrder.price_per_unit > price if self.side == OrderType.sell
+                else MarketOrder.price_per_unit < price
+            )
+            query = query.filter(or_(
+                later_price,
+                and_(
+                    MarketOrder.price_per_unit == price,
+                    or_(
+                        MarketOrder.created_at > created_at,
+                        and_(MarketOrder.created_at == created_at, MarketOrder.id > order_id)
+                    )
+                )
+            ))
+        
+        rows = query.order_by(
+            price_order,
+            MarketOrder.created_at.asc(),  # FIFO within price
+            MarketOrder.id.asc()
+        ).limit(self.batch_size).with_for_update(skip_locked=True).all()
+        
+        self.scans += 1
+        self.rows_loaded += len(rows)
+        if len(rows) < self.batch_size:
+            self._exhausted = True
+        if rows:
+            self._cursor = (rows[-1].price_per_unit, rows[-1].created_at, rows[-1].id)
+        
+        for row in rows:
+            level = self._levels.get(row.price_per_unit)
+            if level is None:
+                level = PriceLevel(row.price_per_unit)
+                self._levels[row.price_per_unit] = level
+                bisect.insort(self._keys, self._sort_key(row.price_per_unit))
+            level.orders.append(row)
+    
+    def best_level(self) -> Optional[PriceLevel]:
+        """Best price level with at least one order, loading more of the book if needed"""
+        if not self._keys and not self._exhausted:
+            self._load_more()
+        if not self._keys:
+            return None
+        key = self._keys[0]
+        return self._levels[key if self.side == OrderType.sell else -key]
+    
+    def pop_front(self, level: PriceLevel) -> MarketOrder:
+        """Remove the oldest order of a level (fully filled), dropping the level once it's empty"""
+        order = level.orders.popleft()
+        if not level.orders:
+            del self._levels[level.price]
+            self._keys.remove(self._sort_key(level.price))
+        return order
 
 
 class MarketMatchingEngine:
@@ -44,6 +204,7 @@ class MarketMatchingEngine:
     
     def __init__(self, db: Session):
         self.db = db
+        self.last_book: Optional[OrderBookSide] = None  # book side walked by the last create_order (for benchmarks)
     
     def create_order(
         self,
@@ -95,150 +256,48 @@ class MarketMatchingEngine:
         self.db.add(order)
         self.db.flush()  # Get the order ID
         
-        # Now try to match against existing orders
-        transactions = []
+        # Match against the opposite side of the book (best price first, FIFO within price)
+        book = OrderBookSide(
+            self.db,
+            kingdom_id=kingdom_id,
+            item_type=item_type,
+            side=OrderType.sell if order_type == OrderType.buy else OrderType.buy,
+            limit_price=price_per_unit,
+            exclude_order_id=order.id
+        )
+        self.last_book = book
+        
+        fills: List[Fill] = []
         remaining_quantity = quantity
+        now = datetime.utcnow()
         
-        if order_type == OrderType.buy:
-            # Match against sell orders (lowest price first, then FIFO)
-            matching_orders = self.db.query(MarketOrder).filter(
-                and_(
-                    MarketOrder.kingdom_id == kingdom_id,
-                    MarketOrder.item_type == item_type,
-                    MarketOrder.order_type == OrderType.sell,
-                    MarketOrder.status.in_([OrderStatus.active, OrderStatus.partially_filled]),
-                    MarketOrder.price_per_unit <= price_per_unit,  # Willing to pay this much
-                    MarketOrder.id != order.id  # Don't match with self
-                )
-            ).order_by(
-                MarketOrder.price_per_unit.asc(),  # Lowest price first
-                MarketOrder.created_at.asc()        # FIFO within price
-            ).all()
+        while remaining_quantity > 0:
+            level = book.best_level()
+            if level is None:
+                break
             
-            for sell_order in matching_orders:
-                if remaining_quantity <= 0:
-                    break
-                
-                # Match as much as possible
-                match_quantity = min(remaining_quantity, sell_order.quantity_remaining)
-                match_price = sell_order.price_per_unit  # Use existing order's price
-                
-                # Create transaction with both order IDs
-                transaction = self._execute_trade(
-                    buyer_id=player_id,
-                    seller_id=sell_order.player_id,
-                    buy_order_id=order.id,
-                    sell_order_id=sell_order.id,
-                    kingdom_id=kingdom_id,
-                    item_type=item_type,
-                    quantity=match_quantity,
-                    price_per_unit=match_price
-                )
-                transactions.append(transaction)
-                
-                # Update sell order
-                sell_order.quantity_remaining -= match_quantity
-                if sell_order.quantity_remaining == 0:
-                    sell_order.status = OrderStatus.filled
-                    sell_order.filled_at = datetime.utcnow()
-                elif sell_order.quantity_remaining < sell_order.quantity_original:
-                    sell_order.status = OrderStatus.partially_filled
-                
-                remaining_quantity -= match_quantity
-                
-                # Handle price difference (buyer bid higher than seller's ask)
-                price_diff = price_per_unit - match_price
-                if price_diff > 0:
-                    diff_gold = price_diff * match_quantity
-                    buyer_merchant_level = getattr(state, 'merchant', 0)
-                    
-                    if buyer_merchant_level >= 2:
-                        # Merchant T2: Buyer keeps the excess
-                        state.gold += diff_gold
-                    else:
-                        # No perk: Excess goes to kingdom treasury
-                        kingdom = self.db.query(Kingdom).filter(Kingdom.id == kingdom_id).first()
-                        if kingdom:
-                            kingdom.treasury_gold += diff_gold
-        
-        else:  # SELL order
-            # Match against buy orders (highest price first, then FIFO)
-            matching_orders = self.db.query(MarketOrder).filter(
-                and_(
-                    MarketOrder.kingdom_id == kingdom_id,
-                    MarketOrder.item_type == item_type,
-                    MarketOrder.order_type == OrderType.buy,
-                    MarketOrder.status.in_([OrderStatus.active, OrderStatus.partially_filled]),
-                    MarketOrder.price_per_unit >= price_per_unit,  # Willing to accept this much
-                    MarketOrder.id != order.id  # Don't match with self
-                )
-            ).order_by(
-                MarketOrder.price_per_unit.desc(),  # Highest price first
-                MarketOrder.created_at.asc()         # FIFO within price
-            ).all()
+            resting_order = level.orders[0]
+            # Match as much as possible, at the existing order's price
+            match_quantity = min(remaining_quantity, resting_order.quantity_remaining)
+            fills.append(Fill(resting_order=resting_order, quantity=match_quantity, price_per_unit=level.price))
             
-            for buy_order in matching_orders:
-                if remaining_quantity <= 0:
-                    break
-                
-                # Match as much as possible
-                match_quantity = min(remaining_quantity, buy_order.quantity_remaining)
-                match_price = buy_order.price_per_unit  # Use existing order's price
-                
-                # Create transaction with both order IDs
-                transaction = self._execute_trade(
-                    buyer_id=buy_order.player_id,
-                    seller_id=player_id,
-                    buy_order_id=buy_order.id,
-                    sell_order_id=order.id,
-                    kingdom_id=kingdom_id,
-                    item_type=item_type,
-                    quantity=match_quantity,
-                    price_per_unit=match_price
-                )
-                transactions.append(transaction)
-                
-                # Update buy order
-                buy_order.quantity_remaining -= match_quantity
-                if buy_order.quantity_remaining == 0:
-                    buy_order.status = OrderStatus.filled
-                    buy_order.filled_at = datetime.utcnow()
-                elif buy_order.quantity_remaining < buy_order.quantity_original:
-                    buy_order.status = OrderStatus.partially_filled
-                
-                remaining_quantity -= match_quantity
-                
-                # Handle price difference (buyer paid more than seller asked)
-                price_diff = match_price - price_per_unit
-                if price_diff > 0:
-                    diff_gold = price_diff * match_quantity
-                    seller_merchant_level = getattr(state, 'merchant', 0)
-                    
-                    # Get the buyer's merchant level to check T2
-                    buyer_user = self.db.query(User).filter(User.id == buy_order.player_id).first()
-                    buyer_merchant_level = 0
-                    if buyer_user and buyer_user.player_state:
-                        buyer_merchant_level = getattr(buyer_user.player_state, 'merchant', 0)
-                    
-                    if buyer_merchant_level >= 2:
-                        # Buyer has T2: They get the refund (already locked gold is returned)
-                        # The buyer's gold was already locked when they placed the order
-                        # So we need to refund them the difference
-                        buyer_user.player_state.gold += diff_gold
-                    elif seller_merchant_level >= 4:
-                        # Seller has T4 (and buyer doesn't have T2): Seller gets the bonus
-                        state.gold += diff_gold
-                    else:
-                        # Neither has the perk: Goes to kingdom treasury
-                        kingdom = self.db.query(Kingdom).filter(Kingdom.id == kingdom_id).first()
-                        if kingdom:
-                            kingdom.treasury_gold += diff_gold
+            resting_order.quantity_remaining -= match_quantity
+            if resting_order.quantity_remaining == 0:
+                resting_order.status = OrderStatus.filled
+                resting_order.filled_at = now
+                book.pop_front(level)
+            elif resting_order.quantity_remaining < resting_order.quantity_original:
+                resting_order.status = OrderStatus.partially_filled
+            
+            remaining_quantity -= match_quantity
+        
+        transactions = self._settle_fills(order, state, fills) if fills else []
         
         # Update our order's remaining quantity and status
         order.quantity_remaining = remaining_quantity
         if remaining_quantity == 0:
             order.status = OrderStatus.filled
-            order.filled_at = datetime.utcnow()
+            order.filled_at = now
         elif remaining_quantity < quantity:
             order.status = OrderStatus.partially_filled
         
@@ -288,72 +347,116 @@ class MarketMatchingEngine:
         
         return order
     
-    def _execute_trade(
-        self,
-        buyer_id: int,
-        seller_id: int,
-        buy_order_id: Optional[int],
-        sell_order_id: Optional[int],
-        kingdom_id: str,
-        item_type: str,
-        quantity: int,
-        price_per_unit: int
-    ) -> MarketTransaction:
-        """Execute a trade between buyer and seller"""
-        total_gold = quantity * price_per_unit
-        
-        # Get buyer and seller states
-        buyer = self.db.query(User).filter(User.id == buyer_id).first()
-        seller = self.db.query(User).filter(User.id == seller_id).first()
+    def _settle_fills(self, order: MarketOrder, state: PlayerState, fills: List["Fill"]) -> List[MarketTransaction]:
+        """
+        Move gold, items and taxes for every fill of `order`, and record the trades.
         
-        if not buyer or not buyer.player_state or not seller or not seller.player_state:
+        Participant states and the kingdom are loaded once, item deliveries are
+        summed per buyer, and the transactions go in as one multi-row INSERT.
+        """
+        participant_ids = {order.player_id} | {fill.resting_order.player_id for fill in fills}
+        states = {
+            s.user_id: s
+            for s in self.db.query(PlayerState).filter(PlayerState.user_id.in_(participant_ids)).all()
+        }
+        if participant_ids - states.keys():
             raise ValueError("Buyer or seller not found")
         
-        buyer_state = buyer.player_state
-        seller_state = seller.player_state
-        
-        # Get kingdom for taxes
-        kingdom = self.db.query(Kingdom).filter(Kingdom.id == kingdom_id).first()
-        
-        # Transfer resources
-        # Buyer receives items
-        self._modify_player_resource(buyer_state, item_type, quantity)
-        
-        # Apply tax to seller's income
-        # Tax goes to the kingdom where the trade happens
-        tax_rate = kingdom.tax_rate if kingdom else 0
-        
-        # Check for Merchant T5: 50% reduced taxes
-        seller_merchant_level = getattr(seller_state, 'merchant', 0)
-        if seller_merchant_level >= 5:
-            tax_rate = tax_rate // 2  # 50% reduced taxes
-        
-        tax_amount = int(total_gold * tax_rate / 100)
-        net_gold = total_gold - tax_amount
-        
-        # Seller receives gold after tax
-        seller_state.gold += net_gold
-        
-        # Kingdom treasury receives tax
-        if kingdom and tax_amount > 0:
-            kingdom.treasury_gold += tax_amount
-        
-        # Create transaction record
-        # Note: order_id fields are nullable to allow creating transaction before order exists
-        transaction = MarketTransaction(
-            kingdom_id=kingdom_id,
-            item_type=item_type,
-            buyer_id=buyer_id,
-            seller_id=seller_id,
-            buy_order_id=buy_order_id,
-            sell_order_id=sell_order_id,
-            quantity=quantity,
-            price_per_unit=price_per_unit,
-            total_gold=total_gold  # Store gross amount, tax is applied separately
-        )
-        self.db.add(transaction)
-        
-        return transaction
+        # Kingdom for taxes (and price differences nobody has the perk for)
+        kingdom = self.db.query(Kingdom).filter(Kingdom.id == order.kingdom_id).first()
+        
+        items_bought: Dict[int, int] = {}
+        rows = []
+        for fill in fills:
+            resting_order = fill.resting_order
+            if order.order_type == OrderType.buy:
+                buyer_id, seller_id = order.player_id, resting_order.player_id
+                buy_order_id, sell_order_id = order.id, resting_order.id
+            else:
+                buyer_id, seller_id = resting_order.player_id, order.player_id
+                buy_order_id, sell_order_id = resting_order.id, order.id
+            buyer_state = states[buyer_id]
+            seller_state = states[seller_id]
+            total_gold = fill.quantity * fill.price_per_unit
+            
+            # Buyer receives items
+            items_bought[buyer_id] = items_bought.get(buyer_id, 0) + fill.quantity
+            
+            # Apply tax to seller's income
+            # Tax goes to the kingdom where the trade happens
+            tax_rate = kingdom.tax_rate if kingdom else 0
+            
+            # Check for Merchant T5: 50% reduced taxes
+            seller_merchant_level = getattr(seller_state, 'merchant', 0)
+            if seller_merchant_level >= 5:
+                tax_rate = tax_rate // 2  # 50% reduced taxes
+            
+            tax_amount = int(total_gold * tax_rate / 100)
+            
+            # Seller receives gold after tax, kingdom treasury receives tax
+            seller_state.gold += total_gold - tax_amount
+            if kingdom and tax_amount > 0:
+                kingdom.treasury_gold += tax_amount
+            
+            # Handle price difference between the two orders
+            if order.order_type == OrderType.buy:
+                # Buyer bid higher than seller's ask
+                price_diff = order.price_per_unit - fill.price_per_unit
+                if price_diff > 0:
+                    diff_gold = price_diff * fill.quantity
+                    if getattr(state, 'merchant', 0) >= 2:
+                        # Merchant T2: Buyer keeps the excess
+                        state.gold += diff_gold
+                    elif kingdom:
+                        # No perk: Excess goes to kingdom treasury
+                        kingdom.treasury_gold += diff_gold
+            else:
+                # Buyer paid more than seller asked
+                price_diff = fill.price_per_unit - order.price_per_unit
+                if price_diff > 0:
+                    diff_gold = price_diff * fill.quantity
+                    if getattr(buyer_state, 'merchant', 0) >= 2:
+                        # Buyer has T2: They get the refund (their gold was locked when they placed the order)
+                        buyer_state.gold += diff_gold
+                    elif getattr(state, 'merchant', 0) >= 4:
+                        # Seller has T4 (and buyer doesn't have T2): Seller gets the bonus
+                        state.gold += diff_gold
+                    elif kingdom:
+                        # Neither has the perk: Goes to kingdom treasury
+                        kingdom.treasury_gold += diff_gold
+            
+            rows.append({
+                "kingdom_id": order.kingdom_id,
+                "item_type": order.item_type,
+                "buyer_id": buyer_id,
+                "seller_id": seller_id,
+                "buy_order_id": buy_order_id,
+                "sell_order_id": sell_order_id,
+                "quantity": fill.quantity,
+                "price_per_unit": fill.price_per_unit,
+                "total_gold": total_gold  # Store gross amount, tax is applied separately
+            })
+        
+        self._add_player_resources(states, order.item_type, items_bought)
+        
+        # One INSERT ... VALUES (...), (...) RETURNING for every trade
+        transactions = self.db.scalars(
+            insert(MarketTransaction).returning(MarketTransaction, sort_by_parameter_order=True),
+            rows
+        ).all()
+        
+        # Price history candles, in the same transaction
+        record_trades(self.db, transactions)
+        
+        # Lifetime trade counts (a self-trade counts once)
+        trade_counts: Dict[int, Dict[str, int]] = {}
+        for row in rows:
+            for player_id in {row["buyer_id"], row["seller_id"]}:
+                counts = trade_counts.setdefault(player_id, {"market_trades": 0})
+                counts["market_trades"] += 1
+        bump_stats_many(self.db, trade_counts)
+        
+        return transactions
     
     def _get_player_resource(self, state: PlayerState, item_type: str) -> int:
         """Get player's current amount of a resource.
@@ -412,3 +515,27 @@ class MarketMatchingEngine:
                 )
                 self.db.add(inv)
 
+    
+    def _add_player_resources(self, states: Dict[int, PlayerState], item_type: str, amounts: Dict[int, int]):
+        """Give several players some of one resource (one inventory query for all of them)"""
+        config = RESOURCES.get(item_type)
+        if not config:
+            raise ValueError(f"Unknown item type: {item_type}")
+        
+        if config.get("storage_type") == "column":
+            for user_id, amount in amounts.items():
+                self._modify_player_resource(states[user_id], item_type, amount)
+            return
+        
+        rows = {
+            inv.user_id: inv
+            for inv in self.db.query(PlayerInventory).filter(
+                PlayerInventory.user_id.in_(list(amounts)),
+                PlayerInventory.item_id == item_type
+            ).all()
+        }
+        for user_id, amount in amounts.items():
+            if user_id in rows:
+                rows[user_id].quantity += amount
+            else:
+                self.db.add(PlayerInventory(user_id=user_id, item_id=item_type, quantity=amount))
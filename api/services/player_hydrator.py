@@ -0,0 +1,138 @@
+"""
+Player card hydration
+=====================
+Activity feeds, friend lists and player lists show the same author card on
+every row: display name, level, and - for subscribers - icon/card style and
+selected title. Building it per row cost ~5 queries (User, PlayerState,
+subscription check, UserPreferences, achievement_definitions), so a 50-row
+feed page ran ~250 queries.
+
+PlayerHydrator collects the distinct user ids of a page and loads each table
+once with an IN query (users, states, active subscriptions, preferences,
+titles). load() can be called again with more ids; only new ids are queried.
+
+Style presets are static and title definitions only change with a deploy, so
+both are memoized per process (_STYLE_CARDS, _TITLE_CACHE).
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from typing import Dict, Iterable, List, Optional, Set
+from datetime import datetime, timezone
+
+from db import User, PlayerState
+from db.models.subscription import Subscription, UserPreferences, STYLE_PRESETS
+
+
+# ============================================================
+# PROCESS-WIDE MEMOS
+# ============================================================
+
+# style_id -> {"id", "name", "background_color", "text_color"} (StylePreset shape)
+_STYLE_CARDS: Dict[str, dict] = {
+    style_id: {"id": style_id, "name": s["name"], "background_color": s["background"], "text_color": s["text"]}
+    for style_id, s in STYLE_PRESETS.items()
+}
+
+# achievement_definitions.id -> {"achievement_id", "display_name", "icon"} (TitleData shape)
+_TITLE_CACHE: Dict[int, dict] = {}
+
+
+def style_card(style_id: Optional[str]) -> Optional[dict]:
+    """Style preset as a StylePreset dict, None for unknown/unset styles. Shared - don't mutate."""
+    if not style_id:
+        return None
+    return _STYLE_CARDS.get(style_id)
+
+
+def get_titles(db: Session, achievement_ids: Iterable[int]) -> Dict[int, dict]:
+    """Title definitions by id (TitleData dicts), one query for ids not cached yet"""
+    wanted = {a for a in achievement_ids if a}
+    missing = [a for a in wanted if a not in _TITLE_CACHE]
+    if missing:
+        rows = db.execute(text("""
+            SELECT id, display_name, icon
+            FROM achievement_definitions
+            WHERE id = ANY(:ids)
+        """), {"ids": missing}).fetchall()
+        for row in rows:
+            _TITLE_CACHE[row.id] = {
+                "achievement_id": row.id,
+                "display_name": row.display_name,
+                "icon": row.icon or "star.fill"
+            }
+    return {a: _TITLE_CACHE[a] for a in wanted if a in _TITLE_CACHE}
+
+
+def get_subscriber_ids(db: Session, user_ids: Iterable[int]) -> Set[int]:
+    """Which of user_ids have an active subscription (same rule as is_user_subscriber)"""
+    user_ids = list(set(user_ids))
+    if not user_ids:
+        return set()
+    now = datetime.now(timezone.utc)
+    rows = db.query(Subscription.user_id).filter(
+        Subscription.user_id.in_(user_ids),
+        Subscription.expires_at > now
+    ).distinct().all()
+    return {user_id for (user_id,) in rows}
+
+
+# ============================================================
+# HYDRATOR
+# ============================================================
+
+class PlayerHydrator:
+    """Users, states and subscriber customization for a page of players"""
+
+    def __init__(self, db: Session, user_ids: Iterable[int] = ()):
+        self.db = db
+        self.users: Dict[int, User] = {}
+        self.states: Dict[int, PlayerState] = {}
+        self.subscribers: Set[int] = set()
+        self.customizations: Dict[int, dict] = {}
+        self._loaded: Set[int] = set()
+        self.load(user_ids)
+
+    def load(self, user_ids: Iterable[int]) -> None:
+        """Load every id not seen yet: at most 5 queries however many ids"""
+        new_ids: List[int] = list({uid for uid in user_ids if uid is not None} - self._loaded)
+        if not new_ids:
+            return
+        self._loaded.update(new_ids)
+        db = self.db
+
+        for user in db.query(User).filter(User.id.in_(new_ids)).all():
+            self.users[user.id] = user
+        for state in db.query(PlayerState).filter(PlayerState.user_id.in_(new_ids)).all():
+            self.states[state.user_id] = state
+
+        # Customization only exists for subscribers
+        subscribers = get_subscriber_ids(db, new_ids)
+        self.subscribers |= subscribers
+        if not subscribers:
+            return
+
+        prefs = db.query(UserPreferences).filter(UserPreferences.user_id.in_(list(subscribers))).all()
+        titles = get_titles(db, [p.selected_title_achievement_id for p in prefs])
+        for p in prefs:
+            icon_style = style_card(p.icon_style)
+            card_style = style_card(p.card_style)
+            selected_title = titles.get(p.selected_title_achievement_id)
+            if icon_style or card_style or selected_title:
+                self.customizations[p.user_id] = {
+                    "icon_style": icon_style,
+                    "card_style": card_style,
+                    "selected_title": selected_title
+                }
+
+    def user(self, user_id: int) -> Optional[User]:
+        return self.users.get(user_id)
+
+    def state(self, user_id: int) -> Optional[PlayerState]:
+        return self.states.get(user_id)
+
+    def is_subscriber(self, user_id: int) -> bool:
+        return user_id in self.subscribers
+
+    def customization(self, user_id: int) -> Optional[dict]:
+        """SubscriberCustomization dict, or None for non-subscribers / nothing selected"""
+        return self.customizations.get(user_id)
@@ -0,0 +1,194 @@
+"""
+Player stat counters
+====================
+Achievement progress used to be recomputed on every achievements screen /
+summary open: COUNT/SUM subqueries over user_kingdoms, foraging_sessions,
+trade_offers, market_transactions, contract_contributions, daily_gathering,
+battles, garden_history, kitchen_history, ... - cost grew with each
+player's history.
+
+Those lifetime totals now live in player_stat_counters (one row per player)
+and are bumped where the events happen, in the event's transaction:
+
+    bump_stats(db, user_id, bread_baked=1)
+    bump_stats_many(db, {buyer_id: {"market_trades": 1}, seller_id: {...}})
+
+Both are a single INSERT ... ON CONFLICT DO UPDATE SET col = col + delta.
+Rows are written in user_id order so multi-player bumps (battles, trades)
+can't deadlock against each other.
+
+find_stat_drift() / rebuild_stats() recompute the counters from the source
+tables (see backfill_player_stats.py).
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy import text
+from typing import Dict, Iterable, List
+from datetime import datetime
+
+from db import PlayerStatCounters
+
+
+_counters = PlayerStatCounters.__table__
+
+# Every lifetime counter column
+STAT_COUNTERS = tuple(c.name for c in _counters.c if c.name not in ("user_id", "updated_at"))
+
+
+# ============================================================
+# WRITES
+# ============================================================
+
+def bump_stats(db: Session, user_id: int, **deltas: int) -> None:
+    """Add deltas to one player's counters. Zero deltas are skipped. Does not commit."""
+    bump_stats_many(db, {user_id: deltas})
+
+
+def bump_stats_many(db: Session, deltas_by_user: Dict[int, Dict[str, int]]) -> None:
+    """Add deltas to several players' counters in one upsert. Does not commit."""
+    columns = sorted({stat for deltas in deltas_by_user.values() for stat, delta in deltas.items() if delta})
+    if not columns:
+        return
+    unknown = set(columns) - set(STAT_COUNTERS)
+    if unknown:
+        raise ValueError(f"Unknown stat counters: {sorted(unknown)}")
+
+    now = datetime.utcnow()
+    rows = [
+        {"user_id": user_id, "updated_at": now, **{c: int(deltas.get(c) or 0) for c in columns}}
+        for user_id, deltas in sorted(deltas_by_user.items())
+        if any(deltas.get(c) for c in columns)
+    ]
+    stmt = pg_insert(_counters).values(rows)
+    set_ = {c: _counters.c[c] + stmt.excluded[c] for c in columns}
+    set_["updated_at"] = stmt.excluded.updated_at
+    db.execute(stmt.on_conflict_do_update(index_elements=[_counters.c.user_id], set_=set_))
+
+
+# ============================================================
+# READS
+# ============================================================
+
+def get_stat_counters(db: Session, user_id: int) -> Dict[str, int]:
+    """Every counter for one player (zeros if nothing was recorded yet)"""
+    row = db.query(*[_counters.c[c] for c in STAT_COUNTERS]).filter(
+        _counters.c.user_id == user_id
+    ).first()
+    if row is None:
+        return {c: 0 for c in STAT_COUNTERS}
+    return {c: int(v or 0) for c, v in zip(STAT_COUNTERS, row)}
+
+
+# ============================================================
+# CONSISTENCY CHECK / REBUILD
+# ============================================================
+
+# Counters recomputed from the source tables, one row per user in :ids
+_ACTUAL_SQL = """
+    SELECT
+        u.id AS user_id,
+        COALESCE((SELECT SUM(checkins_count) FROM user_kingdoms WHERE user_id = u.id), 0) AS total_checkins,
+        (SELECT COUNT(*) FROM foraging_sessions WHERE user_id = u.id AND status = 'collected') AS foraging_completed,
+        (SELECT COUNT(*) FROM trade_offers WHERE (sender_id = u.id OR recipient_id = u.id) AND status = 'accepted') AS direct_trades,
+        (SELECT COUNT(*) FROM market_transactions WHERE buyer_id = u.id OR seller_id = u.id) AS market_trades,
+        COALESCE((SELECT SUM(amount_gathered) FROM daily_gathering WHERE user_id = u.id AND resource_type = 'wood'), 0) AS wood_gathered,
+        COALESCE((SELECT SUM(amount_gathered) FROM daily_gathering WHERE user_id = u.id AND resource_type = 'iron'), 0) AS iron_gathered,
+        COALESCE((SELECT SUM(amount_gathered) FROM daily_gathering WHERE user_id = u.id AND resource_type = 'stone'), 0) AS stone_gathered,
+        (SELECT COUNT(*) FROM contract_contributions cc JOIN unified_contracts uc ON cc.contract_id = uc.id
+         WHERE cc.user_id = u.id AND uc.category = 'kingdom_building') AS building_contracts,
+        (SELECT COUNT(*) FROM contract_contributions cc JOIN unified_contracts uc ON cc.contract_id = uc.id
+         WHERE cc.user_id = u.id AND uc.category = 'personal_training') AS training_contracts,
+        (SELECT COUNT(*) FROM unified_contracts WHERE user_id = u.id AND completed_at IS NOT NULL AND category = 'workshop_craft') AS items_crafted,
+        (SELECT COUNT(*) FROM unified_contracts WHERE user_id = u.id AND completed_at IS NOT NULL AND category = 'workshop_craft'
+         AND type = ANY(:weapon_ids)) AS weapons_crafted,
+        (SELECT COUNT(*) FROM unified_contracts WHERE user_id = u.id AND completed_at IS NOT NULL AND category = 'workshop_craft'
+         AND type = ANY(:armor_ids)) AS armor_crafted,
+        (SELECT COUNT(*) FROM unified_contracts WHERE user_id = u.id AND completed_at IS NOT NULL AND category = 'workshop_craft'
+         AND tier = 5) AS craft_tier_5_item,
+        (SELECT COUNT(*) FROM battles WHERE initiator_id = u.id AND type = 'coup') AS coups_initiated,
+        (SELECT COUNT(DISTINCT bp.battle_id) FROM battle_participants bp JOIN battles b ON b.id = bp.battle_id
+         WHERE bp.user_id = u.id AND b.type = 'coup' AND b.resolved_at IS NOT NULL
+           AND ((b.attacker_victory = true AND bp.side = 'attackers') OR (b.attacker_victory = false AND bp.side = 'defenders'))) AS coups_won,
+        (SELECT COUNT(DISTINCT bp.battle_id) FROM battle_participants bp JOIN battles b ON b.id = bp.battle_id
+         WHERE bp.user_id = u.id AND b.type = 'invasion' AND b.resolved_at IS NOT NULL) AS invasions_participated,
+        (SELECT COUNT(DISTINCT bp.battle_id) FROM battle_participants bp JOIN battles b ON b.id = bp.battle_id
+         WHERE bp.user_id = u.id AND b.type = 'invasion' AND b.resolved_at IS NOT NULL
+           AND b.attacker_victory = true AND bp.side = 'attackers') AS invasions_won_attack,
+        (SELECT COUNT(DISTINCT bp.battle_id) FROM battle_participants bp JOIN battles b ON b.id = bp.battle_id
+         WHERE bp.user_id = u.id AND b.type = 'invasion' AND b.resolved_at IS NOT NULL
+           AND b.attacker_victory = false AND bp.side = 'defenders') AS invasions_won_defend,
+        (SELECT COUNT(*) FROM garden_history WHERE user_id = u.id AND action = 'grown' AND plant_type IS NOT NULL) AS plants_grown,
+        (SELECT COUNT(*) FROM garden_history WHERE user_id = u.id AND action = 'grown' AND plant_type = 'flower') AS flowers_grown,
+        (SELECT COUNT(*) FROM garden_history WHERE user_id = u.id AND action = 'grown' AND plant_type = 'flower'
+         AND flower_rarity = 'rare') AS rare_flowers_grown,
+        (SELECT COUNT(DISTINCT flower_color) FROM garden_history WHERE user_id = u.id AND action = 'grown'
+         AND plant_type = 'flower' AND flower_color IS NOT NULL) AS flower_colors,
+        COALESCE((SELECT SUM(wheat_gained) FROM garden_history WHERE user_id = u.id AND action = 'harvested'), 0) AS wheat_harvested,
+        (SELECT COUNT(*) FROM garden_history WHERE user_id = u.id AND action = 'discarded' AND plant_type = 'weed') AS weeds_cleared,
+        (SELECT COUNT(*) FROM kitchen_history WHERE user_id = u.id AND action = 'baked') AS bread_baked
+    FROM users u
+    WHERE u.id = ANY(:ids)
+"""
+
+
+def _actual_params(user_ids: List[int]) -> dict:
+    from routers.workshop import WEAPON_ITEM_IDS, ARMOR_ITEM_IDS
+    return {"ids": user_ids, "weapon_ids": list(WEAPON_ITEM_IDS), "armor_ids": list(ARMOR_ITEM_IDS)}
+
+
+def find_stat_drift(db: Session, user_ids: Iterable[int]) -> List[dict]:
+    """Counters that don't match the source tables: [{user_id, stat, counter, actual}]"""
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return []
+
+    actual = {
+        row.user_id: row
+        for row in db.execute(text(_ACTUAL_SQL), _actual_params(user_ids)).fetchall()
+    }
+    stored = {
+        row.user_id: row
+        for row in db.query(_counters).filter(_counters.c.user_id.in_(user_ids)).all()
+    }
+
+    drift = []
+    for user_id, expected in actual.items():
+        current = stored.get(user_id)
+        for stat in STAT_COUNTERS:
+            counter = int(getattr(current, stat) or 0) if current is not None else 0
+            value = int(getattr(expected, stat) or 0)
+            if counter != value:
+                drift.append({"user_id": user_id, "stat": stat, "counter": counter, "actual": value})
+    return drift
+
+
+def rebuild_stats(db: Session, user_ids: Iterable[int]) -> int:
+    """
+    Recompute every counter for the given players from the source tables.
+
+    Creates and locks the counter rows first: a concurrent bump either commits
+    before the recount (and is counted) or waits and is added on top of it.
+    Does not commit. Returns players rebuilt.
+    """
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return 0
+
+    db.execute(text("""
+        INSERT INTO player_stat_counters (user_id)
+        SELECT id FROM users WHERE id = ANY(:ids)
+        ON CONFLICT (user_id) DO NOTHING
+    """), {"ids": user_ids})
+    locked = db.execute(text(
+        "SELECT user_id FROM player_stat_counters WHERE user_id = ANY(:ids) ORDER BY user_id FOR UPDATE"
+    ), {"ids": user_ids}).scalars().all()
+
+    assignments = ", ".join(f"{stat} = a.{stat}" for stat in STAT_COUNTERS)
+    db.execute(text(f"""
+        UPDATE player_stat_counters p
+        SET {assignments}, updated_at = NOW()
+        FROM ({_ACTUAL_SQL}) a
+        WHERE p.user_id = a.user_id
+    """), _actual_params(user_ids))
+
+    return len(locked)
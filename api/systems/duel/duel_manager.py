@@ -36,6 +36,7 @@ from sqlalchemy.orm import Session
 
 from db.models import User, PlayerState, DuelMatch, DuelInvitation, DuelAction, DuelStats, DuelStatus, Friend, DuelPairingHistory
 from db.models.duel import DuelPhase, OUTCOME_RANK
+from services.deadline_scheduler import schedule_deadline, DUEL_TIMEOUT
 from .config import (
     DUEL_TURN_TIMEOUT_SECONDS,
     DUEL_INVITATION_TIMEOUT_MINUTES,
@@ -287,6 +288,7 @@ class DuelManager:
         
         # Start style selection phase
         match.start_style_phase(DUEL_STYLE_LOCK_TIMEOUT_SECONDS)
+        self._schedule_timeout(db, match)
         
         db.commit()
         db.refresh(match)
@@ -364,7 +366,15 @@ class DuelManager:
         if not match.style_phase_expired():
             return None
         
-        # Apply default styles where needed
+        self._apply_default_styles(match)
+        
+        db.commit()
+        db.refresh(match)
+        
+        return match
+    
+    def _apply_default_styles(self, match: DuelMatch) -> None:
+        """Give anyone who didn't lock a style the default, then reveal."""
         if not match.challenger_style:
             match.challenger_style = AttackStyle.DEFAULT
             match.challenger_style_locked_at = datetime.utcnow()
@@ -375,11 +385,6 @@ class DuelManager:
         
         # Transition to swing phase
         self._transition_to_swing_phase(match)
-        
-        db.commit()
-        db.refresh(match)
-        
-        return match
     
     def _transition_to_swing_phase(self, match: DuelMatch) -> None:
         """
@@ -751,6 +756,7 @@ class DuelManager:
         else:
             # Advance to next round
             match.advance_round(DUEL_STYLE_LOCK_TIMEOUT_SECONDS)
+            self._schedule_timeout(db, match)
             resolution["game_over"] = False
         
         db.commit()
@@ -955,6 +961,57 @@ class DuelManager:
         
         return match
     
+    def apply_expired_timeouts(self, db: Session, match: DuelMatch) -> Optional[str]:
+        """
+        Apply whichever phase timer has run out, for the deadline worker.
+        
+        - Style selection expired: default styles are locked and the swing
+          phase starts (same as check_style_phase_timeout)
+        - Swing phase expired with exactly one player submitted: that player
+          wins (same as them calling claim_swing_timeout)
+        
+        Does not commit - the worker commits its whole batch.
+        
+        Returns:
+            "styles_revealed", "timeout" or None if nothing was due
+        """
+        if not match.is_fighting:
+            return None
+        
+        if match.in_style_selection:
+            if not match.style_phase_expired():
+                return None
+            self._apply_default_styles(match)
+            return "styles_revealed"
+        
+        if not match.swing_phase_expires_at:
+            return None
+        exp = match.swing_phase_expires_at.replace(tzinfo=None) if match.swing_phase_expires_at.tzinfo else match.swing_phase_expires_at
+        if datetime.utcnow() < exp:
+            return None
+        
+        submitted = [pid for pid in (match.challenger_id, match.opponent_id) if match.has_player_submitted(pid)]
+        if len(submitted) != 1:
+            return None
+        
+        winner_side = "challenger" if submitted[0] == match.challenger_id else "opponent"
+        self._complete_match(db, match, winner_side)
+        return "timeout"
+    
+    def next_timeout_at(self, match: DuelMatch) -> Optional[datetime]:
+        """When the current phase's timer runs out (None if no timer is running)."""
+        if not match.is_fighting:
+            return None
+        if match.in_style_selection:
+            return match.style_lock_expires_at
+        return match.swing_phase_expires_at
+    
+    def _schedule_timeout(self, db: Session, match: DuelMatch) -> None:
+        """Queue the current phase timer so it fires even if nobody polls."""
+        due_at = self.next_timeout_at(match)
+        if due_at:
+            schedule_deadline(db, DUEL_TIMEOUT, match.id, due_at)
+    
     # =========================================================================
     # FORFEIT / CANCEL
     # =========================================================================
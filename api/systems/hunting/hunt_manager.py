@@ -215,7 +215,11 @@ class PhaseState:
     is_resolved: bool = False
     resolution_roll: Optional[int] = None  # The "master roll" value
     resolution_outcome: Optional[str] = None  # The chosen outcome key
-    
+
+    # Persistence bookkeeping (not sent to frontend): how many of round_results
+    # already have rows in hunt_round_results, so save_hunt only appends new ones
+    persisted_rounds: int = 0
+
     def to_dict(self) -> dict:
         """
         Convert to dict for API response.
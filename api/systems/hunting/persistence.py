@@ -7,56 +7,137 @@ Replaces the in-memory storage that didn't work with Lambda.
 
 from datetime import datetime, timedelta
 from typing import Optional, List
+from sqlalchemy import literal_column
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from db.models import HuntSession as HuntSessionModel
+from db.models import HuntSession as HuntSessionModel, HuntSessionParticipant, HuntRoundResult
+from services.deadline_scheduler import schedule_deadline, HUNT_EXPIRY
 from .config import HuntPhase, HuntConfig
 
 
 # Default hunt expiry: 24 hours
 HUNT_EXPIRY_HOURS = 24
 
+ACTIVE_HUNT_STATUSES = ('lobby', 'in_progress')
+
 
 def save_hunt(db: Session, hunt_session) -> None:
     """
     Save a hunt session to the database.
     
+    session_data holds everything except per-roll round results, so it stays
+    small and does not grow with each roll. Round results are appended to
+    hunt_round_results - a roll save inserts one row.
+    
     Args:
         db: SQLAlchemy database session
         hunt_session: HuntSession dataclass instance
     """
-    from .hunt_manager import HuntSession, HuntStatus
-    
     # Convert to storage format
-    session_data = _serialize_hunt(hunt_session)
+    session_data = _serialize_hunt(hunt_session, include_round_results=False)
     
-    # Check if exists
-    existing = db.query(HuntSessionModel).filter(
-        HuntSessionModel.hunt_id == hunt_session.hunt_id
-    ).first()
+    # Upsert in one statement instead of SELECT-then-INSERT/UPDATE
+    expires_at = datetime.utcnow() + timedelta(hours=HUNT_EXPIRY_HOURS)
+    stmt = pg_insert(HuntSessionModel).values(
+        hunt_id=hunt_session.hunt_id,
+        created_by=hunt_session.created_by,
+        kingdom_id=hunt_session.kingdom_id,
+        status=hunt_session.status.value,
+        session_data=session_data,
+        created_at=hunt_session.created_at,
+        started_at=hunt_session.started_at,
+        completed_at=hunt_session.completed_at,
+        updated_at=datetime.utcnow(),
+        expires_at=expires_at,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[HuntSessionModel.hunt_id],
+        set_={
+            "status": stmt.excluded.status,
+            "session_data": stmt.excluded.session_data,
+            "started_at": stmt.excluded.started_at,
+            "completed_at": stmt.excluded.completed_at,
+            "updated_at": stmt.excluded.updated_at,
+        }
+    ).returning(literal_column("xmax = 0").label("inserted"))
+    inserted = db.execute(stmt).scalar()
     
-    if existing:
-        # Update existing
-        existing.status = hunt_session.status.value
-        existing.session_data = session_data
-        existing.started_at = hunt_session.started_at
-        existing.completed_at = hunt_session.completed_at
-    else:
-        # Create new
-        db_hunt = HuntSessionModel(
-            hunt_id=hunt_session.hunt_id,
-            created_by=hunt_session.created_by,
-            kingdom_id=hunt_session.kingdom_id,
-            status=hunt_session.status.value,
-            session_data=session_data,
-            created_at=hunt_session.created_at,
-            started_at=hunt_session.started_at,
-            completed_at=hunt_session.completed_at,
-            expires_at=datetime.utcnow() + timedelta(hours=HUNT_EXPIRY_HOURS),
-        )
-        db.add(db_hunt)
+    # First save of a new hunt - queue its expiry for the deadline worker
+    if inserted:
+        schedule_deadline(db, HUNT_EXPIRY, hunt_session.hunt_id, expires_at)
     
+    _append_round_results(db, hunt_session)
+    _sync_participants(db, hunt_session)
     db.commit()
+    
+    if hunt_session.current_phase_state:
+        state = hunt_session.current_phase_state
+        state.persisted_rounds = len(state.round_results)
+
+
+def _append_round_results(db: Session, hunt_session) -> None:
+    """
+    Insert rows for round results added since the phase state was last saved
+    or loaded. Hunts saved before hunt_round_results existed carry their rolls
+    inline and load with persisted_rounds=0, so their first save copies them
+    over; DO NOTHING keeps that idempotent.
+    """
+    state = hunt_session.current_phase_state
+    if not state:
+        return
+    
+    new_rounds = state.round_results[state.persisted_rounds:]
+    if not new_rounds:
+        return
+    
+    stmt = pg_insert(HuntRoundResult).values([
+        {
+            "hunt_id": hunt_session.hunt_id,
+            "phase": state.phase.value,
+            "round_number": r.round_number,
+            "player_id": r.player_id,
+            "player_name": r.player_name,
+            "roll_value": r.roll_value,
+            "stat_value": r.stat_value,
+            "is_success": r.is_success,
+            "is_critical": r.is_critical,
+            "contribution": r.contribution,
+            "effect_message": r.effect_message,
+        }
+        for r in new_rounds
+    ]).on_conflict_do_nothing(
+        index_elements=[HuntRoundResult.hunt_id, HuntRoundResult.phase, HuntRoundResult.round_number]
+    )
+    db.execute(stmt)
+
+
+def _sync_participants(db: Session, hunt_session) -> None:
+    """
+    Make hunt_participants match the hunt: one row per participant plus the
+    creator, carrying the hunt's status. Rows that already match are left
+    untouched, so the usual save (a roll, a ready toggle) writes nothing here.
+    """
+    status = hunt_session.status.value
+    user_ids = {int(pid) for pid in hunt_session.participants}
+    user_ids.add(int(hunt_session.created_by))
+    
+    # Players who left
+    db.query(HuntSessionParticipant).filter(
+        HuntSessionParticipant.hunt_id == hunt_session.hunt_id,
+        HuntSessionParticipant.user_id.notin_(user_ids)
+    ).delete(synchronize_session=False)
+    
+    stmt = pg_insert(HuntSessionParticipant).values([
+        {"hunt_id": hunt_session.hunt_id, "user_id": user_id, "status": status}
+        for user_id in sorted(user_ids)
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[HuntSessionParticipant.hunt_id, HuntSessionParticipant.user_id],
+        set_={"status": stmt.excluded.status},
+        where=HuntSessionParticipant.status.is_distinct_from(stmt.excluded.status)
+    )
+    db.execute(stmt)
 
 
 def load_hunt(db: Session, hunt_id: str) -> Optional["HuntSession"]:
@@ -84,7 +165,7 @@ def load_hunt(db: Session, hunt_id: str) -> Optional["HuntSession"]:
         db.commit()
         return None
     
-    return _deserialize_hunt(db_hunt.session_data)
+    return _load_hunt_row(db, db_hunt)
 
 
 def get_active_hunt_for_player(db: Session, player_id: int) -> Optional["HuntSession"]:
@@ -98,28 +179,23 @@ def get_active_hunt_for_player(db: Session, player_id: int) -> Optional["HuntSes
     Returns:
         HuntSession if player has an active hunt, None otherwise
     """
-    # First check hunts they created
-    db_hunt = db.query(HuntSessionModel).filter(
-        HuntSessionModel.created_by == player_id,
-        HuntSessionModel.status.in_(['lobby', 'in_progress'])
+    # One lookup on the partial (user_id) index of active participant rows.
+    # The creator always has a row, so this covers "as creator" as well.
+    db_hunt = db.query(HuntSessionModel).join(
+        HuntSessionParticipant,
+        HuntSessionParticipant.hunt_id == HuntSessionModel.hunt_id
+    ).filter(
+        HuntSessionParticipant.user_id == player_id,
+        HuntSessionParticipant.status.in_(ACTIVE_HUNT_STATUSES),
+        HuntSessionModel.status.in_(ACTIVE_HUNT_STATUSES),
+        HuntSessionModel.expires_at > datetime.utcnow()
+    ).order_by(
+        (HuntSessionModel.created_by == player_id).desc(),
+        HuntSessionModel.created_at.desc()
     ).first()
     
-    if db_hunt and not db_hunt.is_expired:
-        return _deserialize_hunt(db_hunt.session_data)
-    
-    # Also check if they're a participant in any hunt
-    # We need to search the JSONB session_data for participant IDs
-    # This is a bit expensive but hunts are short-lived
-    active_hunts = db.query(HuntSessionModel).filter(
-        HuntSessionModel.status.in_(['lobby', 'in_progress'])
-    ).all()
-    
-    for db_hunt in active_hunts:
-        if db_hunt.is_expired:
-            continue
-        participants = db_hunt.session_data.get("participants", {})
-        if str(player_id) in participants:
-            return _deserialize_hunt(db_hunt.session_data)
+    if db_hunt:
+        return _load_hunt_row(db, db_hunt)
     
     return None
 
@@ -140,11 +216,11 @@ def get_active_hunt_for_kingdom(db: Session, kingdom_id: str) -> Optional["HuntS
     """
     db_hunt = db.query(HuntSessionModel).filter(
         HuntSessionModel.kingdom_id == kingdom_id,
-        HuntSessionModel.status.in_(['lobby', 'in_progress'])
+        HuntSessionModel.status.in_(ACTIVE_HUNT_STATUSES)
     ).order_by(HuntSessionModel.created_at.desc()).first()
     
     if db_hunt and not db_hunt.is_expired:
-        return _deserialize_hunt(db_hunt.session_data)
+        return _load_hunt_row(db, db_hunt)
     
     return None
 
@@ -167,14 +243,36 @@ def cleanup_expired_hunts(db: Session) -> int:
     return result
 
 
+def _load_hunt_row(db: Session, db_hunt: HuntSessionModel) -> "HuntSession":
+    """
+    Rebuild a HuntSession from its row plus the current phase's round results.
+    Earlier phases' rolls are only needed while that phase is live (they are
+    summarized in phase_results on resolve), so they are not read back.
+    """
+    data = db_hunt.session_data
+    phase_state = data.get("current_phase_state")
+    
+    round_results = None
+    if phase_state and "round_results" not in phase_state:
+        round_results = db.query(HuntRoundResult).filter(
+            HuntRoundResult.hunt_id == db_hunt.hunt_id,
+            HuntRoundResult.phase == phase_state["phase"]
+        ).order_by(HuntRoundResult.round_number).all()
+    
+    return _deserialize_hunt(data, round_results)
+
+
 # ============================================================
 # SERIALIZATION HELPERS
 # ============================================================
 
-def _serialize_hunt(hunt_session) -> dict:
+def _serialize_hunt(hunt_session, include_round_results: bool = True) -> dict:
     """
     Serialize a HuntSession dataclass to a dict for storage.
     Handles nested dataclasses and enums.
+    
+    save_hunt passes include_round_results=False - rolls are stored as
+    hunt_round_results rows rather than inside the blob.
     """
     from .hunt_manager import HuntSession, HuntParticipant, PhaseState, PhaseResult, PhaseRoundResult
     
@@ -215,11 +313,10 @@ def _serialize_hunt(hunt_session) -> dict:
     def serialize_phase_state(ps: "PhaseState") -> dict:
         if ps is None:
             return None
-        return {
+        data = {
             "phase": ps.phase.value,
             "rounds_completed": ps.rounds_completed,
             "total_score": ps.total_score,
-            "round_results": [serialize_round_result(r) for r in ps.round_results],
             "max_rolls": ps.max_rolls,
             "stat_value": ps.stat_value,
             "effective_hit_chance_percent": ps.effective_hit_chance_percent,
@@ -233,6 +330,9 @@ def _serialize_hunt(hunt_session) -> dict:
             "resolution_roll": ps.resolution_roll,
             "resolution_outcome": ps.resolution_outcome,
         }
+        if include_round_results:
+            data["round_results"] = [serialize_round_result(r) for r in ps.round_results]
+        return data
     
     def serialize_phase_result(pr: "PhaseResult") -> dict:
         return {
@@ -274,9 +374,13 @@ def _serialize_hunt(hunt_session) -> dict:
     }
 
 
-def _deserialize_hunt(data: dict) -> "HuntSession":
+def _deserialize_hunt(data: dict, round_results: Optional[list] = None) -> "HuntSession":
     """
     Deserialize a dict from storage back to a HuntSession dataclass.
+    
+    round_results are the current phase's hunt_round_results rows. Blobs that
+    still carry round_results inline (saved before that table existed) use
+    those instead.
     """
     from .hunt_manager import (
         HuntSession, HuntStatus, HuntParticipant, 
@@ -321,14 +425,34 @@ def _deserialize_hunt(data: dict) -> "HuntSession":
             effect_message=d["effect_message"],
         )
     
+    def row_to_round_result(row) -> PhaseRoundResult:
+        return PhaseRoundResult(
+            round_number=row.round_number,
+            player_id=row.player_id,
+            player_name=row.player_name,
+            roll_value=row.roll_value,
+            stat_value=row.stat_value,
+            is_success=row.is_success,
+            is_critical=row.is_critical,
+            contribution=row.contribution,
+            effect_message=row.effect_message,
+        )
+    
     def deserialize_phase_state(d: dict) -> Optional[PhaseState]:
         if d is None:
             return None
+        if "round_results" in d:
+            # Legacy inline rolls - not in hunt_round_results yet
+            rounds = [deserialize_round_result(r) for r in d["round_results"]]
+            persisted_rounds = 0
+        else:
+            rounds = [row_to_round_result(r) for r in (round_results or [])]
+            persisted_rounds = len(rounds)
         return PhaseState(
             phase=HuntPhase(d["phase"]),
             rounds_completed=d.get("rounds_completed", 0),
             total_score=d.get("total_score", 0.0),
-            round_results=[deserialize_round_result(r) for r in d.get("round_results", [])],
+            round_results=rounds,
             max_rolls=d.get("max_rolls", 1),
             stat_value=d.get("stat_value", 0),
             effective_hit_chance_percent=d.get("effective_hit_chance_percent", 20),
@@ -341,6 +465,7 @@ def _deserialize_hunt(data: dict) -> "HuntSession":
             is_resolved=d.get("is_resolved", False),
             resolution_roll=d.get("resolution_roll"),
             resolution_outcome=d.get("resolution_outcome"),
+            persisted_rounds=persisted_rounds,
         )
     
     def deserialize_phase_result(d: dict) -> PhaseResult:
@@ -11,11 +11,12 @@ ONE BUTTON, ONE ENDPOINT - outcomes scale with Intelligence tier!
 Usage:
     from systems.incidents import IncidentManager, IncidentConfig
     
-    manager = IncidentManager()
+    manager = IncidentManager()  # Postgres-backed; IncidentManager(store=MemoryIncidentStore()) for tests
     
     # Attempt to trigger an incident (patrol determines if it happens)
     # Attacker's intelligence tier determines which outcomes are possible
     result = manager.attempt_trigger(
+        db,
         attacker_kingdom_id="kingdom_a",
         defender_kingdom_id="kingdom_b",
         attacker_id=123,
@@ -27,19 +28,23 @@ Usage:
     # If triggered, players can roll to shift the probability bar
     if result["triggered"]:
         incident_id = result["incident_id"]
-        roll_result = manager.execute_roll(incident_id, player_id=123, side="attacker")
+        roll_result = manager.execute_roll(db, incident_id, player_id=123)
         
     # Resolve when ready - master roll determines outcome
-    final_result = manager.resolve_incident(incident_id)
+    final_result = manager.resolve_incident(db, incident_id)
+    db.commit()  # the manager never commits
 """
 
 from .config import IncidentConfig, INCIDENT_DROP_TABLE, INCIDENT_SHIFT_PER_SUCCESS
 from .incident_manager import IncidentManager, IncidentSession, IncidentStatus
+from .store import PostgresIncidentStore, MemoryIncidentStore
 
 __all__ = [
     "IncidentManager",
     "IncidentSession",
     "IncidentStatus",
+    "PostgresIncidentStore",
+    "MemoryIncidentStore",
     "IncidentConfig",
     "INCIDENT_DROP_TABLE",
     "INCIDENT_SHIFT_PER_SUCCESS",
@@ -221,46 +221,48 @@ class IncidentManager:
     """
     Manages incident sessions.
     
-    In-memory storage (like hunts). Can be backed by Redis for production scale.
+    State lives in an incident store (systems/incidents/store.py) - Postgres
+    by default, so a roll can land on any instance. Methods take the request's
+    db session; the caller commits.
     
-    Key design: incidents are keyed by (attacker_kingdom -> defender_kingdom),
+    Key design: one active incident per (attacker_kingdom -> defender_kingdom),
     so one defender can have multiple incidents from different attackers.
     """
     
-    def __init__(self, seed: Optional[int] = None):
+    # Expired incidents auto-resolved per cleanup_expired batch
+    CLEANUP_BATCH_SIZE = 100
+    
+    def __init__(self, seed: Optional[int] = None, store=None):
         self.roll_engine = RollEngine(seed)
         self.rng = random.Random(seed)
-        self._incidents: Dict[str, IncidentSession] = {}
+        if store is None:
+            from .store import create_incident_store
+            store = create_incident_store()
+        self.store = store
     
     def _make_incident_id(self, attacker_kingdom_id: str, defender_kingdom_id: str) -> str:
-        """Create incident ID from kingdom pair"""
-        return f"incident_{attacker_kingdom_id}_{defender_kingdom_id}"
+        """Create a unique incident ID for a kingdom pair"""
+        return f"incident_{attacker_kingdom_id}_{defender_kingdom_id}_{int(time.time() * 1000)}"
     
-    def get_incident(self, incident_id: str) -> Optional[IncidentSession]:
+    def get_incident(self, db, incident_id: str) -> Optional[IncidentSession]:
         """Get incident by ID"""
-        return self._incidents.get(incident_id)
+        return self.store.get(db, incident_id)
     
-    def get_incident_for_pair(self, attacker_kingdom_id: str, defender_kingdom_id: str) -> Optional[IncidentSession]:
+    def get_incident_for_pair(self, db, attacker_kingdom_id: str, defender_kingdom_id: str) -> Optional[IncidentSession]:
         """Get active incident for a kingdom pair"""
-        incident_id = self._make_incident_id(attacker_kingdom_id, defender_kingdom_id)
-        incident = self._incidents.get(incident_id)
-        
-        if incident and incident.status == IncidentStatus.ACTIVE and not incident.is_expired():
-            return incident
-        return None
+        return self.store.get_active_for_pair(db, attacker_kingdom_id, defender_kingdom_id)
     
-    def get_incidents_for_defender(self, defender_kingdom_id: str) -> List[IncidentSession]:
+    def get_incidents_for_defender(self, db, defender_kingdom_id: str) -> List[IncidentSession]:
         """Get all active incidents targeting a defender kingdom"""
-        result = []
-        for incident in self._incidents.values():
-            if (incident.defender_kingdom_id == defender_kingdom_id and 
-                incident.status == IncidentStatus.ACTIVE and
-                not incident.is_expired()):
-                result.append(incident)
-        return result
+        return self.store.list_active(db, defender_kingdom_id=defender_kingdom_id)
+    
+    def get_incidents_for_attacker(self, db, attacker_kingdom_id: str) -> List[IncidentSession]:
+        """Get all active incidents launched by an attacker kingdom"""
+        return self.store.list_active(db, attacker_kingdom_id=attacker_kingdom_id)
     
     def attempt_trigger(
         self,
+        db,
         attacker_kingdom_id: str,
         defender_kingdom_id: str,
         attacker_id: int,
@@ -292,26 +294,9 @@ class IncidentManager:
         attacker_tier = attacker_stats.get("intelligence", 1)
         
         # Check if incident already exists for this pair
-        existing = self.get_incident_for_pair(attacker_kingdom_id, defender_kingdom_id)
+        existing = self.get_incident_for_pair(db, attacker_kingdom_id, defender_kingdom_id)
         if existing:
-            # Join existing incident instead
-            existing.add_participant(
-                player_id=attacker_id,
-                player_name=attacker_name,
-                side="attacker",
-                stats=attacker_stats,
-                kingdom_id=attacker_kingdom_id,
-            )
-            return {
-                "success": True,
-                "triggered": True,
-                "incident_id": existing.incident_id,
-                "success_chance": 1.0,  # Already existed
-                "roll": None,
-                "message": "Joined existing operation",
-                "incident": existing.to_dict(),
-                "already_existed": True,
-            }
+            return self._join_existing(db, existing, attacker_id, attacker_name, attacker_stats, attacker_kingdom_id)
         
         # PHASE 1: Calculate initial success chance (int tier vs patrols)
         success_chance = IncidentConfig.calculate_initial_success_chance(attacker_tier, active_patrols)
@@ -356,7 +341,25 @@ class IncidentManager:
             kingdom_id=attacker_kingdom_id,
         )
         
-        self._incidents[incident_id] = session
+        # A timed-out incident for this pair still holds the active slot - settle it first
+        self._settle_expired(db, pair=(attacker_kingdom_id, defender_kingdom_id))
+        
+        if not self.store.create(db, session):
+            # Another instance triggered this pair in the meantime - join theirs
+            existing = self.get_incident_for_pair(db, attacker_kingdom_id, defender_kingdom_id)
+            if existing:
+                return self._join_existing(db, existing, attacker_id, attacker_name, attacker_stats, attacker_kingdom_id)
+            return {
+                "success": False,
+                "triggered": False,
+                "incident_id": None,
+                "success_chance": success_chance,
+                "roll": round(roll, 3),
+                "message": "Another operation against this kingdom just ended. Try again.",
+                "incident": None,
+                "intelligence_tier": attacker_tier,
+                "active_patrols": active_patrols,
+            }
         
         return {
             "success": True,
@@ -371,8 +374,39 @@ class IncidentManager:
             "active_patrols": active_patrols,
         }
     
+    def _join_existing(
+        self,
+        db,
+        existing: IncidentSession,
+        attacker_id: int,
+        attacker_name: str,
+        attacker_stats: Dict[str, int],
+        attacker_kingdom_id: str,
+    ) -> dict:
+        """Join an already running incident for the pair instead of triggering a new one"""
+        participant = IncidentParticipant(
+            player_id=attacker_id,
+            player_name=attacker_name,
+            side="attacker",
+            stats=attacker_stats,
+            kingdom_id=attacker_kingdom_id,
+        )
+        if self.store.add_participant(db, existing.incident_id, participant):
+            existing.participants[attacker_id] = participant
+        return {
+            "success": True,
+            "triggered": True,
+            "incident_id": existing.incident_id,
+            "success_chance": 1.0,  # Already existed
+            "roll": None,
+            "message": "Joined existing operation",
+            "incident": existing.to_dict(),
+            "already_existed": True,
+        }
+    
     def join_incident(
         self,
+        db,
         incident_id: str,
         player_id: int,
         player_name: str,
@@ -381,7 +415,7 @@ class IncidentManager:
         kingdom_id: str
     ) -> dict:
         """Join an existing incident as attacker or defender"""
-        incident = self.get_incident(incident_id)
+        incident = self.get_incident(db, incident_id)
         if not incident:
             return {"success": False, "message": "Incident not found"}
         
@@ -397,8 +431,19 @@ class IncidentManager:
         if side == "defender" and kingdom_id != incident.defender_kingdom_id:
             return {"success": False, "message": "Must be from defending kingdom"}
         
-        if not incident.add_participant(player_id, player_name, side, stats, kingdom_id):
+        if player_id in incident.participants:
+            return {"success": False, "message": "Already participating"}
+        
+        participant = IncidentParticipant(
+            player_id=player_id,
+            player_name=player_name,
+            side=side,
+            stats=stats,
+            kingdom_id=kingdom_id,
+        )
+        if not self.store.add_participant(db, incident_id, participant):
             return {"success": False, "message": "Already participating"}
+        incident.participants[player_id] = participant
         
         return {
             "success": True,
@@ -406,13 +451,15 @@ class IncidentManager:
             "incident": incident.to_dict(),
         }
     
-    def execute_roll(self, incident_id: str, player_id: int) -> dict:
+    def execute_roll(self, db, incident_id: str, player_id: int) -> dict:
         """
         Execute a roll for a participant.
         
-        Shifts the probability bar based on success/failure.
+        Shifts the probability bar based on success/failure. The limit checks
+        here give friendly messages; the store re-checks them atomically while
+        applying the shift, so concurrent rolls can't overshoot.
         """
-        incident = self.get_incident(incident_id)
+        incident = self.get_incident(db, incident_id)
         if not incident:
             return {"success": False, "message": "Incident not found"}
         
@@ -438,10 +485,8 @@ class IncidentManager:
             multiplier = IncidentConfig.CRITICAL_MULTIPLIER if roll_result.is_critical else 1
             
             for outcome, shift in base_shift.items():
-                actual_shift = shift * multiplier
                 if outcome in incident.slots:
-                    incident.slots[outcome] = max(1, incident.slots[outcome] + actual_shift)
-                    shift_applied[outcome] = actual_shift
+                    shift_applied[outcome] = shift * multiplier
         
         # Record the roll
         record = RollRecord(
@@ -454,19 +499,21 @@ class IncidentManager:
             is_critical=roll_result.is_critical,
             shift_applied=shift_applied,
         )
-        incident.roll_history.append(record)
         
-        # Update counts
-        participant.rolls_made += 1
-        if roll_result.is_success:
-            participant.successful_rolls += 1
-        if roll_result.is_critical:
-            participant.critical_rolls += 1
+        new_slots = self.store.apply_roll(
+            db,
+            incident_id,
+            record,
+            max_rolls_player=IncidentConfig.MAX_ROLLS_PLAYER,
+            max_rolls_side=IncidentConfig.MAX_ROLLS_SIDE,
+        )
+        if new_slots is None:
+            # Lost a race: another roll used the last slot, or it just ended
+            incident = self.get_incident(db, incident_id)
+            _, reason = incident.can_roll(player_id) if incident else (False, "Incident not found")
+            return {"success": False, "message": reason if reason != "OK" else "Roll limit reached"}
         
-        if participant.side == "attacker":
-            incident.attacker_rolls += 1
-        else:
-            incident.defender_rolls += 1
+        incident = self.get_incident(db, incident_id)
         
         return {
             "success": True,
@@ -477,13 +524,33 @@ class IncidentManager:
             ),
         }
     
-    def resolve_incident(self, incident_id: str) -> dict:
+    def _pick_outcome(self, slots: Dict[str, int]) -> Tuple[int, str]:
+        """Master roll over the bar. Returns (resolution_roll 0-100, outcome)."""
+        total = sum(slots.values())
+        probs = {k: (v / total if total else 0.0) for k, v in slots.items()}
+        master_roll = self.rng.random()
+        
+        cumulative = 0.0
+        selected_outcome = None
+        for outcome, prob in probs.items():
+            cumulative += prob
+            if master_roll <= cumulative:
+                selected_outcome = outcome
+                break
+        
+        # Fallback
+        if not selected_outcome:
+            selected_outcome = max(probs, key=probs.get)
+        
+        return int(master_roll * 100), selected_outcome
+    
+    def resolve_incident(self, db, incident_id: str) -> dict:
         """
         Resolve the incident with a master roll.
         
         Picks outcome based on current probability bar.
         """
-        incident = self.get_incident(incident_id)
+        incident = self.get_incident(db, incident_id)
         if not incident:
             return {"success": False, "message": "Incident not found"}
         
@@ -493,21 +560,12 @@ class IncidentManager:
         
         # Master roll: pick outcome based on probabilities
         probs = incident.get_probabilities()
-        master_roll = self.rng.random()
-        incident.resolution_roll = int(master_roll * 100)
+        resolution_roll, selected_outcome = self._pick_outcome(incident.slots)
         
-        cumulative = 0.0
-        selected_outcome = None
-        for outcome, prob in probs.items():
-            cumulative += prob
-            if master_roll <= cumulative:
-                selected_outcome = outcome
-                break
-        
-        # Fallback
-        if not selected_outcome:
-            selected_outcome = max(probs, key=probs.get)
+        if not self.store.resolve(db, incident_id, resolution_roll, selected_outcome):
+            return {"success": False, "message": "Incident is not active"}
         
+        incident.resolution_roll = resolution_roll
         incident.outcome = selected_outcome
         incident.status = IncidentStatus.RESOLVED
         incident.resolved_at = datetime.utcnow()
@@ -539,26 +597,28 @@ class IncidentManager:
             "incident": incident.to_dict(),
         }
     
-    def cleanup_expired(self) -> int:
-        """Mark expired incidents and clean up old ones. Returns count cleaned."""
-        now = datetime.utcnow()
-        cleaned = 0
+    def _settle_expired(self, db, pair: Optional[Tuple[str, str]] = None) -> int:
+        """
+        Close timed-out incidents: ones with enough rolls get their master
+        roll, the rest are marked expired. Optionally limited to one pair.
+        """
+        settled = self.store.expire_unresolvable(db, IncidentConfig.MIN_ROLLS, pair=pair)
         
-        # Mark expired
-        for incident in self._incidents.values():
-            if incident.status == IncidentStatus.ACTIVE and incident.is_expired():
-                # Auto-resolve expired incidents
-                self.resolve_incident(incident.incident_id)
-                cleaned += 1
+        expired = self.store.lock_expired_resolvable(db, self.CLEANUP_BATCH_SIZE, pair=pair)
+        resolutions = []
+        for incident_id, slots in expired:
+            resolution_roll, outcome = self._pick_outcome(slots)
+            resolutions.append((incident_id, resolution_roll, outcome))
+        settled += self.store.resolve_many(db, resolutions)
+        
+        return settled
+    
+    def cleanup_expired(self, db) -> int:
+        """Settle expired incidents and purge old ones. Returns count cleaned."""
+        cleaned = self._settle_expired(db)
         
         # Remove old resolved incidents (older than 1 hour)
-        cutoff = now - timedelta(hours=1)
-        to_remove = [
-            iid for iid, inc in self._incidents.items()
-            if inc.resolved_at and inc.resolved_at < cutoff
-        ]
-        for iid in to_remove:
-            del self._incidents[iid]
-            cleaned += 1
+        cutoff = datetime.utcnow() - timedelta(hours=1)
+        cleaned += self.store.purge_finished(db, cutoff)
         
         return cleaned
@@ -0,0 +1,568 @@
+"""
+INCIDENT STORE
+==============
+Where incident state lives. IncidentManager only talks to a store, so any
+instance can serve any roll.
+
+- PostgresIncidentStore: incidents / incident_participants / incident_rolls
+  tables. Bar shifts and roll limits are single UPDATE ... RETURNING
+  statements (same approach as routers/battles._atomic_push_territory), so
+  concurrent rolls on different instances can't lose updates or overshoot
+  the per-player / per-side limits.
+- MemoryIncidentStore: process-local stand-in with the same semantics, for
+  tests and local runs (INCIDENT_STORE=memory).
+
+Every method takes the request's SQLAlchemy session first; the memory store
+ignores it. Stores never commit - the caller owns the transaction.
+"""
+
+import copy
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from db.models import (
+    Incident,
+    IncidentParticipant as IncidentParticipantModel,
+    IncidentRoll,
+)
+from .incident_manager import IncidentSession, IncidentParticipant, IncidentStatus, RollRecord
+
+
+# "postgres" = shared tables, "memory" = process-local stand-in
+INCIDENT_STORE = os.getenv("INCIDENT_STORE", "postgres").lower()
+
+# Rolls kept on a loaded IncidentSession (IncidentSession.to_dict shows the last 10)
+ROLL_HISTORY_LIMIT = 10
+
+
+def create_incident_store():
+    if INCIDENT_STORE == "memory":
+        print("🧪 Using in-memory incident store (INCIDENT_STORE=memory)")
+        return MemoryIncidentStore()
+    return PostgresIncidentStore()
+
+
+# ============================================================
+# POSTGRES
+# ============================================================
+
+class PostgresIncidentStore:
+    """Incidents in Postgres, shared by every instance"""
+
+    # ---------- reads ----------
+
+    def get(self, db, incident_id: str) -> Optional[IncidentSession]:
+        row = db.query(Incident).filter(Incident.incident_id == incident_id).first()
+        if not row:
+            return None
+        return self._hydrate(db, [row])[0]
+
+    def get_active_for_pair(self, db, attacker_kingdom_id: str, defender_kingdom_id: str) -> Optional[IncidentSession]:
+        # uq_incidents_active_pair
+        row = db.query(Incident).filter(
+            Incident.attacker_kingdom_id == attacker_kingdom_id,
+            Incident.defender_kingdom_id == defender_kingdom_id,
+            Incident.status == IncidentStatus.ACTIVE.value,
+            Incident.expires_at > datetime.utcnow()
+        ).first()
+        if not row:
+            return None
+        return self._hydrate(db, [row])[0]
+
+    def list_active(
+        self,
+        db,
+        attacker_kingdom_id: Optional[str] = None,
+        defender_kingdom_id: Optional[str] = None,
+    ) -> List[IncidentSession]:
+        query = db.query(Incident).filter(
+            Incident.status == IncidentStatus.ACTIVE.value,
+            Incident.expires_at > datetime.utcnow()
+        )
+        if attacker_kingdom_id is not None:
+            query = query.filter(Incident.attacker_kingdom_id == attacker_kingdom_id)
+        if defender_kingdom_id is not None:
+            query = query.filter(Incident.defender_kingdom_id == defender_kingdom_id)
+        rows = query.order_by(Incident.created_at).all()
+        return self._hydrate(db, rows)
+
+    def _hydrate(self, db, rows: List[Incident]) -> List[IncidentSession]:
+        """Rows -> IncidentSessions, with participants and recent rolls in two queries"""
+        if not rows:
+            return []
+        ids = [r.incident_id for r in rows]
+
+        participants: Dict[str, Dict[int, IncidentParticipant]] = {iid: {} for iid in ids}
+        for p in db.query(IncidentParticipantModel).filter(
+            IncidentParticipantModel.incident_id.in_(ids)
+        ).order_by(IncidentParticipantModel.joined_at).all():
+            participants[p.incident_id][p.player_id] = IncidentParticipant(
+                player_id=p.player_id,
+                player_name=p.player_name,
+                side=p.side,
+                stats=p.stats or {},
+                kingdom_id=p.kingdom_id,
+                joined_at=p.joined_at,
+                rolls_made=p.rolls_made,
+                successful_rolls=p.successful_rolls,
+                critical_rolls=p.critical_rolls,
+            )
+
+        # Last ROLL_HISTORY_LIMIT rolls per incident
+        ranked = db.query(
+            IncidentRoll.id,
+            func.row_number().over(
+                partition_by=IncidentRoll.incident_id,
+                order_by=IncidentRoll.id.desc()
+            ).label("rn")
+        ).filter(IncidentRoll.incident_id.in_(ids)).subquery()
+        recent = db.query(IncidentRoll).join(
+            ranked, ranked.c.id == IncidentRoll.id
+        ).filter(ranked.c.rn <= ROLL_HISTORY_LIMIT).order_by(IncidentRoll.id).all()
+
+        history: Dict[str, List[RollRecord]] = {iid: [] for iid in ids}
+        for r in recent:
+            history[r.incident_id].append(RollRecord(
+                player_id=r.player_id,
+                player_name=r.player_name,
+                side=r.side,
+                roll_value=r.roll_value,
+                stat_value=r.stat_value,
+                is_success=r.is_success,
+                is_critical=r.is_critical,
+                shift_applied=r.shift_applied or {},
+                timestamp=r.created_at,
+            ))
+
+        return [
+            IncidentSession(
+                incident_id=r.incident_id,
+                attacker_kingdom_id=r.attacker_kingdom_id,
+                defender_kingdom_id=r.defender_kingdom_id,
+                triggered_by=r.triggered_by,
+                attacker_tier=r.attacker_tier,
+                created_at=r.created_at,
+                expires_at=r.expires_at,
+                status=IncidentStatus(r.status),
+                participants=participants[r.incident_id],
+                slots=dict(r.slots or {}),
+                roll_history=history[r.incident_id],
+                attacker_rolls=r.attacker_rolls,
+                defender_rolls=r.defender_rolls,
+                resolved_at=r.resolved_at,
+                resolution_roll=r.resolution_roll,
+                outcome=r.outcome,
+            )
+            for r in rows
+        ]
+
+    # ---------- writes ----------
+
+    def create(self, db, session: IncidentSession) -> bool:
+        """
+        Insert a new active incident with its participants. Returns False if
+        the pair already has an active incident (uq_incidents_active_pair).
+        """
+        inserted = db.execute(
+            pg_insert(Incident).values(
+                incident_id=session.incident_id,
+                attacker_kingdom_id=session.attacker_kingdom_id,
+                defender_kingdom_id=session.defender_kingdom_id,
+                triggered_by=session.triggered_by,
+                attacker_tier=session.attacker_tier,
+                status=session.status.value,
+                slots=session.slots,
+                attacker_rolls=session.attacker_rolls,
+                defender_rolls=session.defender_rolls,
+                created_at=session.created_at,
+                expires_at=session.expires_at,
+            ).on_conflict_do_nothing().returning(Incident.incident_id)
+        ).first()
+        if not inserted:
+            return False
+
+        for participant in session.participants.values():
+            self.add_participant(db, session.incident_id, participant)
+        return True
+
+    def add_participant(self, db, incident_id: str, participant: IncidentParticipant) -> bool:
+        """Add a player to a live incident. False if already in it or it isn't live."""
+        row = db.execute(text("""
+            INSERT INTO incident_participants
+                (incident_id, player_id, player_name, side, kingdom_id, stats,
+                 rolls_made, successful_rolls, critical_rolls, joined_at)
+            SELECT :incident_id, :player_id, :player_name, :side, :kingdom_id, CAST(:stats AS JSONB),
+                   0, 0, 0, NOW()
+            WHERE EXISTS (
+                SELECT 1 FROM incidents
+                WHERE incident_id = :incident_id
+                  AND status = 'active'
+                  AND expires_at > NOW()
+            )
+            ON CONFLICT (incident_id, player_id) DO NOTHING
+            RETURNING player_id
+        """), {
+            "incident_id": incident_id,
+            "player_id": participant.player_id,
+            "player_name": participant.player_name,
+            "side": participant.side,
+            "kingdom_id": participant.kingdom_id,
+            "stats": json.dumps(participant.stats),
+        }).fetchone()
+        return row is not None
+
+    def apply_roll(
+        self,
+        db,
+        incident_id: str,
+        record: RollRecord,
+        max_rolls_player: int,
+        max_rolls_side: int,
+    ) -> Optional[Dict[str, int]]:
+        """
+        Atomically count a roll against the player and side limits and shift
+        the bar by record.shift_applied (each slot floored at 1).
+
+        Returns the new slots, or None if a limit was hit or the incident is
+        no longer live - in which case nothing is written.
+        """
+        rolls_column = "attacker_rolls" if record.side == "attacker" else "defender_rolls"
+
+        # Nested so a failed bar update also undoes the player's counter
+        savepoint = db.begin_nested()
+
+        claimed = db.execute(text("""
+            UPDATE incident_participants
+            SET
+                rolls_made = rolls_made + 1,
+                successful_rolls = successful_rolls + :success,
+                critical_rolls = critical_rolls + :critical
+            WHERE incident_id = :incident_id
+              AND player_id = :player_id
+              AND rolls_made < :max_rolls_player
+            RETURNING rolls_made
+        """), {
+            "incident_id": incident_id,
+            "player_id": record.player_id,
+            "success": 1 if record.is_success else 0,
+            "critical": 1 if record.is_critical else 0,
+            "max_rolls_player": max_rolls_player,
+        }).fetchone()
+        if not claimed:
+            savepoint.rollback()
+            return None
+
+        # slots || {outcome: GREATEST(1, slot + shift)} for outcomes on the bar
+        params = {"incident_id": incident_id, "max_rolls_side": max_rolls_side}
+        pairs = []
+        for i, (outcome, shift) in enumerate(record.shift_applied.items()):
+            params[f"k{i}"] = outcome
+            params[f"v{i}"] = shift
+            pairs.append(
+                f"CAST(:k{i} AS TEXT), CASE WHEN slots -> CAST(:k{i} AS TEXT) IS NOT NULL "
+                f"THEN GREATEST(1, (slots ->> CAST(:k{i} AS TEXT))::INT + :v{i}) END"
+            )
+        slots_expr = f"slots || jsonb_strip_nulls(jsonb_build_object({', '.join(pairs)}))" if pairs else "slots"
+
+        bar = db.execute(text(f"""
+            UPDATE incidents
+            SET
+                slots = {slots_expr},
+                {rolls_column} = {rolls_column} + 1
+            WHERE incident_id = :incident_id
+              AND status = 'active'
+              AND expires_at > NOW()
+              AND {rolls_column} < :max_rolls_side
+            RETURNING slots
+        """), params).fetchone()
+        if not bar:
+            savepoint.rollback()
+            return None
+
+        db.execute(pg_insert(IncidentRoll).values(
+            incident_id=incident_id,
+            player_id=record.player_id,
+            player_name=record.player_name,
+            side=record.side,
+            roll_value=record.roll_value,
+            stat_value=record.stat_value,
+            is_success=record.is_success,
+            is_critical=record.is_critical,
+            shift_applied=record.shift_applied,
+            created_at=record.timestamp,
+        ))
+        savepoint.commit()
+        return dict(bar.slots)
+
+    def resolve(self, db, incident_id: str, resolution_roll: int, outcome: str) -> bool:
+        """Mark an active incident resolved. False if someone else resolved it first."""
+        row = db.execute(text("""
+            UPDATE incidents
+            SET status = 'resolved', resolution_roll = :resolution_roll,
+                outcome = :outcome, resolved_at = NOW()
+            WHERE incident_id = :incident_id AND status = 'active'
+            RETURNING incident_id
+        """), {
+            "incident_id": incident_id,
+            "resolution_roll": resolution_roll,
+            "outcome": outcome,
+        }).fetchone()
+        return row is not None
+
+    # ---------- expiry (set-based) ----------
+
+    def expire_unresolvable(self, db, min_rolls: int, pair: Optional[Tuple[str, str]] = None) -> int:
+        """Timed-out incidents with too few rolls to resolve -> 'expired', in one UPDATE"""
+        sql = """
+            UPDATE incidents
+            SET status = 'expired', resolved_at = NOW()
+            WHERE status = 'active'
+              AND expires_at <= NOW()
+              AND attacker_rolls + defender_rolls < :min_rolls
+        """
+        params = {"min_rolls": min_rolls}
+        if pair:
+            sql += " AND attacker_kingdom_id = :attacker AND defender_kingdom_id = :defender"
+            params.update(attacker=pair[0], defender=pair[1])
+        return db.execute(text(sql), params).rowcount
+
+    def lock_expired_resolvable(
+        self, db, limit: int, pair: Optional[Tuple[str, str]] = None
+    ) -> List[Tuple[str, Dict[str, int]]]:
+        """
+        Timed-out incidents that have enough rolls for a master roll, as
+        (incident_id, slots). Locked SKIP LOCKED so concurrent sweepers split
+        the work instead of double-resolving.
+        """
+        query = db.query(Incident.incident_id, Incident.slots).filter(
+            Incident.status == IncidentStatus.ACTIVE.value,
+            Incident.expires_at <= datetime.utcnow()
+        )
+        if pair:
+            query = query.filter(
+                Incident.attacker_kingdom_id == pair[0],
+                Incident.defender_kingdom_id == pair[1]
+            )
+        rows = query.limit(limit).with_for_update(skip_locked=True).all()
+        return [(r.incident_id, dict(r.slots or {})) for r in rows]
+
+    def resolve_many(self, db, resolutions: List[Tuple[str, int, str]]) -> int:
+        """Bulk resolve [(incident_id, resolution_roll, outcome)] in one executemany"""
+        if not resolutions:
+            return 0
+        db.execute(text("""
+            UPDATE incidents
+            SET status = 'resolved', resolution_roll = :resolution_roll,
+                outcome = :outcome, resolved_at = NOW()
+            WHERE incident_id = :incident_id AND status = 'active'
+        """), [
+            {"incident_id": iid, "resolution_roll": roll, "outcome": outcome}
+            for iid, roll, outcome in resolutions
+        ])
+        return len(resolutions)
+
+    def purge_finished(self, db, older_than: datetime) -> int:
+        """Delete resolved/expired incidents (participants and rolls cascade)"""
+        return db.query(Incident).filter(
+            Incident.status != IncidentStatus.ACTIVE.value,
+            Incident.resolved_at < older_than
+        ).delete(synchronize_session=False)
+
+
+# ============================================================
+# IN-MEMORY STAND-IN
+# ============================================================
+
+class MemoryIncidentStore:
+    """
+    Process-local store with the same semantics as PostgresIncidentStore.
+    Indexed by pair and by defender like the tables, so lookups don't scan.
+    Only correct within one process - tests and local runs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._incidents: Dict[str, IncidentSession] = {}
+        self._active_by_pair: Dict[Tuple[str, str], str] = {}
+        self._active_by_defender: Dict[str, set] = {}
+        self._active_by_attacker: Dict[str, set] = {}
+
+    def _copy(self, incident: IncidentSession) -> IncidentSession:
+        result = copy.deepcopy(incident)
+        result.roll_history = result.roll_history[-ROLL_HISTORY_LIMIT:]
+        return result
+
+    def _is_live(self, incident: IncidentSession) -> bool:
+        return incident.status == IncidentStatus.ACTIVE and not incident.is_expired()
+
+    def _deactivate(self, incident: IncidentSession) -> None:
+        pair = (incident.attacker_kingdom_id, incident.defender_kingdom_id)
+        if self._active_by_pair.get(pair) == incident.incident_id:
+            del self._active_by_pair[pair]
+        self._active_by_defender.get(incident.defender_kingdom_id, set()).discard(incident.incident_id)
+        self._active_by_attacker.get(incident.attacker_kingdom_id, set()).discard(incident.incident_id)
+
+    # ---------- reads ----------
+
+    def get(self, db, incident_id: str) -> Optional[IncidentSession]:
+        with self._lock:
+            incident = self._incidents.get(incident_id)
+            return self._copy(incident) if incident else None
+
+    def get_active_for_pair(self, db, attacker_kingdom_id: str, defender_kingdom_id: str) -> Optional[IncidentSession]:
+        with self._lock:
+            incident_id = self._active_by_pair.get((attacker_kingdom_id, defender_kingdom_id))
+            incident = self._incidents.get(incident_id) if incident_id else None
+            if incident and self._is_live(incident):
+                return self._copy(incident)
+            return None
+
+    def list_active(
+        self,
+        db,
+        attacker_kingdom_id: Optional[str] = None,
+        defender_kingdom_id: Optional[str] = None,
+    ) -> List[IncidentSession]:
+        with self._lock:
+            if defender_kingdom_id is not None:
+                ids = set(self._active_by_defender.get(defender_kingdom_id, ()))
+                if attacker_kingdom_id is not None:
+                    ids &= self._active_by_attacker.get(attacker_kingdom_id, set())
+            elif attacker_kingdom_id is not None:
+                ids = set(self._active_by_attacker.get(attacker_kingdom_id, ()))
+            else:
+                ids = set(self._active_by_pair.values())
+            incidents = [self._incidents[iid] for iid in ids]
+            return [
+                self._copy(inc)
+                for inc in sorted(incidents, key=lambda i: i.created_at)
+                if self._is_live(inc)
+            ]
+
+    # ---------- writes ----------
+
+    def create(self, db, session: IncidentSession) -> bool:
+        pair = (session.attacker_kingdom_id, session.defender_kingdom_id)
+        with self._lock:
+            existing_id = self._active_by_pair.get(pair)
+            if existing_id and self._incidents[existing_id].status == IncidentStatus.ACTIVE:
+                return False
+            stored = copy.deepcopy(session)
+            self._incidents[stored.incident_id] = stored
+            self._active_by_pair[pair] = stored.incident_id
+            self._active_by_defender.setdefault(stored.defender_kingdom_id, set()).add(stored.incident_id)
+            self._active_by_attacker.setdefault(stored.attacker_kingdom_id, set()).add(stored.incident_id)
+            return True
+
+    def add_participant(self, db, incident_id: str, participant: IncidentParticipant) -> bool:
+        with self._lock:
+            incident = self._incidents.get(incident_id)
+            if not incident or not self._is_live(incident):
+                return False
+            return incident.add_participant(
+                player_id=participant.player_id,
+                player_name=participant.player_name,
+                side=participant.side,
+                stats=participant.stats,
+                kingdom_id=participant.kingdom_id,
+            )
+
+    def apply_roll(
+        self,
+        db,
+        incident_id: str,
+        record: RollRecord,
+        max_rolls_player: int,
+        max_rolls_side: int,
+    ) -> Optional[Dict[str, int]]:
+        with self._lock:
+            incident = self._incidents.get(incident_id)
+            if not incident or not self._is_live(incident):
+                return None
+            participant = incident.participants.get(record.player_id)
+            if not participant or participant.rolls_made >= max_rolls_player:
+                return None
+            side_rolls = incident.attacker_rolls if record.side == "attacker" else incident.defender_rolls
+            if side_rolls >= max_rolls_side:
+                return None
+
+            for outcome, shift in record.shift_applied.items():
+                if outcome in incident.slots:
+                    incident.slots[outcome] = max(1, incident.slots[outcome] + shift)
+            participant.rolls_made += 1
+            if record.is_success:
+                participant.successful_rolls += 1
+            if record.is_critical:
+                participant.critical_rolls += 1
+            if record.side == "attacker":
+                incident.attacker_rolls += 1
+            else:
+                incident.defender_rolls += 1
+            incident.roll_history.append(copy.deepcopy(record))
+            return dict(incident.slots)
+
+    def resolve(self, db, incident_id: str, resolution_roll: int, outcome: str) -> bool:
+        with self._lock:
+            incident = self._incidents.get(incident_id)
+            if not incident or incident.status != IncidentStatus.ACTIVE:
+                return False
+            incident.status = IncidentStatus.RESOLVED
+            incident.resolution_roll = resolution_roll
+            incident.outcome = outcome
+            incident.resolved_at = datetime.utcnow()
+            self._deactivate(incident)
+            return True
+
+    # ---------- expiry ----------
+
+    def _expired_active(self, pair: Optional[Tuple[str, str]]) -> List[IncidentSession]:
+        if pair:
+            incident_id = self._active_by_pair.get(pair)
+            candidates = [self._incidents[incident_id]] if incident_id else []
+        else:
+            candidates = [self._incidents[iid] for iid in self._active_by_pair.values()]
+        return [
+            inc for inc in candidates
+            if inc.status == IncidentStatus.ACTIVE and inc.is_expired()
+        ]
+
+    def expire_unresolvable(self, db, min_rolls: int, pair: Optional[Tuple[str, str]] = None) -> int:
+        with self._lock:
+            count = 0
+            for incident in self._expired_active(pair):
+                if incident.attacker_rolls + incident.defender_rolls < min_rolls:
+                    incident.status = IncidentStatus.EXPIRED
+                    incident.resolved_at = datetime.utcnow()
+                    self._deactivate(incident)
+                    count += 1
+            return count
+
+    def lock_expired_resolvable(
+        self, db, limit: int, pair: Optional[Tuple[str, str]] = None
+    ) -> List[Tuple[str, Dict[str, int]]]:
+        with self._lock:
+            return [
+                (inc.incident_id, dict(inc.slots))
+                for inc in self._expired_active(pair)[:limit]
+            ]
+
+    def resolve_many(self, db, resolutions: List[Tuple[str, int, str]]) -> int:
+        for incident_id, resolution_roll, outcome in resolutions:
+            self.resolve(db, incident_id, resolution_roll, outcome)
+        return len(resolutions)
+
+    def purge_finished(self, db, older_than: datetime) -> int:
+        with self._lock:
+            to_remove = [
+                iid for iid, inc in self._incidents.items()
+                if inc.status != IncidentStatus.ACTIVE and inc.resolved_at and inc.resolved_at < older_than
+            ]
+            for iid in to_remove:
+                del self._incidents[iid]
+            return len(to_remove)
@@ -0,0 +1,108 @@
+"""
+Conditional GET - body-hash ETags for endpoints the app polls
+
+Most polls of the badge/status endpoints return exactly the same JSON as
+the previous poll. For the paths in CONDITIONAL_GET_PATHS,
+ConditionalGetMiddleware tags every 200 with an ETag (a hash of the
+response body) and answers 304 Not Modified with no body when the
+client's If-None-Match matches.
+
+This only saves bandwidth and client-side decoding. The endpoint still
+runs, builds and serializes its response on every poll; there is no
+version key to answer from before that. Each of these bodies depends on
+the server clock (cooldown and watering countdowns, the garden badge in
+/notifications/summary) or on other players' writes (coups, kingdom
+events, incoming offers), or is a single COUNT already.
+
+Responses are marked `Cache-Control: private, no-cache`, so URLSession
+stores them and revalidates on every request.
+"""
+import hashlib
+from typing import Iterable, Optional
+
+
+CONDITIONAL_GET_PATHS = {
+    "/actions/status",
+    "/notifications/summary",
+    "/duels/pending-count",
+    "/trades/pending-count",
+    "/garden/status",
+}
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison - ignore W/ prefixes
+    wanted = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == wanted:
+            return True
+    return False
+
+
+def body_etag(body: bytes) -> str:
+    return f'W/"b{hashlib.sha1(body).hexdigest()[:24]}"'
+
+
+class ConditionalGetMiddleware:
+    """ASGI middleware adding body-hash ETags (and 304s) to GETs on the configured paths"""
+
+    def __init__(self, app, paths: Iterable[str] = CONDITIONAL_GET_PATHS):
+        self.app = app
+        self.paths = set(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = None
+        for name, value in scope.get("headers", []):
+            if name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+                break
+
+        start_message = None
+        chunks = []
+
+        async def buffered_send(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                if message["status"] != 200:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or start_message["status"] != 200:
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            etag = body_etag(body)
+            headers = [
+                (name, value) for name, value in start_message["headers"]
+                if name not in (b"etag", b"cache-control", b"content-length")
+            ]
+            headers += [(b"etag", etag.encode("latin-1")), (b"cache-control", CACHE_CONTROL.encode("latin-1"))]
+
+            if _etag_matches(if_none_match, etag):
+                await send({"type": "http.response.start", "status": 304, "headers": headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            headers.append((b"content-length", str(len(body)).encode("latin-1")))
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, buffered_send)
@@ -0,0 +1,50 @@
+"""
+Blocking work offload - keeps sync SQLAlchemy and geometry off the event loop
+
+The API uses the synchronous Session from db/base.py. Calling it directly
+from an `async def` endpoint blocks uvicorn's event loop, so one slow
+/startup stalls every other request and the /ws WebSocket traffic.
+
+Async endpoints await network I/O on the loop and hand every blocking step
+to run_sync(), which runs it in anyio's worker threads behind a bounded
+CapacityLimiter. A request's Session is only ever used by one thread at a
+time (each step is awaited before the next), which SQLAlchemy allows.
+"""
+import asyncio
+import functools
+import os
+from typing import Any, Callable, TypeVar
+
+from anyio import CapacityLimiter, to_thread
+
+
+T = TypeVar("T")
+
+# Max blocking steps running at once (per process). The DB pool bounds how
+# many of these can actually hold a connection, so keep it >= pool size.
+BLOCKING_POOL_SIZE = int(os.getenv("BLOCKING_POOL_SIZE", "8"))
+
+_limiter = None
+_limiter_loop = None
+
+
+def _get_limiter() -> CapacityLimiter:
+    # A limiter belongs to the event loop it was created on (Lambda may start new loops)
+    global _limiter, _limiter_loop
+    loop = asyncio.get_running_loop()
+    if _limiter is None or _limiter_loop is not loop:
+        _limiter = CapacityLimiter(BLOCKING_POOL_SIZE)
+        _limiter_loop = loop
+    return _limiter
+
+
+async def run_sync(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking function in the bounded worker pool and await its result"""
+    return await to_thread.run_sync(functools.partial(func, *args, **kwargs), limiter=_get_limiter())
+
+
+def blocking_pool_stats() -> dict:
+    if _limiter is None:
+        return {"size": BLOCKING_POOL_SIZE, "busy": 0, "waiting": 0}
+    stats = _limiter.statistics()
+    return {"size": BLOCKING_POOL_SIZE, "busy": stats.borrowed_tokens, "waiting": stats.tasks_waiting}
@@ -225,6 +225,7 @@ class KingdomEvents:
     COUP_ENDED = "coup_ended"
     INVASION_STARTED = "invasion_started"
     INVASION_ENDED = "invasion_ended"
+    BATTLE_PHASE_STARTED = "battle_phase_started"  # Pledge window closed, fighting open
     BUILDING_UPGRADED = "building_upgraded"
     CONTRACT_POSTED = "contract_posted"
     CONTRACT_COMPLETED = "contract_completed"
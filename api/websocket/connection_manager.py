@@ -3,21 +3,36 @@ Connection Manager - DynamoDB-backed WebSocket connection tracking
 
 This is the core infrastructure for all real-time features.
 Handles connection lifecycle and provides broadcast utilities.
+Broadcasts send in parallel through websocket/fanout.py.
 """
 import os
 import json
 import time
 import logging
-from typing import Optional
+import threading
+from typing import Dict, Iterable, Optional
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+from .fanout import fanout_engine, WS_FANOUT_WORKERS
+
 logger = logging.getLogger(__name__)
 
 # Initialize clients
-dynamodb = boto3.resource('dynamodb')
+# DYNAMODB_ENDPOINT_URL points at a local stand-in (DynamoDB Local, websocket/fake_aws.py)
+DYNAMODB_ENDPOINT_URL = os.environ.get('DYNAMODB_ENDPOINT_URL') or None
+dynamodb = boto3.resource(
+    'dynamodb',
+    endpoint_url=DYNAMODB_ENDPOINT_URL,
+    config=Config(max_pool_connections=max(WS_FANOUT_WORKERS, 10))
+)
 TABLE_NAME = os.environ.get('CONNECTIONS_TABLE', 'kingdom-api-connections-dev')
 
+# One client per endpoint, sized for the fan-out pool (clients are thread-safe)
+_api_gateway_clients: Dict[str, object] = {}
+_api_gateway_clients_lock = threading.Lock()
+
 
 def get_table():
     """Get the connections DynamoDB table"""
@@ -27,14 +42,28 @@ def get_table():
 def get_api_gateway_client(endpoint_url: str):
     """
     Get API Gateway Management API client for sending messages.
+    Cached per endpoint so its HTTPS connections are reused across calls.
     
     Args:
         endpoint_url: The WebSocket API endpoint (e.g., https://abc123.execute-api.us-east-1.amazonaws.com/dev)
     """
-    return boto3.client(
-        'apigatewaymanagementapi',
-        endpoint_url=endpoint_url
-    )
+    client = _api_gateway_clients.get(endpoint_url)
+    if client is None:
+        # Client creation isn't thread-safe in boto3
+        with _api_gateway_clients_lock:
+            client = _api_gateway_clients.get(endpoint_url)
+            if client is None:
+                client = boto3.client(
+                    'apigatewaymanagementapi',
+                    endpoint_url=endpoint_url,
+                    config=Config(
+                        max_pool_connections=max(WS_FANOUT_WORKERS, 10),
+                        connect_timeout=3,
+                        read_timeout=5
+                    )
+                )
+                _api_gateway_clients[endpoint_url] = client
+    return client
 
 
 # ===== Connection Lifecycle =====
@@ -97,6 +126,26 @@ def delete_connection(connection_id: str) -> bool:
         return False
 
 
+def delete_connections(connection_ids: Iterable[str]) -> int:
+    """
+    Remove many connections at once (stale connections found by a broadcast).
+    Uses BatchWriteItem, 25 deletes per request.
+    """
+    connection_ids = list(dict.fromkeys(connection_ids))
+    if not connection_ids:
+        return 0
+    
+    try:
+        with get_table().batch_writer() as batch:
+            for connection_id in connection_ids:
+                batch.delete_item(Key={'connection_id': connection_id})
+        logger.info(f"Deleted {len(connection_ids)} connections")
+        return len(connection_ids)
+    except ClientError as e:
+        logger.error(f"Failed to delete connections: {e}")
+        return 0
+
+
 def get_connection(connection_id: str) -> Optional[dict]:
     """Get a connection's details"""
     table = get_table()
@@ -156,6 +205,24 @@ def update_connection(
 
 # ===== Query Connections =====
 
+def _query_index(index_name: str, key: str, value: str) -> list:
+    """
+    Every item in a GSI partition, following LastEvaluatedKey.
+    Uses the resource's client, which (unlike Table resources) is safe to share
+    between the fan-out threads and still converts to/from plain Python values.
+    """
+    paginator = dynamodb.meta.client.get_paginator('query')
+    items = []
+    for page in paginator.paginate(
+        TableName=TABLE_NAME,
+        IndexName=index_name,
+        KeyConditionExpression=f'{key} = :v',
+        ExpressionAttributeValues={':v': value}
+    ):
+        items.extend(page.get('Items', []))
+    return items
+
+
 def get_kingdom_connections(kingdom_id: str, subscription_filter: Optional[str] = None) -> list:
     """
     Get all connections in a kingdom.
@@ -167,16 +234,8 @@ def get_kingdom_connections(kingdom_id: str, subscription_filter: Optional[str]
     Returns:
         List of connection items
     """
-    table = get_table()
-    
     try:
-        response = table.query(
-            IndexName='kingdom-index',
-            KeyConditionExpression='kingdom_id = :k',
-            ExpressionAttributeValues={':k': kingdom_id}
-        )
-        
-        connections = response.get('Items', [])
+        connections = _query_index('kingdom-index', 'kingdom_id', str(kingdom_id))
         
         # Filter by subscription if specified
         if subscription_filter:
@@ -200,20 +259,22 @@ def get_user_connections(user_id: str) -> list:
     - Personal notifications
     - Detecting if user is online
     """
-    table = get_table()
-    
     try:
-        response = table.query(
-            IndexName='user-index',
-            KeyConditionExpression='user_id = :u',
-            ExpressionAttributeValues={':u': user_id}
-        )
-        return response.get('Items', [])
+        return _query_index('user-index', 'user_id', str(user_id))
     except ClientError as e:
         logger.error(f"Failed to query user connections: {e}")
         return []
 
 
+def get_connections_for_users(user_ids: Iterable) -> Dict[str, list]:
+    """
+    Connections of several users, keyed by user ID (as a string).
+    The per-user index queries run concurrently on the fan-out pool.
+    """
+    unique_ids = list(dict.fromkeys(str(uid) for uid in user_ids if uid is not None))
+    return dict(zip(unique_ids, fanout_engine.map(get_user_connections, unique_ids)))
+
+
 # ===== Message Sending =====
 
 def send_to_connection(endpoint_url: str, connection_id: str, message: dict) -> bool:
@@ -271,19 +332,17 @@ def broadcast_to_kingdom(
     """
     connections = get_kingdom_connections(kingdom_id, subscription_filter=channel)
     
-    sent_count = 0
-    for conn in connections:
-        conn_id = conn['connection_id']
-        
-        # Skip excluded connection
-        if exclude_connection and conn_id == exclude_connection:
-            continue
-        
-        if send_to_connection(endpoint_url, conn_id, message):
-            sent_count += 1
+    connection_ids = [
+        conn['connection_id'] for conn in connections
+        if not (exclude_connection and conn['connection_id'] == exclude_connection)
+    ]
+    result = fanout_engine.send(endpoint_url, connection_ids, message)
     
-    logger.info(f"Broadcast to {sent_count}/{len(connections)} connections in kingdom {kingdom_id}")
-    return sent_count
+    logger.info(
+        f"Broadcast to {result.sent}/{len(connections)} connections in kingdom {kingdom_id} "
+        f"({len(result.gone)} stale, {result.elapsed_seconds * 1000:.0f}ms)"
+    )
+    return result.sent
 
 
 def broadcast_to_user(endpoint_url: str, user_id: str, message: dict) -> int:
@@ -294,12 +353,8 @@ def broadcast_to_user(endpoint_url: str, user_id: str, message: dict) -> int:
     """
     connections = get_user_connections(user_id)
     
-    sent_count = 0
-    for conn in connections:
-        if send_to_connection(endpoint_url, conn['connection_id'], message):
-            sent_count += 1
-    
-    return sent_count
+    result = fanout_engine.send(endpoint_url, [conn['connection_id'] for conn in connections], message)
+    return result.sent
 
 
 def broadcast_to_multiple_users(endpoint_url: str, user_ids: list, message: dict) -> int:
@@ -309,9 +364,15 @@ def broadcast_to_multiple_users(endpoint_url: str, user_ids: list, message: dict
     Useful for:
     - Party notifications (group hunts)
     - Alliance-wide messages
+    
+    User lookups and sends both run concurrently (websocket/fanout.py).
     """
-    sent_count = 0
-    for user_id in user_ids:
-        sent_count += broadcast_to_user(endpoint_url, user_id, message)
-    return sent_count
-
+    connections_by_user = get_connections_for_users(user_ids)
+    
+    connection_ids = [
+        conn['connection_id']
+        for connections in connections_by_user.values()
+        for conn in connections
+    ]
+    result = fanout_engine.send(endpoint_url, connection_ids, message)
+    return result.sent
@@ -0,0 +1,190 @@
+"""
+Fake AWS backend - Local stand-in for API Gateway WebSockets and DynamoDB
+
+Lets connection_manager / fanout run with real boto3 clients and no AWS
+account, e.g. for benchmark_ws_fanout.py. One threaded HTTP server answers
+both services:
+
+- POST {stage}/@connections/{id}  API Gateway Management PostToConnection.
+  Unknown or gone connections get 410 GoneException, like the real service.
+- POST / with X-Amz-Target        DynamoDB JSON protocol: PutItem, GetItem,
+  DeleteItem, BatchWriteItem and Query on a GSI (paginated with Limit /
+  ExclusiveStartKey so callers must follow LastEvaluatedKey).
+
+Point the code at it with:
+
+    DYNAMODB_ENDPOINT_URL=http://127.0.0.1:<port>
+    WEBSOCKET_API_ENDPOINT=http://127.0.0.1:<port>/dev
+
+Any access key / region works; requests are not signature-checked.
+"""
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Set, Tuple
+from urllib.parse import unquote
+
+
+_KEY_CONDITION = re.compile(r"^\s*(#?\w+)\s*=\s*(:\w+)\s*$")
+
+
+class FakeAwsState:
+    """Connections table, stale connection IDs and request counters"""
+
+    def __init__(self, latency_ms: float = 20, page_size: int = 100):
+        self.latency_seconds = latency_ms / 1000
+        self.page_size = page_size
+        self.items: Dict[str, dict] = {}  # connection_id -> DynamoDB-typed item
+        self.gone: Set[str] = set()  # connections API Gateway reports as gone
+        self.delivered: Counter = Counter()  # connection_id -> messages received
+        self.requests: Counter = Counter()  # operation -> calls
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self.lock = threading.Lock()
+
+    def enter(self, operation: str) -> None:
+        with self.lock:
+            self.requests[operation] += 1
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+
+    def leave(self) -> None:
+        with self.lock:
+            self._in_flight -= 1
+
+    def reset_counters(self) -> None:
+        with self.lock:
+            self.delivered.clear()
+            self.requests.clear()
+            self.max_in_flight = 0
+
+    def put_connection(self, connection_id: str, user_id: str, kingdom_id: str, subscriptions=("chat", "notifications")) -> None:
+        """Seed a connection row (same shape as connection_manager.save_connection)"""
+        self.items[connection_id] = {
+            "connection_id": {"S": connection_id},
+            "user_id": {"S": str(user_id)},
+            "kingdom_id": {"S": str(kingdom_id)},
+            "subscriptions": {"L": [{"S": s} for s in subscriptions]},
+            "connected_at": {"N": str(int(time.time()))},
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so client connection pools are exercised
+    disable_nagle_algorithm = True  # headers and body are separate writes
+    state: FakeAwsState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: dict, error_type: Optional[str] = None) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/x-amz-json-1.0")
+        self.send_header("Content-Length", str(len(payload)))
+        if error_type:
+            self.send_header("x-amzn-ErrorType", error_type)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        path = unquote(self.path)
+
+        if "/@connections/" in path:
+            operation = "PostToConnection"
+        else:
+            operation = (self.headers.get("X-Amz-Target") or "").split(".")[-1]
+
+        state = self.state
+        state.enter(operation)
+        try:
+            time.sleep(state.latency_seconds)
+            if operation == "PostToConnection":
+                self._post_to_connection(path.split("/@connections/", 1)[1])
+            else:
+                handler = getattr(self, f"_dynamo_{operation}", None)
+                if handler is None:
+                    self._reply(400, {"__type": "UnknownOperationException"}, "UnknownOperationException")
+                else:
+                    handler(json.loads(body or b"{}"))
+        finally:
+            state.leave()
+
+    # ===== API Gateway =====
+
+    def _post_to_connection(self, connection_id: str) -> None:
+        state = self.state
+        if connection_id in state.gone or connection_id not in state.items:
+            self._reply(410, {"message": None}, "GoneException")
+            return
+        with state.lock:
+            state.delivered[connection_id] += 1
+        self._reply(200, {})
+
+    # ===== DynamoDB =====
+
+    def _dynamo_PutItem(self, request: dict) -> None:
+        item = request["Item"]
+        self.state.items[item["connection_id"]["S"]] = item
+        self._reply(200, {})
+
+    def _dynamo_GetItem(self, request: dict) -> None:
+        item = self.state.items.get(request["Key"]["connection_id"]["S"])
+        self._reply(200, {"Item": item} if item else {})
+
+    def _dynamo_DeleteItem(self, request: dict) -> None:
+        self.state.items.pop(request["Key"]["connection_id"]["S"], None)
+        self._reply(200, {})
+
+    def _dynamo_BatchWriteItem(self, request: dict) -> None:
+        for writes in request["RequestItems"].values():
+            for write in writes:
+                if "DeleteRequest" in write:
+                    self.state.items.pop(write["DeleteRequest"]["Key"]["connection_id"]["S"], None)
+                elif "PutRequest" in write:
+                    item = write["PutRequest"]["Item"]
+                    self.state.items[item["connection_id"]["S"]] = item
+        self._reply(200, {"UnprocessedItems": {}})
+
+    def _dynamo_Query(self, request: dict) -> None:
+        attribute, placeholder = _parse_key_condition(request)
+        value = request["ExpressionAttributeValues"][placeholder]
+        matches = sorted(
+            (item for item in list(self.state.items.values()) if item.get(attribute) == value),
+            key=lambda item: item["connection_id"]["S"]
+        )
+
+        start_after = (request.get("ExclusiveStartKey") or {}).get("connection_id", {}).get("S")
+        if start_after:
+            matches = [item for item in matches if item["connection_id"]["S"] > start_after]
+
+        limit = min(request.get("Limit") or self.state.page_size, self.state.page_size)
+        page = matches[:limit]
+        response = {"Items": page, "Count": len(page), "ScannedCount": len(page)}
+        if len(matches) > limit:
+            last = page[-1]
+            response["LastEvaluatedKey"] = {"connection_id": last["connection_id"], attribute: last[attribute]}
+        self._reply(200, response)
+
+
+def _parse_key_condition(request: dict) -> Tuple[str, str]:
+    match = _KEY_CONDITION.match(request["KeyConditionExpression"])
+    if not match:
+        raise ValueError(f"Unsupported KeyConditionExpression: {request['KeyConditionExpression']}")
+    attribute, placeholder = match.groups()
+    if attribute.startswith("#"):
+        attribute = request["ExpressionAttributeNames"][attribute]
+    return attribute, placeholder
+
+
+def start_fake_aws(state: FakeAwsState, host: str = "127.0.0.1", port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve `state` on a background thread. Returns the server and its base URL."""
+    handler = type("FakeAwsHandler", (_Handler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-aws", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
@@ -0,0 +1,127 @@
+"""
+WebSocket fan-out - parallel post_to_connection with bounded concurrency
+
+API Gateway has no broadcast: every recipient is one HTTPS PostToConnection.
+Broadcasting used to send them one at a time (and query the user index once
+per user, in turn), so a coup or battle event in a large kingdom held the
+REST Lambda for N sequential round trips.
+
+FanoutEngine sends on a process-wide thread pool (WS_FANOUT_WORKERS threads)
+through one pooled API Gateway client per endpoint, with the message encoded
+once. Connections that answer GoneException are collected and deleted in one
+BatchWriteItem pass at the end instead of one DeleteItem each.
+
+Lookups for several users run on the same pool (DynamoDB has no multi-key
+query on a GSI, so each user is still one Query - but they overlap).
+
+The pool survives between invocations of a warm Lambda container. To run
+against local stand-ins, see websocket/fake_aws.py and benchmark_ws_fanout.py.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional, TypeVar
+
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Max PostToConnection / Query calls in flight per process
+WS_FANOUT_WORKERS = int(os.getenv("WS_FANOUT_WORKERS", "16"))
+
+_SENT = "sent"
+_GONE = "gone"
+_FAILED = "failed"
+
+
+@dataclass
+class FanoutResult:
+    """Outcome of one fan-out"""
+    sent: int = 0
+    failed: int = 0
+    gone: List[str] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def attempted(self) -> int:
+        return self.sent + self.failed + len(self.gone)
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.attempted / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+class FanoutEngine:
+    """Bounded thread pool for PostToConnection and per-user index queries"""
+
+    def __init__(self, max_workers: int = WS_FANOUT_WORKERS):
+        self.max_workers = max(1, max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created on first use - imports for REST routes that never broadcast stay cheap
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="ws-fanout"
+                    )
+        return self._executor
+
+    def map(self, fn: Callable[[T], R], items: Iterable[T]) -> List[R]:
+        """fn over items on the pool, results in input order (inline for 0-1 items or 1 worker)"""
+        items = list(items)
+        if len(items) <= 1 or self.max_workers == 1:
+            return [fn(item) for item in items]
+        return list(self._get_executor().map(fn, items))
+
+    def send(self, endpoint_url: str, connection_ids: Iterable[str], message: dict) -> FanoutResult:
+        """Post one message to every connection, then delete the gone ones in bulk"""
+        from .connection_manager import get_api_gateway_client, delete_connections
+
+        connection_ids = list(dict.fromkeys(connection_ids))  # dedupe, keep order
+        result = FanoutResult()
+        if not connection_ids:
+            return result
+
+        start = time.perf_counter()
+        client = get_api_gateway_client(endpoint_url)
+        payload = json.dumps(message).encode('utf-8')
+
+        def post(connection_id: str) -> str:
+            try:
+                client.post_to_connection(ConnectionId=connection_id, Data=payload)
+                return _SENT
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code', '') == 'GoneException':
+                    return _GONE
+                logger.error(f"Failed to send to {connection_id}: {e}")
+                return _FAILED
+
+        for connection_id, status in zip(connection_ids, self.map(post, connection_ids)):
+            if status == _SENT:
+                result.sent += 1
+            elif status == _GONE:
+                result.gone.append(connection_id)
+            else:
+                result.failed += 1
+
+        if result.gone:
+            logger.info(f"Removing {len(result.gone)} stale connections")
+            delete_connections(result.gone)
+
+        result.elapsed_seconds = time.perf_counter() - start
+        return result
+
+
+# Shared by every broadcast in this process
+fanout_engine = FanoutEngine()